@@ -13,7 +13,7 @@ Protokol özellikleri:
 - 115200 baud rate
 
 Kullanım:
-    python main.py
+    python main.py [--verbose]
 
 Requirements:
     - Python 3.7+
@@ -27,11 +27,14 @@ import os
 # src klasörünü Python path'ine ekle
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
+from src.cli import enable_debug_log
 from src.gui import STM32BootloaderGUI
 
 def main():
     """Ana fonksiyon"""
     try:
+        if "--verbose" in sys.argv[1:] or "-v" in sys.argv[1:]:
+            enable_debug_log()
         print("STM32 Bootloader GUI başlatılıyor...")
         app = STM32BootloaderGUI()
         app.run()
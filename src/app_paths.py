@@ -0,0 +1,22 @@
+import os
+
+def app_data_dir() -> str:
+    """
+    Uygulamanın kalıcı verileri (önbellekler, tablolar, loglar) için dizini döner.
+    STM32_BOOTLOADER_HOME ortam değişkeni ile değiştirilebilir.
+    """
+    path = os.environ.get("STM32_BOOTLOADER_HOME") or os.path.join(
+        os.path.expanduser("~"), ".stm32_bootloader"
+    )
+    os.makedirs(path, exist_ok=True)
+    return path
+
+def app_data_path(filename: str) -> str:
+    """Uygulama veri dizini içindeki bir dosyanın tam yolunu döner"""
+    return os.path.join(app_data_dir(), filename)
+
+def app_logs_dir() -> str:
+    """Oturum logları ve profil çıktıları için dizin (uygulama veri dizini/logs)"""
+    path = os.path.join(app_data_dir(), "logs")
+    os.makedirs(path, exist_ok=True)
+    return path
@@ -0,0 +1,91 @@
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+from .app_paths import app_data_path
+
+# Otomatik baud taramasında denenen hızlar (GUI'deki seçeneklerle aynı)
+DEFAULT_BAUDRATE_CANDIDATES = [
+    115200, 230400, 460800, 921600,
+    1000000, 2000000, 3000000, 4000000,
+]
+
+@dataclass
+class BaudProbeResult:
+    """Tek bir baud rate için test paketi patlamasının sonucu"""
+    baudrate: int
+    sent: int = 0
+    acked: int = 0
+    nacks: int = 0
+    timeouts: int = 0
+
+    @property
+    def errors(self) -> int:
+        return self.nacks + self.timeouts
+
+    @property
+    def error_rate(self) -> float:
+        if self.sent == 0:
+            return 1.0
+        return self.errors / self.sent
+
+    def __str__(self) -> str:
+        return (f"{self.baudrate} baud: {self.acked}/{self.sent} ACK, "
+                f"{self.nacks} NACK, {self.timeouts} timeout "
+                f"(hata oranı %{self.error_rate * 100:.1f})")
+
+class BaudRateCache:
+    """
+    Adaptör seri numarasına göre en son bulunan baud rate'i saklar.
+    Sonraki oturumlar doğrudan bu hızdan başlayabilir.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or app_data_path("baud_cache.json")
+        self._lock = threading.Lock()
+
+    def _load(self) -> Dict[str, dict]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self, data: Dict[str, dict]):
+        """Önbelleği geçici dosyaya yazıp atomik olarak yerine koyar (çağıran kilidi tutar)"""
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def get(self, adapter_serial: str) -> Optional[int]:
+        """Adaptör için kayıtlı baud rate'i döner (yoksa None)"""
+        with self._lock:
+            entry = self._load().get(adapter_serial)
+        if not entry:
+            return None
+        try:
+            return int(entry["baudrate"])
+        except (KeyError, TypeError, ValueError):
+            return None
+
+    def set(self, adapter_serial: str, baudrate: int, error_rate: float = 0.0):
+        """Adaptör için bulunan baud rate'i kaydeder"""
+        with self._lock:
+            data = self._load()
+            data[adapter_serial] = {
+                "baudrate": baudrate,
+                "error_rate": round(error_rate, 4),
+                "updated": time.strftime("%Y-%m-%d %H:%M:%S"),
+            }
+            self._save(data)
+
+    def forget(self, adapter_serial: str):
+        """Adaptörün kaydını siler"""
+        with self._lock:
+            data = self._load()
+            if data.pop(adapter_serial, None) is not None:
+                self._save(data)
@@ -0,0 +1,34 @@
+import threading
+
+CANCELLED_MESSAGE = "İşlem iptal edildi"
+
+class CancelToken:
+    """
+    Uzun süren silme / yazma işlemlerini başka bir thread'den durdurmak için bayrak
+
+    Kullanım:
+        token = CancelToken()
+        threading.Thread(target=lambda: uart.send_firmware(data, 5, cancel_token=token)).start()
+        ...
+        token.cancel()  # İşlem bir paket gidiş-dönüşü içinde durur
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        """İptal ister (thread-safe, tekrar çağrılabilir)"""
+        self._event.set()
+
+    @property
+    def is_cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def wait(self, timeout: float) -> bool:
+        """
+        En fazla timeout kadar uyur; iptal edilirse hemen döner
+
+        Returns:
+            bool: İptal istendiyse True
+        """
+        return self._event.wait(max(0.0, timeout))
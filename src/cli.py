@@ -0,0 +1,455 @@
+"""
+STM32 Bootloader komut satırı arayüzü
+
+Kullanım:
+    python -m src.cli ports
+    python -m src.cli flash firmware.bin --port /dev/ttyUSB0 --sector 5
+    python -m src.cli plan firmware.bin --port /dev/ttyUSB0 --sector 5 --baudrate 921600
+    python -m src.cli erase --port /dev/ttyUSB0 --sectors 2-5
+    python -m src.cli bundle production.json --port /dev/ttyUSB0
+    python -m src.cli daemon
+    python -m src.cli submit firmware.bin --ports /dev/ttyUSB0,/dev/ttyUSB1 --sector 5 --wait
+    python -m src.cli history --by day --days 30
+    python -m src.cli soak --hours 8 --target gui
+    python -m src.cli simulate --size 2048 --baudrate 115200 921600 --error-rate 0 0.1
+
+--verbose (-v) paket başına DEBUG izini açar (ör. python -m src.cli -v flash ...).
+
+Ctrl+C işlemi iptal eder: cihaza FINISH gönderilir ve port temiz kapatılır.
+İkinci Ctrl+C programı hemen sonlandırır.
+"""
+
+import argparse
+import logging
+import os
+import signal
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from typing import Iterator, List
+from .cancellation import CancelToken
+from .flash_bundle import load_manifest
+from .flash_history import GROUP_COLUMNS, FlashHistory
+from .flash_daemon import DEFAULT_DAEMON_HOST, DEFAULT_DAEMON_PORT, FlashDaemon, FlashDaemonClient, daemon_token_path
+from .image_preprocess import preprocess_image
+from .session_log import SessionLog, default_log_writer
+from .soak import SOAK_TARGETS, SoakThresholds, run_soak
+from .profiling import PROFILE_MODES
+from .sector_timing import SectorTimingTable
+from .transfer_planner import estimate_link, plan_transfer
+from .transport import create_transport
+from .virtual_bench import sweep
+from .uart_comm import UARTCommunication
+
+def parse_sector_list(text: str) -> List[int]:
+    """'2-5', '4,7' veya '1,3-4' biçimindeki sektör listesini çözer"""
+    sectors: List[int] = []
+    for part in text.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            first, last = (int(x) for x in part.split("-", 1))
+            if last < first:
+                raise ValueError(f"Geçersiz sektör aralığı: {part}")
+            sectors.extend(range(first, last + 1))
+        else:
+            sectors.append(int(part))
+    if not sectors:
+        raise ValueError("Sektör listesi boş")
+    return sectors
+
+@contextmanager
+def cancel_on_sigint(token: CancelToken) -> Iterator[CancelToken]:
+    """
+    İlk SIGINT'te token'ı iptal eder, ikincisinde KeyboardInterrupt yükseltir
+
+    Ana thread dışında sinyal işleyicisi kurulamadığından orada hiçbir şey yapmaz.
+    """
+    def handler(signum, frame):
+        if token.is_cancelled:
+            raise KeyboardInterrupt
+        print("\nİptal ediliyor... (hemen çıkmak için tekrar Ctrl+C)", file=sys.stderr)
+        token.cancel()
+
+    try:
+        previous = signal.signal(signal.SIGINT, handler)
+    except ValueError:
+        yield token
+        return
+    try:
+        yield token
+    finally:
+        signal.signal(signal.SIGINT, previous)
+
+def print_progress(current: int, total: int):
+    """Tek satırda güncellenen ilerleme çıktısı"""
+    percentage = current / total * 100 if total else 100.0
+    end = "\n" if current >= total else ""
+    print(f"\r📦 Paket {current}/{total} ({percentage:.1f}%)", end=end, flush=True)
+
+def open_uart(args) -> UARTCommunication:
+    """Argümanlara göre portu açar (açılamazsa ConnectionError)"""
+    uart = UARTCommunication(args.port, args.baudrate)
+    if not uart.connect(low_latency=args.low_latency):
+        raise ConnectionError(f"UART bağlantısı kurulamadı: {args.port}")
+    return uart
+
+def cmd_ports(args) -> int:
+    """Kullanılabilir seri portları listeler"""
+    for port in UARTCommunication("", 0).get_available_ports():
+        print(port)
+    return 0
+
+def read_image(args) -> bytes:
+    """Firmware dosyasını okur; --raw verilmediyse ön işlemden geçirir (hata: ValueError)"""
+    with open(args.firmware, "rb") as f:
+        firmware_data = f.read()
+
+    if not args.raw:
+        report = preprocess_image(firmware_data, args.sector)
+        print(f"Ön işleme: {report.summary()}")
+        if not report.ok:
+            raise ValueError("Görüntü ön işlemden geçemedi (ham göndermek için --raw)")
+        firmware_data = report.image
+    return firmware_data
+
+def print_plan(plan):
+    print(f"Aktarım planı ({plan.link}):")
+    for line in plan.table():
+        print(f"  {line}")
+
+def cmd_plan(args) -> int:
+    """Porta bağlanmadan, geçmiş oturumlara göre yükleme süresini mod başına tahmin eder"""
+    firmware_data = read_image(args)
+    history = FlashHistory()
+    table = SectorTimingTable()
+    try:
+        link = estimate_link(args.baudrate, create_transport(args.port).defaults.guard_time, args.sector,
+                             history, args.port, timing_table=table)
+        erase_time = table.delay("erase", args.sector) if args.erase else 0.0
+        print_plan(plan_transfer(firmware_data, link, erase_time=erase_time))
+    finally:
+        history.close()
+        table.flush()
+    return 0
+
+def cmd_flash(args) -> int:
+    """Firmware dosyasını hedef sektöre yükler"""
+    firmware_data = read_image(args)
+
+    uart = open_uart(args)
+    log = None
+    try:
+        plan = uart.plan_transfer(firmware_data, args.sector, erase=args.erase)
+        print_plan(plan)
+        uart.profile_mode = args.profile
+        log = SessionLog(f"cli_{args.port}")
+        log.write(f"Yükleme: {args.firmware} ({len(firmware_data)} byte) -> sektör {args.sector} @ {uart.baudrate}")
+        with cancel_on_sigint(CancelToken()) as token:
+            if args.erase:
+                success, message = uart.erase_sector(args.sector, cancel_token=token)
+                print(message)
+                log.write(message, "SUCCESS" if success else "ERROR")
+                if not success:
+                    return 1
+            success, message = uart.send_firmware(firmware_data, args.sector, print_progress,
+                                                  cancel_token=token, plan=plan)
+        log.write(message, "SUCCESS" if success else "ERROR")
+        if uart.last_plan and uart.last_plan.actual is not None:
+            print(f"Yükleme süresi: {uart.last_plan.compare()}")
+            log.write(f"Yükleme süresi: {uart.last_plan.compare()}")
+        if uart.last_profile:
+            # Özet DEBUG logunda; yolu her zaman gösterilir
+            print(uart.last_profile)
+    finally:
+        uart.disconnect()
+        if log is not None:
+            log.close()
+
+    print(message)
+    return 0 if success else 1
+
+def cmd_bundle(args) -> int:
+    """Paket tanımındaki görüntüleri tek oturumda yükler"""
+    manifest = load_manifest(args.manifest)
+    if args.no_erase:
+        manifest.erase = False
+    if not args.raw:
+        failed = False
+        for name, report in manifest.preprocess().items():
+            print(f"Ön işleme [{name}]: {report.summary()}")
+            failed = failed or not report.ok
+        if failed:
+            return 1
+
+    uart = open_uart(args)
+    log = None
+    try:
+        log = SessionLog(f"cli_{args.port}")
+        images = ", ".join(f"{image.name} -> {image.sector}" for image in manifest.ordered())
+        log.write(f"Paket yükleme: {manifest.name} ({images}) @ {uart.baudrate}")
+        with cancel_on_sigint(CancelToken()) as token:
+            success, message = uart.flash_bundle(manifest, print_progress, cancel_token=token)
+        log.write(message, "SUCCESS" if success else "ERROR")
+        if uart.last_bundle_report:
+            log.write(uart.last_bundle_report.summary())
+    finally:
+        uart.disconnect()
+        if log is not None:
+            log.close()
+
+    print(message)
+    if uart.last_bundle_report:
+        print(uart.last_bundle_report.summary())
+    return 0 if success else 1
+
+def cmd_erase(args) -> int:
+    """Sektör listesini siler"""
+    sectors = parse_sector_list(args.sectors)
+    log = None
+
+    def on_sector_done(current, total, result):
+        status = "✅" if result.success else "❌"
+        print(f"{status} [{current}/{total}] {result.message} ({result.duration:.2f}s)")
+        log.write(f"[{current}/{total}] {result.message} ({result.duration:.2f}s)",
+                  "INFO" if result.success else "ERROR")
+
+    uart = open_uart(args)
+    try:
+        log = SessionLog(f"cli_{args.port}")
+        log.write(f"Silme: sektör {args.sectors} @ {uart.baudrate}")
+        with cancel_on_sigint(CancelToken()) as token:
+            success, message = uart.erase_sectors(sectors, on_sector_done, cancel_token=token)
+        log.write(message, "SUCCESS" if success else "ERROR")
+    finally:
+        uart.disconnect()
+        if log is not None:
+            log.close()
+
+    print(message)
+    return 0 if success else 1
+
+def cmd_daemon(args) -> int:
+    """Yükleme servisini ön planda çalıştırır (Ctrl+C ile durur)"""
+    daemon = FlashDaemon(args.host, args.listen_port, image_dir=args.image_dir)
+    print(f"Erişim anahtarı: {daemon_token_path()}")
+    daemon.serve_forever()
+    return 0
+
+def cmd_submit(args) -> int:
+    """Yükleme servisine iş gönderir; --wait ile olayları izler"""
+    client = FlashDaemonClient(args.daemon)
+    erase_sectors = parse_sector_list(args.erase) if args.erase else []
+    job = client.submit(args.firmware, [p.strip() for p in args.ports.split(",") if p.strip()],
+                        args.sector, erase_sectors, args.priority, args.client, args.baudrate)
+    print(f"İş kuyruğa alındı: {job['id']}")
+    if not args.wait:
+        return 0
+
+    try:
+        for event in client.events(job_id=job["id"]):
+            if event["type"] == "progress":
+                print(f"  {event['port']}: {event['current']}/{event['total']}")
+            elif event["type"] == "job_finished":
+                print(f"İş bitti: {event['state']}")
+                return 0 if event["state"] == "done" else 1
+            else:
+                print(f"  {event.get('port', '')} {event['type']} {event.get('message', '')}".rstrip())
+    except KeyboardInterrupt:
+        client.cancel(job["id"])
+        print("\nİş iptal edildi", file=sys.stderr)
+        return 130
+    return 1
+
+def cmd_jobs(args) -> int:
+    """Servisteki işleri ve port durumlarını listeler"""
+    client = FlashDaemonClient(args.daemon)
+    for job in client.jobs():
+        tasks = ", ".join(f"{t['port']}={t['state']}" for t in job["tasks"])
+        print(f"{job['id']} [{job['state']}] {job['image_name']} -> sektör {job['sector']} ({tasks})")
+    for port in client.ports():
+        print(f"{port['port']}: {port['state']} (bekleyen {port['pending']}, tamamlanan {port['completed']})")
+    return 0
+
+def cmd_history(args) -> int:
+    """Yükleme geçmişinden yüzdelikleri (yükleme: KB/s, silme: saniye) ve son oturumları gösterir"""
+    history = FlashHistory(path=args.db)
+    since = time.time() - args.days * 86400 if args.days else None
+    metric, unit, scale = ("duration", "s", 1) if args.operation == "erase" else ("throughput", "KB/s", 1 / 1024)
+    try:
+        rows = history.percentiles(args.by, args.operation, metric, port=args.port, since=since)
+        headers = " ".join(f"{f'{p} {unit}':>9}" for p in ("p50", "p90", "p99"))
+        print(f"{args.by:<20} {'oturum':>7} {'hata':>5} {headers}")
+        for row in rows:
+            values = " ".join(f"{row[p] * scale:>9.2f}" for p in ("p50", "p90", "p99"))
+            print(f"{str(row['key'])[:20]:<20} {row['sessions']:>7} {row['failures']:>5} {values}")
+        if args.recent:
+            print()
+            for record in history.recent(args.recent, args.operation, args.port, since):
+                started = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(record.started_at))
+                phases = ", ".join(f"{name} {value:.2f}s" for name, value in record.phases.items())
+                print(f"{started} {record.port} {record.operation} sektör {record.sectors}: "
+                      f"{'OK' if record.success else 'HATA'} {record.duration:.2f}s, "
+                      f"{record.nacks} NACK, {record.retries} tekrar ({phases})")
+    finally:
+        history.close()
+    return 0
+
+def cmd_soak(args) -> int:
+    """Yerel simüle cihaza art arda silme / yükleme yapar; bellek, thread, fd veya hız kayarsa başarısız olur"""
+    thresholds = SoakThresholds(
+        window=args.window,
+        max_rss_growth=int(args.max_rss_growth * 1024 * 1024),
+        max_slowdown=args.max_slowdown / 100,
+    )
+    duration = args.hours * 3600 if args.hours else None
+    iterations = args.iterations if args.iterations or duration else 100
+
+    # Oturum logları ve zamanlama tabloları kullanıcının veri dizinini doldurmasın
+    with tempfile.TemporaryDirectory(prefix="stm32_soak_") as data_dir:
+        try:
+            report = run_soak(args.target, iterations, duration, args.size * 1024, args.sector, thresholds,
+                              on_sample=print, data_dir=data_dir)
+        finally:
+            default_log_writer().flush()
+
+    print(report.summary())
+    return 0 if report.ok else 1
+
+def cmd_simulate(args) -> int:
+    """Yüklemeyi sanal zamanda simüle cihaza karşı koşar; hat parametrelerinin tüm kombinasyonları"""
+    if args.firmware:
+        with open(args.firmware, "rb") as f:
+            image = f.read()
+    else:
+        image = bytes(i % 251 for i in range(args.size * 1024))
+    print(f"{len(image)} byte, sektör {args.sector}{' (silme dahil)' if args.erase else ''}, sanal zamanda:")
+    runs = sweep(image, args.baudrate, [ms / 1000 for ms in args.turnaround], [p / 100 for p in args.error_rate],
+                 on_run=print, sector=args.sector, erase=args.erase, seed=args.seed)
+    return 0 if all(run.success for run in runs) else 1
+
+def enable_debug_log():
+    """DEBUG izini (ör. src.uart_comm paket izi) "DEBUG: ..." satırları olarak stdout'a yazar"""
+    logging.basicConfig(level=logging.DEBUG, format="DEBUG: %(message)s", stream=sys.stdout)
+
+def add_port_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--port", "-p", required=True, help="Seri port (örn: COM3, /dev/ttyUSB0)")
+    parser.add_argument("--baudrate", "-b", type=int, default=115200, help="Baud rate (varsayılan: 115200)")
+    parser.add_argument("--low-latency", action="store_true", help="Linux düşük gecikme ayarlarını uygula")
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="stm32-bootloader", description="STM32 bootloader UART aracı")
+    parser.add_argument("--verbose", "-v", action="store_true", help="Ayrıntılı DEBUG izi (paket başına)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    ports = subparsers.add_parser("ports", help="Seri portları listele")
+    ports.set_defaults(func=cmd_ports)
+
+    flash = subparsers.add_parser("flash", help="Firmware yükle")
+    flash.add_argument("firmware", help="Firmware dosyası (.bin)")
+    flash.add_argument("--sector", "-s", type=int, required=True, help="Hedef sektör")
+    flash.add_argument("--erase", action="store_true", help="Yüklemeden önce sektörü sil")
+    flash.add_argument("--raw", action="store_true", help="Ön işleme yapma (dosyayı aynen gönder)")
+    flash.add_argument("--profile", choices=PROFILE_MODES, help="Yüklemeyi profille (çıktı log dizinine yazılır)")
+    add_port_arguments(flash)
+    flash.set_defaults(func=cmd_flash)
+
+    bundle = subparsers.add_parser("bundle", help="Birden fazla görüntüyü tek oturumda yükle")
+    bundle.add_argument("manifest", help="Paket tanımı (.json)")
+    bundle.add_argument("--no-erase", action="store_true", help="Sektörleri yüklemeden önce silme")
+    bundle.add_argument("--raw", action="store_true", help="Ön işleme yapma (dosyaları aynen gönder)")
+    add_port_arguments(bundle)
+    bundle.set_defaults(func=cmd_bundle)
+
+    plan = subparsers.add_parser("plan", help="Yükleme süresini tahmin et (porta bağlanmaz)")
+    plan.add_argument("firmware", help="Firmware dosyası (.bin)")
+    plan.add_argument("--sector", "-s", type=int, required=True, help="Hedef sektör")
+    plan.add_argument("--erase", action="store_true", help="Silme süresini de ekle")
+    plan.add_argument("--raw", action="store_true", help="Ön işleme yapma")
+    plan.add_argument("--port", "-p", default="", help="Port (geçmiş ölçümler ve taşıma türü için)")
+    plan.add_argument("--baudrate", "-b", type=int, default=115200, help="Baud rate (varsayılan: 115200)")
+    plan.set_defaults(func=cmd_plan)
+
+    erase = subparsers.add_parser("erase", help="Sektör sil")
+    erase.add_argument("--sectors", "-s", required=True, help="Sektörler (örn: 5, 2-5, 1,3-4)")
+    add_port_arguments(erase)
+    erase.set_defaults(func=cmd_erase)
+
+    default_url = f"http://{DEFAULT_DAEMON_HOST}:{DEFAULT_DAEMON_PORT}"
+
+    daemon = subparsers.add_parser("daemon", help="Yükleme servisini başlat")
+    daemon.add_argument("--host", default=DEFAULT_DAEMON_HOST, help="Dinlenecek adres")
+    daemon.add_argument("--listen-port", type=int, default=DEFAULT_DAEMON_PORT, help="HTTP portu")
+    daemon.add_argument("--image-dir", help="image_path ile okunabilecek görüntülerin dizini (varsayılan: kapalı)")
+    daemon.set_defaults(func=cmd_daemon)
+
+    submit = subparsers.add_parser("submit", help="Yükleme servisine iş gönder")
+    submit.add_argument("firmware", help="Firmware dosyası (.bin)")
+    submit.add_argument("--ports", required=True, help="Virgülle ayrılmış portlar")
+    submit.add_argument("--sector", "-s", type=int, required=True, help="Hedef sektör")
+    submit.add_argument("--erase", help="Yüklemeden önce silinecek sektörler (örn: 5, 4-5)")
+    submit.add_argument("--priority", type=int, default=0, help="Öncelik (büyük olan önce)")
+    submit.add_argument("--client", default="cli", help="İstemci adı (adil sıralama için)")
+    submit.add_argument("--baudrate", "-b", type=int, default=115200, help="Baud rate")
+    submit.add_argument("--wait", action="store_true", help="İş bitene kadar olayları izle")
+    submit.add_argument("--daemon", default=default_url, help="Servis adresi")
+    submit.set_defaults(func=cmd_submit)
+
+    jobs = subparsers.add_parser("jobs", help="Servisteki işleri listele")
+    jobs.add_argument("--daemon", default=default_url, help="Servis adresi")
+    jobs.set_defaults(func=cmd_jobs)
+
+    history = subparsers.add_parser("history", help="Yükleme geçmişi istatistikleri")
+    history.add_argument("--by", choices=list(GROUP_COLUMNS), default="port", help="Gruplama (varsayılan: port)")
+    history.add_argument("--operation", choices=["flash", "erase", "bundle"], default="flash", help="İşlem türü")
+    history.add_argument("--port", "-p", help="Yalnızca bu port")
+    history.add_argument("--days", type=float, help="Son N gün")
+    history.add_argument("--recent", type=int, default=0, help="Son N oturumu da listele")
+    history.add_argument("--db", help="Veritabanı dosyası (varsayılan: kullanıcı veri dizini)")
+    history.set_defaults(func=cmd_history)
+
+    soak = subparsers.add_parser("soak", help="Uzun süreli dayanıklılık testi (simüle cihaz)")
+    soak.add_argument("--target", choices=SOAK_TARGETS, default="uart",
+                      help="uart: UARTCommunication, gui: gizli Tk kökünde GUI işçi yolları")
+    soak.add_argument("--iterations", "-n", type=int, help="Tur sayısı (varsayılan: 100, --hours verilmediyse)")
+    soak.add_argument("--hours", type=float, help="Süre (saat)")
+    soak.add_argument("--size", type=int, default=32, help="Görüntü boyutu (KB)")
+    soak.add_argument("--sector", "-s", type=int, default=5, help="Hedef sektör")
+    soak.add_argument("--window", type=int, default=10, help="Karşılaştırılan pencere (tur)")
+    soak.add_argument("--max-rss-growth", type=float, default=32, help="İzin verilen RSS büyümesi (MB)")
+    soak.add_argument("--max-slowdown", type=float, default=25, help="İzin verilen hız düşüşü (%%)")
+    soak.set_defaults(func=cmd_soak)
+
+    simulate = subparsers.add_parser("simulate", help="Yüklemeyi sanal zamanda simüle et (hat parametresi karşılaştırması)")
+    simulate.add_argument("firmware", nargs="?", help="Firmware dosyası (verilmezse --size byte'lık örnek görüntü)")
+    simulate.add_argument("--size", type=int, default=2048, help="Örnek görüntü boyutu (KB)")
+    simulate.add_argument("--sector", "-s", type=int, default=5, help="Hedef sektör")
+    simulate.add_argument("--erase", action="store_true", help="Silme süresini de simüle et")
+    simulate.add_argument("--baudrate", "-b", type=int, nargs="+", default=[115200], help="Baud rate'ler")
+    simulate.add_argument("--turnaround", type=float, nargs="+", default=[0.5],
+                          help="Cihaz / adaptör yanıt gecikmeleri (ms)")
+    simulate.add_argument("--error-rate", type=float, nargs="+", default=[0.0], help="Paket hata oranları (%%)")
+    simulate.add_argument("--seed", type=int, default=0, help="Hata üreteci tohumu")
+    simulate.set_defaults(func=cmd_simulate)
+
+    return parser
+
+def main(argv=None) -> int:
+    """Ana fonksiyon"""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.verbose:
+        enable_debug_log()
+    try:
+        return args.func(args)
+    except (ConnectionError, OSError, ValueError) as e:
+        print(f"Hata: {e}", file=sys.stderr)
+        return 1
+    except KeyboardInterrupt:
+        print("\nUygulama kullanıcı tarafından sonlandırıldı.", file=sys.stderr)
+        return 130
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,63 @@
+import threading
+import time
+from typing import Optional
+
+class SystemClock:
+    """Gerçek zaman: time.time / time.sleep"""
+
+    virtual = False
+
+    def time(self) -> float:
+        return time.time()
+
+    def sleep(self, seconds: float):
+        if seconds > 0:
+            time.sleep(seconds)
+
+class VirtualClock:
+    """
+    Sanal zaman: sleep() beklemeden saati ilerletir
+
+    UARTCommunication ve simüle cihaz aynı VirtualClock'u paylaşırsa oturum
+    gerçek beklemeler olmadan çalışır; hattaki süreler (bkz. VirtualLinkSerial)
+    ve tüm beklemeler saate eklenir, elapsed oturumun gerçek donanımda
+    süreceği zamanı verir. Sanal zamanda thread'ler birbirini bekleyemeyeceği
+    için alım thread'i kullanılmaz, yanıtlar gönderen thread'de okunur.
+
+    Kullanım:
+        clock = VirtualClock()
+        device = STM32BootloaderSimulator(clock=clock)
+        uart = UARTCommunication("virtual", 115200, clock=clock)
+        uart.serial_conn = VirtualLinkSerial(device, clock, 115200)
+    """
+
+    virtual = True
+
+    def __init__(self, start: Optional[float] = None):
+        """
+        Args:
+            start: Başlangıç zamanı (None: şimdiki Unix zamanı; geçmiş kayıtları anlamlı kalır)
+        """
+        self.start = time.time() if start is None else start
+        self._elapsed = 0.0  # Başlangıca göre tutulur: Unix zamanı büyüklüğünde toplama hassasiyet kaybettirir
+        self._lock = threading.Lock()
+
+    def time(self) -> float:
+        return self.start + self._elapsed
+
+    def sleep(self, seconds: float):
+        if seconds > 0:
+            with self._lock:
+                self._elapsed += seconds
+
+    def advance_to(self, timestamp: float):
+        """Saati timestamp'e ilerletir (geri almaz)"""
+        with self._lock:
+            self._elapsed = max(self._elapsed, timestamp - self.start)
+
+    @property
+    def elapsed(self) -> float:
+        """Başlangıçtan bu yana geçen sanal süre (saniye)"""
+        return self._elapsed
+
+SYSTEM_CLOCK = SystemClock()
@@ -0,0 +1,167 @@
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+class DeviceExecutor:
+    """
+    Bir bağlantının tüm cihaz işlemlerini sırayla yürüten tek işçili yürütücü
+
+    Bağlanma, silme, yükleme, oto baud ve kapatma aynı thread'de sırayla
+    çalışır; böylece aynı portta iki işlem asla üst üste binmez ve Tk
+    thread'i hiçbir zaman seri port beklemez. submit() bir Future döner,
+    sonuç GUI thread'inde FuturePoller ile alınır.
+    """
+
+    def __init__(self, name: str = "device"):
+        self.name = name
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"device-{name}")
+        self._lock = threading.Lock()
+        self._pending: List[Future] = []
+        self._closed = False
+
+    @property
+    def busy(self) -> bool:
+        """Çalışan veya sırada bekleyen işlem var mı"""
+        with self._lock:
+            self._pending = [f for f in self._pending if not f.done()]
+            return bool(self._pending)
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def submit(self, fn: Callable, *args, **kwargs) -> Future:
+        """İşlemi sıraya koyar (kapatılmışsa RuntimeError)"""
+        with self._lock:
+            if self._closed:
+                raise RuntimeError(f"{self.name}: yürütücü kapatıldı")
+            future = self._executor.submit(fn, *args, **kwargs)
+            self._pending.append(future)
+            return future
+
+    def close(self, final: Optional[Callable[[], None]] = None) -> Optional[Future]:
+        """
+        Sıradaki işlemleri iptal eder, varsa son işlemi (ör. port kapatma) çalıştırıp kapanır
+
+        Çalışan işlem kesilmez (iptal bayrağı ile durdurulmalıdır); final ondan
+        sonra aynı thread'de çalışır. Çağıran beklemez.
+        """
+        with self._lock:
+            if self._closed:
+                return None
+            self._closed = True
+            for future in self._pending:
+                future.cancel()
+            future = self._executor.submit(final) if final else None
+            self._executor.shutdown(wait=False)
+            return future
+
+class FuturePoller:
+    """
+    Future'ları Tk after() döngüsüyle izler ve bitince callback'i GUI thread'inde çağırır
+
+    İşçi thread'lerinin Tk nesnelerine dokunması gerekmez; tüm izlenen
+    future'lar tek bir periyodik kontrolle taranır.
+    """
+
+    def __init__(self, root, interval_ms: int = 20):
+        """
+        Args:
+            root: after(ms, fn) metoduna sahip Tk kökü
+            interval_ms: Kontrol aralığı (milisaniye)
+        """
+        self.root = root
+        self.interval_ms = interval_ms
+        self._watched: Dict[Future, Callable[[Future], None]] = {}
+        self._scheduled = False
+
+    @property
+    def pending(self) -> int:
+        return len(self._watched)
+
+    def watch(self, future: Future, on_done: Callable[[Future], None]):
+        """future bitince on_done(future) GUI thread'inde çağrılır (iptal edildiyse de)"""
+        self._watched[future] = on_done
+        if not self._scheduled:
+            self._scheduled = True
+            self.root.after(self.interval_ms, self._poll)
+
+    def _poll(self):
+        done = [f for f in self._watched if f.done()]
+        for future in done:
+            on_done = self._watched.pop(future)
+            try:
+                on_done(future)
+            except Exception as e:
+                logger.warning("Future callback hatası: %s", e, exc_info=True)
+        if self._watched:
+            self.root.after(self.interval_ms, self._poll)
+        else:
+            self._scheduled = False
+
+class FrameMonitor:
+    """
+    Tk ana döngüsünün kare süresini ölçer
+
+    interval_ms aralıklarla kendini yeniden planlar; callback'in planlanandan
+    ne kadar geç çalıştığı, ana döngünün o süre boyunca olay işleyemediğini
+    (donmayı) gösterir. Bütçeyi aşan gecikmeler on_stall ile raporlanır.
+    """
+
+    def __init__(self, root, budget_ms: float = 50.0, interval_ms: int = 100,
+                 on_stall: Optional[Callable[[float], None]] = None,
+                 clock: Callable[[], float] = time.perf_counter):
+        """
+        Args:
+            root: after(ms, fn) metoduna sahip Tk kökü
+            budget_ms: İzin verilen en uzun kare süresi (milisaniye)
+            interval_ms: Ölçüm aralığı (milisaniye)
+            on_stall: Bütçe aşılınca gecikme (ms) ile çağrılır
+            clock: Zaman kaynağı (saniye)
+        """
+        self.root = root
+        self.budget_ms = budget_ms
+        self.interval_ms = interval_ms
+        self.on_stall = on_stall
+        self.clock = clock
+        self.frames = 0
+        self.stalls = 0
+        self.max_frame_ms = 0.0
+        self.last_frame_ms = 0.0
+        self._expected: Optional[float] = None
+        self._running = False
+
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+        self._schedule()
+
+    def stop(self):
+        self._running = False
+
+    def _schedule(self):
+        self._expected = self.clock() + self.interval_ms / 1000
+        self.root.after(self.interval_ms, self._tick)
+
+    def _tick(self):
+        if not self._running:
+            return
+        # Beklenen zamana göre gecikme = ana döngünün bloklandığı süre
+        delay_ms = max(0.0, (self.clock() - self._expected) * 1000)
+        self.frames += 1
+        self.last_frame_ms = delay_ms
+        self.max_frame_ms = max(self.max_frame_ms, delay_ms)
+        if delay_ms > self.budget_ms:
+            self.stalls += 1
+            if self.on_stall:
+                self.on_stall(delay_ms)
+        self._schedule()
+
+    def stats(self) -> Dict[str, float]:
+        return {"frames": self.frames, "stalls": self.stalls,
+                "max_frame_ms": round(self.max_frame_ms, 1), "budget_ms": self.budget_ms}
@@ -0,0 +1,520 @@
+import os
+import random
+import select
+import socket
+import struct
+import threading
+import time
+from typing import Dict, List, Optional, Set
+from .stm32_protocol import STM32Protocol, MessageType
+from .flash_layout import max_erase_time
+from .clock import SYSTEM_CLOCK
+
+class STM32BootloaderSimulator:
+    """STM32 bootloader'ın ACK/NACK davranışını taklit eden yazılım cihazı"""
+
+    def __init__(self, baudrate: int = 115200, sector_count: int = 12,
+                 max_reliable_baudrate: int = 4000000, support_extensions: bool = True,
+                 erase_time_scale: float = 1.0, write_prepare_time: float = 0.0, clock=None,
+                 ack_when_done: bool = False):
+        """
+        Args:
+            baudrate: Cihazın başlangıç baud rate'i
+            sector_count: Geçerli sektör sayısı (üstü NACK 0x04 alır)
+            max_reliable_baudrate: Bu hızın üstünde paketler bozulmaya başlar
+            support_extensions: PING / SET_BAUD / STATUS komutlarını destekler mi
+                (False ise eski bootloader gibi NACK 0x01 döner)
+            erase_time_scale: Silme süresi çarpanı (1.0: kılavuzdaki en kötü sürenin yarısı)
+            write_prepare_time: CMD_WRITE sonrası meşgul kalma süresi (saniye)
+            clock: Meşgul süreleri için saat (None: gerçek zaman, bkz. VirtualClock)
+            ack_when_done: CMD_ERASE / CMD_WRITE ACK'ini işlem bitince gönder (birçok
+                eski bootloader gibi; yanıt meşgul süre kadar gecikir)
+        """
+        self.baudrate = baudrate
+        self.sector_count = sector_count
+        self.max_reliable_baudrate = max_reliable_baudrate
+        self.support_extensions = support_extensions
+        self.erase_time_scale = erase_time_scale
+        self.write_prepare_time = write_prepare_time
+        self.clock = clock or SYSTEM_CLOCK
+        self.busy_until = 0.0  # Flash işlemi bitene kadar paketler NACK 0x06 alır
+        self.ack_when_done = ack_when_done
+        self.response_delay = 0.0  # Son yanıtın gönderilmeden önce bekleyeceği süre (port uygular)
+
+        self.write_sector: Optional[int] = None
+        self.flash: Dict[int, bytearray] = {}
+        self.erased_sectors: Set[int] = set()
+        self.received_types: List[int] = []
+
+    def frame_error_probability(self, baudrate: int) -> float:
+        """Verilen hızda bir paketin bozulma olasılığı"""
+        if baudrate <= self.max_reliable_baudrate:
+            return 0.0
+        return min(1.0, (baudrate / self.max_reliable_baudrate - 1.0) * 0.25)
+
+    def erase_duration(self, sector: int) -> float:
+        """Sektör silme işleminin simüle edilen süresi"""
+        return max_erase_time(sector) / 2 * self.erase_time_scale
+
+    @property
+    def is_busy(self) -> bool:
+        return self.clock.time() < self.busy_until
+
+    @staticmethod
+    def _ack() -> bytes:
+        return bytes([STM32Protocol.ACK_BYTE])
+
+    @staticmethod
+    def _nack(code: int) -> bytes:
+        return bytes([STM32Protocol.NACK_BYTE, code])
+
+    def handle_packet(self, packet: bytes, now: Optional[float] = None) -> bytes:
+        """
+        Tek bir 21 byte'lık paketi işler ve cihazın yanıtını döner
+
+        Args:
+            packet: Alınan paket
+            now: Paketin cihaza ulaştığı an (None: saatin şimdiki zamanı)
+        """
+        now = self.clock.time() if now is None else now
+        self.response_delay = 0.0
+        if not STM32Protocol.verify_packet_crc(packet):
+            return self._nack(0x02)
+
+        msg_type = packet[0]
+        self.received_types.append(msg_type)
+
+        extension_types = (MessageType.PING, MessageType.SET_BAUD, MessageType.STATUS)
+        if msg_type in extension_types and not self.support_extensions:
+            return self._nack(STM32Protocol.NACK_UNKNOWN_TYPE)
+
+        if now < self.busy_until:
+            return self._nack(STM32Protocol.NACK_BUSY)
+
+        if msg_type in (MessageType.CMD_WRITE, MessageType.CMD_ERASE):
+            sector = packet[1]
+            if sector >= self.sector_count:
+                return self._nack(0x04)
+            if msg_type == MessageType.CMD_WRITE:
+                self.write_sector = sector
+                self.flash[sector] = bytearray()
+                self.busy_until = now + self.write_prepare_time
+            else:
+                self.erased_sectors.add(sector)
+                self.flash.pop(sector, None)
+                self.busy_until = now + self.erase_duration(sector)
+            if self.ack_when_done:
+                self.response_delay = self.busy_until - now
+            return self._ack()
+
+        if msg_type == MessageType.DATA:
+            if self.write_sector is None:
+                return self._nack(0x05)
+            self.flash[self.write_sector] += packet[1:1 + STM32Protocol.DATA_PAYLOAD_SIZE]
+            return self._ack()
+
+        if msg_type == MessageType.FINISH:
+            self.write_sector = None
+            return self._ack()
+
+        if msg_type in (MessageType.PING, MessageType.STATUS):
+            return self._ack()
+
+        if msg_type == MessageType.SET_BAUD:
+            # ACK eski hızda gönderilir, ardından cihaz yeni hıza geçer
+            self.baudrate = struct.unpack('<I', packet[1:5])[0]
+            return self._ack()
+
+        return self._nack(0x01)
+
+class SimulatedSerial:
+    """
+    Simülatöre bağlı, pyserial.Serial arayüzünü taklit eden host tarafı port
+
+    Host ve cihaz hızları farklıysa cihaz paketleri çözemez ve yanıt vermez.
+    Cihazın güvenilir hızının üstünde paketler rastgele bozulur (CRC NACK)
+    veya kaybolur (timeout).
+    """
+
+    def __init__(self, device: STM32BootloaderSimulator, baudrate: int = 115200,
+                 timeout: float = 1.0, seed: Optional[int] = None):
+        self.device = device
+        self._baudrate = baudrate
+        self.timeout = timeout
+        self.is_open = True
+        self._rng = random.Random(seed)
+        self._rx = bytearray()
+        self._tx = bytearray()
+        self._cond = threading.Condition()
+        self._cancelled = False
+        self.lost_responses = 0  # Sonraki bu kadar yanıt kaybolur (cihaz paketi yine işler)
+
+    @property
+    def baudrate(self) -> int:
+        return self._baudrate
+
+    @baudrate.setter
+    def baudrate(self, value: int):
+        self._baudrate = value
+
+    @property
+    def in_waiting(self) -> int:
+        with self._cond:
+            return len(self._rx)
+
+    def write(self, data: bytes) -> int:
+        self._tx += data
+        while len(self._tx) >= STM32Protocol.PACKET_SIZE:
+            packet = bytes(self._tx[:STM32Protocol.PACKET_SIZE])
+            del self._tx[:STM32Protocol.PACKET_SIZE]
+            self._deliver(packet)
+        return len(data)
+
+    def _deliver(self, packet: bytes):
+        if self._baudrate != self.device.baudrate:
+            return  # Cihaz çerçeveleri çözemez, yanıt yok
+
+        if self._rng.random() < self.device.frame_error_probability(self._baudrate):
+            if self._rng.random() < 0.5:
+                return  # Paket kayboldu
+            corrupted = bytearray(packet)
+            corrupted[self._rng.randrange(len(corrupted))] ^= 0xFF
+            packet = bytes(corrupted)
+
+        response = self.device.handle_packet(packet)
+        if self.lost_responses > 0:
+            self.lost_responses -= 1
+            return  # ACK hatta kayboldu
+        if self.device.response_delay > 0:
+            timer = threading.Timer(self.device.response_delay, self.inject, (response,))
+            timer.daemon = True
+            timer.start()
+            return
+        with self._cond:
+            self._rx += response
+            self._cond.notify_all()
+
+    def inject(self, data: bytes):
+        """Cihaz tarafından istenmeden gönderilmiş byte'lar (gürültü, geç yanıt)"""
+        with self._cond:
+            self._rx += data
+            self._cond.notify_all()
+
+    def read(self, size: int = 1) -> bytes:
+        deadline = time.time() + (self.timeout or 0)
+        with self._cond:
+            self._cancelled = False
+            while len(self._rx) < size and self.is_open and not self._cancelled:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            data = bytes(self._rx[:size])
+            del self._rx[:size]
+            return data
+
+    def cancel_read(self):
+        with self._cond:
+            self._cancelled = True
+            self._cond.notify_all()
+
+    def flush(self):
+        pass
+
+    def reset_input_buffer(self):
+        with self._cond:
+            self._rx.clear()
+
+    def reset_output_buffer(self):
+        self._tx.clear()
+
+    def close(self):
+        with self._cond:
+            self.is_open = False
+            self._cond.notify_all()
+
+class VirtualLinkSerial:
+    """
+    Simülatöre sanal zamanda bağlı, pyserial.Serial arayüzünü taklit eden port
+
+    Hattaki süre baud rate ve çerçeve boyundan (8N1: byte başına 10 bit)
+    hesaplanır: paket son byte'ı hattan geçince cihaza ulaşır, yanıt
+    turnaround kadar sonra gönderilir ve kendi hat süresi sonunda okunabilir
+    olur. Beklemeler (flush, read timeout) gerçek zamanda beklemez, VirtualClock'u
+    ilerletir; böylece MB'lık bir yükleme saniyeler yerine milisaniyelerde
+    biter ve clock.elapsed gerçek donanımdaki süreyi verir.
+
+    Paketler error_rate (veya cihazın güvenilir hızının üstündeki hata)
+    olasılığıyla bozulur (CRC NACK) ya da kaybolur (timeout).
+    """
+
+    BITS_PER_BYTE = 10
+
+    def __init__(self, device: STM32BootloaderSimulator, clock, baudrate: int = 115200,
+                 timeout: float = 1.0, turnaround: float = 0.0005, error_rate: float = 0.0,
+                 seed: Optional[int] = None):
+        """
+        Args:
+            device: Simüle cihaz (aynı clock ile oluşturulmalı)
+            clock: VirtualClock
+            baudrate: Host tarafı baud rate
+            timeout: read() timeout'u (sanal saniye)
+            turnaround: Paketin cihaza ulaşmasından yanıtın gönderilmesine kadar (saniye;
+                cihazın işlemesi + USB-UART adaptör gecikmesi)
+            error_rate: Paket başına bozulma / kaybolma olasılığı
+            seed: Hata üreteci tohumu (tekrarlanabilir koşular için)
+        """
+        self.device = device
+        self.clock = clock
+        self._baudrate = baudrate
+        self.timeout = timeout
+        self.turnaround = turnaround
+        self.error_rate = error_rate
+        self.is_open = True
+        self._rng = random.Random(seed)
+        self._tx = bytearray()
+        self._tx_busy_until = 0.0  # TX hattının boşalacağı an
+        self._rx = bytearray()
+        self._incoming: List[tuple] = []  # (okunabileceği an, byte'lar), zaman sırasıyla
+        self.lost_responses = 0  # Sonraki bu kadar yanıt kaybolur (cihaz paketi yine işler)
+        self.late_response_delay = 0.0  # Sonraki yanıt bu kadar geç gelir (USB / zamanlayıcı takılması)
+        self.bytes_sent = 0
+        self.bytes_received = 0
+
+    @property
+    def baudrate(self) -> int:
+        return self._baudrate
+
+    @baudrate.setter
+    def baudrate(self, value: int):
+        self._baudrate = value
+
+    def wire_time(self, nbytes: int) -> float:
+        """nbytes'ın hatta geçme süresi (saniye)"""
+        return nbytes * self.BITS_PER_BYTE / self._baudrate
+
+    def _arrive(self, until: float):
+        """until anına kadar hattan gelmiş byte'ları RX buffer'ına alır"""
+        while self._incoming and self._incoming[0][0] <= until:
+            self._rx += self._incoming.pop(0)[1]
+
+    @property
+    def in_waiting(self) -> int:
+        self._arrive(self.clock.time())
+        return len(self._rx)
+
+    def write(self, data: bytes) -> int:
+        # Yazma bloklamaz; byte'lar TX hattı boşaldıkça sırayla gönderilir
+        start = max(self.clock.time(), self._tx_busy_until)
+        offset = -len(self._tx)  # Önceki yazmadan kalan yarım paket
+        self._tx += data
+        self.bytes_sent += len(data)
+        while len(self._tx) >= STM32Protocol.PACKET_SIZE:
+            packet = bytes(self._tx[:STM32Protocol.PACKET_SIZE])
+            del self._tx[:STM32Protocol.PACKET_SIZE]
+            offset += STM32Protocol.PACKET_SIZE
+            self._deliver(packet, start + self.wire_time(max(0, offset)))
+        self._tx_busy_until = start + self.wire_time(len(data))
+        return len(data)
+
+    def _deliver(self, packet: bytes, arrival: float):
+        if self._baudrate != self.device.baudrate:
+            return  # Cihaz çerçeveleri çözemez, yanıt yok
+
+        error_rate = max(self.error_rate, self.device.frame_error_probability(self._baudrate))
+        if error_rate and self._rng.random() < error_rate:
+            if self._rng.random() < 0.5:
+                return  # Paket kayboldu
+            corrupted = bytearray(packet)
+            corrupted[self._rng.randrange(len(corrupted))] ^= 0xFF
+            packet = bytes(corrupted)
+
+        response = self.device.handle_packet(packet, now=arrival)
+        if self.lost_responses > 0:
+            self.lost_responses -= 1
+            return  # ACK hatta kayboldu
+        ready = max(arrival + self.turnaround + self.device.response_delay + self.late_response_delay,
+                    self._incoming[-1][0] if self._incoming else 0.0)
+        self.late_response_delay = 0.0
+        self._incoming.append((ready + self.wire_time(len(response)), response))
+
+    def inject(self, data: bytes):
+        """Cihaz tarafından istenmeden gönderilmiş byte'lar (hemen okunabilir)"""
+        self._rx += data
+
+    def read(self, size: int = 1) -> bytes:
+        # Timeout içinde gelecek byte'ları bekle (saati ilerleterek); gelmeyecekse timeout kadar ilerle
+        deadline = self.clock.time() + self.timeout if self.timeout is not None else float("inf")
+        self._arrive(self.clock.time())
+        while len(self._rx) < size and self.is_open and self._incoming and self._incoming[0][0] <= deadline:
+            self.clock.advance_to(self._incoming[0][0])
+            self._arrive(self.clock.time())
+        if len(self._rx) < size and self.timeout is not None:
+            self.clock.advance_to(deadline)
+        data = bytes(self._rx[:size])
+        del self._rx[:size]
+        self.bytes_received += len(data)
+        return data
+
+    def cancel_read(self):
+        pass
+
+    def flush(self):
+        """TX hattı boşalana kadar (sanal olarak) bekler"""
+        self.clock.advance_to(self._tx_busy_until)
+
+    def reset_input_buffer(self):
+        self._arrive(self.clock.time())
+        self._rx.clear()
+
+    def reset_output_buffer(self):
+        self._tx.clear()
+
+    def close(self):
+        self.is_open = False
+
+class PtyBootloaderDevice:
+    """
+    Simülatörü bir pseudo-terminal üzerinden gerçek seri port gibi sunar (Linux/macOS)
+
+    `port` yolu UARTCommunication / pyserial ile normal bir port gibi açılabilir.
+    Pty'lerde baud rate kavramı olmadığından hız uyumsuzluğu modellenmez.
+
+    Kullanım:
+        with PtyBootloaderDevice() as pty_device:
+            uart = UARTCommunication(pty_device.port)
+    """
+
+    def __init__(self, device: Optional[STM32BootloaderSimulator] = None):
+        import tty
+        self.device = device or STM32BootloaderSimulator()
+        self._master_fd, self._slave_fd = os.openpty()
+        tty.setraw(self._slave_fd)
+        self.port = os.ttyname(self._slave_fd)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "PtyBootloaderDevice":
+        self._thread = threading.Thread(target=self._run, name="PtyBootloaderDevice", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+        for fd in (self._master_fd, self._slave_fd):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+    def __enter__(self) -> "PtyBootloaderDevice":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _run(self):
+        frame = bytearray()
+        while not self._stop.is_set():
+            readable, _, _ = select.select([self._master_fd], [], [], 0.05)
+            if not readable:
+                continue
+            try:
+                frame += os.read(self._master_fd, 4096)
+            except OSError:
+                continue  # Karşı taraf portu kapattı
+            while len(frame) >= STM32Protocol.PACKET_SIZE:
+                packet = bytes(frame[:STM32Protocol.PACKET_SIZE])
+                del frame[:STM32Protocol.PACKET_SIZE]
+                os.write(self._master_fd, self.device.handle_packet(packet))
+
+class TcpBootloaderDevice:
+    """
+    Simülatörü ham TCP seri sunucusu (ser2net raw modu) gibi sunar
+
+    `url` (tcp://127.0.0.1:port) veya `socket_url` (socket://...) adresine
+    UARTCommunication ile bağlanılabilir. Aynı anda tek istemci kabul edilir;
+    istemci kapanınca sıradaki beklenir. latency verilirse her yanıt o kadar
+    geciktirilir (uzak rack'teki ağ gidiş-dönüşünü taklit eder).
+
+    Kullanım:
+        with TcpBootloaderDevice(latency=0.002) as tcp_device:
+            uart = UARTCommunication(tcp_device.url)
+    """
+
+    def __init__(self, device: Optional[STM32BootloaderSimulator] = None,
+                 host: str = "127.0.0.1", latency: float = 0.0):
+        self.device = device or STM32BootloaderSimulator()
+        self.latency = latency
+        self._server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._server.bind((host, 0))
+        self._server.listen(1)
+        self.host, self.port = self._server.getsockname()[:2]
+        self.connections = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        return f"tcp://{self.host}:{self.port}"
+
+    @property
+    def socket_url(self) -> str:
+        return f"socket://{self.host}:{self.port}"
+
+    def start(self) -> "TcpBootloaderDevice":
+        self._thread = threading.Thread(target=self._run, name="TcpBootloaderDevice", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+        self._server.close()
+
+    def __enter__(self) -> "TcpBootloaderDevice":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _run(self):
+        while not self._stop.is_set():
+            readable, _, _ = select.select([self._server], [], [], 0.05)
+            if not readable:
+                continue
+            client, _ = self._server.accept()
+            client.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self.connections += 1
+            with client:
+                self._serve(client)
+
+    def _serve(self, client: socket.socket):
+        frame = bytearray()
+        while not self._stop.is_set():
+            readable, _, _ = select.select([client], [], [], 0.05)
+            if not readable:
+                continue
+            try:
+                data = client.recv(4096)
+            except OSError:
+                return
+            if not data:
+                return  # İstemci bağlantıyı kapattı
+            frame += data
+            while len(frame) >= STM32Protocol.PACKET_SIZE:
+                packet = bytes(frame[:STM32Protocol.PACKET_SIZE])
+                del frame[:STM32Protocol.PACKET_SIZE]
+                response = self.device.handle_packet(packet)
+                if self.latency:
+                    time.sleep(self.latency)
+                try:
+                    client.sendall(response)
+                except OSError:
+                    return
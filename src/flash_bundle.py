@@ -0,0 +1,174 @@
+import json
+import os
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+from .flash_layout import STM32F4_SECTOR_SIZES
+from .image_preprocess import PreprocessResult, preprocess_image
+
+@dataclass
+class BundleImage:
+    """Paketteki tek görüntü (ör. konfigürasyon, uygulama, kalibrasyon)"""
+    name: str
+    sector: int
+    data: bytes
+    order: int = 0
+    path: Optional[str] = None
+    vectors: bool = False  # Cortex-M vektör tablosu doğrulansın mı (yalnızca uygulama görüntüsü)
+
+@dataclass
+class BundleManifest:
+    """
+    Tek oturumda yüklenecek görüntüler
+
+    Görüntüler order alanına göre (eşitse tanım sırasıyla) yazılır. erase
+    True ise gereken her sektör yazmadan önce bir kez silinir.
+    """
+    name: str
+    images: List[BundleImage]
+    erase: bool = True
+
+    def ordered(self) -> List[BundleImage]:
+        return sorted(self.images, key=lambda image: image.order)
+
+    def erase_plan(self) -> List[int]:
+        """Silinecek sektörler (yazma sırasıyla, her sektör bir kez)"""
+        plan: List[int] = []
+        for image in self.ordered():
+            if image.sector not in plan:
+                plan.append(image.sector)
+        return plan
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(len(image.data) for image in self.images)
+
+    def validate(self) -> List[str]:
+        """Tanım hataları (boş liste: geçerli)"""
+        errors = []
+        if not self.images:
+            errors.append("Pakette görüntü yok")
+        seen: Dict[int, str] = {}
+        for image in self.images:
+            if image.sector in seen:
+                errors.append(f"'{image.name}' ve '{seen[image.sector]}' aynı sektörü ({image.sector}) hedefliyor")
+            seen.setdefault(image.sector, image.name)
+            if not image.data:
+                errors.append(f"'{image.name}' boş")
+        names = [image.name for image in self.images]
+        if len(set(names)) != len(names):
+            errors.append("Görüntü adları benzersiz olmalı")
+        return errors
+
+    def preprocess(self, sector_sizes: List[int] = STM32F4_SECTOR_SIZES) -> Dict[str, PreprocessResult]:
+        """
+        Her görüntüyü ön işlemden geçirir (bkz. preprocess_image); hatasız
+        görüntülerin verisi normalize edilmiş haliyle değiştirilir
+
+        Returns:
+            Görüntü adı -> PreprocessResult
+        """
+        reports = {}
+        for image in self.images:
+            report = preprocess_image(image.data, image.sector, validate_vectors=image.vectors,
+                                      sector_sizes=sector_sizes)
+            if report.ok:
+                image.data = report.image
+            reports[image.name] = report
+        return reports
+
+def load_manifest(path: str) -> BundleManifest:
+    """
+    JSON paket tanımını okur; dosya yolları tanım dosyasına göredir
+
+    Örnek:
+        {
+          "name": "production",
+          "erase": true,
+          "images": [
+            {"name": "config", "file": "config.bin", "sector": 2, "order": 1},
+            {"name": "app", "file": "app.bin", "sector": 5, "order": 2, "vectors": true},
+            {"name": "calibration", "file": "cal.bin", "sector": 3, "order": 3}
+          ]
+        }
+
+    Raises:
+        ValueError: Tanım hatalıysa
+        OSError: Dosya okunamazsa
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        try:
+            spec = json.load(f)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Paket tanımı okunamadı ({path}): {e}") from e
+
+    base_dir = os.path.dirname(os.path.abspath(path))
+    images = []
+    for index, entry in enumerate(spec.get("images", [])):
+        try:
+            file_path = os.path.join(base_dir, entry["file"])
+            sector = int(entry["sector"])
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"Paket tanımı: {index + 1}. görüntüde 'file' / 'sector' hatalı ({e})") from e
+        with open(file_path, "rb") as f:
+            data = f.read()
+        images.append(BundleImage(
+            name=entry.get("name") or os.path.splitext(os.path.basename(file_path))[0],
+            sector=sector,
+            data=data,
+            order=int(entry.get("order", index)),
+            path=file_path,
+            vectors=bool(entry.get("vectors", False)),
+        ))
+
+    manifest = BundleManifest(
+        name=spec.get("name") or os.path.splitext(os.path.basename(path))[0],
+        images=images,
+        erase=bool(spec.get("erase", True)),
+    )
+    errors = manifest.validate()
+    if errors:
+        raise ValueError("Paket tanımı hatalı: " + "; ".join(errors))
+    return manifest
+
+@dataclass
+class BundleImageResult:
+    """Paketteki bir görüntünün yükleme sonucu"""
+    name: str
+    sector: int
+    bytes: int
+    packets: int
+    success: bool
+    message: str
+    phases: Dict[str, float] = field(default_factory=dict)  # prepare / data / finish (saniye)
+
+    @property
+    def duration(self) -> float:
+        return sum(self.phases.values())
+
+@dataclass
+class BundleReport:
+    """Paket oturumunun birleşik zamanlama raporu"""
+    name: str
+    erase_durations: Dict[int, float] = field(default_factory=dict)  # Sektör -> silme süresi
+    images: List[BundleImageResult] = field(default_factory=list)
+    duration: float = 0.0
+    success: bool = False
+    message: str = ""
+
+    @property
+    def erase_time(self) -> float:
+        return sum(self.erase_durations.values())
+
+    def summary(self) -> str:
+        lines = [f"Paket '{self.name}': {'OK' if self.success else 'HATA'} {self.duration:.2f}s"]
+        width = max([len("silme")] + [len(image.name) for image in self.images])
+        if self.erase_durations:
+            sectors = ", ".join(f"{sector}: {value:.2f}s" for sector, value in self.erase_durations.items())
+            lines.append(f"  {'silme':<{width}} {self.erase_time:7.2f}s  ({sectors})")
+        for image in self.images:
+            phases = " ".join(f"{name} {value:.2f}s" for name, value in image.phases.items())
+            rate = image.bytes / image.phases["data"] / 1024 if image.phases.get("data") else 0.0
+            lines.append(f"  {image.name:<{width}} {image.duration:7.2f}s  sektör {image.sector}, {image.bytes} byte, "
+                         f"{image.packets} paket, {rate:.1f} KB/s ({phases})"
+                         + ("" if image.success else f" HATA: {image.message}"))
+        return "\n".join(lines)
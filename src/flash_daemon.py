@@ -0,0 +1,717 @@
+"""
+Yerel yükleme servisi (flash daemon)
+
+Tek bir süreç tüm fikstür portlarını yönetir: işler (görüntü, hedef portlar,
+sektör planı) HTTP API ile kuyruğa alınır, port başına bir worker portu
+işler arasında açık tutar ve görüntüler gönderilmeden önce paketlenir.
+İlerleme olayları NDJSON akışı olarak izlenebilir.
+
+Portlar açılmadan önce süreçler arası port kilidi alınır (bkz. port_lock):
+servis çalışırken GUI işleri servise gönderir, aynı portu kendisi açmaz.
+
+Her istek kurulum başına üretilen erişim anahtarını taşımalıdır
+(Authorization: Bearer <anahtar>, dosya: veri dizini/daemon_token); Host
+başlığı yerel adres olmalı, POST gövdesi application/json olmalıdır. Böylece
+tarayıcıdaki bir sayfa servise iş gönderemez. image_path yalnızca servis
+görüntü diziniyle (image_dir) başlatıldıysa ve yol bu dizindeyse kabul edilir.
+
+API (varsayılan: http://127.0.0.1:8765):
+    POST /jobs                  {"image_path"|"image_b64", "ports", "sector",
+                                 "erase_sectors", "priority", "client", "baudrate"}
+                                (boş image_b64: yalnızca erase_sectors silinir)
+    GET  /jobs                  Tüm işler
+    GET  /jobs/<id>             Tek iş
+    POST /jobs/<id>/cancel      İşi iptal et
+    GET  /ports                 Port worker durumları
+    GET  /events?since=N&job=ID Olay akışı (her satır bir JSON nesnesi)
+"""
+
+import base64
+import hmac
+import itertools
+import json
+import os
+import secrets
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterator, List, Optional
+from .app_paths import app_data_path
+from .cancellation import CancelToken
+from .frame_cache import FrameCache, default_frame_cache
+from .image_preprocess import preprocess_image
+from .session_log import SessionLog
+from .serial_session import SerialSession
+
+DEFAULT_DAEMON_HOST = "127.0.0.1"
+DEFAULT_DAEMON_PORT = 8765
+
+JOB_STATES = ("queued", "running", "done", "failed", "cancelled")
+
+# Host başlığında kabul edilen yerel adlar (DNS rebinding'e karşı)
+LOCAL_HOSTS = ("127.0.0.1", "localhost", "::1")
+
+def daemon_token_path() -> str:
+    """Servis erişim anahtarının dosyası (veri dizini/daemon_token)"""
+    return app_data_path("daemon_token")
+
+def load_daemon_token(path: Optional[str] = None, create: bool = False) -> Optional[str]:
+    """
+    Kurulum başına erişim anahtarını okur
+
+    Args:
+        path: Anahtar dosyası (None: daemon_token_path())
+        create: Dosya yoksa rastgele anahtar üretip yalnızca kullanıcının
+            okuyabileceği şekilde (0600) yaz
+    Returns:
+        Anahtar (dosya yoksa ve create False ise None)
+    """
+    path = path or daemon_token_path()
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            token = f.read().strip()
+        if token:
+            return token
+    except OSError:
+        pass
+    if not create:
+        return None
+    token = secrets.token_urlsafe(32)
+    tmp_path = path + ".tmp"
+    with os.fdopen(os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), "w", encoding="utf-8") as f:
+        f.write(token)
+    os.replace(tmp_path, path)
+    return token
+
+@dataclass
+class PortTask:
+    """Bir işin tek bir porttaki kısmı"""
+    job: "FlashJob"
+    port: str
+    seq: int
+    state: str = "queued"
+    message: str = ""
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    def to_dict(self) -> dict:
+        return {
+            "port": self.port,
+            "state": self.state,
+            "message": self.message,
+            "duration": (self.finished_at - self.started_at) if self.finished_at and self.started_at else None,
+        }
+
+@dataclass
+class FlashJob:
+    """Bir görüntünün bir veya daha fazla porta yüklenmesi"""
+    id: str
+    image: bytes
+    image_name: str
+    ports: List[str]
+    sector: int
+    erase_sectors: List[int] = field(default_factory=list)
+    priority: int = 0
+    client: str = "default"
+    baudrate: int = 115200
+    submitted_at: float = field(default_factory=time.time)
+    cancel_token: CancelToken = field(default_factory=CancelToken)
+    tasks: Dict[str, PortTask] = field(default_factory=dict)
+    finished: bool = False  # job_finished olayı yayınlandı mı (görüntü bellekten atılır)
+    image_size: int = 0
+
+    def __post_init__(self):
+        self.image_size = self.image_size or len(self.image)
+
+    @property
+    def state(self) -> str:
+        states = [task.state for task in self.tasks.values()]
+        if any(s in ("queued", "running") for s in states):
+            return "running" if any(s != "queued" for s in states) else "queued"
+        if self.cancel_token.is_cancelled and "cancelled" in states:
+            return "cancelled"
+        return "done" if all(s == "done" for s in states) else "failed"
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "image_name": self.image_name,
+            "image_size": self.image_size,
+            "sector": self.sector,
+            "erase_sectors": self.erase_sectors,
+            "priority": self.priority,
+            "client": self.client,
+            "baudrate": self.baudrate,
+            "submitted_at": self.submitted_at,
+            "state": self.state,
+            "tasks": [task.to_dict() for task in self.tasks.values()],
+        }
+
+class EventLog:
+    """Sıra numaralı, sınırlı olay geçmişi; okuyucular yeni olayı bekleyebilir"""
+
+    def __init__(self, max_events: int = 10000):
+        self._events: deque = deque(maxlen=max_events)
+        self._seq = 0
+        self._cond = threading.Condition()
+
+    def publish(self, event_type: str, **data) -> dict:
+        with self._cond:
+            self._seq += 1
+            event = {"seq": self._seq, "time": time.time(), "type": event_type, **data}
+            self._events.append(event)
+            self._cond.notify_all()
+            return event
+
+    def since(self, seq: int, timeout: float = 0.0) -> List[dict]:
+        """seq'ten sonraki olaylar; yoksa en fazla timeout kadar bekler"""
+        with self._cond:
+            if self._seq <= seq and timeout > 0:
+                self._cond.wait(timeout)
+            return [event for event in self._events if event["seq"] > seq]
+
+class PortScheduler:
+    """
+    Port başına bekleyen görevleri öncelik ve adaletle sıralar
+
+    Sıra anahtarı: (-öncelik, istemcinin o portta aldığı görev sayısı, geliş sırası).
+    Aynı öncelikte çok iş gönderen bir istemci diğerlerini bekletmez.
+    """
+
+    def __init__(self):
+        self._pending: Dict[str, List[PortTask]] = defaultdict(list)
+        self._served: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self._cond = threading.Condition()
+
+    def put(self, task: PortTask):
+        with self._cond:
+            self._pending[task.port].append(task)
+            self._cond.notify_all()
+
+    def _key(self, task: PortTask):
+        return (-task.job.priority, self._served[task.port][task.job.client], task.seq)
+
+    def take(self, port: str, timeout: float) -> Optional[PortTask]:
+        """Portun sıradaki görevini döner (timeout içinde yoksa None)"""
+        with self._cond:
+            deadline = time.time() + timeout
+            while not self._pending[port]:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    return None
+                self._cond.wait(remaining)
+            task = min(self._pending[port], key=self._key)
+            self._pending[port].remove(task)
+            self._served[port][task.job.client] += 1
+            return task
+
+    def remove_job(self, job_id: str) -> List[PortTask]:
+        """İşin henüz başlamamış görevlerini kuyruktan çıkarır"""
+        with self._cond:
+            removed = []
+            for tasks in self._pending.values():
+                for task in [t for t in tasks if t.job.id == job_id]:
+                    tasks.remove(task)
+                    removed.append(task)
+            return removed
+
+    def pending_count(self, port: str) -> int:
+        with self._cond:
+            return len(self._pending[port])
+
+class PortWorker:
+    """Tek bir portun görevlerini sırayla yürütür; portu görevler arasında açık tutar"""
+
+    def __init__(self, daemon: "FlashDaemon", port: str):
+        self.daemon = daemon
+        self.port = port
+        self.session: Optional[SerialSession] = None
+        self.current: Optional[PortTask] = None
+        self.completed = 0  # Başarıyla biten görevler
+        self.log = SessionLog(f"daemon_{port}")  # Port başına disk logu
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"flash-worker-{port}", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join(timeout=5.0)
+        if self.session:
+            self.session.close()
+        self.log.close()
+
+    def to_dict(self) -> dict:
+        return {
+            "port": self.port,
+            "state": "busy" if self.current else "idle",
+            "connected": bool(self.session and self.session.is_connected),
+            "baudrate": self.session.baudrate if self.session else None,
+            "current_job": self.current.job.id if self.current else None,
+            "pending": self.daemon.scheduler.pending_count(self.port),
+            "completed": self.completed,
+        }
+
+    def _run(self):
+        while not self._stop.is_set():
+            task = self.daemon.scheduler.take(self.port, timeout=0.2)
+            if task is None:
+                continue
+            self.current = task
+            try:
+                self._execute(task)
+            finally:
+                self.current = None
+                if task.state == "done":
+                    self.completed += 1
+                self.daemon.task_finished(task)
+
+    def _open_session(self, baudrate: int) -> SerialSession:
+        if self.session and self.session.baudrate != baudrate:
+            self.session.close()
+            self.session = None
+        if self.session is None:
+            self.session = SerialSession(self.port, baudrate, owner="yükleme servisi")
+            self.session.open()  # Açılamazsa operation() yeniden dener ve ConnectionError verir
+        return self.session
+
+    def _execute(self, task: PortTask):
+        job = task.job
+        events = self.daemon.events
+        if job.cancel_token.is_cancelled:
+            task.state, task.message = "cancelled", "İşlem iptal edildi"
+            return
+
+        task.state, task.started_at = "running", time.time()
+        events.publish("started", job=job.id, port=self.port)
+        self.log.write(f"{job.id}: {job.image_name} ({len(job.image)} byte) -> sektör {job.sector}, "
+                       f"silme {job.erase_sectors or '-'} @ {job.baudrate} (istemci {job.client})")
+
+        last_percent = -1
+
+        def on_progress(current: int, total: int):
+            nonlocal last_percent
+            percent = current * 100 // total if total else 100
+            if percent >= last_percent + 5 or current == total:
+                last_percent = percent
+                events.publish("progress", job=job.id, port=self.port, current=current, total=total)
+                self.log.write(f"{job.id}: paket {current}/{total} (%{percent})")
+
+        try:
+            with self._open_session(job.baudrate).operation() as uart:
+                uart.frame_cache = self.daemon.frame_cache
+                success, message = True, ""
+                if job.erase_sectors:
+                    success, message = uart.erase_sectors(job.erase_sectors, cancel_token=job.cancel_token)
+                    events.publish("erase", job=job.id, port=self.port, success=success, message=message)
+                    self.log.write(f"{job.id}: {message}", "INFO" if success else "ERROR")
+                if success and job.image_size:
+                    success, message = uart.send_firmware(job.image, job.sector, on_progress,
+                                                          cancel_token=job.cancel_token)
+        except ConnectionError as e:
+            success, message = False, str(e)
+
+        task.finished_at = time.time()
+        task.message = message
+        if success:
+            task.state = "done"
+        elif job.cancel_token.is_cancelled:
+            task.state = "cancelled"
+        else:
+            task.state = "failed"
+        level = {"done": "SUCCESS", "cancelled": "WARNING"}.get(task.state, "ERROR")
+        self.log.write(f"{job.id}: {task.state} - {message}", level)
+
+class FlashDaemon:
+    """
+    Yükleme işlerini kuyruğa alan ve portlar arasında dağıtan servis
+
+    Kullanım:
+        daemon = FlashDaemon()
+        daemon.serve_forever()          # veya start() ile arka planda
+    """
+
+    def __init__(self, host: str = DEFAULT_DAEMON_HOST, port: int = DEFAULT_DAEMON_PORT,
+                 frame_cache: Optional[FrameCache] = None, token: Optional[str] = None,
+                 image_dir: Optional[str] = None, max_finished_jobs: int = 200):
+        """
+        Args:
+            host: Dinlenecek adres (varsayılan yalnızca yerel makine)
+            port: HTTP portu (0: boş port seçilir)
+            frame_cache: Paketlenmiş görüntü önbelleği (varsayılan: süreç geneli önbellek)
+            token: Erişim anahtarı (None: load_daemon_token ile okunur, yoksa üretilir)
+            image_dir: image_path ile okunabilecek görüntülerin dizini (None: image_path kapalı)
+            max_finished_jobs: Bellekte tutulan en fazla biten iş (eskiler atılır)
+        """
+        self.frame_cache = frame_cache or default_frame_cache
+        self.token = token or load_daemon_token(create=True)
+        self.image_dir = os.path.realpath(image_dir) if image_dir else None
+        self.max_finished_jobs = max_finished_jobs
+        self.allowed_hosts = {name.lower() for name in (*LOCAL_HOSTS, host)}
+        self.scheduler = PortScheduler()
+        self.events = EventLog()
+        self.jobs: Dict[str, FlashJob] = {}
+        self._finished_jobs: deque = deque()  # Biten iş id'leri (eskiden yeniye)
+        self.workers: Dict[str, PortWorker] = {}
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._seq = itertools.count()
+        self._stopping = threading.Event()
+        self._server = ThreadingHTTPServer((host, port), _DaemonRequestHandler)
+        self._server.daemon_threads = True
+        self._server.flash_daemon = self
+        self._server_thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    # -- Erişim -------------------------------------------------------------
+    def host_allowed(self, host_header: str) -> bool:
+        """Host başlığı yerel bir ad ve servisin portu mu"""
+        try:
+            parsed = urllib.parse.urlsplit(f"//{host_header}")
+            port = parsed.port
+        except ValueError:
+            return False
+        return bool(parsed.hostname) and parsed.hostname.lower() in self.allowed_hosts and \
+            port in (None, self._server.server_address[1])
+
+    def token_valid(self, authorization: str) -> bool:
+        return hmac.compare_digest(authorization.encode("utf-8"), f"Bearer {self.token}".encode("utf-8"))
+
+    def read_image_path(self, path: str) -> bytes:
+        """image_dir içindeki görüntüyü okur (dizin yoksa / yol dışarıdaysa ValueError)"""
+        if not self.image_dir:
+            raise ValueError("image_path kapalı: servis görüntü diziniyle başlatılmadı (image_b64 kullanın)")
+        real_path = os.path.realpath(path)
+        if os.path.commonpath([real_path, self.image_dir]) != self.image_dir:
+            raise ValueError(f"Görüntü dizini dışında: {path}")
+        with open(real_path, "rb") as f:
+            return f.read()
+
+    # -- İşler --------------------------------------------------------------
+    def submit(self, image: bytes, ports: List[str], sector: int, erase_sectors: Optional[List[int]] = None,
+               priority: int = 0, client: str = "default", baudrate: int = 115200,
+               image_name: str = "", preprocess: bool = True) -> FlashJob:
+        """
+        İşi kuyruğa alır; görüntü gönderimden önce paketlenip önbelleğe konur
+
+        preprocess True ise görüntü kırpılıp hizalanır ve doğrulanır (bkz. preprocess_image);
+        doğrulama hatasında ValueError yükseltilir. Görüntüsüz iş yalnızca erase_sectors'ı siler.
+        """
+        if not ports:
+            raise ValueError("En az bir port gerekli")
+        if not image and not erase_sectors:
+            raise ValueError("Görüntü boş")
+        if preprocess and image:
+            report = preprocess_image(image, sector)
+            if not report.ok:
+                raise ValueError(f"Görüntü reddedildi: {report.summary()}")
+            image = report.image
+
+        job = FlashJob(
+            id=f"job-{next(self._ids)}", image=image, image_name=image_name or ("image.bin" if image else "silme"),
+            ports=list(dict.fromkeys(ports)), sector=sector, erase_sectors=list(erase_sectors or []),
+            priority=priority, client=client, baudrate=baudrate,
+        )
+        if image:
+            self.frame_cache.get_or_encode(image, sector)
+
+        with self._lock:
+            self.jobs[job.id] = job
+            for port in job.ports:
+                job.tasks[port] = PortTask(job, port, next(self._seq))
+                self._ensure_worker(port)
+        self.events.publish("queued", job=job.id, ports=job.ports, priority=priority, client=client)
+        for task in job.tasks.values():
+            self.scheduler.put(task)
+        return job
+
+    def cancel(self, job_id: str) -> bool:
+        job = self.jobs.get(job_id)
+        if job is None:
+            return False
+        job.cancel_token.cancel()
+        for task in self.scheduler.remove_job(job_id):
+            task.state, task.message = "cancelled", "İşlem iptal edildi"
+            self.task_finished(task)
+        return True
+
+    def task_finished(self, task: PortTask):
+        """Worker'dan: görev bitti; iş tamamen bittiyse olay yayınlar"""
+        self.events.publish(task.state, job=task.job.id, port=task.port, message=task.message)
+        job = task.job
+        with self._lock:
+            if job.finished or job.state in ("queued", "running"):
+                return
+            job.finished = True
+            job.image = b""  # Tüm görevler bitti; paketlenmiş hali zaten önbellekte
+            self._finished_jobs.append(job.id)
+            while len(self._finished_jobs) > self.max_finished_jobs:
+                self.jobs.pop(self._finished_jobs.popleft(), None)
+        self.events.publish("job_finished", job=job.id, state=job.state)
+
+    def _ensure_worker(self, port: str):
+        """Kilit tutulurken çağrılır"""
+        if port not in self.workers:
+            worker = PortWorker(self, port)
+            self.workers[port] = worker
+            worker.start()
+
+    # -- Servis -------------------------------------------------------------
+    def start(self) -> "FlashDaemon":
+        """HTTP sunucusunu arka plan thread'inde başlatır"""
+        self._server_thread = threading.Thread(target=self._server.serve_forever, name="flash-daemon", daemon=True)
+        self._server_thread.start()
+        return self
+
+    def serve_forever(self):
+        print(f"Yükleme servisi dinliyor: {self.url}")
+        try:
+            self._server.serve_forever()
+        finally:
+            self.stop()
+
+    def stop(self):
+        """Sunucuyu durdurur, süren işleri iptal eder ve portları kapatır"""
+        if self._stopping.is_set():
+            return
+        self._stopping.set()
+        if self._server_thread:
+            self._server.shutdown()
+        self._server.server_close()
+        for job in list(self.jobs.values()):
+            if job.state in ("queued", "running"):
+                self.cancel(job.id)
+        for worker in list(self.workers.values()):
+            worker.stop()
+
+class _DaemonRequestHandler(BaseHTTPRequestHandler):
+    """FlashDaemon HTTP API'si"""
+    protocol_version = "HTTP/1.0"
+
+    @property
+    def daemon(self) -> FlashDaemon:
+        return self.server.flash_daemon
+
+    def log_message(self, format, *args):
+        pass  # Olay akışı zaten ilerleme bilgisini taşıyor
+
+    def _send_json(self, status: int, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_json(self) -> dict:
+        length = int(self.headers.get("Content-Length") or 0)
+        request = json.loads(self.rfile.read(length) or b"{}")
+        if not isinstance(request, dict):
+            raise ValueError("İstek gövdesi bir JSON nesnesi olmalı")
+        return request
+
+    def _authorize(self, json_body: bool = False) -> bool:
+        """Host, erişim anahtarı ve gövde türünü denetler; uymazsa hata yanıtı gönderip False döner"""
+        if not self.daemon.host_allowed(self.headers.get("Host", "")):
+            self._send_json(403, {"error": "Geçersiz Host başlığı"})
+            return False
+        if not self.daemon.token_valid(self.headers.get("Authorization", "")):
+            self._send_json(401, {"error": f"Geçersiz erişim anahtarı (bkz. {daemon_token_path()})"})
+            return False
+        content_type = self.headers.get("Content-Type", "").split(";")[0].strip().lower()
+        if json_body and content_type != "application/json":
+            self._send_json(415, {"error": "İstek gövdesi application/json olmalı"})
+            return False
+        return True
+
+    def do_GET(self):
+        if not self._authorize():
+            return
+        url = urllib.parse.urlparse(self.path)
+        parts = [p for p in url.path.split("/") if p]
+        query = urllib.parse.parse_qs(url.query)
+
+        if parts == ["jobs"]:
+            self._send_json(200, [job.to_dict() for job in list(self.daemon.jobs.values())])
+        elif len(parts) == 2 and parts[0] == "jobs":
+            job = self.daemon.jobs.get(parts[1])
+            if job is None:
+                self._send_json(404, {"error": f"İş bulunamadı: {parts[1]}"})
+            else:
+                self._send_json(200, job.to_dict())
+        elif parts == ["ports"]:
+            self._send_json(200, [worker.to_dict() for worker in list(self.daemon.workers.values())])
+        elif parts == ["events"]:
+            try:
+                since = int(query.get("since", ["0"])[0])
+            except ValueError:
+                self._send_json(400, {"error": "since bir sayı olmalı"})
+                return
+            self._stream_events(since, query.get("job", [None])[0])
+        else:
+            self._send_json(404, {"error": "Bilinmeyen adres"})
+
+    def do_POST(self):
+        if not self._authorize(json_body=True):
+            return
+        parts = [p for p in urllib.parse.urlparse(self.path).path.split("/") if p]
+        try:
+            if parts == ["jobs"]:
+                job = self._submit(self._read_json())
+                self._send_json(201, job.to_dict())
+            elif len(parts) == 3 and parts[0] == "jobs" and parts[2] == "cancel":
+                if self.daemon.cancel(parts[1]):
+                    self._send_json(200, {"id": parts[1], "cancelled": True})
+                else:
+                    self._send_json(404, {"error": f"İş bulunamadı: {parts[1]}"})
+            else:
+                self._send_json(404, {"error": "Bilinmeyen adres"})
+        except KeyError as e:
+            self._send_json(400, {"error": f"Eksik alan: {e}"})
+        except (ValueError, TypeError, OSError) as e:
+            self._send_json(400, {"error": str(e)})
+
+    def _submit(self, request: dict) -> FlashJob:
+        ports = request["ports"]
+        if not isinstance(ports, list) or not all(isinstance(port, str) for port in ports):
+            raise ValueError("ports bir port adı listesi olmalı")
+        if "image_b64" in request:
+            image = base64.b64decode(request["image_b64"])
+            image_name = str(request.get("image_name", "image.bin"))
+        else:
+            image_path = request["image_path"]
+            if not isinstance(image_path, str):
+                raise ValueError("image_path bir dosya yolu olmalı")
+            image = self.daemon.read_image_path(image_path)
+            image_name = os.path.basename(image_path)
+        return self.daemon.submit(
+            image, ports, int(request["sector"]),
+            erase_sectors=[int(s) for s in request.get("erase_sectors", [])],
+            priority=int(request.get("priority", 0)), client=str(request.get("client", "default")),
+            baudrate=int(request.get("baudrate", 115200)), image_name=image_name,
+            preprocess=bool(request.get("preprocess", True)),
+        )
+
+    def _stream_events(self, since: int, job_id: Optional[str]):
+        """Olayları satır satır yazar; job verilmişse iş bitince akış kapanır"""
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.end_headers()
+        try:
+            while not self.daemon._stopping.is_set():
+                for event in self.daemon.events.since(since, timeout=1.0):
+                    since = event["seq"]
+                    if job_id and event.get("job") != job_id:
+                        continue
+                    self.wfile.write(json.dumps(event).encode("utf-8") + b"\n")
+                    self.wfile.flush()
+                    if job_id and event["type"] == "job_finished":
+                        return
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # İstemci akışı kapattı
+
+class FlashDaemonClient:
+    """FlashDaemon HTTP API istemcisi (GUI ve betikler için)"""
+
+    def __init__(self, url: str = f"http://{DEFAULT_DAEMON_HOST}:{DEFAULT_DAEMON_PORT}", timeout: float = 10.0,
+                 token: Optional[str] = None):
+        """
+        Args:
+            url: Servis adresi
+            timeout: İstek zaman aşımı (saniye)
+            token: Erişim anahtarı (None: aynı kullanıcının anahtar dosyasından okunur)
+        """
+        self.url = url.rstrip("/")
+        self.timeout = timeout
+        self.token = token or load_daemon_token()
+
+    def _headers(self) -> Dict[str, str]:
+        headers = {"Content-Type": "application/json"}
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        return headers
+
+    def _request(self, method: str, path: str, payload: Optional[dict] = None):
+        data = json.dumps(payload).encode("utf-8") if payload is not None else None
+        request = urllib.request.Request(self.url + path, data=data, method=method, headers=self._headers())
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                return json.loads(response.read())
+        except urllib.error.HTTPError as e:
+            raise ValueError(json.loads(e.read() or b"{}").get("error", str(e)))
+        except urllib.error.URLError as e:
+            raise ConnectionError(f"Yükleme servisine ulaşılamadı ({self.url}): {e.reason}")
+
+    def available(self) -> bool:
+        """Servis çalışıyor ve bu kullanıcının anahtarını kabul ediyor mu"""
+        if not self.token:
+            return False  # Anahtar dosyası yok: bu kullanıcı servisi hiç başlatmadı
+        try:
+            self.ports()
+            return True
+        except (ConnectionError, ValueError, OSError):
+            return False
+
+    def submit(self, image_path: str, ports: List[str], sector: int, erase_sectors: Optional[List[int]] = None,
+               priority: int = 0, client: str = "default", baudrate: int = 115200,
+               preprocess: bool = True) -> dict:
+        """Görüntü dosyasını okuyup servise yükler"""
+        with open(image_path, "rb") as f:
+            image = f.read()
+        return self.submit_image(image, os.path.basename(image_path), ports, sector, erase_sectors,
+                                 priority, client, baudrate, preprocess)
+
+    def submit_image(self, image: bytes, image_name: str, ports: List[str], sector: int,
+                     erase_sectors: Optional[List[int]] = None, priority: int = 0, client: str = "default",
+                     baudrate: int = 115200, preprocess: bool = True) -> dict:
+        """Bellekteki görüntüyü servise yükler (boş görüntü: yalnızca erase_sectors silinir)"""
+        return self._request("POST", "/jobs", {
+            "image_b64": base64.b64encode(image).decode("ascii"), "image_name": image_name,
+            "ports": ports, "sector": sector,
+            "erase_sectors": erase_sectors or [], "priority": priority, "client": client, "baudrate": baudrate,
+            "preprocess": preprocess,
+        })
+
+    def erase(self, ports: List[str], sectors: List[int], priority: int = 0, client: str = "default",
+              baudrate: int = 115200) -> dict:
+        """Yalnızca silme işi gönderir"""
+        return self.submit_image(b"", "", ports, sectors[0], sectors, priority, client, baudrate, preprocess=False)
+
+    def job(self, job_id: str) -> dict:
+        return self._request("GET", f"/jobs/{job_id}")
+
+    def jobs(self) -> List[dict]:
+        return self._request("GET", "/jobs")
+
+    def ports(self) -> List[dict]:
+        return self._request("GET", "/ports")
+
+    def cancel(self, job_id: str) -> dict:
+        return self._request("POST", f"/jobs/{job_id}/cancel", {})
+
+    def events(self, since: int = 0, job_id: Optional[str] = None) -> Iterator[dict]:
+        """Olay akışı; job_id verilmişse iş bitince biter"""
+        query = {"since": since}
+        if job_id:
+            query["job"] = job_id
+        request = urllib.request.Request(f"{self.url}/events?{urllib.parse.urlencode(query)}", headers=self._headers())
+        try:
+            response = urllib.request.urlopen(request)
+        except urllib.error.HTTPError as e:
+            raise ValueError(json.loads(e.read() or b"{}").get("error", str(e)))
+        except urllib.error.URLError as e:
+            raise ConnectionError(f"Yükleme servisine ulaşılamadı ({self.url}): {e.reason}")
+        with response:
+            for line in response:
+                if line.strip():
+                    yield json.loads(line)
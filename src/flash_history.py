@@ -0,0 +1,302 @@
+import atexit
+import json
+import logging
+import math
+import queue
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field, fields
+from typing import Dict, List, Optional, Sequence
+from .app_paths import app_data_path
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    started_at REAL NOT NULL,
+    operation TEXT NOT NULL,
+    port TEXT NOT NULL,
+    adapter_serial TEXT,
+    image_hash TEXT,
+    sectors TEXT,
+    bytes INTEGER NOT NULL DEFAULT 0,
+    packets INTEGER NOT NULL DEFAULT 0,
+    baudrate INTEGER NOT NULL DEFAULT 0,
+    duration REAL NOT NULL,
+    nacks INTEGER NOT NULL DEFAULT 0,
+    retries INTEGER NOT NULL DEFAULT 0,
+    success INTEGER NOT NULL,
+    message TEXT,
+    phases TEXT,
+    app_version TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_started ON sessions(started_at);
+CREATE INDEX IF NOT EXISTS idx_sessions_port ON sessions(port, started_at);
+CREATE INDEX IF NOT EXISTS idx_sessions_adapter ON sessions(adapter_serial, started_at);
+CREATE INDEX IF NOT EXISTS idx_sessions_image ON sessions(image_hash, started_at);
+"""
+
+# Gruplama anahtarları (percentiles group_by)
+GROUP_COLUMNS = {
+    "port": "port",
+    "adapter": "COALESCE(adapter_serial, '-')",
+    "day": "date(started_at, 'unixepoch', 'localtime')",
+    "version": "COALESCE(app_version, '-')",
+    "image": "COALESCE(image_hash, '-')",
+}
+
+def app_version() -> str:
+    """Kayıtlara yazılan uygulama sürümü (sürümler arası gerilemeleri ayırmak için)"""
+    from . import __version__  # Paket yüklendikten sonra çağrılır (döngüsel import yok)
+    return __version__
+
+@dataclass
+class FlashRecord:
+    """Tek bir silme / yükleme oturumunun kaydı"""
+    operation: str                     # "flash", "erase" veya "bundle"
+    port: str
+    started_at: float                  # Unix zamanı (saniye)
+    duration: float                    # Toplam süre (saniye)
+    success: bool
+    message: str = ""
+    sectors: str = ""                  # ör. "5" veya "1,2,3"
+    bytes: int = 0
+    packets: int = 0
+    baudrate: int = 0
+    nacks: int = 0
+    retries: int = 0
+    adapter_serial: Optional[str] = None
+    image_hash: Optional[str] = None
+    phases: Dict[str, float] = field(default_factory=dict)  # Aşama adı -> süre (saniye)
+    app_version: str = ""
+
+    @property
+    def throughput(self) -> float:
+        """Byte/saniye (süre yoksa 0)"""
+        return self.bytes / self.duration if self.duration > 0 else 0.0
+
+def percentile(sorted_values: Sequence[float], fraction: float) -> float:
+    """Sıralı listede en yakın sıra yöntemiyle yüzdelik (sector_timing ile aynı)"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, math.ceil(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+class FlashHistory:
+    """
+    Silme / yükleme oturumlarını SQLite veritabanında saklar
+
+    record() kaydı yalnızca kuyruğa koyar; arka plandaki yazıcı thread'i
+    kayıtları toplar ve tek bir transaction ile yazar, böylece aktarım
+    diske yazma beklemez. Sorgular önce bekleyen kayıtları yazdırır.
+    """
+
+    def __init__(self, path: Optional[str] = None, batch_size: int = 100, flush_interval: float = 1.0):
+        """
+        Args:
+            path: Veritabanı dosyası (None: kullanıcı veri dizini, "": sadece bellekte)
+            batch_size: Tek transaction'da yazılacak en fazla kayıt
+            flush_interval: Kayıt geldikten sonra toplu yazmadan önce en fazla bekleme (saniye)
+        """
+        self.path = app_data_path("flash_history.sqlite3") if path is None else path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: "queue.Queue" = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._closed = False
+        self._keepalive: Optional[sqlite3.Connection] = None
+        if not self.path:
+            # Paylaşımlı bellek veritabanı: en az bir bağlantı açık kaldıkça yaşar
+            self._uri = f"file:flash_history_{id(self)}?mode=memory&cache=shared"
+            self._keepalive = self._connect()
+        else:
+            self._uri = None
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._uri:
+            return sqlite3.connect(self._uri, uri=True, timeout=5.0)
+        conn = sqlite3.connect(self.path, timeout=5.0)
+        conn.execute("PRAGMA journal_mode=WAL")  # Okuyucular yazıcıyı bloklamasın
+        return conn
+
+    def _ensure_writer(self):
+        with self._lock:
+            if self._writer is None or not self._writer.is_alive():
+                self._writer = threading.Thread(target=self._writer_loop, name="flash-history", daemon=True)
+                self._writer.start()
+
+    def record(self, record: FlashRecord):
+        """Kaydı yazma kuyruğuna ekler (bloklamaz)"""
+        if self._closed:
+            return
+        self._ensure_writer()
+        self._queue.put(record)
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Kuyruktaki kayıtlar yazılana kadar bekler"""
+        if self._writer is None or not self._writer.is_alive():
+            return self._queue.empty()
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self, timeout: float = 5.0):
+        """Bekleyen kayıtları yazar ve yazıcıyı durdurur"""
+        if self._closed:
+            return
+        self._closed = True
+        if self._writer is not None and self._writer.is_alive():
+            self._queue.put(None)
+            self._writer.join(timeout)
+        if self._keepalive is not None:
+            self._keepalive.close()
+            self._keepalive = None
+
+    def _writer_loop(self):
+        conn = self._connect()
+        conn.execute("PRAGMA synchronous=NORMAL")
+        try:
+            while True:
+                item = self._queue.get()
+                batch, markers, stop = [], [], False
+                deadline = time.monotonic() + self.flush_interval
+                while True:
+                    if item is None:
+                        stop = True
+                    elif isinstance(item, threading.Event):
+                        markers.append(item)
+                    else:
+                        batch.append(item)
+                    if stop or markers or len(batch) >= self.batch_size:
+                        break
+                    try:
+                        item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                    except queue.Empty:
+                        break
+                if batch:
+                    self._write_batch(conn, batch)
+                for marker in markers:
+                    marker.set()
+                if stop:
+                    return
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _write_batch(conn: sqlite3.Connection, batch: List[FlashRecord]):
+        columns = [f.name for f in fields(FlashRecord)]
+        rows = []
+        for record in batch:
+            values = [getattr(record, name) for name in columns]
+            values[columns.index("phases")] = json.dumps(record.phases)
+            values[columns.index("success")] = int(record.success)
+            rows.append(values)
+        try:
+            with conn:
+                conn.executemany(
+                    f"INSERT INTO sessions ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})", rows
+                )
+        except sqlite3.Error as e:
+            logger.warning("Yükleme geçmişi yazılamadı (%d kayıt): %s", len(batch), e)
+
+    # ------------------------------------------------------------------
+    # Sorgular
+    # ------------------------------------------------------------------
+    def _query(self, sql: str, params: Sequence = ()) -> List[sqlite3.Row]:
+        self.flush()
+        conn = self._connect()
+        try:
+            conn.row_factory = sqlite3.Row
+            return conn.execute(sql, params).fetchall()
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _filters(operation: Optional[str], port: Optional[str], since: Optional[float]):
+        clauses, params = [], []
+        if operation:
+            clauses.append("operation = ?")
+            params.append(operation)
+        if port:
+            clauses.append("port = ?")
+            params.append(port)
+        if since is not None:
+            clauses.append("started_at >= ?")
+            params.append(since)
+        return clauses, params
+
+    def recent(self, limit: int = 20, operation: Optional[str] = None, port: Optional[str] = None,
+               since: Optional[float] = None) -> List[FlashRecord]:
+        """En yeni kayıtlar (yeniden eskiye)"""
+        clauses, params = self._filters(operation, port, since)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self._query(f"SELECT * FROM sessions {where} ORDER BY started_at DESC, id DESC LIMIT ?",
+                           (*params, limit))
+        records = []
+        for row in rows:
+            values = {f.name: row[f.name] for f in fields(FlashRecord)}
+            values["success"] = bool(values["success"])
+            values["phases"] = json.loads(values["phases"] or "{}")
+            records.append(FlashRecord(**values))
+        return records
+
+    def percentiles(self, group_by: str = "port", operation: str = "flash", metric: str = "throughput",
+                    port: Optional[str] = None, since: Optional[float] = None,
+                    fractions: Sequence[float] = (0.5, 0.9, 0.99)) -> List[dict]:
+        """
+        Gruba göre yüzdelikler (yalnızca başarılı oturumlar)
+
+        Args:
+            group_by: "port", "adapter", "day", "version" veya "image"
+            operation: "flash", "erase" veya "bundle"
+            metric: "throughput" (byte/saniye) veya "duration" (saniye; silme için anlamlı olan)
+            fractions: Hesaplanacak yüzdelikler (0-1)
+        Returns:
+            Her grup için {"key", "sessions", "failures", "p50", "p90", ...} sözlükleri
+        """
+        if group_by not in GROUP_COLUMNS:
+            raise ValueError(f"Geçersiz gruplama: {group_by} ({', '.join(GROUP_COLUMNS)})")
+        if metric not in ("throughput", "duration"):
+            raise ValueError(f"Geçersiz ölçü: {metric} (throughput, duration)")
+        clauses, params = self._filters(operation, port, since)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self._query(
+            f"SELECT {GROUP_COLUMNS[group_by]} AS key, success, bytes, duration FROM sessions {where} "
+            f"ORDER BY key", params
+        )
+
+        groups: Dict[str, dict] = {}
+        for row in rows:
+            group = groups.setdefault(row["key"], {"key": row["key"], "sessions": 0, "failures": 0, "values": []})
+            group["sessions"] += 1
+            if not row["success"]:
+                group["failures"] += 1
+            elif metric == "duration":
+                group["values"].append(row["duration"])
+            elif row["duration"] > 0:
+                group["values"].append(row["bytes"] / row["duration"])
+
+        result = []
+        for group in groups.values():
+            values = sorted(group.pop("values"))
+            for fraction in fractions:
+                group[f"p{fraction * 100:g}"] = percentile(values, fraction)
+            result.append(group)
+        return result
+
+_default_history: Optional[FlashHistory] = None
+_default_lock = threading.Lock()
+
+def default_flash_history() -> FlashHistory:
+    """Süreç genelinde paylaşılan geçmiş deposu (ilk kullanımda oluşturulur)"""
+    global _default_history
+    with _default_lock:
+        if _default_history is None:
+            _default_history = FlashHistory()
+            atexit.register(_default_history.close)
+        return _default_history
@@ -0,0 +1,32 @@
+from typing import List
+
+# STM32F4 (F405/F407/F415/F417 vb.) tek bank flash yerleşimi
+FLASH_BASE = 0x08000000
+STM32F4_SECTOR_SIZES: List[int] = [16 * 1024] * 4 + [64 * 1024] + [128 * 1024] * 7
+
+# Referans kılavuzundaki en kötü durum sektör silme süreleri (x32 paralellik, saniye)
+MAX_ERASE_TIME_BY_SIZE = {
+    16 * 1024: 0.5,
+    64 * 1024: 1.1,
+    128 * 1024: 2.0,
+}
+
+def sector_size(sector: int, sector_sizes: List[int] = STM32F4_SECTOR_SIZES) -> int:
+    """Sektörün byte cinsinden boyutu"""
+    if sector < 0 or sector >= len(sector_sizes):
+        raise ValueError(f"Geçersiz sektör: {sector} (0-{len(sector_sizes) - 1})")
+    return sector_sizes[sector]
+
+def sector_address(sector: int, sector_sizes: List[int] = STM32F4_SECTOR_SIZES,
+                   base: int = FLASH_BASE) -> int:
+    """Sektörün başlangıç adresi"""
+    sector_size(sector, sector_sizes)
+    return base + sum(sector_sizes[:sector])
+
+def max_erase_time(sector: int, sector_sizes: List[int] = STM32F4_SECTOR_SIZES) -> float:
+    """Sektör için kılavuzdaki en kötü durum silme süresi (bilinmiyorsa 128 KB değeri)"""
+    try:
+        size = sector_size(sector, sector_sizes)
+    except ValueError:
+        return MAX_ERASE_TIME_BY_SIZE[128 * 1024]
+    return MAX_ERASE_TIME_BY_SIZE.get(size, MAX_ERASE_TIME_BY_SIZE[128 * 1024])
@@ -0,0 +1,191 @@
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Iterator, Optional, Tuple
+from .stm32_protocol import STM32Protocol
+
+logger = logging.getLogger(__name__)
+
+# Paket formatı değişirse (boyut / payload) önbellek anahtarları da değişir
+FRAME_FORMAT = f"stm32-{STM32Protocol.PACKET_SIZE}b-{STM32Protocol.DATA_PAYLOAD_SIZE}p-v1"
+
+CacheKey = Tuple[str, str, str]
+
+# Disk kaydı başlığı: görüntü boyu (8 byte) + paket akışının SHA-256'sı (32 byte)
+SPILL_HEADER_SIZE = 8 + 32
+
+@dataclass
+class EncodedImage:
+    """Paketlenmiş firmware: art arda eklenmiş DATA paketleri"""
+    sha256: str
+    frame_format: str
+    sector_plan: str
+    image_size: int
+    data_stream: bytes
+
+    @property
+    def key(self) -> CacheKey:
+        return (self.sha256, self.frame_format, self.sector_plan)
+
+    @property
+    def packet_count(self) -> int:
+        return len(self.data_stream) // STM32Protocol.PACKET_SIZE
+
+    @staticmethod
+    def stream_size(image_size: int) -> int:
+        """image_size byte'lık görüntünün paket akışı uzunluğu"""
+        packets = -(-image_size // STM32Protocol.DATA_PAYLOAD_SIZE)
+        return packets * STM32Protocol.PACKET_SIZE
+
+    def packet(self, index: int) -> bytes:
+        size = STM32Protocol.PACKET_SIZE
+        return self.data_stream[index * size:(index + 1) * size]
+
+    def packets(self) -> Iterator[bytes]:
+        for index in range(self.packet_count):
+            yield self.packet(index)
+
+class FrameCache:
+    """
+    Paketlenmiş firmware görüntüleri için boyut sınırlı LRU önbellek
+
+    Anahtar: (görüntünün SHA-256'sı, paket formatı, sektör planı). Aynı
+    build onlarca karta yüklenirken paketleme ve CRC hesaplaması yalnızca
+    ilk kartta yapılır. Bellek sınırı aşılınca en eski kayıt atılır; spill_dir
+    verilmişse atılan kayıt diske yazılır ve sonraki isteklerde oradan okunur.
+    Diskteki kaydın uzunluğu ve özeti tutmazsa (yarım yazım, bozulma) dosya
+    silinir ve görüntü yeniden paketlenir.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, spill_dir: Optional[str] = None):
+        """
+        Args:
+            max_bytes: Bellekte tutulacak en fazla paket verisi (byte)
+            spill_dir: Atılan kayıtların yazılacağı dizin (None: diske yazma)
+        """
+        self.max_bytes = max_bytes
+        self.spill_dir = spill_dir
+        self.hits = 0
+        self.misses = 0
+        self.spill_hits = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[CacheKey, EncodedImage]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        if spill_dir:
+            os.makedirs(spill_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(firmware_data: bytes, sector_plan, frame_format: str = FRAME_FORMAT) -> CacheKey:
+        return (hashlib.sha256(firmware_data).hexdigest(), frame_format, str(sector_plan))
+
+    def _spill_path(self, key: CacheKey) -> str:
+        sha256, frame_format, sector_plan = key
+        safe_plan = "".join(c if c.isalnum() else "_" for c in sector_plan)
+        return os.path.join(self.spill_dir, f"{sha256}_{frame_format}_{safe_plan}.frames")
+
+    def _insert(self, image: EncodedImage):
+        """Kilit tutulurken çağrılır"""
+        if image.key in self._entries:
+            return
+        self._entries[image.key] = image
+        self._size += len(image.data_stream)
+
+        while self._size > self.max_bytes and len(self._entries) > 1:
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= len(evicted.data_stream)
+            self.evictions += 1
+            self._spill(evicted)
+
+    def _spill(self, image: EncodedImage):
+        if not self.spill_dir:
+            return
+        path = self._spill_path(image.key)
+        if os.path.exists(path):
+            return
+        try:
+            with open(path + ".tmp", "wb") as f:
+                f.write(image.image_size.to_bytes(8, "little"))
+                f.write(hashlib.sha256(image.data_stream).digest())
+                f.write(image.data_stream)
+            os.replace(path + ".tmp", path)
+        except OSError as e:
+            logger.warning("Paket önbelleği diske yazılamadı: %s", e)
+
+    def _load_spilled(self, key: CacheKey) -> Optional[EncodedImage]:
+        if not self.spill_dir:
+            return None
+        path = self._spill_path(key)
+        try:
+            with open(path, "rb") as f:
+                header = f.read(SPILL_HEADER_SIZE)
+                data_stream = f.read()
+        except OSError:
+            return None
+        image_size = int.from_bytes(header[:8], "little")
+        if (len(header) != SPILL_HEADER_SIZE
+                or len(data_stream) != EncodedImage.stream_size(image_size)
+                or hashlib.sha256(data_stream).digest() != header[8:]):
+            logger.warning("Bozuk paket önbelleği kaydı silindi: %s", os.path.basename(path))
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+        return EncodedImage(key[0], key[1], key[2], image_size, data_stream)
+
+    def get_or_encode(self, firmware_data: bytes, sector_plan) -> EncodedImage:
+        """
+        Görüntünün paketlenmiş halini döner; önbellekte yoksa paketler ve ekler
+
+        Args:
+            firmware_data: Firmware binary data
+            sector_plan: Hedef sektör(ler); ör. 5 veya "4,5"
+        """
+        key = self.make_key(firmware_data, sector_plan)
+
+        with self._lock:
+            image = self._entries.get(key)
+            if image is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return image
+
+        image = self._load_spilled(key)
+        if image is not None:
+            with self._lock:
+                self.spill_hits += 1
+                self._insert(image)
+            return image
+
+        # Paketleme kilit dışında: diğer portların thread'leri beklemez
+        data_stream = STM32Protocol.encode_data_stream(firmware_data)
+        image = EncodedImage(key[0], key[1], key[2], len(firmware_data), data_stream)
+        with self._lock:
+            self.misses += 1
+            self._insert(image)
+        return image
+
+    def clear(self):
+        """Bellekteki tüm kayıtları siler (disk kayıtları kalır)"""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self) -> Dict[str, int]:
+        """İsabet/ıskalama sayaçları ve doluluk"""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "spill_hits": self.spill_hits,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._size,
+            }
+
+# Aynı süreçteki tüm portların paylaştığı önbellek
+default_frame_cache = FrameCache()
@@ -1,14 +1,49 @@
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, scrolledtext
-import threading
+import datetime
+import logging
 import os
-from typing import Optional
+import threading
+import time
+from typing import Callable, Dict, Optional
 from .uart_comm import UARTCommunication
+from .serial_session import SerialSession
+from .port_watcher import PortWatcher, PortFilter, PortInfo
+from .cancellation import CancelToken, CANCELLED_MESSAGE
+from .image_preprocess import preprocess_image
+from .flash_bundle import load_manifest
+from .flash_history import FlashHistory, default_flash_history
+from .sector_timing import SectorTimingTable
+from .transfer_planner import TransferPlan, estimate_link, plan_transfer
+from .transport import create_transport
+from .device_executor import DeviceExecutor, FuturePoller, FrameMonitor
+from .flash_daemon import FlashDaemonClient
+from .session_log import SessionLog
+
+logger = logging.getLogger(__name__)
+
+# Ana döngünün bir olayı işlemesi için izin verilen en uzun süre (milisaniye)
+UI_FRAME_BUDGET_MS = 50
+
+# Süre tahmini: son değişiklikten sonra bekleme (milisaniye) ve saklanan en fazla plan
+PLAN_DEBOUNCE_MS = 300
+PLAN_CACHE_SIZE = 16
+
+# Bağlanırken yükleme servisinin çalışıp çalışmadığını sorma süresi (saniye)
+DAEMON_PROBE_TIMEOUT = 1.0
+
+# Log alanında tutulan en fazla satır (eskiler silinir; tam kayıt diskteki oturum logunda)
+LOG_WIDGET_MAX_LINES = 2000
 
 class STM32BootloaderGUI:
     """STM32 Bootloader GUI ana sınıfı"""
     
-    def __init__(self):
+    def __init__(self, data_dir: Optional[str] = None):
+        """
+        Args:
+            data_dir: Loglar, yükleme geçmişi ve zamanlama tablosu için dizin
+                (None: kullanıcı veri dizini)
+        """
         self.root = tk.Tk()
         self.root.title("STM32 Bootloader GUI")
         self.root.geometry("900x700")
@@ -23,13 +58,56 @@ class STM32BootloaderGUI:
             pass
         
         # UART iletişim nesnesi
+        self.session: Optional[SerialSession] = None
         self.uart_comm: Optional[UARTCommunication] = None
         self.firmware_data: Optional[bytes] = None
         self.firmware_path: str = ""
+        self.active_cancel_token: Optional[CancelToken] = None  # Süren silme/yazma işleminin iptal bayrağı
+        
+        # Yükleme servisi çalışıyorsa GUI portu açmaz: yükleme / silme işleri servise
+        # gönderilir (ince istemci). Servis yoksa port, servisle paylaşılan port
+        # kilidi alınarak yerel olarak açılır.
+        self.use_daemon = True
+        self.daemon_client: Optional[FlashDaemonClient] = None
+        self.daemon_port: Optional[str] = None
+        self.daemon_baudrate = 0
+        
+        # Kalıcı veriler: tüm bağlantılar aynı geçmiş deposunu ve zamanlama tablosunu paylaşır
+        self.data_dir = data_dir
+        self.log_dir = os.path.join(data_dir, "logs", "sessions") if data_dir else None
+        self.history: Optional[FlashHistory] = \
+            FlashHistory(os.path.join(data_dir, "flash_history.sqlite3")) if data_dir else None
+        self.timing_table = SectorTimingTable(os.path.join(data_dir, "sector_timing.json") if data_dir else None)
+        if self.log_dir:
+            os.makedirs(self.log_dir, exist_ok=True)
+        
+        # Disk logları: bağlantı başına bir dosya, bağlantı yokken uygulama logu
+        self.app_log = SessionLog("gui", directory=self.log_dir)
+        self.session_log: Optional[SessionLog] = None
+        
+        # Tüm cihaz işlemleri bağlantıya ait tek işçili yürütücüde sırayla çalışır;
+        # sonuçlar Future olarak döner ve after() ile GUI thread'inde alınır
+        self.executor: Optional[DeviceExecutor] = None
+        self.poller = FuturePoller(self.root)
+        # Bağlantı yokken süre tahmini ayrı bir işçide hesaplanır (bkz. update_transfer_estimate)
+        self.plan_executor = DeviceExecutor("plan")
+        self._plan_cache: Dict[tuple, TransferPlan] = {}
+        self._plan_after: Optional[str] = None
+        self._plan_log_table = False
+        self.frame_monitor = FrameMonitor(self.root, budget_ms=UI_FRAME_BUDGET_MS, on_stall=self._on_ui_stall)
+        self._last_stall_log = 0.0
+        
+        # Arka planda port izleyici (sadece filtreye uyan fikstür adaptörleri)
+        self.port_watcher = PortWatcher(
+            PortFilter.load(os.path.join(data_dir, "port_filter.json") if data_dir else None),
+            on_added=lambda info: self.root.after(0, lambda: self._on_port_added(info)),
+            on_removed=lambda info: self.root.after(0, lambda: self._on_port_removed(info)),
+        )
         
         # GUI bileşenlerini oluştur
         self.create_widgets()
-        self.refresh_ports()
+        self.port_watcher.start()
+        self.frame_monitor.start()
         
         # Uygulama kapatılırken temizlik yap
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
@@ -161,7 +239,8 @@ class STM32BootloaderGUI:
         # COM Port seçimi
         ttk.Label(connection_group, text="🔌 COM Port:", style='Header.TLabel').grid(row=0, column=0, sticky=tk.W, padx=(0, 10), pady=(0, 5))
         self.port_var = tk.StringVar()
-        self.port_combo = ttk.Combobox(connection_group, textvariable=self.port_var, state="readonly", style='Modern.TCombobox', width=15)
+        # Düzenlenebilir: ağ üzerinden portlar için tcp://host:port, rfc2217://host:port yazılabilir
+        self.port_combo = ttk.Combobox(connection_group, textvariable=self.port_var, style='Modern.TCombobox', width=15)
         self.port_combo.grid(row=0, column=1, sticky=(tk.W, tk.E), padx=(0, 10), pady=(0, 5))
         
         # Yenile butonu
@@ -197,9 +276,24 @@ class STM32BootloaderGUI:
         self.connect_btn = ttk.Button(connection_group, text="🔗 Bağlan", command=self.toggle_connection, style='Connect.TButton')
         self.connect_btn.grid(row=1, column=2, padx=(5, 0), pady=(5, 5))
         
+        # Otomatik baud rate butonu
+        self.auto_baud_btn = ttk.Button(connection_group, text="🔍 Oto Baud", command=self.auto_baud_thread, style='Modern.TButton')
+        self.auto_baud_btn.grid(row=1, column=3, padx=(5, 0), pady=(5, 5))
+        self.auto_baud_btn.config(state="disabled")
+        
+        # Takılan kartı otomatik bağla ve firmware'i yükle
+        self.auto_connect_var = tk.BooleanVar(value=False)
+        self.auto_connect_check = ttk.Checkbutton(connection_group, text="⚡ Oto Bağlan/Yükle", variable=self.auto_connect_var)
+        self.auto_connect_check.grid(row=0, column=3, padx=(5, 0), pady=(0, 5))
+        
+        # Linux düşük gecikme modu (ASYNC_LOW_LATENCY, FTDI latency_timer)
+        self.low_latency_var = tk.BooleanVar(value=False)
+        self.low_latency_check = ttk.Checkbutton(connection_group, text="🐧 Düşük Gecikme", variable=self.low_latency_var)
+        self.low_latency_check.grid(row=3, column=0, columnspan=4, sticky=tk.W, pady=(5, 0))
+        
         # Bağlantı durumu
         status_frame = ttk.Frame(connection_group)
-        status_frame.grid(row=2, column=0, columnspan=3, pady=(10, 0))
+        status_frame.grid(row=2, column=0, columnspan=4, pady=(10, 0))
         
         # ----------------------------
         # 🧹 Sektör Silme Grubu
@@ -217,9 +311,19 @@ class STM32BootloaderGUI:
         self.erase_btn.grid(row=0, column=2, padx=(5,0))
         self.erase_btn.config(state="disabled")
 
+        # Sektör aralığı silme (başlangıç: yukarıdaki sektör)
+        ttk.Label(erase_group, text="🏁 Bitiş Sektörü:", style='Header.TLabel').grid(row=1, column=0, sticky=tk.W, padx=(0, 10), pady=(10, 0))
+        self.erase_end_sector_var = tk.StringVar(value="11")
+        self.erase_end_sector_spinbox = ttk.Spinbox(erase_group, from_=0, to=255, textvariable=self.erase_end_sector_var, width=12, style='Modern.TEntry')
+        self.erase_end_sector_spinbox.grid(row=1, column=1, sticky=tk.W, padx=(0,10), pady=(10, 0))
+        
+        self.erase_range_btn = ttk.Button(erase_group, text="🧨 Aralığı Sil", command=self.erase_range_thread, style='Send.TButton')
+        self.erase_range_btn.grid(row=1, column=2, padx=(5,0), pady=(10, 0))
+        self.erase_range_btn.config(state="disabled")
+
         # Silme durum metni
         self.erase_status = ttk.Label(erase_group, text="", font=('Microsoft YaHei UI', 8), foreground="#7f8c8d")
-        self.erase_status.grid(row=1, column=0, columnspan=3, sticky=tk.W, pady=(5,0))
+        self.erase_status.grid(row=2, column=0, columnspan=3, sticky=tk.W, pady=(5,0))
         
         ttk.Label(status_frame, text="📊 Durum:", style='Header.TLabel').pack(side=tk.LEFT, padx=(0, 5))
         self.connection_status = ttk.Label(status_frame, text="❌ Bağlantı yok", foreground="#e74c3c", font=('Microsoft YaHei UI', 8, 'bold'))
@@ -245,6 +349,10 @@ class STM32BootloaderGUI:
         self.sector_spinbox = ttk.Spinbox(firmware_group, from_=0, to=255, textvariable=self.sector_var, width=12, style='Modern.TEntry')
         self.sector_spinbox.grid(row=1, column=1, sticky=tk.W, padx=(0, 10), pady=(5, 5))
         
+        # Ön işleme: sondaki 0xFF'leri at, 16 byte'a hizala, vektör tablosunu ve boyutu doğrula
+        self.preprocess_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(firmware_group, text="✂️ Ön İşleme", variable=self.preprocess_var).grid(row=1, column=2, sticky=tk.W, pady=(5, 5))
+        
         # Firmware bilgisi
         info_frame = ttk.Frame(firmware_group)
         info_frame.grid(row=2, column=0, columnspan=3, pady=(10, 0))
@@ -253,6 +361,11 @@ class STM32BootloaderGUI:
         self.firmware_info = ttk.Label(info_frame, text="Firmware yüklenmedi", foreground="#7f8c8d", font=('Microsoft YaHei UI', 8))
         self.firmware_info.pack(side=tk.LEFT)
         
+        # Seçili görüntünün tahmini yükleme süresi (bkz. update_transfer_estimate)
+        self.plan_info = ttk.Label(info_frame, text="", foreground="#7f8c8d", font=('Microsoft YaHei UI', 8))
+        self.plan_info.pack(side=tk.LEFT, padx=(10, 0))
+        self.sector_var.trace_add("write", lambda *_: self.update_transfer_estimate())
+        
         # İlerleme alanı (Firmware grubunda)
         progress_header = ttk.Label(firmware_group, text="📊 İlerleme Durumu", style='Header.TLabel')
         progress_header.grid(row=3, column=0, columnspan=3, pady=(10, 5), sticky=tk.W)
@@ -266,11 +379,28 @@ class STM32BootloaderGUI:
         self.progress_text = ttk.Label(firmware_group, text="⏳ Hazır", font=('Microsoft YaHei UI', 8), foreground="#7f8c8d")
         self.progress_text.grid(row=5, column=0, columnspan=3, pady=(0, 10), sticky=tk.W)
 
-        # Gönder butonu
-        self.send_btn = ttk.Button(firmware_group, text="🚀 Firmware Gönder", command=self.send_firmware_thread, style='Send.TButton')
-        self.send_btn.grid(row=6, column=0, columnspan=3, pady=(5, 0))
+        # Gönder / İptal butonları
+        action_frame = ttk.Frame(firmware_group)
+        action_frame.grid(row=6, column=0, columnspan=3, pady=(5, 0))
+        
+        self.send_btn = ttk.Button(action_frame, text="🚀 Firmware Gönder", command=self.send_firmware_thread, style='Send.TButton')
+        self.send_btn.pack(side=tk.LEFT)
         self.send_btn.config(state="disabled")
         
+        # Paket tanımındaki görüntüleri (konfigürasyon + uygulama + kalibrasyon) tek oturumda yükler
+        self.bundle_btn = ttk.Button(action_frame, text="📦 Paket Yükle", command=self.flash_bundle_thread, style='Send.TButton')
+        self.bundle_btn.pack(side=tk.LEFT, padx=(10, 0))
+        self.bundle_btn.config(state="disabled")
+        
+        # Süren yükleme / silme işlemini durdurur
+        self.cancel_btn = ttk.Button(action_frame, text="⛔ İptal", command=self.cancel_operation, style='Send.TButton')
+        self.cancel_btn.pack(side=tk.LEFT, padx=(10, 0))
+        self.cancel_btn.config(state="disabled")
+        
+        # Yükleme oturumunu örnekleyici profil ile çalıştır (tüm thread'ler, flame graph çıktısı)
+        self.profile_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(action_frame, text="🔬 Profil", variable=self.profile_var).pack(side=tk.LEFT, padx=(10, 0))
+        
         # Log alanı
         log_group = ttk.LabelFrame(main_frame, text="📜 Sistem Günlüğü", padding="15", style='Modern.TLabelframe')
         log_group.grid(row=4, column=0, columnspan=2, sticky=(tk.W, tk.E, tk.N, tk.S), pady=(0, 0))
@@ -302,15 +432,16 @@ class STM32BootloaderGUI:
     
     def log_message(self, message: str, level: str = "INFO"):
         """Log alanına mesaj ekler"""
-        timestamp = tk.StringVar()
-        import datetime
-        timestamp.set(datetime.datetime.now().strftime("%H:%M:%S"))
+        timestamp = datetime.datetime.now().strftime("%H:%M:%S")
         
-        log_entry = f"[{timestamp.get()}] {level}: {message}\n"
+        log_entry = f"[{timestamp}] {level}: {message}\n"
         
         # Debug: Konsola da yazdır
         print(f"LOG [{level}]: {message}")
         
+        # Disk loguna yaz (arka plan thread'inde; clear_log diskteki kaydı silmez)
+        (self.session_log or self.app_log).write(message, level)
+        
         # GUI thread'inden çalıştır
         self.root.after(0, lambda: self._append_log(log_entry, level))
     
@@ -327,6 +458,15 @@ class STM32BootloaderGUI:
             start_line = float(self.log_text.index(tk.END)) - 1.0
             self.log_text.tag_add("success", f"{start_line:.1f}", tk.END)
             self.log_text.tag_config("success", foreground="green")
+        elif level == "WARNING":
+            start_line = float(self.log_text.index(tk.END)) - 1.0
+            self.log_text.tag_add("warning", f"{start_line:.1f}", tk.END)
+            self.log_text.tag_config("warning", foreground="#f39c12")
+        
+        # Vardiya boyu açık kalan istasyonda alan sınırsız büyümesin
+        lines = int(self.log_text.index("end-1c").split(".")[0])
+        if lines > LOG_WIDGET_MAX_LINES:
+            self.log_text.delete("1.0", f"{lines - LOG_WIDGET_MAX_LINES + 1}.0")
         
         self.log_text.see(tk.END)
     
@@ -335,38 +475,77 @@ class STM32BootloaderGUI:
         self.log_text.delete(1.0, tk.END)
     
     def refresh_ports(self):
-        """Kullanılabilir COM portlarını yeniler"""
-        # Geçici UART nesnesi oluştur
-        temp_uart = UARTCommunication("dummy")
-        ports = temp_uart.get_available_ports()
-        
+        """Port listesini önbellekten günceller ve arka planda yeniden tarama ister"""
+        self.port_watcher.rescan()
+        self.update_port_list()
+    
+    def update_port_list(self):
+        """Combobox'u izleyicinin önbelleğindeki portlarla günceller (bloklamaz)"""
+        ports = [info.device for info in self.port_watcher.ports]
         self.port_combo['values'] = ports
+        
+        # Seçili port hâlâ varsa (veya bağlıysa / elle ağ adresi yazıldıysa) seçimi koru
+        selected = self.port_var.get()
+        if selected in ports or "://" in selected or self._is_connected():
+            return
         if ports:
             self.port_combo.set(ports[0])
-            self.log_message(f"{len(ports)} COM port bulundu")
         else:
-            self.log_message("Hiç COM port bulunamadı", "ERROR")
-        
-        # Eğer bağlıysa bağlantıyı kes
-        if self.uart_comm and self.uart_comm.is_connected:
-            self.uart_comm.disconnect()
-            self.uart_comm = None
-            self.connect_btn.config(text="🔗 Bağlan")
-            self.connection_status.config(text="❌ Bağlantı yok", foreground="#e74c3c")
-            self.send_btn.config(state="disabled")
-            self.erase_btn.config(state="disabled")
-            self.log_message("Port yenilendi, bağlantı kapatıldı")
+            self.port_combo.set("")
+    
+    def _on_port_added(self, info: PortInfo):
+        """Yeni port takıldığında GUI thread'inde çalışır"""
+        self.log_message(f"Port takıldı: {info}")
+        self.update_port_list()
+        
+        # Oto bağlan: boştaysak yeni kartı hemen bağla (bağlanınca yükleme başlar)
+        if self.auto_connect_var.get() and not self._is_connected():
+            self.port_combo.set(info.device)
+            self.toggle_connection()
+    
+    def _on_port_removed(self, info: PortInfo):
+        """Port çıkarıldığında GUI thread'inde çalışır"""
+        self.log_message(f"Port çıkarıldı: {info}")
+        self.update_port_list()
+        
+        if self.session and self.session.port == info.device:
+            if self.auto_connect_var.get():
+                # Kart değişimi: sonraki kart takılınca yeniden bağlanılacak
+                self.close_session()
+                self.log_message("Bağlı kart çıkarıldı, sonraki kart bekleniyor")
+            else:
+                # Oturum, bir sonraki işlemde adaptörü seri numarasıyla yeniden bulur
+                self.connection_status.config(text=f"⚠️ Port çıkarıldı: {info.device}", foreground="#f39c12")
+    
+    def _is_connected(self) -> bool:
+        """Yerel oturum açık ya da işler yükleme servisine gönderiliyor"""
+        return self.daemon_client is not None or bool(self.session and self.session.is_connected)
+    
+    def close_session(self):
+        """Kalıcı oturumu kapatır ve UI'yi bağlantısız duruma getirir (port arka planda kapanır)"""
+        if self.active_cancel_token:
+            # Servis modunda süren iş serviste de iptal edilir
+            self.active_cancel_token.cancel()
+        if self.executor:
+            # Sıradaki işlemler iptal edilir; port, süren işlem bittikten sonra aynı thread'de kapanır
+            self.executor.close(self.session.close if self.session else None)
+        if self.session_log:
+            self.session_log.close()
+        self.session_log = None
+        self.executor = None
+        self.session = None
+        self.uart_comm = None
+        self.daemon_client = None
+        self.daemon_port = None
+        self.connect_btn.config(text="🔗 Bağlan")
+        self.connection_status.config(text="❌ Bağlantı yok", foreground="#e74c3c")
+        self.update_action_buttons()
     
     def toggle_connection(self):
         """UART bağlantısını açar/kapatır"""
-        if self.uart_comm and self.uart_comm.is_connected:
+        if self._is_connected():
             # Bağlantıyı kes
-            self.uart_comm.disconnect()
-            self.uart_comm = None
-            self.connect_btn.config(text="🔗 Bağlan")
-            self.connection_status.config(text="❌ Bağlantı yok", foreground="#e74c3c")
-            self.send_btn.config(state="disabled")
-            self.erase_btn.config(state="disabled")
+            self.close_session()
             self.log_message("UART bağlantısı kapatıldı")
         else:
             # Bağlan
@@ -381,15 +560,65 @@ class STM32BootloaderGUI:
                 messagebox.showerror("Hata", "Geçersiz baud rate")
                 return
             
-            self.uart_comm = UARTCommunication(port, baudrate)
-            if self.uart_comm.connect():
-                self.connect_btn.config(text="🔌 Bağlantıyı Kes")
-                self.connection_status.config(text=f"✅ Bağlı: {port} @ {baudrate}", foreground="#27ae60")
-                self.update_action_buttons()
-                self.log_message(f"UART bağlantısı kuruldu: {port} @ {baudrate}", "SUCCESS")
-            else:
-                self.uart_comm = None
-                messagebox.showerror("Hata", f"UART bağlantısı kurulamadı: {port}")
+            # Servis sorgusu ve port açma bağlantının yürütücüsünde çalışır, Tk thread'i beklemez
+            self.connect_btn.config(state="disabled")
+            session = SerialSession(port, baudrate, low_latency=self.low_latency_var.get(), owner="GUI")
+            session.uart.timing_table = self.timing_table
+            session.uart.history = self.history
+            executor = DeviceExecutor(port)
+            use_daemon = self.use_daemon
+            
+            def connect() -> Optional[FlashDaemonClient]:
+                """Servis çalışıyorsa istemcisini döner; yoksa port kilidini alıp portu açar"""
+                if use_daemon:
+                    client = FlashDaemonClient(timeout=DAEMON_PROBE_TIMEOUT)
+                    if client.available():
+                        client.timeout = 10.0
+                        return client
+                if not session.open():
+                    raise ConnectionError(f"UART bağlantısı kurulamadı: {port}")
+                return None
+            
+            future = executor.submit(connect)
+            self.poller.watch(future, lambda f: self._on_connect_done(session, executor, f))
+    
+    def _on_connect_done(self, session: SerialSession, executor: DeviceExecutor, future):
+        """Bağlantı denemesi bittiğinde GUI thread'inde çalışır"""
+        self.connect_btn.config(state="normal")
+        port, baudrate = session.port, session.baudrate
+        error = CANCELLED_MESSAGE if future.cancelled() else future.exception()
+        if error is None and future.result() is not None:
+            # Servis portu yönetiyor: GUI yalnızca iş gönderir
+            self.daemon_client = future.result()
+            self.daemon_port = port
+            self.daemon_baudrate = baudrate
+            self.executor = executor
+            self.connect_btn.config(text="🔌 Bağlantıyı Kes")
+            self.connection_status.config(text=f"✅ Servis üzerinden: {port} @ {baudrate}", foreground="#27ae60")
+            self.update_action_buttons()
+            self.log_message(f"Yükleme servisi çalışıyor ({self.daemon_client.url}): "
+                             f"{port} işleri servise gönderilecek", "SUCCESS")
+            self.update_transfer_estimate()
+        elif error is None:
+            self.session = session
+            self.executor = executor
+            self.uart_comm = session.uart
+            self.session_log = SessionLog(f"gui_{port}", directory=self.log_dir)
+            self.connect_btn.config(text="🔌 Bağlantıyı Kes")
+            self.connection_status.config(text=f"✅ Bağlı: {port} @ {baudrate}", foreground="#27ae60")
+            self.update_action_buttons()
+            self.log_message(f"UART bağlantısı kuruldu: {port} @ {baudrate}", "SUCCESS")
+            if session.uart.tuning_report:
+                self.log_message(f"Düşük gecikme ayarları: {session.uart.tuning_report}")
+            self.update_transfer_estimate()
+            
+            # Oto yükleme: firmware seçiliyse kart takılır takılmaz gönder
+            if self.auto_connect_var.get() and self.firmware_data is not None:
+                self.send_firmware_thread()
+        else:
+            executor.close()
+            self.log_message(str(error), "ERROR")
+            messagebox.showerror("Hata", str(error))
     
     def browse_firmware(self):
         """Firmware dosyası seçer"""
@@ -417,103 +646,498 @@ class STM32BootloaderGUI:
                 self.update_action_buttons()
                 self.log_message(f"Firmware yüklendi: {os.path.basename(file_path)} ({len(self.firmware_data)} byte)")
                 
+                try:
+                    report = preprocess_image(self.firmware_data, int(self.sector_var.get()))
+                    self.log_message(f"Ön işleme (sektör {self.sector_var.get()}): {report.summary()}",
+                                     "INFO" if report.ok else "WARNING")
+                except ValueError:
+                    pass  # Sektör geçersizse gönderimde raporlanır
+                
+                self._plan_cache.clear()
+                self.update_transfer_estimate(log_table=True)
+                
             except Exception as e:
                 error_msg = f"Firmware dosyası okunamadı: {e}"
                 messagebox.showerror("Hata", error_msg)
                 self.log_message(f"Firmware okuma hatası: {str(e)}", "ERROR")
     
+    def _plan_key(self) -> Optional[tuple]:
+        """Tahmin önbelleği anahtarı: (görüntü, sektör, baud, ön işleme, bağlı port); seçim geçersizse None"""
+        if self.firmware_data is None:
+            return None
+        try:
+            sector = int(self.sector_var.get())
+            baudrate = int(self.baudrate_var.get())
+        except ValueError:
+            return None
+        port = (self.daemon_port or self.session.port) if self._is_connected() else None
+        return self.firmware_data, sector, baudrate, self.preprocess_var.get(), port
+    
+    def update_transfer_estimate(self, log_table: bool = False):
+        """
+        Seçili görüntünün tahmini yükleme süresini firmware bilgisinin yanında gösterir
+        
+        Hesaplama (ön işleme, geçmiş sorgusu, sıkıştırma) Tk thread'inde
+        yapılmaz: art arda değişiklikler PLAN_DEBOUNCE_MS kadar birleştirilir,
+        sonuç (görüntü, sektör, baud) başına saklanır. Bağlıyken tahmin
+        bağlantının yürütücüsünde, yani süren bir işlemden sonra hesaplanır.
+        
+        Args:
+            log_table: Sonuç geldiğinde mod tablosunu log alanına da yaz
+        """
+        self._plan_log_table = self._plan_log_table or log_table
+        if self._plan_after is not None:
+            self.root.after_cancel(self._plan_after)
+        self._plan_after = self.root.after(PLAN_DEBOUNCE_MS, self._start_transfer_estimate)
+    
+    def _start_transfer_estimate(self):
+        """Debounce sonrası GUI thread'inde: önbellekte yoksa tahmini arka planda hesaplatır"""
+        self._plan_after = None
+        key = self._plan_key()
+        if key is None:
+            return
+        if key in self._plan_cache:
+            self._show_transfer_estimate(self._plan_cache[key])
+            return
+        image, sector, baudrate, preprocess, port = key
+        session = self.session if port else None
+        history, timing_table = self.history, self.timing_table
+        guard_port = self.port_var.get()
+        
+        def compute() -> TransferPlan:
+            data = image
+            if preprocess:
+                report = preprocess_image(data, sector)
+                if report.ok:
+                    data = report.image
+            if session:
+                # Bu bağlantıda ölçülen gidiş-dönüş de kullanılır
+                with session.operation() as uart:
+                    return uart.plan_transfer(data, sector)
+            link = estimate_link(baudrate, create_transport(guard_port).defaults.guard_time, sector,
+                                 history or default_flash_history(), guard_port or None, timing_table=timing_table)
+            return plan_transfer(data, link)
+        
+        executor = self.executor if session and self.executor and not self.executor.closed else self.plan_executor
+        self.poller.watch(executor.submit(compute), lambda future: self._on_transfer_estimate(key, future))
+        self.update_action_buttons()
+    
+    def _on_transfer_estimate(self, key: tuple, future):
+        """Tahmin bittiğinde GUI thread'inde çalışır"""
+        self.update_action_buttons()
+        if future.cancelled():
+            return
+        if future.exception() is not None:
+            logger.warning("Süre tahmini hesaplanamadı: %s", future.exception())
+            return
+        plan = future.result()
+        if len(self._plan_cache) >= PLAN_CACHE_SIZE:
+            self._plan_cache.pop(next(iter(self._plan_cache)))
+        self._plan_cache[key] = plan
+        if key == self._plan_key():
+            self._show_transfer_estimate(plan)
+    
+    def _show_transfer_estimate(self, plan: TransferPlan):
+        self.plan_info.config(text=f"⏱️ {plan.summary()}")
+        if self._plan_log_table:
+            self._plan_log_table = False
+            self.log_message(f"Aktarım planı ({plan.link}):")
+            for line in plan.table():
+                self.log_message(f"  {line}")
+    
+    def _on_ui_stall(self, delay_ms: float):
+        """Ana döngü kare bütçesini aştığında çağrılır (en fazla 5 saniyede bir loglanır)"""
+        now = time.time()
+        if now - self._last_stall_log >= 5.0:
+            self._last_stall_log = now
+            self.log_message(f"Arayüz {delay_ms:.0f} ms yanıt vermedi (bütçe {UI_FRAME_BUDGET_MS} ms)", "WARNING")
+    
+    def _run_device_operation(self, operation: Callable[[UARTCommunication], tuple],
+                              on_done: Callable[..., None]) -> bool:
+        """
+        Cihaz işlemini bağlantının yürütücüsüne gönderir
+        
+        operation(uart) işçi thread'inde oturum kilidi altında çalışır ve
+        (başarılı_mı, mesaj, ...) döner; on_done(*sonuç) GUI thread'inde çağrılır.
+        Butonların durumu işlem bitince yeniden hesaplanır.
+        """
+        if not self.executor or self.executor.closed or not self.session:
+            self.log_message("UART bağlantısı yok", "ERROR")
+            return False
+        session = self.session
+        
+        def job():
+            try:
+                with session.operation() as uart:
+                    return operation(uart)
+            except ConnectionError as e:
+                return False, str(e)
+        
+        self._watch_operation(self.executor.submit(job), on_done)
+        return True
+    
+    def _run_daemon_job(self, submit: Callable[[FlashDaemonClient], dict], on_done: Callable[..., None],
+                        token: CancelToken, on_event: Optional[Callable[[dict], None]] = None) -> bool:
+        """
+        İşi yükleme servisine gönderir ve olaylarını bağlantının yürütücüsünde izler
+        
+        submit(client) işi gönderip iş kaydını döner. İlerleme olayları
+        update_progress'e, diğer olaylar on_event'e (işçi thread'inde) iletilir;
+        iş bitince on_done(başarılı_mı, mesaj) GUI thread'inde çağrılır. token
+        iptal edilirse iş serviste de iptal edilir.
+        """
+        if not self.executor or self.executor.closed or not self.daemon_client:
+            self.log_message("Yükleme servisi bağlantısı yok", "ERROR")
+            return False
+        client = self.daemon_client
+        
+        def job():
+            try:
+                job_id = submit(client)["id"]
+            except (ConnectionError, ValueError, OSError) as e:
+                return False, f"Yükleme servisi işi kabul etmedi: {e}"
+            finished = threading.Event()
+            
+            def cancel_on_request():
+                # İptal bayrağı kalkarsa iş serviste iptal edilir; iş bitince thread kapanır
+                while not finished.is_set():
+                    if token.wait(0.1):
+                        try:
+                            client.cancel(job_id)
+                        except (ConnectionError, ValueError):
+                            pass
+                        return
+            
+            threading.Thread(target=cancel_on_request, name=f"cancel-{job_id}", daemon=True).start()
+            message = ""
+            try:
+                for event in client.events(job_id=job_id):
+                    if event["type"] == "progress":
+                        self.update_progress(event["current"], event["total"])
+                    elif event["type"] == "job_finished":
+                        return event["state"] == "done", message or f"{job_id}: {event['state']}"
+                    else:
+                        message = event.get("message") or message
+                        if on_event:
+                            on_event(event)
+                return False, f"Yükleme servisi olay akışı kesildi ({job_id})"
+            except (ConnectionError, ValueError, OSError) as e:
+                return False, f"Yükleme servisi hatası: {e}"
+            finally:
+                finished.set()
+        
+        self._watch_operation(self.executor.submit(job), on_done)
+        return True
+    
+    def _watch_operation(self, future, on_done: Callable[..., None]):
+        """Yürütücüdeki işlem bitince on_done(*sonuç)'u GUI thread'inde çağırır"""
+        def finished(future):
+            if future.cancelled():
+                result = (False, CANCELLED_MESSAGE)
+            elif future.exception() is not None:
+                result = (False, f"Beklenmeyen hata: {future.exception()}")
+            else:
+                result = future.result()
+            on_done(*result)
+            self.update_action_buttons()
+        
+        self.poller.watch(future, finished)
+        self.update_action_buttons()
+    
+    def _begin_cancellable(self) -> CancelToken:
+        """GUI thread'inde: yeni iptal bayrağı oluşturur"""
+        token = CancelToken()
+        self.active_cancel_token = token
+        return token
+    
+    def _end_cancellable(self, token: CancelToken):
+        """GUI thread'inde: işlem bitince iptal bayrağını bırakır"""
+        if self.active_cancel_token is token:
+            self.active_cancel_token = None
+    
+    def cancel_operation(self):
+        """Süren silme / yükleme işlemini iptal eder"""
+        token = self.active_cancel_token
+        if token and not token.is_cancelled:
+            token.cancel()
+            self.cancel_btn.config(state="disabled")
+            self.log_message("İptal isteniyor...", "WARNING")
+    
     def update_action_buttons(self):
-        """Gönder / Sil butonlarının durumunu günceller"""
-        if self.uart_comm and self.uart_comm.is_connected:
-            # Bağlı ise ERASE her zaman kullanılabilir
+        """Gönder / Sil butonlarının durumunu işlem durumuna göre günceller"""
+        token = self.active_cancel_token
+        self.cancel_btn.config(state="normal" if token and not token.is_cancelled else "disabled")
+        busy = self.executor is not None and self.executor.busy
+        if self._is_connected() and not busy:
+            # Bağlı ve boştaysa ERASE her zaman kullanılabilir
             self.erase_btn.config(state="normal")
+            self.erase_range_btn.config(state="normal")
+            # Paket yükleme ve baud taraması portu doğrudan kullanır: servis modunda yok
+            local = "disabled" if self.daemon_client else "normal"
+            self.auto_baud_btn.config(state=local)
+            self.bundle_btn.config(state=local)
             # SEND için firmware gerekiyor
             if self.firmware_data is not None:
                 self.send_btn.config(state="normal")
             else:
                 self.send_btn.config(state="disabled")
         else:
-            # Bağlı değilse ikisi de pasif
+            # Bağlı değilse veya işlem sürüyorsa hepsi pasif
             self.send_btn.config(state="disabled")
             self.erase_btn.config(state="disabled")
+            self.erase_range_btn.config(state="disabled")
+            self.auto_baud_btn.config(state="disabled")
+            self.bundle_btn.config(state="disabled")
     
     def update_progress(self, current: int, total: int):
-        """İlerleme çubuğunu günceller"""
+        """İlerleme çubuğunu günceller (işçi thread'inden çağrılır)"""
         percentage = (current / total) * 100
         self.root.after(0, lambda: self.progress.config(value=percentage))
         self.root.after(0, lambda: self.progress_text.config(text=f"📦 Paket {current}/{total} ({percentage:.1f}%)"))
     
     def send_firmware_thread(self):
-        """Firmware gönderimini ayrı thread'de çalıştırır"""
-        def send_worker():
-            try:
-                sector = int(self.sector_var.get())
-            except ValueError:
-                error_msg = "Geçersiz sektör numarası"
-                self.log_message(error_msg, "ERROR")
+        """Firmware gönderimini bağlantının yürütücüsünde çalıştırır"""
+        try:
+            sector = int(self.sector_var.get())
+        except ValueError:
+            self.log_message("Geçersiz sektör numarası", "ERROR")
+            return
+        
+        firmware_data = self.firmware_data
+        if self.preprocess_var.get():
+            report = preprocess_image(firmware_data, sector)
+            if not report.ok:
+                self.log_message(f"Ön işleme hatası: {report.summary()}", "ERROR")
                 return
+            self.log_message(f"Ön işleme: {report.summary()}")
+            firmware_data = report.image
+        profile_mode = "sampling" if self.profile_var.get() else None
+        
+        self.progress.config(value=0)
+        self.progress_text.config(text="🚀 Firmware gönderiliyor...", foreground="#7f8c8d")
+        self.log_message(f"Firmware gönderimi başlıyor (Sektör: {sector})")
+        token = self._begin_cancellable()
+        
+        # Daha önce hesaplanmış tahmin varsa gerçek süreyle karşılaştırılır; yükleme tahmini beklemez
+        key = self._plan_key()
+        plan = self._plan_cache.get(key) if key else None
+        
+        def send(uart: UARTCommunication):
+            uart.profile_mode = profile_mode
+            uart.last_profile = None
+            success, message = uart.send_firmware(firmware_data, sector, self.update_progress,
+                                                  cancel_token=token, plan=plan)
+            return success, message, uart.last_profile, uart.last_plan
+        
+        def on_done(success: bool, message: str, profile=None, plan=None):
+            self._end_cancellable(token)
+            if plan and plan.actual is not None:
+                self.log_message(f"Yükleme süresi: {plan.compare()}")
+            # Geçmişe yeni oturum eklendi: tahminler yeniden hesaplanmalı
+            self._plan_cache.clear()
+            self.update_transfer_estimate()
+            if profile:
+                self.log_message(f"{profile} ({profile.samples} örnek)")
+                for line in profile.summary.splitlines()[:6]:
+                    self.log_message(f"  {line}")
             
-            # UI'yi disable et
-            self.root.after(0, lambda: self.send_btn.config(state="disabled"))
-            self.root.after(0, lambda: self.progress.config(value=0))
-            self.root.after(0, lambda: self.progress_text.config(text="🚀 Firmware gönderiliyor..."))
-            
-            self.log_message(f"Firmware gönderimi başlıyor (Sektör: {sector})")
-            
-            # Firmware gönder
-            success, message = self.uart_comm.send_firmware(
-                self.firmware_data, sector, self.update_progress
-            )
-            
-            # Sonucu logla
             if success:
                 self.log_message(message, "SUCCESS")
-                self.root.after(0, lambda: self.progress_text.config(text="✅ Tamamlandı!", foreground="#27ae60"))
+                self.progress_text.config(text="✅ Tamamlandı!", foreground="#27ae60")
+            elif token.is_cancelled:
+                self.log_message(message, "WARNING")
+                self.progress_text.config(text="⛔ İptal edildi", foreground="#f39c12")
             else:
                 self.log_message(f"Firmware gönderim hatası: {message}", "ERROR")
-                self.root.after(0, lambda: self.progress_text.config(text="❌ Hata!", foreground="#e74c3c"))
+                self.progress_text.config(text="❌ Hata!", foreground="#e74c3c")
+        
+        if self.daemon_client:
+            # Görüntü zaten ön işlendi; servis tekrar işlemez
+            name = os.path.basename(self.firmware_path or "") or "firmware.bin"
+            submit = lambda client: client.submit_image(firmware_data, name, [self.daemon_port], sector,
+                                                        client="gui", baudrate=self.daemon_baudrate,
+                                                        preprocess=False)
+            started = self._run_daemon_job(submit, on_done, token)
+        else:
+            started = self._run_device_operation(send, on_done)
+        if not started:
+            self._end_cancellable(token)
+    
+    def flash_bundle_thread(self):
+        """Paket tanımı seçer ve görüntüleri bağlantının yürütücüsünde tek oturumda yükler"""
+        file_path = filedialog.askopenfilename(
+            title="Paket Tanımı Seç",
+            filetypes=[("Bundle manifest", "*.json"), ("All files", "*.*")]
+        )
+        if not file_path:
+            return
+        try:
+            manifest = load_manifest(file_path)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Hata", str(e))
+            self.log_message(f"Paket tanımı okunamadı: {e}", "ERROR")
+            return
+        
+        if self.preprocess_var.get():
+            reports = manifest.preprocess()
+            for name, report in reports.items():
+                self.log_message(f"Ön işleme [{name}]: {report.summary()}", "INFO" if report.ok else "ERROR")
+            if not all(report.ok for report in reports.values()):
+                return
+        
+        images = ", ".join(f"{image.name} -> {image.sector}" for image in manifest.ordered())
+        self.progress.config(value=0)
+        self.progress_text.config(text="📦 Paket yükleniyor...", foreground="#7f8c8d")
+        self.log_message(f"Paket yükleme başlıyor: {manifest.name} ({images})")
+        token = self._begin_cancellable()
+        
+        def flash(uart: UARTCommunication):
+            success, message = uart.flash_bundle(manifest, self.update_progress, cancel_token=token)
+            return success, message, uart.last_bundle_report
+        
+        def on_done(success: bool, message: str, report=None):
+            self._end_cancellable(token)
+            if report:
+                for line in report.summary().splitlines():
+                    self.log_message(line)
             
-            # UI'yi tekrar enable et
-            self.root.after(0, self.update_action_buttons)
+            if success:
+                self.log_message(message, "SUCCESS")
+                self.progress_text.config(text="✅ Tamamlandı!", foreground="#27ae60")
+            elif token.is_cancelled:
+                self.log_message(message, "WARNING")
+                self.progress_text.config(text="⛔ İptal edildi", foreground="#f39c12")
+            else:
+                self.log_message(f"Paket yükleme hatası: {message}", "ERROR")
+                self.progress_text.config(text="❌ Hata!", foreground="#e74c3c")
         
-        # Worker thread'i başlat
-        thread = threading.Thread(target=send_worker, daemon=True)
-        thread.start()
+        if not self._run_device_operation(flash, on_done):
+            self._end_cancellable(token)
     
     def erase_sector_thread(self):
-        """Sektör silme işlemini ayrı thread'de yapar"""
-        def erase_worker():
-            try:
-                sector = int(self.erase_sector_var.get())
-            except ValueError:
-                self.log_message("Geçersiz sektör numarası", "ERROR")
-                return
+        """Sektör silme işlemini bağlantının yürütücüsünde çalıştırır"""
+        try:
+            sector = int(self.erase_sector_var.get())
+        except ValueError:
+            self.log_message("Geçersiz sektör numarası", "ERROR")
+            return
+
+        self.progress.config(value=0)
+        self.erase_status.config(text="🧹 Sektör siliniyor...", foreground="#7f8c8d")
+        self.log_message(f"Sektör silme başlıyor (Sektör: {sector})")
+        token = self._begin_cancellable()
+
+        def on_done(success: bool, message: str):
+            self._end_cancellable(token)
+            if success:
+                self.log_message(message, "SUCCESS")
+                self.erase_status.config(text="✅ Silme tamamlandı", foreground="#27ae60")
+            elif token.is_cancelled:
+                self.log_message(message, "WARNING")
+                self.erase_status.config(text=f"⛔ {CANCELLED_MESSAGE}", foreground="#f39c12")
+            else:
+                self.log_message(f"Sektör silme hatası: {message}", "ERROR")
+                self.erase_status.config(text="❌ Hata!", foreground="#e74c3c")
+
+        if self.daemon_client:
+            submit = lambda client: client.erase([self.daemon_port], [sector], client="gui",
+                                                 baudrate=self.daemon_baudrate)
+            started = self._run_daemon_job(submit, on_done, token)
+        else:
+            started = self._run_device_operation(lambda uart: uart.erase_sector(sector, cancel_token=token), on_done)
+        if not started:
+            self._end_cancellable(token)
+
+    def erase_range_thread(self):
+        """Sektör aralığını bağlantının yürütücüsünde tek seferde siler"""
+        try:
+            first = int(self.erase_sector_var.get())
+            last = int(self.erase_end_sector_var.get())
+        except ValueError:
+            self.log_message("Geçersiz sektör numarası", "ERROR")
+            return
+        if last < first:
+            self.log_message("Bitiş sektörü başlangıçtan küçük olamaz", "ERROR")
+            return
+        sectors = list(range(first, last + 1))
 
-            # UI kilitle
-            self.root.after(0, lambda: self.erase_btn.config(state="disabled"))
-            self.root.after(0, lambda: self.progress.config(value=0))
-            self.root.after(0, lambda: self.erase_status.config(text="🧹 Sektör siliniyor...", foreground="#7f8c8d"))
+        self.progress.config(value=0)
+        self.erase_status.config(text=f"🧨 {len(sectors)} sektör siliniyor...", foreground="#7f8c8d")
+        self.log_message(f"Toplu silme başlıyor (Sektör {first}-{last})")
 
-            self.log_message(f"Sektör silme başlıyor (Sektör: {sector})")
+        def on_sector_done(current, total, result):
+            # İşçi thread'inde çağrılır
+            level = "INFO" if result.success else "ERROR"
+            self.log_message(f"Sektör {result.sector}: {result.message} [{result.duration:.2f}s]", level)
+            self.update_progress(current, total)
+            self.root.after(0, lambda: self.erase_status.config(text=f"🧨 {current}/{total} sektör silindi"))
 
-            success, message = self.uart_comm.erase_sector(sector)
+        token = self._begin_cancellable()
 
+        def on_done(success: bool, message: str):
+            self._end_cancellable(token)
             if success:
                 self.log_message(message, "SUCCESS")
-                self.root.after(0, lambda: self.erase_status.config(text="✅ Silme tamamlandı", foreground="#27ae60"))
+                self.erase_status.config(text=f"✅ {message}", foreground="#27ae60")
+            elif token.is_cancelled:
+                self.log_message(message, "WARNING")
+                self.erase_status.config(text=f"⛔ {message}", foreground="#f39c12")
             else:
-                self.log_message(f"Sektör silme hatası: {message}", "ERROR")
-                self.root.after(0, lambda: self.erase_status.config(text="❌ Hata!", foreground="#e74c3c"))
+                self.log_message(f"Toplu silme hatası: {message}", "ERROR")
+                self.erase_status.config(text="❌ Hata!", foreground="#e74c3c")
 
-            # UI butonlarını güncelle
-            self.root.after(0, self.update_action_buttons)
+        if self.daemon_client:
+            # Servis sektör bazında değil, silme adımının sonunda tek olay yayınlar
+            def on_event(event):
+                if event["type"] == "erase":
+                    self.log_message(event["message"], "INFO" if event["success"] else "ERROR")
+            
+            submit = lambda client: client.erase([self.daemon_port], sectors, client="gui",
+                                                 baudrate=self.daemon_baudrate)
+            started = self._run_daemon_job(submit, on_done, token, on_event)
+        else:
+            operation = lambda uart: uart.erase_sectors(sectors, on_sector_done, cancel_token=token)
+            started = self._run_device_operation(operation, on_done)
+        if not started:
+            self._end_cancellable(token)
+
+    def auto_baud_thread(self):
+        """En hızlı güvenilir baud rate'i bağlantının yürütücüsünde arar"""
+        session = self.session
+        if not session:
+            return
+        self.log_message(f"Otomatik baud taraması başlıyor ({session.baudrate} baud)")
+
+        def on_probe(result):
+            self.log_message(f"Baud testi: {result}")
+
+        def on_done(success: bool, message: str):
+            if success:
+                self.log_message(message, "SUCCESS")
+            else:
+                self.log_message(f"Otomatik baud hatası: {message}", "ERROR")
+            if self.session is session:
+                self.baudrate_var.set(str(session.baudrate))
+                self.connection_status.config(text=f"✅ Bağlı: {session.port} @ {session.baudrate}",
+                                              foreground="#27ae60")
+                self.update_transfer_estimate()
 
-        threading.Thread(target=erase_worker, daemon=True).start()
+        self._run_device_operation(lambda uart: uart.auto_baud(progress_callback=on_probe), on_done)
 
     def on_closing(self):
         """Uygulama kapatılırken çağrılır"""
-        if self.uart_comm and self.uart_comm.is_connected:
-            self.uart_comm.disconnect()
+        self.frame_monitor.stop()
+        self.port_watcher.stop()
+        # Süren işlem cihaza FINISH gönderip portu bıraksın; port yürütücüde kapanır
+        self.close_session()
+        self.log_message(f"Arayüz kare süresi: {self.frame_monitor.stats()}")
+        self.app_log.close()
+        if self._plan_after is not None:
+            self.root.after_cancel(self._plan_after)
+        self.plan_executor.close()
+        self.timing_table.flush()
+        if self.history is not None:
+            self.history.close()
         self.root.destroy()
     
     def run(self):
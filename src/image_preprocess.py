@@ -0,0 +1,146 @@
+import struct
+from dataclasses import dataclass, field
+from typing import List, Tuple
+from .flash_layout import STM32F4_SECTOR_SIZES, sector_address, sector_size
+from .stm32_protocol import STM32Protocol
+
+ERASED_BYTE = 0xFF
+
+# Bootloader her DATA paketinde 16 byte yazar; son paket 0x00 ile doldurulduğundan
+# görüntü 0xFF ile 16 byte sınırına tamamlanır (silinmiş flash değişmeden kalır)
+DEFAULT_ALIGNMENT = STM32Protocol.DATA_PAYLOAD_SIZE
+
+# Başlangıç SP'sinin gösterebileceği RAM bölgeleri (STM32F4: CCM ve SRAM1/2/3)
+STM32F4_RAM_RANGES: List[Tuple[int, int]] = [
+    (0x10000000, 0x10010000),  # CCM RAM (64 KB)
+    (0x20000000, 0x20050000),  # SRAM (F4 ailesinde en fazla 320 KB)
+]
+
+@dataclass
+class PreprocessResult:
+    """Ön işleme sonucu: normalize edilmiş görüntü ve rapor"""
+    image: bytes
+    original_size: int
+    trimmed_bytes: int = 0
+    padded_bytes: int = 0
+    errors: List[str] = field(default_factory=list)
+    warnings: List[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    @property
+    def packets_before(self) -> int:
+        return -(-self.original_size // STM32Protocol.DATA_PAYLOAD_SIZE)
+
+    @property
+    def packets_after(self) -> int:
+        return -(-len(self.image) // STM32Protocol.DATA_PAYLOAD_SIZE)
+
+    @property
+    def packets_saved(self) -> int:
+        return self.packets_before - self.packets_after
+
+    def summary(self) -> str:
+        saved_pct = self.packets_saved / self.packets_before * 100 if self.packets_before else 0.0
+        text = (f"{self.original_size} -> {len(self.image)} byte, "
+                f"{self.packets_before} -> {self.packets_after} paket "
+                f"({self.packets_saved} paket / %{saved_pct:.1f} tasarruf)")
+        if self.errors:
+            text += " | HATA: " + "; ".join(self.errors)
+        if self.warnings:
+            text += " | UYARI: " + "; ".join(self.warnings)
+        return text
+
+def trim_erased_tail(data: bytes) -> bytes:
+    """Sondaki silinmiş (0xFF) byte'ları atar; flash'a 0xFF yazmak hücreyi değiştirmez"""
+    return data.rstrip(bytes([ERASED_BYTE]))
+
+def align_image(data: bytes, alignment: int = DEFAULT_ALIGNMENT) -> bytes:
+    """Görüntüyü 0xFF ile alignment katına tamamlar"""
+    remainder = len(data) % alignment
+    if remainder == 0:
+        return data
+    return data + bytes([ERASED_BYTE]) * (alignment - remainder)
+
+def validate_vector_table(image: bytes, load_address: int,
+                          ram_ranges: List[Tuple[int, int]] = STM32F4_RAM_RANGES) -> List[str]:
+    """
+    Cortex-M vektör tablosunun ilk iki girişini doğrular
+
+    - Başlangıç SP'si bir RAM bölgesinin içinde (veya tam sonunda) ve 8 byte hizalı olmalı
+    - Reset vektörü Thumb bitli (tek) olmalı ve görüntünün içini göstermeli
+
+    Returns:
+        Hata mesajları (boş liste: geçerli)
+    """
+    if len(image) < 8:
+        return ["Görüntü vektör tablosu için çok kısa (< 8 byte)"]
+
+    errors = []
+    initial_sp, reset_vector = struct.unpack_from("<II", image, 0)
+
+    if not any(start < initial_sp <= end for start, end in ram_ranges):
+        errors.append(f"Başlangıç SP'si RAM dışında: 0x{initial_sp:08X}")
+    elif initial_sp % 8:
+        errors.append(f"Başlangıç SP'si 8 byte hizalı değil: 0x{initial_sp:08X}")
+
+    if not reset_vector & 1:
+        errors.append(f"Reset vektöründe Thumb biti yok: 0x{reset_vector:08X}")
+    handler = reset_vector & ~1
+    if not load_address <= handler < load_address + len(image):
+        errors.append(f"Reset vektörü görüntü dışında: 0x{reset_vector:08X} "
+                      f"(görüntü 0x{load_address:08X}-0x{load_address + len(image):08X})")
+    return errors
+
+def preprocess_image(data: bytes, sector: int, alignment: int = DEFAULT_ALIGNMENT,
+                     trim: bool = True, validate_vectors: bool = True,
+                     sector_sizes: List[int] = STM32F4_SECTOR_SIZES) -> PreprocessResult:
+    """
+    Firmware görüntüsünü gönderime hazırlar
+
+    1. Sondaki 0xFF byte'ları atar (trim)
+    2. 0xFF ile programlama birimine (varsayılan 16 byte) tamamlar
+    3. Vektör tablosunu hedef sektör adresine göre doğrular
+    4. Boyutu hedef sektörle karşılaştırır
+
+    Args:
+        data: Dosyadan okunan görüntü
+        sector: Hedef sektör
+        alignment: Programlama birimi (byte)
+        trim: Sondaki 0xFF'leri at
+        validate_vectors: Cortex-M vektör tablosunu doğrula (ham veri yüklerken False)
+        sector_sizes: Flash sektör yerleşimi
+    Returns:
+        PreprocessResult (errors boş değilse görüntü gönderilmemeli)
+    """
+    result = PreprocessResult(image=data, original_size=len(data))
+
+    try:
+        load_address = sector_address(sector, sector_sizes)
+        capacity = sector_size(sector, sector_sizes)
+    except ValueError as e:
+        result.errors.append(str(e))
+        return result
+
+    image = trim_erased_tail(data) if trim else data
+    result.trimmed_bytes = len(data) - len(image)
+    if not image:
+        result.errors.append("Görüntü boş (tamamı 0xFF)")
+        result.image = image
+        return result
+
+    aligned = align_image(image, alignment)
+    result.padded_bytes = len(aligned) - len(image)
+    result.image = aligned
+
+    if validate_vectors:
+        result.errors += validate_vector_table(image, load_address)
+
+    if len(aligned) > capacity:
+        result.errors.append(f"Görüntü ({len(aligned)} byte) sektör {sector} boyutunu ({capacity} byte) aşıyor")
+    elif len(aligned) > capacity * 0.9:
+        result.warnings.append(f"Sektör {sector} %{len(aligned) / capacity * 100:.0f} dolu")
+
+    return result
@@ -0,0 +1,142 @@
+import logging
+import os
+import struct
+import sys
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+logger = logging.getLogger(__name__)
+
+# linux/serial.h ve asm-generic/ioctls.h
+TIOCGSERIAL = 0x541E
+TIOCSSERIAL = 0x541F
+ASYNC_LOW_LATENCY = 1 << 13
+SERIAL_STRUCT_SIZE = 72       # struct serial_struct (64-bit)
+SERIAL_STRUCT_FLAGS_OFFSET = 16  # type, line, port, irq, flags
+
+SYSFS_USB_SERIAL_DIR = "/sys/bus/usb-serial/devices"
+
+@dataclass
+class TuningReport:
+    """Düşük gecikme ayarlarından hangilerinin uygulandığını raporlar"""
+    applied: List[str] = field(default_factory=list)
+    skipped: Dict[str, str] = field(default_factory=dict)  # ayar -> neden
+    previous: Dict[str, int] = field(default_factory=dict)  # değiştirilen ayar -> önceki değer
+
+    def __str__(self) -> str:
+        parts = [f"✓ {name}" for name in self.applied]
+        parts += [f"✗ {name} ({reason})" for name, reason in self.skipped.items()]
+        return ", ".join(parts) if parts else "ayar yok"
+
+def _is_linux() -> bool:
+    return sys.platform.startswith("linux")
+
+def set_async_low_latency(fd: int, enabled: bool = True) -> bool:
+    """
+    TIOCSSERIAL ile ASYNC_LOW_LATENCY bayrağını açar / kapatır (desteklenmezse OSError)
+
+    Returns:
+        bool: Bayrağın önceki durumu
+    """
+    import fcntl
+    buf = bytearray(SERIAL_STRUCT_SIZE)
+    fcntl.ioctl(fd, TIOCGSERIAL, buf)
+    flags = struct.unpack_from("i", buf, SERIAL_STRUCT_FLAGS_OFFSET)[0]
+    previous = bool(flags & ASYNC_LOW_LATENCY)
+    if previous == enabled:
+        return previous
+    flags = flags | ASYNC_LOW_LATENCY if enabled else flags & ~ASYNC_LOW_LATENCY
+    struct.pack_into("i", buf, SERIAL_STRUCT_FLAGS_OFFSET, flags)
+    fcntl.ioctl(fd, TIOCSSERIAL, buf)
+    return previous
+
+def latency_timer_path(port: str) -> str:
+    """FTDI sürücüsünün latency_timer sysfs dosyası (/dev/ttyUSB0 -> .../ttyUSB0/latency_timer)"""
+    name = os.path.basename(os.path.realpath(port))
+    return os.path.join(SYSFS_USB_SERIAL_DIR, name, "latency_timer")
+
+def set_latency_timer(port: str, milliseconds: int = 1) -> int:
+    """
+    FTDI latency_timer'ı ayarlar (dosya yoksa / yazılamıyorsa OSError)
+
+    Returns:
+        int: Önceki değer (ms)
+    """
+    path = latency_timer_path(port)
+    with open(path, "r") as f:
+        previous = int(f.read().strip() or 0)
+    if previous != milliseconds:
+        with open(path, "w") as f:
+            f.write(str(milliseconds))
+    return previous
+
+def apply_low_latency(serial_conn, port: str, latency_timer_ms: int = 1) -> TuningReport:
+    """
+    Açık bir pyserial portuna Linux düşük gecikme ayarlarını uygular
+
+    Her ayar bağımsız denenir; desteklenmeyen ayar (pty, CP210x'te
+    latency_timer, yetki yok vb.) atlanır ve nedeni rapora yazılır.
+    Ayarlar port kapansa da sürücüde kalır: değiştirilenlerin önceki
+    değerleri rapora yazılır ve restore_low_latency ile geri yüklenir.
+
+    Args:
+        serial_conn: Açık serial.Serial nesnesi
+        port: Port yolu (örn: '/dev/ttyUSB0')
+        latency_timer_ms: FTDI latency_timer değeri (ms; sürücü varsayılanı 16)
+    """
+    report = TuningReport()
+
+    if getattr(serial_conn, "exclusive", None):
+        report.applied.append("exclusive")
+    else:
+        report.skipped["exclusive"] = "port özel erişimle açılmadı"
+
+    if not _is_linux():
+        report.skipped["low_latency"] = "Linux dışı platform"
+        report.skipped["latency_timer"] = "Linux dışı platform"
+        return report
+
+    try:
+        if not set_async_low_latency(serial_conn.fileno()):
+            report.previous["low_latency"] = 0
+        report.applied.append("low_latency")
+    except (OSError, AttributeError, ValueError) as e:
+        report.skipped["low_latency"] = getattr(e, "strerror", None) or str(e)
+
+    try:
+        previous = set_latency_timer(port, latency_timer_ms)
+        if previous != latency_timer_ms:
+            report.previous["latency_timer"] = previous
+        report.applied.append(f"latency_timer={latency_timer_ms}ms")
+    except FileNotFoundError:
+        report.skipped["latency_timer"] = "FTDI latency_timer yok"
+    except (OSError, ValueError) as e:
+        report.skipped["latency_timer"] = getattr(e, "strerror", None) or str(e)
+
+    return report
+
+def restore_low_latency(serial_conn, port: str, report: TuningReport) -> List[str]:
+    """
+    apply_low_latency'nin değiştirdiği ayarları önceki değerlerine döndürür
+
+    Port kapatılmadan önce çağrılmalıdır (ASYNC_LOW_LATENCY açık fd ister).
+    Geri yüklenemeyen ayar atlanır.
+
+    Returns:
+        List[str]: Geri yüklenen ayarlar
+    """
+    restored = []
+    if "low_latency" in report.previous:
+        try:
+            set_async_low_latency(serial_conn.fileno(), bool(report.previous["low_latency"]))
+            restored.append("low_latency")
+        except (OSError, AttributeError, ValueError) as e:
+            logger.warning("ASYNC_LOW_LATENCY geri alınamadı: %s", e)
+    if "latency_timer" in report.previous:
+        try:
+            set_latency_timer(port, report.previous["latency_timer"])
+            restored.append(f"latency_timer={report.previous['latency_timer']}ms")
+        except (OSError, ValueError) as e:
+            logger.warning("latency_timer geri alınamadı: %s", e)
+    report.previous.clear()
+    return restored
@@ -0,0 +1,114 @@
+"""
+Süreçler arası port kilidi
+
+Yükleme servisi ve GUI aynı portu açmadan önce veri dizinindeki
+locks/<port>.lock dosyasını kilitler (POSIX: flock, Windows: msvcrt).
+Kilit, tutan süreç kapanınca (çökse bile) işletim sistemi tarafından
+bırakılır. Dosyada kilidi tutan sürecin adı ve pid'i yazar; böylece
+"port meşgul" hatası kimin tuttuğunu söyler.
+"""
+
+import hashlib
+import os
+import re
+from typing import Optional
+from .app_paths import app_data_dir
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+class PortBusyError(ConnectionError):
+    """Port başka bir süreç (ör. yükleme servisi) tarafından kullanılıyor"""
+
+def port_lock_dir() -> str:
+    """Port kilit dosyalarının dizini (uygulama veri dizini/locks)"""
+    path = os.path.join(app_data_dir(), "locks")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+class PortLock:
+    """
+    Tek bir portun süreçler arası özel kilidi
+
+    Kullanım:
+        lock = PortLock("/dev/ttyUSB0", owner="GUI")
+        if not lock.acquire():
+            raise PortBusyError(f"Port kullanımda: {lock.holder()}")
+        ...
+        lock.release()
+    """
+
+    def __init__(self, port: str, owner: str = "", directory: Optional[str] = None):
+        """
+        Args:
+            port: Port adı veya ağ adresi
+            owner: Kilidi tutan sürecin adı (hata mesajlarında gösterilir)
+            directory: Kilit dizini (None: port_lock_dir())
+        """
+        self.port = port
+        self.owner = owner or "stm32-bootloader"
+        safe_name = re.sub(r"[^A-Za-z0-9_.-]", "_", port).strip("_")[-40:]
+        digest = hashlib.sha1(port.encode("utf-8")).hexdigest()[:8]
+        self.path = os.path.join(directory or port_lock_dir(), f"{safe_name}-{digest}.lock")
+        self._fd: Optional[int] = None
+
+    @property
+    def held(self) -> bool:
+        return self._fd is not None
+
+    def acquire(self) -> bool:
+        """Kilidi beklemeden almayı dener (zaten tutuluyorsa True)"""
+        if self._fd is not None:
+            return True
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            if fcntl:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                os.lseek(fd, 0, os.SEEK_SET)
+                msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        except OSError:
+            os.close(fd)
+            return False
+        # İlk byte kilit bölgesidir (Windows); tutan süreç bilgisi ondan sonra yazılır
+        os.ftruncate(fd, 1)
+        os.lseek(fd, 1, os.SEEK_SET)
+        os.write(fd, f"{self.owner} (pid {os.getpid()})".encode("utf-8"))
+        self._fd = fd
+        return True
+
+    def release(self):
+        """Kilidi bırakır (tutulmuyorsa bir şey yapmaz)"""
+        fd, self._fd = self._fd, None
+        if fd is None:
+            return
+        try:
+            if fcntl:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            else:
+                os.lseek(fd, 0, os.SEEK_SET)
+                msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+
+    def holder(self) -> str:
+        """Kilidi son alan sürecin bilgisi (okunamazsa boş)"""
+        try:
+            with open(self.path, "rb") as f:
+                f.seek(1)
+                return f.read(200).decode("utf-8", "replace")
+        except OSError:
+            return ""
+
+    def __enter__(self) -> "PortLock":
+        if not self.acquire():
+            raise PortBusyError(f"Port kullanımda: {self.port} ({self.holder() or 'başka bir süreç'})")
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
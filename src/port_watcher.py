@@ -0,0 +1,187 @@
+import json
+import logging
+import os
+import sys
+import threading
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Set, Tuple
+from .app_paths import app_data_path
+
+logger = logging.getLogger(__name__)
+
+SYSFS_TTY_DIR = "/sys/class/tty"
+
+@dataclass(frozen=True)
+class PortInfo:
+    """Bulunan bir seri portun özet bilgisi"""
+    device: str
+    vid: Optional[int] = None
+    pid: Optional[int] = None
+    serial_number: Optional[str] = None
+    description: str = ""
+
+    def __str__(self) -> str:
+        if self.vid is None:
+            return self.device
+        pid = f"{self.pid:04X}" if self.pid is not None else "----"
+        return f"{self.device} ({self.vid:04X}:{pid} {self.serial_number or '-'})"
+
+@dataclass
+class PortFilter:
+    """
+    USB VID/PID/seri numarasına göre port filtresi
+    Boş kümeler "hepsi" anlamına gelir.
+    """
+    vid_pids: Set[Tuple[int, Optional[int]]] = field(default_factory=set)
+    serial_numbers: Set[str] = field(default_factory=set)
+
+    def matches(self, info: PortInfo) -> bool:
+        if self.vid_pids:
+            if info.vid is None:
+                return False
+            if not any(info.vid == vid and (pid is None or info.pid == pid)
+                       for vid, pid in self.vid_pids):
+                return False
+        if self.serial_numbers and info.serial_number not in self.serial_numbers:
+            return False
+        return True
+
+    @staticmethod
+    def parse(vid_pids: str = "", serial_numbers: str = "") -> "PortFilter":
+        """
+        Metinden filtre oluşturur
+        Örnek: parse("0403:6001,10c4", "FT123,FT456")
+        """
+        pairs = set()
+        for item in vid_pids.replace(" ", "").split(","):
+            if not item:
+                continue
+            vid, _, pid = item.partition(":")
+            pairs.add((int(vid, 16), int(pid, 16) if pid else None))
+        serials = {s.strip() for s in serial_numbers.split(",") if s.strip()}
+        return PortFilter(pairs, serials)
+
+    @staticmethod
+    def load(path: Optional[str] = None) -> "PortFilter":
+        """
+        Filtreyi JSON dosyasından yükler (yoksa boş filtre)
+        Format: {"vid_pid": "0403:6001,10c4:ea60", "serial": "FT123"}
+        """
+        path = path or app_data_path("port_filter.json")
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return PortFilter.parse(data.get("vid_pid", ""), data.get("serial", ""))
+        except (OSError, ValueError, AttributeError):
+            return PortFilter()
+
+def enumerate_ports(port_filter: Optional[PortFilter] = None) -> List[PortInfo]:
+    """Sistemdeki seri portları listeler ve filtreler (bloklayıcı)"""
+    import serial.tools.list_ports
+    ports = []
+    for info in serial.tools.list_ports.comports():
+        port = PortInfo(info.device, info.vid, info.pid, info.serial_number, info.description or "")
+        if port_filter is None or port_filter.matches(port):
+            ports.append(port)
+    return sorted(ports, key=lambda p: p.device)
+
+class PortWatcher:
+    """
+    Seri portları arka planda izleyen ve eklenen/çıkarılan portları bildiren sınıf
+
+    Linux'ta her turda sadece /sys/class/tty dizin listesi okunur; tam
+    enumerasyon (USB tanımlayıcıları) yalnızca bu liste değiştiğinde yapılır.
+    Diğer platformlarda her turda enumerasyon yapılır. Port listesi
+    önbellekte tutulduğundan `ports` hiçbir zaman bloklamaz.
+    """
+
+    def __init__(self, port_filter: Optional[PortFilter] = None, interval: float = 0.5,
+                 on_added: Optional[Callable[[PortInfo], None]] = None,
+                 on_removed: Optional[Callable[[PortInfo], None]] = None):
+        """
+        Args:
+            port_filter: Sadece eşleşen portları raporla (None: hepsi)
+            interval: Tarama aralığı (saniye)
+            on_added: Port eklendiğinde watcher thread'inden çağrılır
+            on_removed: Port çıkarıldığında watcher thread'inden çağrılır
+        """
+        self.port_filter = port_filter
+        self.interval = interval
+        self.on_added = on_added
+        self.on_removed = on_removed
+        self._ports: Dict[str, PortInfo] = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._last_signature = None
+
+    @property
+    def ports(self) -> List[PortInfo]:
+        """Önbellekteki port listesi (bloklamaz)"""
+        with self._lock:
+            return sorted(self._ports.values(), key=lambda p: p.device)
+
+    def start(self):
+        """İzleme thread'ini başlatır"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="PortWatcher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """İzleme thread'ini durdurur"""
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+
+    def rescan(self):
+        """Bir sonraki turu beklemeden tam tarama ister (bloklamaz)"""
+        self._last_signature = None
+        self._wake.set()
+
+    def set_filter(self, port_filter: Optional[PortFilter]):
+        """Filtreyi değiştirir ve yeniden tarama ister"""
+        self.port_filter = port_filter
+        self.rescan()
+
+    @staticmethod
+    def _sysfs_signature():
+        """Linux'ta tty dizin listesi; değişmediyse enumerasyona gerek yok"""
+        if not sys.platform.startswith("linux"):
+            return None
+        try:
+            return tuple(sorted(os.listdir(SYSFS_TTY_DIR)))
+        except OSError:
+            return None
+
+    def poll(self):
+        """Tek bir tarama turu yapar ve değişiklikleri bildirir"""
+        signature = self._sysfs_signature()
+        if signature is not None and signature == self._last_signature:
+            return
+        self._last_signature = signature
+
+        current = {p.device: p for p in enumerate_ports(self.port_filter)}
+        with self._lock:
+            previous = self._ports
+            self._ports = current
+
+        for device, info in previous.items():
+            if device not in current and self.on_removed:
+                self.on_removed(info)
+        for device, info in current.items():
+            if device not in previous and self.on_added:
+                self.on_added(info)
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.poll()
+            except Exception as e:
+                logger.warning("Port tarama hatası: %s", e)
+            self._wake.wait(self.interval)
+            self._wake.clear()
@@ -0,0 +1,200 @@
+import cProfile
+import io
+import logging
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+from .app_paths import app_logs_dir
+
+logger = logging.getLogger(__name__)
+
+PROFILE_MODES = ("cprofile", "sampling")
+
+@dataclass
+class ProfileReport:
+    """Bir profil oturumunun sonucu"""
+    mode: str
+    path: str          # .prof (cprofile) veya .folded (sampling) dosyası
+    duration: float    # Profil süresi (saniye)
+    samples: int       # sampling: toplanan örnek sayısı, cprofile: 0
+    summary: str       # En çok zaman harcanan N fonksiyon
+
+    def __str__(self) -> str:
+        return f"Profil ({self.mode}, {self.duration:.2f}s): {self.path}"
+
+def _thread_cpu_ns(native_id: Optional[int]) -> Optional[int]:
+    """Thread'in toplam CPU süresi (ns, Linux schedstat); okunamazsa None"""
+    if native_id is None:
+        return None
+    try:
+        with open(f"/proc/self/task/{native_id}/schedstat") as f:
+            return int(f.read().split()[0])
+    except (OSError, ValueError, IndexError):
+        return None
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+class SamplingProfiler:
+    """
+    Tüm thread'lerin yığınlarını sabit aralıkla örnekleyen profil aracı
+
+    Tk ana thread'i, alım thread'i ve worker'lar birlikte görülür. Linux'ta
+    her örnek, thread'in son örnekten beri harcadığı CPU süresiyle (µs)
+    ağırlıklandırılır; böylece read/sleep'te bekleyen thread'ler sıcak nokta
+    gibi görünmez. Diğer platformlarda örnek sayısı (duvar saati) kullanılır.
+    Sonuç "katlanmış yığın" (folded stacks) biçiminde yazılır:
+        thread;dış_fonksiyon;...;iç_fonksiyon ağırlık
+    Bu biçim flamegraph.pl, speedscope ve inferno ile doğrudan açılabilir.
+    """
+
+    def __init__(self, interval: float = 0.005):
+        """
+        Args:
+            interval: Örnekleme aralığı (saniye)
+        """
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self.weight = "cpu" if _thread_cpu_ns(threading.get_native_id()) is not None else "wall"
+        self._last_cpu = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="profiler-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            threads = {t.ident: t for t in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                thread = threads.get(thread_id)
+                if thread_id == own_id or thread is None:
+                    continue
+                weight = 1
+                if self.weight == "cpu":
+                    cpu = _thread_cpu_ns(thread.native_id)
+                    previous = self._last_cpu.get(thread_id)
+                    self._last_cpu[thread_id] = cpu
+                    if cpu is None or previous is None:
+                        continue
+                    weight = (cpu - previous) // 1000
+                    if weight <= 0:
+                        continue  # Thread bu aralıkta beklemedeydi
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_label(frame))
+                    frame = frame.f_back
+                stack.append(thread.name)
+                self.stacks[";".join(reversed(stack))] += weight
+            self.samples += 1
+
+    def write_folded(self, path: str):
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+    def summary(self, top_n: int = 15) -> str:
+        """Kendi (self) ve toplam (inclusive) ağırlığa göre en yoğun fonksiyonlar"""
+        own: Counter = Counter()
+        inclusive: Counter = Counter()
+        total = sum(self.stacks.values()) or 1
+        for stack, count in self.stacks.items():
+            frames = stack.split(";")[1:]  # thread adını atla
+            if not frames:
+                continue
+            own[frames[-1]] += count
+            for label in set(frames):
+                inclusive[label] += count
+
+        unit = "CPU süresi" if self.weight == "cpu" else "örnek"
+        lines = [f"{'self%':>6} {'total%':>7}  fonksiyon ({unit}, toplam {total})"]
+        for label, count in own.most_common(top_n):
+            lines.append(f"{count / total * 100:6.1f} {inclusive[label] / total * 100:7.1f}  {label}")
+        return "\n".join(lines)
+
+class SessionProfiler:
+    """
+    Bir aktarım oturumunu profil altında çalıştıran bağlam yöneticisi
+
+    - "cprofile": deterministik, yalnızca çağıran thread'i ölçer; .prof dosyası
+      (pstats, snakeviz, flameprof, gprof2dot ile açılır)
+    - "sampling": tüm thread'leri örnekler; .folded dosyası (flame graph araçları)
+
+    Çıktılar uygulama log dizinine yazılır, özet konsola basılır.
+
+    Kullanım:
+        with SessionProfiler("sampling", name="flash_COM3") as profiler:
+            uart.send_firmware(data, 5)
+        print(profiler.report.summary)
+    """
+
+    def __init__(self, mode: str = "sampling", name: str = "session",
+                 output_dir: Optional[str] = None, interval: float = 0.005, top_n: int = 15):
+        """
+        Args:
+            mode: "cprofile" veya "sampling"
+            name: Dosya adı öneki (ör. port adı)
+            output_dir: Çıktı dizini (None: uygulama log dizini)
+            interval: sampling modunda örnekleme aralığı (saniye)
+            top_n: Özette gösterilecek fonksiyon sayısı
+        """
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Geçersiz profil modu: {mode} (seçenekler: {', '.join(PROFILE_MODES)})")
+        self.mode = mode
+        self.name = "".join(c if c.isalnum() or c in "-_" else "_" for c in name)
+        self.output_dir = output_dir
+        self.interval = interval
+        self.top_n = top_n
+        self.report: Optional[ProfileReport] = None
+        self._profiler = None
+        self._start = 0.0
+
+    def __enter__(self) -> "SessionProfiler":
+        self._start = time.perf_counter()
+        if self.mode == "cprofile":
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        else:
+            self._profiler = SamplingProfiler(self.interval)
+            self._profiler.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        duration = time.perf_counter() - self._start
+        output_dir = self.output_dir or app_logs_dir()
+        os.makedirs(output_dir, exist_ok=True)
+        stem = os.path.join(output_dir, f"profile_{self.name}_{datetime.now():%Y%m%d_%H%M%S}")
+
+        if self.mode == "cprofile":
+            self._profiler.disable()
+            path = stem + ".prof"
+            self._profiler.dump_stats(path)
+            stream = io.StringIO()
+            pstats.Stats(self._profiler, stream=stream).sort_stats("tottime").print_stats(self.top_n)
+            summary, samples = stream.getvalue().strip(), 0
+        else:
+            self._profiler.stop()
+            path = stem + ".folded"
+            self._profiler.write_folded(path)
+            summary, samples = self._profiler.summary(self.top_n), self._profiler.samples
+
+        self.report = ProfileReport(self.mode, path, duration, samples, summary)
+        logger.debug("%s\n%s", self.report, summary)
+        return False
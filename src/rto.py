@@ -0,0 +1,136 @@
+import threading
+from typing import Dict, Optional, Tuple
+from .stm32_protocol import MessageType
+
+# RFC 6298 katsayıları (Jacobson / Karels)
+RTO_ALPHA = 1 / 8   # SRTT yumuşatma
+RTO_BETA = 1 / 4    # RTTVAR yumuşatma
+RTO_K = 4           # Sapma çarpanı
+RTO_GRANULARITY = 0.001  # Saat çözünürlüğü (saniye); K*RTTVAR bunun altına inmez
+
+# Mesaj tipi başına (taban, tavan) saniye. DATA yanıtı yalnızca 16 byte yazmayı
+# bekler: gecikme milisaniyeler içinde fark edilir ve RTO geri çekilir. RTO dolunca
+# paket yeniden gönderilmez; yanıt response_timeout'a kadar beklenmeye devam eder
+# (bkz. UARTCommunication.send_packet_and_wait_ack). Silme / yazma hazırlığı
+# komutlarının yanıtı flash işlemini bekleyebileceğinden tavanları yüksektir.
+DEFAULT_RTO_BOUNDS: Dict[int, Tuple[float, float]] = {
+    MessageType.DATA: (0.05, 10.0),
+    MessageType.CMD_WRITE: (0.2, 30.0),
+    MessageType.CMD_ERASE: (0.2, 30.0),
+    MessageType.FINISH: (0.2, 30.0),
+}
+
+class RTOEstimator:
+    """
+    Tek bir mesaj tipi için TCP tarzı yanıt zaman aşımı tahmincisi (RFC 6298)
+
+    SRTT ve RTTVAR gözlenen gidiş-dönüş sürelerinden güncellenir;
+    RTO = SRTT + max(G, K * RTTVAR), [floor, ceiling] aralığına sıkıştırılır.
+    Zaman aşımında RTO ikiye katlanır (üstel geri çekilme), ilk geçerli
+    ölçümde geri çekilme sıfırlanır.
+    """
+
+    def __init__(self, floor: float, ceiling: float):
+        self.floor = floor
+        self.ceiling = ceiling
+        self.srtt: Optional[float] = None
+        self.rttvar = 0.0
+        self.samples = 0
+        self.backoff = 1  # Üst üste zaman aşımlarında 2'nin katları
+
+    def observe(self, rtt: float):
+        """Yeni gidiş-dönüş ölçümü (yalnızca zaman aşımına uğramamış paketlerden: Karn kuralı)"""
+        if self.srtt is None:
+            self.srtt = rtt
+            self.rttvar = rtt / 2
+        else:
+            self.rttvar = (1 - RTO_BETA) * self.rttvar + RTO_BETA * abs(self.srtt - rtt)
+            self.srtt = (1 - RTO_ALPHA) * self.srtt + RTO_ALPHA * rtt
+        self.samples += 1
+        self.backoff = 1
+
+    def on_timeout(self):
+        """Zaman aşımı: sonraki bekleme iki katına çıkar (tavanı aşmaz)"""
+        if self.timeout(self.ceiling) < self.ceiling:
+            self.backoff *= 2
+
+    def timeout(self, initial: float) -> float:
+        """
+        Sonraki yanıt için bekleme süresi
+
+        Args:
+            initial: Henüz ölçüm yokken kullanılacak süre (ör. response_timeout)
+        """
+        if self.srtt is None:
+            base = initial
+        else:
+            base = self.srtt + max(RTO_GRANULARITY, RTO_K * self.rttvar)
+        return min(self.ceiling, max(self.floor, base * self.backoff))
+
+    def __str__(self) -> str:
+        if self.srtt is None:
+            return "ölçüm yok"
+        return (f"srtt={self.srtt * 1000:.1f}ms rttvar={self.rttvar * 1000:.1f}ms "
+                f"rto={self.timeout(0) * 1000:.0f}ms ({self.samples} örnek)")
+
+class AdaptiveTimeouts:
+    """
+    Mesaj tipi başına ayrı RTO tahmincileri (DATA, CMD_WRITE, CMD_ERASE, FINISH)
+
+    Böylece hızlı DATA ACK'leri silme komutlarının beklemesini kısaltmaz,
+    yavaş silmeler de DATA'daki kayıp tespitini yavaşlatmaz. CMD_WRITE ve
+    CMD_ERASE ayrıca sektör başına izlenir: ACK'i silme bitince gönderen
+    bootloader'larda 128 KB sektör, 16 KB sektörün süresiyle kesilmez.
+    Diğer tipler (PING, STATUS, SET_BAUD) izlenmez; onlar için timeout() None döner.
+    """
+
+    PER_SECTOR_TYPES = (MessageType.CMD_WRITE, MessageType.CMD_ERASE)
+
+    def __init__(self, bounds: Optional[Dict[int, Tuple[float, float]]] = None):
+        self.bounds = dict(DEFAULT_RTO_BOUNDS if bounds is None else bounds)
+        self._lock = threading.Lock()
+        self._estimators: Dict[Tuple[int, Optional[int]], RTOEstimator] = {}
+
+    def reset(self):
+        """Tüm ölçümleri siler (port veya baud rate değiştiğinde)"""
+        with self._lock:
+            self._estimators = {}
+
+    def _key(self, packet: bytes) -> Optional[Tuple[int, Optional[int]]]:
+        msg_type = packet[0]
+        if msg_type not in self.bounds:
+            return None
+        return (msg_type, packet[1] if msg_type in self.PER_SECTOR_TYPES else None)
+
+    def estimator(self, packet: bytes) -> Optional[RTOEstimator]:
+        """Paketin tahmincisi (izlenmeyen tip: None); yoksa oluşturulur"""
+        key = self._key(packet)
+        if key is None:
+            return None
+        with self._lock:
+            estimator = self._estimators.get(key)
+            if estimator is None:
+                estimator = self._estimators[key] = RTOEstimator(*self.bounds[key[0]])
+            return estimator
+
+    def timeout(self, packet: bytes, initial: float) -> Optional[float]:
+        """Paket için bekleme süresi (izlenmeyen tip: None)"""
+        estimator = self.estimator(packet)
+        return estimator.timeout(initial) if estimator else None
+
+    def observe(self, packet: bytes, rtt: float):
+        estimator = self.estimator(packet)
+        if estimator:
+            estimator.observe(rtt)
+
+    def on_timeout(self, packet: bytes):
+        estimator = self.estimator(packet)
+        if estimator:
+            estimator.on_timeout()
+
+    def __str__(self) -> str:
+        parts = []
+        for (msg_type, sector), estimator in sorted(self._estimators.items(), key=lambda kv: (kv[0][0], kv[0][1] or 0)):
+            name = MessageType(msg_type).name + (f"[{sector}]" if sector is not None else "")
+            parts.append(f"{name}: {estimator}")
+        return ", ".join(parts) or "ölçüm yok"
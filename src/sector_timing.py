@@ -0,0 +1,136 @@
+import json
+import math
+import os
+import logging
+import threading
+from typing import Dict, List, Optional
+from .app_paths import app_data_path
+from .flash_layout import max_erase_time
+
+logger = logging.getLogger(__name__)
+
+# Cihaz hazırlık bilgisi vermezken CMD_WRITE sonrası beklenen süre (eski sabit değer)
+DEFAULT_WRITE_PREPARE_TIME = 1.0
+
+class SectorTimingTable:
+    """
+    Sektör başına gözlenen silme / yazma hazırlığı sürelerini öğrenen tablo
+
+    Ölçümler cihaz kimliğine (adaptör seri numarası / port ve STATUS desteği,
+    ör. "FT123|status") göre ayrı tutulur: STATUS ile ölçülen gerçek süreler
+    hazır bilgisi vermeyen eski bir karta asla uygulanmaz. Eski kartın
+    ölçümleri, ACK'ini işlem bitince gönderen bootloader'ın komut gidiş-dönüş
+    süresinden ve FINISH'in meşgul yanıtlarından gelir. Yeterli ölçüm yoksa
+    kılavuzdaki en kötü durum süresi kullanılır. Ölçüm biriktikçe sabit yerine
+    güvenli bir yüzdelik (varsayılan p95) ve küçük bir pay ile bekleme süresi
+    hesaplanır.
+
+    Dosyaya yazma arka plandaki bir thread'de yapılır; record() silme /
+    yükleme akışını disk işlemiyle bekletmez.
+    """
+
+    def __init__(self, path: Optional[str] = None, percentile: float = 0.95,
+                 margin: float = 1.2, min_samples: int = 3, max_samples: int = 50):
+        """
+        Args:
+            path: JSON dosyası (None: kullanıcı veri dizini, "" : sadece bellekte)
+            percentile: Bekleme süresi için kullanılacak yüzdelik (0-1)
+            margin: Yüzdelik değerinin çarpanı (güvenlik payı)
+            min_samples: Öğrenilmiş değerin kullanılması için gereken ölçüm sayısı
+            max_samples: Anahtar başına saklanan en fazla ölçüm
+        """
+        self.path = app_data_path("sector_timing.json") if path is None else path
+        self.percentile = percentile
+        self.margin = margin
+        self.min_samples = min_samples
+        self.max_samples = max_samples
+        self._lock = threading.Lock()
+        self._samples: Dict[str, Dict[str, List[float]]] = self._load()
+        self._dirty = False
+        self._saver: Optional[threading.Thread] = None
+
+    @staticmethod
+    def _key(operation: str, sector: int) -> str:
+        return f"{operation}:{sector}"
+
+    def _load(self) -> Dict[str, Dict[str, List[float]]]:
+        if not self.path:
+            return {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            # Cihaz kimliği olmayan eski düz kayıtlar ({"erase:3": [...]}) atlanır
+            return {device: {k: [float(x) for x in v] for k, v in entries.items()}
+                    for device, entries in data.items() if isinstance(entries, dict)}
+        except (OSError, ValueError, AttributeError, TypeError):
+            return {}
+
+    def _save_pending(self):
+        """Arka plan thread'i: tablo değiştikçe dosyaya yazar"""
+        while True:
+            with self._lock:
+                if not self._dirty:
+                    self._saver = None
+                    return
+                self._dirty = False
+                content = json.dumps(self._samples)
+            try:
+                tmp_path = self.path + ".tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    f.write(content)
+                os.replace(tmp_path, self.path)
+            except OSError as e:
+                logger.warning("Zamanlama tablosu kaydedilemedi: %s", e)
+
+    def flush(self):
+        """Bekleyen dosya yazımı bitene kadar bekler"""
+        while True:
+            with self._lock:
+                saver = self._saver
+            if saver is None:
+                return
+            saver.join()
+
+    @staticmethod
+    def default_delay(operation: str, sector: int) -> float:
+        """Ölçüm yokken kullanılan güvenli varsayılan"""
+        if operation == "erase":
+            return max_erase_time(sector)
+        return DEFAULT_WRITE_PREPARE_TIME
+
+    def samples(self, operation: str, sector: int, device: Optional[str] = None) -> List[float]:
+        with self._lock:
+            return list(self._samples.get(device or "", {}).get(self._key(operation, sector), []))
+
+    def record(self, operation: str, sector: int, duration: float, device: Optional[str] = None):
+        """Gözlenen bir süreyi cihazın kaydına ekler (dosyaya arka planda yazılır)"""
+        with self._lock:
+            entries = self._samples.setdefault(device or "", {})
+            values = entries.setdefault(self._key(operation, sector), [])
+            values.append(round(duration, 4))
+            del values[:-self.max_samples]
+            if not self.path:
+                return
+            self._dirty = True
+            if self._saver is None:
+                self._saver = threading.Thread(target=self._save_pending, name="SectorTimingSave", daemon=True)
+                self._saver.start()
+
+    def has_learned(self, operation: str, sector: int, device: Optional[str] = None) -> bool:
+        """Cihazın bu sektör için öğrenilmiş süre kullanacak kadar ölçümü var mı"""
+        return len(self.samples(operation, sector, device)) >= self.min_samples
+
+    def delay(self, operation: str, sector: int, device: Optional[str] = None) -> float:
+        """Cihazın bu sektör için beklemesi gereken güvenli süre"""
+        values = sorted(self.samples(operation, sector, device))
+        if len(values) < self.min_samples:
+            return self.default_delay(operation, sector)
+        index = min(len(values) - 1, math.ceil(self.percentile * len(values)) - 1)
+        return values[index] * self.margin
+
+    def expected(self, operation: str, sector: int, device: Optional[str] = None) -> float:
+        """Ölçümlerin medyanı (ölçüm yoksa varsayılan); ilerleme tahmini için"""
+        values = sorted(self.samples(operation, sector, device))
+        if not values:
+            return self.default_delay(operation, sector)
+        return values[len(values) // 2]
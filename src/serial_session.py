@@ -0,0 +1,157 @@
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+from .port_lock import PortBusyError, PortLock
+from .uart_comm import UARTCommunication
+
+logger = logging.getLogger(__name__)
+
+class SerialSession:
+    """
+    Portu işlemler boyunca açık tutan kalıcı oturum
+
+    - Port özel erişimle (exclusive) bir kez açılır, her silme/yazma işlemi
+      aynı bağlantıyı kullanır.
+    - Aynı anda tek bir işlem yürütülür (operation() kilidi).
+    - USB yeniden numaralandırıldığında (ör. /dev/ttyUSB0 -> /dev/ttyUSB1)
+      adaptör seri numarası ile yeni port bulunup bağlantı hızlıca yenilenir.
+    - Port açılmadan önce süreçler arası port kilidi alınır (bkz. PortLock);
+      yükleme servisi ve GUI aynı portu aynı anda açamaz. Kilit başka bir
+      süreçteyse PortBusyError (ConnectionError) yükseltilir.
+    """
+
+    def __init__(self, port: str, baudrate: int = 115200, reconnect_timeout: float = 5.0,
+                 poll_interval: float = 0.05, low_latency: bool = False, owner: str = ""):
+        """
+        Args:
+            port: Başlangıç portu (örn: 'COM3', '/dev/ttyUSB0')
+            baudrate: Baud rate
+            reconnect_timeout: Adaptörün yeniden görünmesi için beklenecek en uzun süre (saniye)
+            poll_interval: Yeniden bağlanırken port listesini tarama aralığı (saniye)
+            low_latency: Linux düşük gecikme ayarlarını uygula (bkz. UARTCommunication.connect)
+            owner: Port kilidinde görünen süreç adı (ör. "GUI", "yükleme servisi")
+        """
+        self.uart = UARTCommunication(port, baudrate)
+        self.reconnect_timeout = reconnect_timeout
+        self.poll_interval = poll_interval
+        self.low_latency = low_latency
+        self.owner = owner
+        self.adapter_serial: Optional[str] = None
+        self.reconnect_count = 0
+        self._lock = threading.RLock()
+        self._port_lock: Optional[PortLock] = None
+
+    @property
+    def port(self) -> str:
+        return self.uart.port
+
+    @property
+    def baudrate(self) -> int:
+        return self.uart.baudrate
+
+    @property
+    def is_connected(self) -> bool:
+        return self.uart.is_connected
+
+    def _acquire_port(self, port: str):
+        """Portun süreçler arası kilidini alır; port değiştiyse eskisini bırakır"""
+        if self._port_lock and self._port_lock.port == port and self._port_lock.held:
+            return
+        lock = PortLock(port, self.owner)
+        if not lock.acquire():
+            raise PortBusyError(f"Port kullanımda: {port} ({lock.holder() or 'başka bir süreç'})")
+        if self._port_lock:
+            self._port_lock.release()
+        self._port_lock = lock
+
+    def _release_port(self):
+        if self._port_lock:
+            self._port_lock.release()
+            self._port_lock = None
+
+    def open(self) -> bool:
+        """
+        Port kilidini alıp portu açar ve adaptör seri numarasını kaydeder
+
+        Raises:
+            PortBusyError: Port başka bir süreç tarafından kullanılıyor
+        """
+        with self._lock:
+            if self.uart.is_alive():
+                return True
+            self._acquire_port(self.uart.port)
+            if not self.uart.connect(exclusive=True, low_latency=self.low_latency):
+                self._release_port()
+                return False
+            self.adapter_serial = self.uart.get_adapter_serial()
+            return True
+
+    def close(self):
+        """Portu kapatır ve port kilidini bırakır"""
+        with self._lock:
+            self.uart.disconnect()
+            self._release_port()
+
+    def _find_port_by_serial(self) -> Optional[str]:
+        """Adaptör seri numarasına sahip portu arar"""
+        import serial.tools.list_ports
+        for info in serial.tools.list_ports.comports():
+            if info.serial_number and info.serial_number == self.adapter_serial:
+                return info.device
+        return None
+
+    def reconnect(self) -> bool:
+        """
+        Bağlantıyı yeniler; adaptör seri numarası biliniyorsa yeni port adını bulur
+
+        Returns:
+            bool: Yeniden bağlantı başarılı ise True
+        Raises:
+            PortBusyError: Port başka bir süreç tarafından kullanılıyor
+        """
+        with self._lock:
+            self.uart.disconnect()
+            deadline = time.time() + self.reconnect_timeout
+
+            while True:
+                if self.adapter_serial:
+                    port = self._find_port_by_serial()
+                    if port and port != self.uart.port:
+                        logger.debug("Adaptör %s yeni portta: %s", self.adapter_serial, port)
+                        self.uart.port = port
+                else:
+                    port = self.uart.port
+
+                if port:
+                    self._acquire_port(port)
+                if port and self.uart.connect(exclusive=True, low_latency=self.low_latency):
+                    self.reconnect_count += 1
+                    return True
+
+                if time.time() >= deadline:
+                    return False
+                time.sleep(self.poll_interval)
+
+    def ensure_connected(self) -> bool:
+        """Bağlantı kopmuşsa yeniden bağlanır"""
+        with self._lock:
+            if self.uart.is_alive():
+                return True
+            logger.warning("Port erişilemiyor, yeniden bağlanılıyor: %s", self.uart.port)
+            return self.reconnect()
+
+    @contextmanager
+    def operation(self) -> Iterator[UARTCommunication]:
+        """
+        Bir cihaz işlemi için portu özel olarak ayırır
+
+        Kullanım:
+            with session.operation() as uart:
+                uart.erase_sector(3)
+        """
+        with self._lock:
+            if not self.ensure_connected():
+                raise ConnectionError(f"Port yeniden açılamadı: {self.uart.port}")
+            yield self.uart
@@ -0,0 +1,248 @@
+import atexit
+import datetime
+import glob
+import gzip
+import logging
+import os
+import queue
+import re
+import shutil
+import threading
+from typing import Dict, List, Optional
+from .app_paths import app_logs_dir
+
+logger = logging.getLogger(__name__)
+
+# Diske hemen yazdırılan (flush + fsync) seviyeler: çökmede hata öncesi son satırlar kaybolmasın
+FLUSH_LEVELS = ("ERROR",)
+
+def session_logs_dir() -> str:
+    """Oturum logları dizini (log dizini/sessions)"""
+    path = os.path.join(app_logs_dir(), "sessions")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+def safe_log_name(name: str) -> str:
+    """Port adını dosya adına çevirir ('/dev/ttyUSB0' -> 'dev_ttyUSB0', 'tcp://h:4001' -> 'tcp_h_4001')"""
+    return re.sub(r"[^A-Za-z0-9.-]+", "_", name).strip("_") or "session"
+
+class SessionLog:
+    """
+    Tek bir oturumun (ör. bir port bağlantısı) disk logu
+
+    write() satırı yalnızca yazıcı kuyruğuna koyar; dosya işlemleri arka
+    plandaki LogWriter thread'inde yapılır. Dosya max_bytes'ı aşınca
+    <ad>.<n>.log olarak kenara alınır ve ayrı bir thread'de gzip ile
+    sıkıştırılır; en fazla backup_count eski dosya tutulur.
+    """
+
+    def __init__(self, name: str, directory: Optional[str] = None, writer: Optional["LogWriter"] = None,
+                 max_bytes: int = 5 * 1024 * 1024, backup_count: int = 5):
+        """
+        Args:
+            name: Oturum adı (ör. "gui_/dev/ttyUSB0"); dosya adına zaman damgası eklenir
+            directory: Log dizini (None: session_logs_dir())
+            writer: Arka plan yazıcısı (None: paylaşılan varsayılan)
+            max_bytes: Döndürme eşiği (byte)
+            backup_count: Saklanacak sıkıştırılmış eski dosya sayısı
+        """
+        stamp = datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
+        self.directory = directory or session_logs_dir()
+        self.base = os.path.join(self.directory, f"{safe_log_name(name)}_{stamp}")
+        self.path = self.base + ".log"
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.writer = writer or default_log_writer()
+        self.closed = False
+        self.dropped = 0  # Kuyruk dolu olduğu için atılan satırlar
+        self._dropped_reported = 0
+        # Aşağıdakiler yalnızca yazıcı thread'inde kullanılır
+        self._file = None
+        self._size = 0
+        self._rotations = 0
+
+    def write(self, message: str, level: str = "INFO") -> bool:
+        """
+        Satırı kuyruğa ekler (bloklamaz)
+
+        Returns:
+            bool: Kuyruk doluysa ve satır atıldıysa False
+        """
+        if self.closed:
+            return False
+        timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+        line = f"{timestamp} [{level}] {message}\n"
+        return self.writer.submit(self, line, flush=level in FLUSH_LEVELS)
+
+    def close(self):
+        """Kalan satırlar yazıldıktan sonra dosyayı kapatır (bloklamaz)"""
+        if not self.closed:
+            self.closed = True
+            self.writer.close_log(self)
+
+    # ------------------------------------------------------------------
+    # Yazıcı thread'i
+    # ------------------------------------------------------------------
+    def _write_lines(self, lines: List[str]):
+        if self._file is None:
+            self._file = open(self.path, "a", encoding="utf-8")
+            self._size = self._file.tell()
+        for line in lines:
+            size = len(line.encode("utf-8"))
+            if self._size and self._size + size > self.max_bytes:
+                self._rotate()
+            self._file.write(line)
+            self._size += size
+
+    def _rotate(self):
+        """Dolan dosyayı kenara alır, sıkıştırmayı arka plana bırakır"""
+        self._file.close()
+        self._rotations += 1
+        rotated = f"{self.base}.{self._rotations}.log"
+        os.replace(self.path, rotated)
+        threading.Thread(target=self._compress, args=(rotated,), name="log-compress", daemon=True).start()
+        self._file = open(self.path, "a", encoding="utf-8")
+        self._size = 0
+
+    def _compress(self, rotated: str):
+        try:
+            with open(rotated, "rb") as src, gzip.open(rotated + ".gz", "wb") as dst:
+                shutil.copyfileobj(src, dst)
+            os.remove(rotated)
+        except OSError as e:
+            logger.warning("Log sıkıştırılamadı (%s): %s", rotated, e)
+            return
+        # Sıkıştırmalar sırasız bitebilir: eşiği geçen tüm arşivler o anki döndürme sayısına göre silinir
+        expired = self._rotations - self.backup_count
+        for path in glob.glob(glob.escape(self.base) + ".*.log.gz"):
+            index = path[len(self.base) + 1:-len(".log.gz")]
+            if index.isdigit() and int(index) <= expired:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass  # Başka bir sıkıştırma thread'i sildi
+
+    def _flush(self, sync: bool):
+        if self._file is None:
+            return
+        self._file.flush()
+        if sync:
+            os.fsync(self._file.fileno())
+
+    def _close_file(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+class LogWriter:
+    """
+    Tüm oturum loglarını yazan arka plan thread'i
+
+    Kuyruk sınırlıdır: disk yavaşlarsa kuyruk dolar ve yeni INFO satırları
+    atılır (dropped sayacı); çağıran thread asla diske yazma beklemez.
+    ERROR satırları kuyrukta kısa süre yer bekler ve yazılır yazılmaz
+    flush + fsync yapılır. Diğer satırlar kuyruk boşaldığında flush edilir.
+    """
+
+    def __init__(self, max_queue: int = 10000, error_put_timeout: float = 0.05):
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue)
+        self.error_put_timeout = error_put_timeout
+        self.dropped = 0
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def _ensure_thread(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="session-log", daemon=True)
+                self._thread.start()
+
+    def submit(self, log: SessionLog, line: str, flush: bool = False) -> bool:
+        self._ensure_thread()
+        with self._lock:
+            missed = log.dropped - log._dropped_reported
+        if missed:
+            # Atılan satırların yeri dosyada belli olsun
+            line = f"... {missed} satır atıldı (log kuyruğu dolu)\n" + line
+        try:
+            if flush:
+                self._queue.put(("line", log, line, True), timeout=self.error_put_timeout)
+            else:
+                self._queue.put_nowait(("line", log, line, False))
+            if missed:
+                with self._lock:
+                    log._dropped_reported += missed
+            return True
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+                log.dropped += 1
+            return False
+
+    def close_log(self, log: SessionLog):
+        self._ensure_thread()
+        self._queue.put(("close", log, None, False))
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Kuyruktaki her şey diske yazılana kadar bekler (testler / kapanış için)"""
+        self._ensure_thread()
+        done = threading.Event()
+        self._queue.put(("flush", None, done, False))
+        return done.wait(timeout)
+
+    def _run(self):
+        open_logs: Dict[int, SessionLog] = {}
+        while True:
+            items = [self._queue.get()]
+            while len(items) < 500:
+                try:
+                    items.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            pending: Dict[int, List[str]] = {}
+            sync = set()
+            for kind, log, payload, flush in items:
+                if kind == "line":
+                    open_logs[id(log)] = log
+                    pending.setdefault(id(log), []).append(payload)
+                    if flush:
+                        sync.add(id(log))
+                elif kind == "close":
+                    self._write(log, pending.pop(id(log), []), sync=True)
+                    log._close_file()
+                    open_logs.pop(id(log), None)
+                elif kind == "flush":
+                    for key, lines in pending.items():
+                        self._write(open_logs[key], lines, sync=False)
+                    pending.clear()
+                    for log_ in open_logs.values():
+                        log_._flush(sync=False)
+                    payload.set()
+
+            for key, lines in pending.items():
+                self._write(open_logs[key], lines, sync=key in sync)
+            if self._queue.empty():
+                for log in open_logs.values():
+                    log._flush(sync=False)
+
+    @staticmethod
+    def _write(log: SessionLog, lines: List[str], sync: bool):
+        try:
+            if lines:
+                log._write_lines(lines)
+            log._flush(sync)
+        except (OSError, ValueError) as e:
+            logger.warning("Oturum logu yazılamadı (%s): %s", log.path, e)
+
+_default_writer: Optional[LogWriter] = None
+_default_lock = threading.Lock()
+
+def default_log_writer() -> LogWriter:
+    """Süreç genelinde paylaşılan log yazıcısı (çıkışta kuyruk diske yazılır)"""
+    global _default_writer
+    with _default_lock:
+        if _default_writer is None:
+            _default_writer = LogWriter()
+            atexit.register(_default_writer.flush, 2.0)
+        return _default_writer
@@ -0,0 +1,362 @@
+import gc
+import os
+import statistics
+import sys
+import threading
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional
+from .device_simulator import STM32BootloaderSimulator, TcpBootloaderDevice
+from .sector_timing import SectorTimingTable
+from .uart_comm import UARTCommunication
+
+SOAK_TARGETS = ("uart", "gui")
+
+@dataclass
+class SoakSample:
+    """Tek soak turunun ölçümleri (tur sonunda alınır)"""
+    iteration: int
+    elapsed: float                 # Soak başından beri (saniye)
+    duration: float                # Turun süresi (saniye)
+    throughput: float              # send_firmware hızı (byte/saniye; başarısız turda 0)
+    success: bool
+    message: str
+    rss: Optional[int]             # Süreç RSS (byte; ölçülemezse None)
+    traced: int                    # tracemalloc'un izlediği Python belleği (byte)
+    threads: int
+    fds: Optional[int]             # Açık dosya tanımlayıcıları (Linux / macOS; diğerlerinde None)
+    widget_lines: Optional[int] = None  # GUI log alanındaki satır sayısı (yalnızca gui hedefi)
+
+    def __str__(self) -> str:
+        rss = f"{self.rss / 1024 / 1024:.1f} MB" if self.rss is not None else "-"
+        fds = self.fds if self.fds is not None else "-"
+        text = (f"#{self.iteration} {'OK' if self.success else 'HATA'} {self.duration:.2f}s "
+                f"{self.throughput / 1024:.1f} KB/s rss {rss} py {self.traced / 1024:.0f} KB "
+                f"thread {self.threads} fd {fds}")
+        if self.widget_lines is not None:
+            text += f" log {self.widget_lines} satır"
+        return text
+
+@dataclass
+class SoakThresholds:
+    """
+    Başarısızlık eşikleri
+
+    Büyüme ve yavaşlama, ısınma turlarından sonraki ilk pencerenin medyanı
+    ile son pencerenin medyanı karşılaştırılarak hesaplanır; tek turluk
+    sıçramalar (GC, port açılışı) sonucu etkilemez.
+    """
+    warmup: int = 3                          # Önbellek / tablo dolarken ölçülmeyen turlar
+    window: int = 10                         # Medyanı alınan tur sayısı
+    max_rss_growth: int = 32 * 1024 * 1024   # byte
+    max_traced_growth: int = 8 * 1024 * 1024 # byte
+    max_thread_growth: int = 2
+    max_fd_growth: int = 4
+    max_slowdown: float = 0.25               # Hızdaki en fazla oransal düşüş
+    max_widget_lines: int = 5000
+    max_failures: int = 0
+
+def rss_bytes() -> Optional[int]:
+    """Sürecin anlık RSS'i (Linux: /proc; diğerlerinde tepe değer veya None)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+    except ImportError:
+        return None
+
+def open_fd_count() -> Optional[int]:
+    """Açık dosya tanımlayıcı sayısı (Windows'ta None)"""
+    for path in ("/proc/self/fd", "/dev/fd"):
+        try:
+            return len(os.listdir(path))
+        except OSError:
+            continue
+    return None
+
+@dataclass
+class SoakReport:
+    """Soak sonucu: tur ölçümleri, eşik ihlalleri ve en çok büyüyen bellek kaynakları"""
+    target: str
+    samples: List[SoakSample] = field(default_factory=list)
+    violations: List[str] = field(default_factory=list)
+    top_growth: List[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return bool(self.samples) and not self.violations
+
+    @property
+    def failures(self) -> int:
+        return sum(1 for sample in self.samples if not sample.success)
+
+    def summary(self) -> str:
+        if not self.samples:
+            return f"Soak ({self.target}): tur yok"
+        first, last = self.samples[0], self.samples[-1]
+        lines = [f"Soak ({self.target}): {'OK' if self.ok else 'BAŞARISIZ'}, {len(self.samples)} tur, "
+                 f"{last.elapsed / 60:.1f} dk, {self.failures} hatalı tur",
+                 f"  ilk: {first}",
+                 f"  son: {last}"]
+        lines += [f"  ❌ {violation}" for violation in self.violations]
+        if self.top_growth:
+            lines.append("  En çok büyüyen bellek (tracemalloc):")
+            lines += [f"    {line}" for line in self.top_growth]
+        return "\n".join(lines)
+
+class SoakMonitor:
+    """Tur ölçümlerini toplar ve eşiklerle karşılaştırır"""
+
+    def __init__(self, thresholds: Optional[SoakThresholds] = None, clock: Callable[[], float] = time.time):
+        self.thresholds = thresholds or SoakThresholds()
+        self.clock = clock
+        self.samples: List[SoakSample] = []
+        self._start = clock()
+        self._baseline_snapshot: Optional[tracemalloc.Snapshot] = None
+
+    def sample(self, iteration: int, duration: float, throughput: float, success: bool, message: str,
+               widget_lines: Optional[int] = None) -> SoakSample:
+        """Turun sonunda süreç kaynaklarını ölçer"""
+        gc.collect()  # Döngüsel referanslar (ör. json kodlayıcı closure'ları) büyüme gibi görünmesin
+        traced = tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else 0
+        sample = SoakSample(
+            iteration=iteration,
+            elapsed=self.clock() - self._start,
+            duration=duration,
+            throughput=throughput,
+            success=success,
+            message=message,
+            rss=rss_bytes(),
+            traced=traced,
+            threads=threading.active_count(),
+            fds=open_fd_count(),
+            widget_lines=widget_lines,
+        )
+        self.samples.append(sample)
+        if len(self.samples) == self.thresholds.warmup + self.thresholds.window and tracemalloc.is_tracing():
+            # Taban pencerenin sonu: bellek büyümesi bu noktaya göre raporlanır
+            self._baseline_snapshot = tracemalloc.take_snapshot()
+        return sample
+
+    @staticmethod
+    def _median(samples: List[SoakSample], attr: str) -> Optional[float]:
+        values = [getattr(s, attr) for s in samples if getattr(s, attr) is not None]
+        return statistics.median(values) if values else None
+
+    def check(self) -> List[str]:
+        """Eşik ihlalleri (yeterli tur yoksa yalnızca hata sayısı ve log alanı kontrol edilir)"""
+        t = self.thresholds
+        violations = []
+        failures = sum(1 for s in self.samples if not s.success)
+        if failures > t.max_failures:
+            last_error = next(s for s in reversed(self.samples) if not s.success)
+            violations.append(f"{failures} tur başarısız (son: {last_error.message})")
+        lines = self.samples[-1].widget_lines if self.samples else None
+        if lines is not None and lines > t.max_widget_lines:
+            violations.append(f"GUI log alanı {lines} satır (sınır {t.max_widget_lines})")
+
+        if len(self.samples) < t.warmup + 2 * t.window:
+            return violations
+        baseline = self.samples[t.warmup:t.warmup + t.window]
+        recent = self.samples[-t.window:]
+
+        def growth(attr: str) -> Optional[float]:
+            before, after = self._median(baseline, attr), self._median(recent, attr)
+            return None if before is None or after is None else after - before
+
+        for attr, limit, label, scale, unit, digits in (
+            ("rss", t.max_rss_growth, "RSS", 1 / 1024 / 1024, " MB", 1),
+            ("traced", t.max_traced_growth, "Python belleği", 1 / 1024 / 1024, " MB", 1),
+            ("threads", t.max_thread_growth, "Thread sayısı", 1, "", 0),
+            ("fds", t.max_fd_growth, "Dosya tanımlayıcı", 1, "", 0),
+        ):
+            value = growth(attr)
+            if value is not None and value > limit:
+                violations.append(f"{label} {value * scale:+.{digits}f}{unit} büyüdü "
+                                  f"(sınır {limit * scale:.{digits}f}{unit})")
+
+        before = self._median(baseline, "throughput")
+        after = self._median(recent, "throughput")
+        if before and after is not None and 1 - after / before > t.max_slowdown:
+            violations.append(f"Hız %{(1 - after / before) * 100:.0f} düştü "
+                              f"({before / 1024:.1f} -> {after / 1024:.1f} KB/s, sınır %{t.max_slowdown * 100:.0f})")
+        return violations
+
+    def top_growth(self, limit: int = 5) -> List[str]:
+        """Taban pencereden bu yana en çok büyüyen tahsis satırları"""
+        if self._baseline_snapshot is None or not tracemalloc.is_tracing():
+            return []
+        stats = tracemalloc.take_snapshot().compare_to(self._baseline_snapshot, "lineno")
+        return [str(stat) for stat in stats[:limit] if stat.size_diff > 0]
+
+class UartSoakTarget:
+    """Her turda UARTCommunication ile bağlan, sil, yükle, bağlantıyı kes"""
+
+    name = "uart"
+
+    def __init__(self, url: str, firmware: bytes, sector: int, data_dir: Optional[str] = None):
+        self.url = url
+        self.firmware = firmware
+        self.sector = sector
+        # Turlar arasında paylaşılır: gerçek kullanımdaki gibi tablo bir kez dolar
+        self.timing_table = SectorTimingTable(os.path.join(data_dir, "sector_timing.json") if data_dir else None)
+
+    def iteration(self) -> tuple:
+        """(başarılı_mı, mesaj, yükleme_süresi, log_satırı)"""
+        uart = UARTCommunication(self.url)
+        uart.record_history = False
+        uart.timing_table = self.timing_table
+        if not uart.connect():
+            return False, f"Bağlantı kurulamadı: {self.url}", 0.0, None
+        try:
+            success, message = uart.erase_sector(self.sector)
+            if not success:
+                return False, message, 0.0, None
+            start = time.perf_counter()
+            success, message = uart.send_firmware(self.firmware, self.sector)
+            return success, message, time.perf_counter() - start, None
+        finally:
+            uart.disconnect()
+
+    def close(self):
+        self.timing_table.flush()
+
+class GuiSoakTarget:
+    """
+    STM32BootloaderGUI'nin işçi yollarını gizli bir Tk kökü üzerinden çalıştırır
+
+    Her turda Bağlan -> Sektör Sil -> Firmware Gönder -> Bağlantıyı Kes
+    butonlarının komutları çağrılır ve sonuçlar gelene kadar olay döngüsü
+    döndürülür. Log alanının satır sayısı ölçülür. Ekran (DISPLAY) gerekir.
+    """
+
+    name = "gui"
+
+    def __init__(self, url: str, firmware: bytes, sector: int, op_timeout: float = 60.0,
+                 data_dir: Optional[str] = None):
+        from .gui import STM32BootloaderGUI  # tkinter yalnızca bu hedefte gerekir
+        self.url = url
+        self.firmware = firmware
+        self.sector = sector
+        self.op_timeout = op_timeout
+        self.app = STM32BootloaderGUI(data_dir=data_dir)
+        self.app.root.withdraw()
+        # Soak simülatöre doğrudan bağlanır; makinede çalışan yükleme servisi araya girmemeli
+        self.app.use_daemon = False
+
+    def _pump(self, until: Callable[[], bool]):
+        deadline = time.time() + self.op_timeout
+        while not until():
+            if time.time() > deadline:
+                raise TimeoutError("GUI işlemi zaman aşımına uğradı")
+            self.app.root.update()
+            time.sleep(0.002)
+
+    def _idle(self) -> bool:
+        app = self.app
+        return not (app.executor and app.executor.busy) and app.poller.pending == 0
+
+    def _widget_lines(self) -> int:
+        return int(self.app.log_text.index("end-1c").split(".")[0])
+
+    def iteration(self) -> tuple:
+        app = self.app
+        app.port_var.set(self.url)
+        app.firmware_data = self.firmware
+        app.sector_var.set(str(self.sector))
+        app.erase_sector_var.set(str(self.sector))
+
+        app.toggle_connection()
+        self._pump(lambda: app.poller.pending == 0)
+        if not (app.session and app.session.is_connected):
+            return False, f"Bağlantı kurulamadı: {self.url}", 0.0, self._widget_lines()
+        app.session.uart.record_history = False
+        try:
+            app.erase_sector_thread()
+            self._pump(self._idle)
+            if not app.erase_status.cget("text").startswith("✅"):
+                return False, "Sektör silinemedi", 0.0, self._widget_lines()
+
+            start = time.perf_counter()
+            app.send_firmware_thread()
+            self._pump(self._idle)
+            elapsed = time.perf_counter() - start
+            success = app.progress_text.cget("text").startswith("✅")
+            return success, "Firmware gönderildi" if success else "Firmware gönderilemedi", elapsed, self._widget_lines()
+        finally:
+            app.toggle_connection()
+            self._pump(lambda: app.poller.pending == 0)
+
+    def close(self):
+        self.app.on_closing()
+
+def run_soak(target: str = "uart", iterations: Optional[int] = None, duration: Optional[float] = None,
+             image_size: int = 32 * 1024, sector: int = 5, thresholds: Optional[SoakThresholds] = None,
+             on_sample: Optional[Callable[[SoakSample], None]] = None, trace_frames: int = 1,
+             data_dir: Optional[str] = None) -> SoakReport:
+    """
+    Yerel simüle cihaza (TCP üzerinden) art arda silme + yükleme yapar
+
+    Args:
+        target: "uart" (UARTCommunication doğrudan) veya "gui" (gizli Tk kökü)
+        iterations: Tur sayısı (None: duration dolana kadar)
+        duration: En uzun süre (saniye; None: iterations kadar)
+        image_size: Yüklenecek görüntü boyutu (byte)
+        sector: Hedef sektör
+        thresholds: Başarısızlık eşikleri
+        on_sample: Her tur sonrası çağrılır
+        trace_frames: tracemalloc'un sakladığı çağrı derinliği
+        data_dir: Zamanlama tablosu ve (gui hedefinde) loglar / geçmiş için dizin
+            (None: kullanıcı veri dizini)
+    Returns:
+        SoakReport (ilk eşik ihlalinde durulur)
+    """
+    if target not in SOAK_TARGETS:
+        raise ValueError(f"Geçersiz soak hedefi: {target} ({', '.join(SOAK_TARGETS)})")
+    if iterations is None and duration is None:
+        raise ValueError("iterations veya duration verilmeli")
+
+    firmware = bytes((i * 7) & 0xFF for i in range(image_size))
+    report = SoakReport(target)
+    started_tracing = not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start(trace_frames)
+    monitor = SoakMonitor(thresholds)
+    deadline = time.time() + duration if duration is not None else None
+
+    with TcpBootloaderDevice(STM32BootloaderSimulator(erase_time_scale=0.01)) as device:
+        runner = UartSoakTarget(device.url, firmware, sector, data_dir=data_dir) if target == "uart" \
+            else GuiSoakTarget(device.url, firmware, sector, data_dir=data_dir)
+        try:
+            iteration = 0
+            while (iterations is None or iteration < iterations) and (deadline is None or time.time() < deadline):
+                iteration += 1
+                start = time.perf_counter()
+                try:
+                    success, message, flash_time, widget_lines = runner.iteration()
+                except (OSError, TimeoutError) as e:
+                    success, message, flash_time, widget_lines = False, str(e), 0.0, None
+                throughput = len(firmware) / flash_time if success and flash_time > 0 else 0.0
+                sample = monitor.sample(iteration, time.perf_counter() - start, throughput,
+                                        success, message, widget_lines)
+                # Simülatörün paket kaydı test aracıdır, ölçülen sürecin parçası değildir
+                device.device.received_types.clear()
+                if on_sample:
+                    on_sample(sample)
+                report.violations = monitor.check()
+                if report.violations:
+                    break
+        finally:
+            runner.close()
+
+    report.samples = monitor.samples
+    report.top_growth = monitor.top_growth()
+    if started_tracing:
+        tracemalloc.stop()
+    return report
@@ -1,8 +1,8 @@
 import struct
 import zlib
-from typing import Tuple, Optional
+from dataclasses import dataclass
+from typing import List, Tuple, Optional
 from enum import IntEnum
-import time
 
 class MessageType(IntEnum):
     """Mesaj tiplerini tanımlayan enum"""
@@ -10,12 +10,28 @@ class MessageType(IntEnum):
     CMD_ERASE = 0x02
     DATA = 0x03
     FINISH = 0x04
+    PING = 0x05      # No-op: bağlantı testi için, cihaz sadece ACK döner
+    SET_BAUD = 0x06  # Baud rate değişimi: ACK sonrası cihaz yeni hıza geçer
+    STATUS = 0x07    # Hazır mı sorgusu: hazırsa ACK, flash işlemi sürüyorsa NACK 0x06
+
+NACK_ERROR_MESSAGES = {
+    0x01: "Bilinmeyen mesaj tipi",
+    0x02: "CRC kontrolü başarısız", 
+    0x03: "Mesaj kuyruğu dolu",
+    0x04: "Komut verisi geçersiz (sektör out-of-range)",
+    0x05: "Mesaj sıralaması hatalı (CMD gelmeden DATA)",
+    0x06: "Cihaz meşgul (flash işlemi sürüyor)"
+}
 
 class STM32Protocol:
     """STM32 bootloader protokol işlemleri için ana sınıf"""
     
     PACKET_SIZE = 21
     DATA_PAYLOAD_SIZE = 16  # DATA paketinde maksimum 16 byte veri
+    ACK_BYTE = 0xAA
+    NACK_BYTE = 0x55
+    NACK_UNKNOWN_TYPE = 0x01
+    NACK_BUSY = 0x06
     
     @staticmethod
     def calculate_crc32(data: bytes) -> int:
@@ -28,17 +44,10 @@ class STM32Protocol:
         #         crc = (crc >> 1) ^ (0xEDB88320U & -(crc & 1));
         # }
         # return ~crc;
-        
-        crc = 0xFFFFFFFF
-        for byte in data:
-            crc ^= byte
-            for _ in range(8):
-                # STM32'deki -(crc & 1) ifadesi: eğer crc & 1 ise 0xFFFFFFFF, değilse 0
-                if crc & 1:
-                    crc = (crc >> 1) ^ 0xEDB88320
-                else:
-                    crc = crc >> 1
-        return ~crc & 0xFFFFFFFF
+        #
+        # Bu, standart (yansıtılmış) CRC-32 ile birebir aynıdır; zlib'in C
+        # uygulaması byte başına 8 Python döngüsü yerine tablo kullanır.
+        return zlib.crc32(data) & 0xFFFFFFFF
     
     @staticmethod
     def create_cmd_write_packet(sector: int) -> bytes:
@@ -136,6 +145,82 @@ class STM32Protocol:
         
         return bytes(packet)
     
+    @staticmethod
+    def create_ping_packet() -> bytes:
+        """
+        PING paketi oluşturur (no-op, bağlantı kalitesi ölçümü için)
+        Format: 0x05 + padding(16) + CRC32(4)
+        CRC32: İlk 17 byte üzerinden hesaplanır
+        """
+        packet = bytearray(STM32Protocol.PACKET_SIZE)
+        packet[0] = MessageType.PING  # 0x05
+        # packet[1:17] zaten 0 (padding)
+        
+        crc_offset = STM32Protocol.PACKET_SIZE - 4
+        crc32 = STM32Protocol.calculate_crc32(packet[:crc_offset])
+        packet[crc_offset:] = struct.pack('<I', crc32)
+        
+        return bytes(packet)
+    
+    @staticmethod
+    def create_set_baud_packet(baudrate: int) -> bytes:
+        """
+        SET_BAUD paketi oluşturur
+        Format: 0x06 + baudrate(4, little-endian) + padding(12) + CRC32(4)
+        CRC32: İlk 17 byte üzerinden hesaplanır
+        """
+        if baudrate <= 0 or baudrate > 0xFFFFFFFF:
+            raise ValueError("Baud rate 32-bit pozitif bir sayı olmalıdır")
+        
+        packet = bytearray(STM32Protocol.PACKET_SIZE)
+        packet[0] = MessageType.SET_BAUD  # 0x06
+        packet[1:5] = struct.pack('<I', baudrate)
+        # packet[5:17] zaten 0 (padding)
+        
+        crc_offset = STM32Protocol.PACKET_SIZE - 4
+        crc32 = STM32Protocol.calculate_crc32(packet[:crc_offset])
+        packet[crc_offset:] = struct.pack('<I', crc32)
+        
+        return bytes(packet)
+    
+    @staticmethod
+    def create_status_packet() -> bytes:
+        """
+        STATUS paketi oluşturur (silme/yazma hazırlığı bitti mi sorgusu)
+        Format: 0x07 + padding(16) + CRC32(4)
+        CRC32: İlk 17 byte üzerinden hesaplanır
+        """
+        packet = bytearray(STM32Protocol.PACKET_SIZE)
+        packet[0] = MessageType.STATUS  # 0x07
+        # packet[1:17] zaten 0 (padding)
+        
+        crc_offset = STM32Protocol.PACKET_SIZE - 4
+        crc32 = STM32Protocol.calculate_crc32(packet[:crc_offset])
+        packet[crc_offset:] = struct.pack('<I', crc32)
+        
+        return bytes(packet)
+    
+    @staticmethod
+    def verify_packet_crc(packet: bytes) -> bool:
+        """Paketin son 4 byte'ındaki CRC32'nin doğru olduğunu kontrol eder"""
+        if not STM32Protocol.verify_packet_size(packet):
+            return False
+        crc_offset = STM32Protocol.PACKET_SIZE - 4
+        expected = struct.unpack('<I', packet[crc_offset:])[0]
+        return STM32Protocol.calculate_crc32(packet[:crc_offset]) == expected
+    
+    @staticmethod
+    def encode_data_stream(firmware_data: bytes) -> bytes:
+        """
+        Firmware'i art arda eklenmiş DATA paketlerinden oluşan tek bir byte dizisine çevirir
+        i. paket: stream[i*21:(i+1)*21]
+        """
+        data_size = STM32Protocol.DATA_PAYLOAD_SIZE
+        stream = bytearray()
+        for start in range(0, len(firmware_data), data_size):
+            stream += STM32Protocol.create_data_packet(firmware_data[start:start + data_size])
+        return bytes(stream)
+    
     @staticmethod
     def verify_packet_size(packet: bytes) -> bool:
         """Paket boyutunun doğru olduğunu kontrol eder"""
@@ -152,7 +237,6 @@ class STM32Protocol:
         
         first_byte = response[0]
         if first_byte == 0xAA:      # ACK
-            time.sleep(0.2)       # 2 ms STM32'nin RX'i yeniden açması için
             return True, "ACK alındı"
         elif first_byte == 0x55:  # NACK
             # NACK durumunda hata kodu kontrol et
@@ -170,12 +254,98 @@ class STM32Protocol:
         """
         NACK hata koduna göre açıklama döner
         """
-        error_messages = {
-            0x01: "Bilinmeyen mesaj tipi",
-            0x02: "CRC kontrolü başarısız", 
-            0x03: "Mesaj kuyruğu dolu",
-            0x04: "Komut verisi geçersiz (sektör out-of-range)",
-            0x05: "Mesaj sıralaması hatalı (CMD gelmeden DATA)"
-        }
-        
-        return error_messages.get(error_code, f"Bilinmeyen hata kodu: 0x{error_code:02X}") 
\ No newline at end of file
+        return NACK_ERROR_MESSAGES.get(error_code, f"Bilinmeyen hata kodu: 0x{error_code:02X}")
+
+class ResponseType(IntEnum):
+    """Bootloader yanıt tipleri"""
+    ACK = 0xAA
+    NACK = 0x55
+
+@dataclass(frozen=True)
+class ResponseEvent:
+    """Çözülmüş tek bir bootloader yanıtı"""
+    type: ResponseType
+    code: Optional[int] = None  # NACK hata kodu (yoksa None)
+
+    @property
+    def is_ack(self) -> bool:
+        return self.type == ResponseType.ACK
+
+    @property
+    def message(self) -> str:
+        if self.is_ack:
+            return "ACK alındı"
+        if self.code is None:
+            return "NACK alındı (Hata kodu yok)"
+        error_message = STM32Protocol.get_nack_error_message(self.code)
+        return f"NACK: {error_message} (Kod: 0x{self.code:02X})"
+
+    def __str__(self) -> str:
+        if self.is_ack:
+            return "ACK"
+        return "NACK" if self.code is None else f"NACK(0x{self.code:02X})"
+
+class ResponseDecoder:
+    """
+    Seri porttan gelen byte parçalarını ACK/NACK olaylarına çeviren artımlı çözücü
+
+    - Parçalar istenen boyutta verilebilir (tek byte veya birikmiş bir blok).
+    - ACK/NACK dışındaki byte'lar (boot banner'ı, hat gürültüsü) atlanır ve
+      noise_bytes'ta sayılır; çözücü bir sonraki geçerli yanıtta senkron olur.
+    - NACK'ten sonra gelen byte bilinen bir hata koduysa NACK'e eklenir.
+      Yazdırılabilir bir ASCII karakter gelirse NACK byte'ı ('U' = 0x55)
+      metnin parçası sayılıp gürültü olarak atlanır. ACK gelirse NACK kodsuz
+      kabul edilir ve ACK yeniden işlenir. Başka her byte (ör. yeni bir
+      firmware'in 0xFF'i) bilinmeyen hata kodu olarak NACK'e eklenir.
+    - NACK'ten sonra henüz byte gelmediyse `pending` True'dur; çağıran taraf
+      kısa bir süre sonra flush() ile kodsuz NACK'i alabilir.
+    """
+
+    def __init__(self):
+        self.noise_bytes = 0
+        self._pending_nack = False
+
+    @property
+    def pending(self) -> bool:
+        """Hata kodu beklenen bir NACK var mı"""
+        return self._pending_nack
+
+    @staticmethod
+    def _is_text(byte: int) -> bool:
+        return 0x20 <= byte <= 0x7E or byte in (0x09, 0x0A, 0x0D)
+
+    def feed(self, chunk: bytes) -> List[ResponseEvent]:
+        """Yeni byte'ları işler ve tamamlanan yanıtları sırayla döner"""
+        events: List[ResponseEvent] = []
+        for byte in chunk:
+            if self._pending_nack:
+                self._pending_nack = False
+                if byte in NACK_ERROR_MESSAGES:
+                    events.append(ResponseEvent(ResponseType.NACK, byte))
+                    continue
+                if self._is_text(byte):
+                    self.noise_bytes += 2  # 'U' + metin karakteri
+                    continue
+                if byte != ResponseType.ACK:
+                    events.append(ResponseEvent(ResponseType.NACK, byte))  # Bilinmeyen hata kodu
+                    continue
+                events.append(ResponseEvent(ResponseType.NACK))
+
+            if byte == ResponseType.ACK:
+                events.append(ResponseEvent(ResponseType.ACK))
+            elif byte == ResponseType.NACK:
+                self._pending_nack = True
+            else:
+                self.noise_bytes += 1
+        return events
+
+    def flush(self) -> List[ResponseEvent]:
+        """Hata kodu gelmeyen NACK'i kodsuz olarak tamamlar"""
+        if self._pending_nack:
+            self._pending_nack = False
+            return [ResponseEvent(ResponseType.NACK)]
+        return []
+
+    def reset(self):
+        """Yarım kalan durumu siler (buffer temizliğinden sonra)"""
+        self._pending_nack = False
@@ -0,0 +1,212 @@
+import logging
+import math
+import statistics
+import zlib
+from dataclasses import dataclass, field
+from typing import Iterable, List, Optional
+from .stm32_protocol import STM32Protocol
+
+logger = logging.getLogger(__name__)
+
+# 8N1: başlangıç + 8 veri + bitiş biti
+BITS_PER_BYTE = 10
+
+# Aktarım modları. Bu bootloader yalnızca stop-and-wait'i destekler (her DATA
+# paketinin ACK'i beklenir); diğerleri protokol genişletilirse ne kazanılacağını
+# göstermek için tahmin edilir ve otomatik seçimde atlanır.
+STOP_AND_WAIT = "stop_and_wait"
+WINDOWED = "windowed"
+LARGE_FRAMES = "large_frames"
+COMPRESSED = "compressed"
+SPARSE = "sparse"
+TRANSFER_MODES = (STOP_AND_WAIT, WINDOWED, LARGE_FRAMES, COMPRESSED, SPARSE)
+SUPPORTED_MODES = (STOP_AND_WAIT,)
+
+WINDOW_SIZE = 8              # windowed: ACK beklemeden gönderilen paket sayısı
+LARGE_FRAME_PAYLOAD = 256    # large_frames: paket başına veri (byte)
+SPARSE_ADDRESS_BYTES = 4     # sparse: her pakete eklenecek hedef adres
+
+# Ölçüm yokken paket gönderimi ile ACK arasındaki, telde geçmeyen süre
+# (cihazın işlemesi + USB-UART adaptör gecikmesi)
+DEFAULT_TURNAROUND = 0.004
+
+def wire_time(nbytes: int, baudrate: int) -> float:
+    """nbytes'ın hatta geçme süresi (saniye)"""
+    return nbytes * BITS_PER_BYTE / baudrate
+
+@dataclass
+class LinkProfile:
+    """Bağlantının ölçülen (veya varsayılan) gecikme özellikleri"""
+    baudrate: int
+    turnaround: float      # Paket sonu -> ACK başı arası bekleme (saniye)
+    guard_time: float      # ACK sonrası sonraki paket öncesi bekleme (saniye)
+    prepare: float         # CMD_WRITE + cihaz hazır bekleme (saniye)
+    finish: float          # FINISH gidiş-dönüşü (saniye)
+    source: str = "varsayılan"  # "geçmiş", "rto" veya "varsayılan"
+
+    @property
+    def ack_time(self) -> float:
+        """Paket sonundan sonraki paketin yazılabileceği ana kadar (ACK + bekleme + guard)"""
+        return wire_time(1, self.baudrate) + self.turnaround + self.guard_time
+
+    def frame_time(self, frame_bytes: int = STM32Protocol.PACKET_SIZE) -> float:
+        """ACK'i beklenen tek paketin süresi"""
+        return wire_time(frame_bytes, self.baudrate) + self.ack_time
+
+    def __str__(self) -> str:
+        return (f"{self.baudrate} baud, paket {self.frame_time() * 1000:.2f} ms "
+                f"(bekleme {self.turnaround * 1000:.2f} ms, guard {self.guard_time * 1000:.1f} ms, {self.source})")
+
+def estimate_link(baudrate: int, guard_time: float = 0.002, sector: Optional[int] = None,
+                  history=None, port: Optional[str] = None, rtt: Optional[float] = None,
+                  timing_table=None, history_limit: int = 20, device: Optional[str] = None) -> LinkProfile:
+    """
+    Bağlantı profilini önceki oturumlardan çıkarır
+
+    Öncelik: aynı port ve baud rate'teki son başarılı yüklemeler (DATA aşaması
+    süresi / paket sayısı), sonra bu bağlantıda ölçülen DATA gidiş-dönüşü
+    (RTO tahmincisinin SRTT'si), yoksa varsayılan bekleme süresi.
+
+    Args:
+        baudrate: Baud rate
+        guard_time: Taşıma katmanının guard süresi (saniye)
+        sector: Hedef sektör (hazırlık süresi için)
+        history: FlashHistory (None: geçmiş kullanılmaz)
+        port: Geçmişte aranacak port
+        rtt: Ölçülmüş DATA gidiş-dönüş süresi (saniye)
+        timing_table: SectorTimingTable (hazırlık süresi için)
+        history_limit: Kullanılacak en fazla geçmiş oturum
+        device: Zamanlama tablosundaki cihaz kimliği (None: kılavuz varsayılanları)
+    """
+    packet_wire = wire_time(STM32Protocol.PACKET_SIZE, baudrate) + wire_time(1, baudrate)
+    prepare = timing_table.delay("write", sector, device) if timing_table is not None and sector is not None else 1.0
+
+    records = []
+    if history is not None:
+        try:
+            records = [r for r in history.recent(history_limit * 3, "flash", port)
+                       if r.success and r.baudrate == baudrate and r.packets and "data" in r.phases]
+        except Exception as e:
+            logger.warning("Yükleme geçmişi okunamadı: %s", e)
+    records = records[:history_limit]
+    if records:
+        per_packet = statistics.median(r.phases["data"] / r.packets for r in records)
+        turnaround = max(0.0, per_packet - packet_wire - guard_time)
+        prepares = [r.phases["prepare"] for r in records if "prepare" in r.phases]
+        finishes = [r.phases["finish"] for r in records if "finish" in r.phases]
+        return LinkProfile(baudrate, turnaround, guard_time,
+                           statistics.median(prepares) if prepares else prepare,
+                           statistics.median(finishes) if finishes else per_packet,
+                           f"geçmiş ({len(records)} oturum)")
+
+    if rtt is not None:
+        turnaround = max(0.0, rtt - packet_wire)
+        return LinkProfile(baudrate, turnaround, guard_time, prepare, rtt + guard_time, "rto")
+
+    return LinkProfile(baudrate, DEFAULT_TURNAROUND, guard_time, prepare,
+                       packet_wire + DEFAULT_TURNAROUND + guard_time)
+
+@dataclass
+class ModePrediction:
+    """Bir aktarım modu için tahmin"""
+    mode: str
+    supported: bool
+    packets: int
+    duration: float   # Hazırlık + veri + FINISH (+ silme) (saniye)
+    note: str = ""
+
+    def __str__(self) -> str:
+        details = [f"{self.packets} paket"] + ([self.note] if self.note else [])
+        if not self.supported:
+            details.append("cihaz desteklemiyor")
+        return f"{self.mode}: {format_duration(self.duration)} ({', '.join(details)})"
+
+@dataclass
+class TransferPlan:
+    """Görüntünün her aktarım modu için süre tahmini"""
+    image_size: int
+    link: LinkProfile
+    erase_time: float = 0.0
+    predictions: List[ModePrediction] = field(default_factory=list)
+    actual: Optional[float] = None  # Yükleme bitince ölçülen süre (saniye; silme hariç)
+
+    def best(self) -> ModePrediction:
+        """Cihazın desteklediği en hızlı mod"""
+        supported = [p for p in self.predictions if p.supported]
+        if not supported:
+            raise ValueError("Desteklenen aktarım modu yok")
+        return min(supported, key=lambda p: p.duration)
+
+    @property
+    def flash_duration(self) -> float:
+        """Seçilen modun silme hariç tahmini (actual ile karşılaştırılır)"""
+        return self.best().duration - self.erase_time
+
+    def prediction(self, mode: str) -> Optional[ModePrediction]:
+        return next((p for p in self.predictions if p.mode == mode), None)
+
+    def summary(self) -> str:
+        best = self.best()
+        return f"~{format_duration(best.duration)} ({best.mode}, {best.packets} paket @ {self.link.baudrate})"
+
+    def table(self) -> List[str]:
+        """Mod başına bir satır (seçilen mod işaretli)"""
+        best = self.best()
+        return [("➡️ " if p is best else "   ") + str(p) for p in self.predictions]
+
+    def compare(self, actual: Optional[float] = None) -> str:
+        """Gerçek süreyi seçilen modun tahminiyle karşılaştırır (model kalibrasyonu için loglanır)"""
+        actual = self.actual if actual is None else actual
+        predicted = self.flash_duration
+        if actual is None:
+            return f"tahmin {format_duration(predicted)} ({self.link.source})"
+        error = (actual - predicted) / predicted * 100 if predicted else 0.0
+        return f"gerçek {format_duration(actual)}, tahmin {format_duration(predicted)} (%{error:+.0f}, {self.link.source})"
+
+def format_duration(seconds: float) -> str:
+    if seconds >= 90:
+        return f"{seconds / 60:.1f} dk"
+    return f"{seconds:.1f} s"
+
+def plan_transfer(image: bytes, link: LinkProfile, supported: Iterable[str] = SUPPORTED_MODES,
+                  erase_time: float = 0.0) -> TransferPlan:
+    """
+    Görüntünün aktarım süresini her mod için tahmin eder
+
+    Args:
+        image: Gönderilecek görüntü (ön işlemden geçmiş haliyle)
+        link: Bağlantı profili (bkz. estimate_link)
+        supported: Cihazın desteklediği modlar
+        erase_time: Yükleme öncesi silme süresi (saniye; tüm modlara eklenir)
+    """
+    supported = set(supported)
+    payload = STM32Protocol.DATA_PAYLOAD_SIZE
+    header = STM32Protocol.PACKET_SIZE - payload  # Tip + CRC32
+    fixed = link.prepare + link.finish + erase_time
+    plan = TransferPlan(len(image), link, erase_time)
+
+    def add(mode: str, packets: int, data_time: float, note: str = ""):
+        plan.predictions.append(ModePrediction(mode, mode in supported, packets, fixed + data_time, note))
+
+    packets = math.ceil(len(image) / payload)
+    add(STOP_AND_WAIT, packets, packets * link.frame_time())
+
+    # Pencereli: WINDOW_SIZE paket art arda, pencere başına tek ACK
+    windows = math.ceil(packets / WINDOW_SIZE)
+    add(WINDOWED, packets, packets * wire_time(STM32Protocol.PACKET_SIZE, link.baudrate) + windows * link.ack_time,
+        f"pencere {WINDOW_SIZE}")
+
+    frames = math.ceil(len(image) / LARGE_FRAME_PAYLOAD)
+    add(LARGE_FRAMES, frames, frames * link.frame_time(LARGE_FRAME_PAYLOAD + header),
+        f"{LARGE_FRAME_PAYLOAD} byte")
+
+    compressed = len(zlib.compress(image, 6)) if image else 0
+    compressed_packets = math.ceil(compressed / payload)
+    add(COMPRESSED, compressed_packets, compressed_packets * link.frame_time(),
+        f"zlib %{compressed / len(image) * 100 if image else 0:.0f}, cihazda açma hariç")
+
+    # Seyrek: tamamı silinmiş (0xFF) bloklar atlanır, her paket hedef adres taşır
+    blocks = sum(1 for i in range(0, len(image), payload) if image[i:i + payload].strip(b"\xff"))
+    add(SPARSE, blocks, blocks * link.frame_time(STM32Protocol.PACKET_SIZE + SPARSE_ADDRESS_BYTES))
+
+    return plan
@@ -0,0 +1,247 @@
+import abc
+import select
+import socket
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional, Tuple
+import serial
+
+@dataclass(frozen=True)
+class TransportDefaults:
+    """Bağlantı türüne göre gecikme ayarları (UARTCommunication'a uygulanır)"""
+    guard_time: float           # Yanıttan sonra sonraki paket öncesi bekleme (saniye)
+    response_timeout: float     # ACK/NACK bekleme süresi (saniye)
+    nack_code_timeout: float    # NACK sonrası hata kodu byte'ı için bekleme (saniye)
+    status_poll_timeout: float  # Tek STATUS sorgusunun yanıt süresi (saniye)
+
+# Yerel UART: STM32'nin RX'i yeniden açması için kısa guard süresi yeterli
+LOCAL_SERIAL_DEFAULTS = TransportDefaults(
+    guard_time=0.002, response_timeout=10.0, nack_code_timeout=0.05, status_poll_timeout=0.1
+)
+
+# Ağ üzerinden seri sunucu: gidiş-dönüş süresi guard süresini zaten aşar; NACK
+# kodu ayrı bir TCP segmentinde gelebileceğinden beklemeler daha uzun tutulur
+NETWORK_DEFAULTS = TransportDefaults(
+    guard_time=0.0, response_timeout=12.0, nack_code_timeout=0.25, status_poll_timeout=0.5
+)
+
+# loop:// gibi süreç içi portlar
+LOOPBACK_DEFAULTS = TransportDefaults(
+    guard_time=0.0, response_timeout=2.0, nack_code_timeout=0.05, status_poll_timeout=0.1
+)
+
+class Transport(abc.ABC):
+    """
+    Bootloader bağlantısının taşıma katmanı
+
+    open() pyserial.Serial arayüzüne uyan bir bağlantı nesnesi döner (read,
+    write, flush, in_waiting, reset_input_buffer, reset_output_buffer,
+    cancel_read, close, is_open, baudrate). UARTCommunication yalnızca bu
+    arayüzü kullanır. Alt sınıflar en az open()'u uygulamalıdır.
+    """
+    kind = "base"
+    defaults: TransportDefaults = LOCAL_SERIAL_DEFAULTS
+    supports_baudrate = True      # Host tarafı baud rate'i değiştirilebilir mi (SET_BAUD / oto baud)
+    supports_low_latency = False  # Linux düşük gecikme ayarları uygulanabilir mi
+
+    def __init__(self, address: str):
+        self.address = address
+
+    @abc.abstractmethod
+    def open(self, baudrate: int, timeout: float, exclusive: bool = True):
+        """Bağlantıyı açar ve pyserial.Serial benzeri bağlantı nesnesini döner"""
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.address!r})"
+
+class SerialTransport(Transport):
+    """Yerel seri port (COM3, /dev/ttyUSB0)"""
+    kind = "serial"
+    defaults = LOCAL_SERIAL_DEFAULTS
+    supports_low_latency = sys.platform.startswith("linux")
+
+    def open(self, baudrate: int, timeout: float, exclusive: bool = True):
+        return serial.Serial(
+            port=self.address,
+            baudrate=baudrate,
+            bytesize=serial.EIGHTBITS,
+            parity=serial.PARITY_NONE,
+            stopbits=serial.STOPBITS_ONE,
+            timeout=timeout,
+            exclusive=exclusive or None
+        )
+
+class SerialURLTransport(Transport):
+    """
+    pyserial URL'leri: rfc2217://host:port, socket://host:port, loop://
+
+    rfc2217 baud rate'i uzaktaki sunucuya iletir; socket:// ham TCP'dir ve
+    sunucudaki UART hızı sabittir (oto baud kullanılamaz).
+    """
+    kind = "url"
+
+    def __init__(self, address: str):
+        super().__init__(address)
+        scheme = address.split("://", 1)[0].lower()
+        self.scheme = scheme
+        self.defaults = LOOPBACK_DEFAULTS if scheme == "loop" else NETWORK_DEFAULTS
+        self.supports_baudrate = scheme in ("rfc2217", "loop")
+
+    def open(self, baudrate: int, timeout: float, exclusive: bool = True):
+        conn = serial.serial_for_url(self.address, baudrate=baudrate, timeout=timeout)
+        sock = getattr(conn, "_socket", None)
+        if sock is not None:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return conn
+
+class TCPConnection:
+    """
+    Ham TCP (ser2net "raw" modu) üzerinde pyserial.Serial benzeri bağlantı
+
+    TCP_NODELAY açıktır: 21 byte'lık paketler Nagle algoritmasına takılmadan
+    hemen gönderilir. Keepalive ile kopan bağlantılar algılanır. Alım thread'i
+    read() ile beklerken diğer thread'ler in_waiting / reset_input_buffer
+    çağırabilir; soketten okuma kilit altında yapılır.
+    """
+
+    def __init__(self, host: str, port: int, baudrate: int = 115200, timeout: float = 1.0,
+                 connect_timeout: float = 5.0, nodelay: bool = True):
+        try:
+            self._sock = socket.create_connection((host, port), timeout=connect_timeout)
+        except OSError as e:
+            raise serial.SerialException(f"TCP bağlantısı kurulamadı {host}:{port}: {e}")
+        self._sock.settimeout(None)
+        if nodelay:
+            self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        self._wake_r, self._wake_w = socket.socketpair()
+        self._rx = bytearray()
+        self._rx_lock = threading.Lock()
+        self.baudrate = baudrate  # Bilgi amaçlı: sunucudaki UART hızı değişmez
+        self.timeout = timeout
+        self.is_open = True
+        self.port = f"tcp://{host}:{port}"
+
+    def _receive(self, wait: Optional[float]) -> bool:
+        """
+        Soket okunabilir olana kadar en fazla wait saniye bekler ve gelenleri tamponlar
+
+        Returns:
+            bool: cancel_read ile uyandırıldıysa True
+        """
+        if not self.is_open:
+            raise serial.PortNotOpenError()
+        readable, _, _ = select.select([self._sock, self._wake_r], [], [], wait)
+        if self._wake_r in readable:
+            self._wake_r.recv(64)
+            return True
+        if self._sock in readable:
+            self._recv_available()
+        return False
+
+    def _recv_available(self) -> int:
+        """Soketteki veriyi bloklamadan tampona alır (başka thread önce almışsa 0)"""
+        with self._rx_lock:
+            if not select.select([self._sock], [], [], 0)[0]:
+                return 0
+            data = self._sock.recv(65536)
+            if not data:
+                raise serial.SerialException("TCP bağlantısı karşı taraftan kapatıldı")
+            self._rx += data
+            return len(data)
+
+    @property
+    def in_waiting(self) -> int:
+        self._receive(0)
+        return len(self._rx)
+
+    def read(self, size: int = 1) -> bytes:
+        deadline = None if self.timeout is None else time.monotonic() + self.timeout
+        while len(self._rx) < size:
+            wait = None if deadline is None else max(0.0, deadline - time.monotonic())
+            if self._receive(wait) or (deadline is not None and time.monotonic() >= deadline):
+                break
+        with self._rx_lock:
+            data = bytes(self._rx[:size])
+            del self._rx[:size]
+        return data
+
+    def write(self, data: bytes) -> int:
+        if not self.is_open:
+            raise serial.PortNotOpenError()
+        try:
+            self._sock.sendall(data)
+        except OSError as e:
+            raise serial.SerialException(f"TCP yazma hatası: {e}")
+        return len(data)
+
+    def flush(self):
+        pass  # sendall veriyi çekirdeğe teslim eder; TCP_NODELAY ile hemen gönderilir
+
+    def reset_input_buffer(self):
+        while self.is_open and self._recv_available():
+            pass
+        with self._rx_lock:
+            self._rx.clear()
+
+    def reset_output_buffer(self):
+        pass
+
+    def cancel_read(self):
+        try:
+            self._wake_w.send(b"x")
+        except OSError:
+            pass
+
+    def fileno(self) -> int:
+        return self._sock.fileno()
+
+    def close(self):
+        if not self.is_open:
+            return
+        self.is_open = False
+        self.cancel_read()
+        try:
+            self._sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        for sock in (self._sock, self._wake_r, self._wake_w):
+            sock.close()
+
+class TCPTransport(Transport):
+    """Ham TCP seri sunucusu: tcp://host:port (ör. ser2net raw modu)"""
+    kind = "tcp"
+    defaults = NETWORK_DEFAULTS
+    supports_baudrate = False
+
+    def __init__(self, address: str, connect_timeout: float = 5.0):
+        super().__init__(address)
+        self.host, self.port = parse_host_port(address)
+        self.connect_timeout = connect_timeout
+
+    def open(self, baudrate: int, timeout: float, exclusive: bool = True):
+        return TCPConnection(self.host, self.port, baudrate, timeout, self.connect_timeout)
+
+def parse_host_port(address: str) -> Tuple[str, int]:
+    """'tcp://host:port' veya 'host:port' adresini çözer"""
+    hostport = address.split("://", 1)[-1].rstrip("/")
+    host, sep, port = hostport.rpartition(":")
+    if not sep or not host or not port.isdigit():
+        raise ValueError(f"Geçersiz TCP adresi: {address} (beklenen: tcp://host:port)")
+    return host.strip("[]"), int(port)
+
+def create_transport(address: str) -> Transport:
+    """
+    Port adından taşıma katmanını seçer
+
+    - tcp://host:port              -> TCPTransport (ham TCP, TCP_NODELAY)
+    - rfc2217://, socket://, loop:// -> SerialURLTransport (pyserial URL)
+    - diğerleri (COM3, /dev/ttyUSB0) -> SerialTransport
+    """
+    if "://" not in address:
+        return SerialTransport(address)
+    if address.lower().startswith("tcp://"):
+        return TCPTransport(address)
+    return SerialURLTransport(address)
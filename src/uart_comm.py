@@ -1,74 +1,313 @@
+import hashlib
+import logging
 import serial
-import time
 import threading
-from typing import Optional, Callable, List
-from .stm32_protocol import STM32Protocol
+import queue
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Optional, Callable, Dict, Iterable, List
+from .stm32_protocol import STM32Protocol, ResponseDecoder, ResponseEvent
+from .auto_baud import BaudProbeResult, BaudRateCache, DEFAULT_BAUDRATE_CANDIDATES
+from .sector_timing import SectorTimingTable
+from .flash_layout import STM32F4_SECTOR_SIZES
+from .frame_cache import EncodedImage, FrameCache, default_frame_cache
+from .linux_tuning import TuningReport, apply_low_latency, restore_low_latency
+from .cancellation import CancelToken, CANCELLED_MESSAGE
+from .profiling import ProfileReport, SessionProfiler
+from .transport import Transport, create_transport
+from .rto import AdaptiveTimeouts
+from .flash_history import FlashHistory, FlashRecord, app_version, default_flash_history
+from .flash_bundle import BundleImageResult, BundleManifest, BundleReport
+from .transfer_planner import STOP_AND_WAIT, SUPPORTED_MODES, LinkProfile, TransferPlan, estimate_link, plan_transfer
+from .clock import SYSTEM_CLOCK
+
+# Ayrıntılı iz (paket başına gönderim / yanıt dahil) yalnızca DEBUG seviyesinde
+# üretilir; mesajlar seviye kontrolünden sonra biçimlenir
+logger = logging.getLogger(__name__)
+
+@dataclass
+class SectorEraseResult:
+    """Toplu silmede tek bir sektörün sonucu"""
+    sector: int
+    success: bool
+    message: str
+    duration: float  # CMD_ERASE gönderiminden FINISH ACK'ine kadar (saniye)
 
 class UARTCommunication:
     """UART üzerinden STM32 bootloader ile iletişim sağlayan sınıf"""
     
-    def __init__(self, port: str, baudrate: int = 115200, timeout: float = 1.0):
+    def __init__(self, port: str, baudrate: int = 115200, timeout: float = 1.0,
+                 transport: Optional[Transport] = None, clock=None):
         """
         UART iletişim nesnesini başlatır
         
         Args:
-            port: COM port (örn: 'COM3', '/dev/ttyUSB0')
+            port: COM port (örn: 'COM3', '/dev/ttyUSB0') veya ağ adresi
+                ('tcp://host:port', 'rfc2217://host:port', 'socket://host:port', 'loop://')
             baudrate: Baud rate (varsayılan: 115200)
             timeout: Yanıt bekleme süresi (saniye)
+            transport: Taşıma katmanı (None: port adından seçilir, bkz. create_transport)
+            clock: Tüm zaman ölçümleri ve beklemeler için saat (None: gerçek zaman).
+                VirtualClock verilirse alım thread'i kullanılmaz; port VirtualLinkSerial olmalıdır
         """
         self.port = port
+        self.clock = clock or SYSTEM_CLOCK
         self.baudrate = baudrate
         self.timeout = timeout
         self.serial_conn: Optional[serial.Serial] = None
         self.is_connected = False
         self.response_timeout = 10.0  # ACK/NACK bekleme süresi (5 saniyeden 10 saniyeye çıkarıldı)
+        # Uyarlanır zaman aşımı: DATA / CMD_WRITE / CMD_ERASE / FINISH için ölçülen
+        # gidiş-dönüş sürelerinden TCP tarzı RTO (ölçüm yokken response_timeout)
+        self.adaptive_timeouts = True
+        self.rto = AdaptiveTimeouts()
+        self.baud_probe_results: List[BaudProbeResult] = []  # Son otomatik baud taramasının sonuçları
+        self.last_erase_results: List[SectorEraseResult] = []  # Son toplu silmenin sektör sonuçları
+        self.last_bundle_report: Optional[BundleReport] = None  # Son paket yüklemesinin zamanlama raporu
+        self.last_nack_code: Optional[int] = None  # Son NACK yanıtının hata kodu
+        
+        # Yanıt çözme
+        self.guard_time = 0.002         # Yanıttan sonra STM32'nin RX'i yeniden açması için (saniye)
+        self.nack_code_timeout = 0.05   # NACK sonrası hata kodu byte'ı için bekleme (saniye)
+        self._decoder = ResponseDecoder()
+        self._last_response_time = 0.0
+        self.last_round_trip: Optional[float] = None  # Son paketin gönderimden yanıta süresi (saniye)
+        
+        # Alım thread'i: porttan okur, çözülmüş yanıtları (zaman damgası, olay) kuyruğa koyar
+        self._rx_queue: "queue.Queue[tuple[float, Optional[ResponseEvent]]]" = queue.Queue()
+        self._rx_lock = threading.Lock()
+        self._reader_thread: Optional[threading.Thread] = None
+        self._reader_conn = None
+        self._reader_stop = threading.Event()
+        self._reader_error: Optional[str] = None
+        
+        # İptal (send_firmware / erase_* cancel_token parametresi)
+        self._cancel_token: Optional[CancelToken] = None
+        self.cancel_check_interval = 0.02  # Yanıt beklerken iptal kontrol aralığı (saniye)
+        self.abort_timeout = 0.5           # İptal sonrası FINISH yanıtı için bekleme (saniye)
+        
+        # Düşük gecikme modu (connect(low_latency=True))
+        self.tuning_report: Optional[TuningReport] = None
+        self.coalesce_tx = False  # True: paket başına flush() (tcdrain) yapılmaz
+        
+        self.frame_cache: FrameCache = default_frame_cache  # Portlar arası paylaşılan paket önbelleği
         
-    def connect(self) -> bool:
+        # Profil modu: None, "cprofile" veya "sampling" (send_firmware oturumunu profiller)
+        self.profile_mode: Optional[str] = None
+        self.last_profile: Optional[ProfileReport] = None
+        
+        # Oturum geçmişi: her silme / yükleme SQLite'a kaydedilir (arka planda, toplu)
+        self.record_history = True
+        self.history: Optional[FlashHistory] = None  # None: paylaşılan varsayılan depo
+        self.nack_count = 0    # Oturumdaki NACK sayısı (her oturum başında sıfırlanır)
+        self.retry_count = 0   # Oturumdaki meşgul (NACK_BUSY) tekrar sayısı
+        self.late_response_count = 0  # RTO'dan sonra (response_timeout içinde) gelen / gelmeyen yanıtlar
+        self._phases: Dict[str, float] = {}
+        self._session_start = 0.0
+        self._adapter_serial_cache: Optional[tuple] = None  # (port, seri no)
+        
+        # Aktarım planı: istendiğinde (plan_transfer) mod başına süre tahmini; plan
+        # send_firmware'e verilirse desteklenen en hızlı mod seçilir (bu bootloader
+        # yalnızca stop-and-wait destekler)
+        self.supported_transfer_modes = SUPPORTED_MODES
+        self.transfer_mode = STOP_AND_WAIT
+        self.last_plan: Optional[TransferPlan] = None  # Son yüklemenin tahmini ve gerçek süresi
+        # (port, baud, sektör, cihaz) -> bağlantı profili; geçmiş sorgusu her planda tekrarlanmaz
+        self._link_cache: Dict[tuple, LinkProfile] = {}
+        
+        # Silme / yazma hazırlığı zamanlaması
+        self.timing_table = SectorTimingTable()
+        self.status_supported: Optional[bool] = None  # None: henüz denenmedi
+        self.status_poll_interval = 0.005  # STATUS sorguları arası bekleme (saniye)
+        self.status_poll_timeout = 0.1     # Tek STATUS sorgusunun yanıt süresi (saniye)
+        self.held_ack_threshold = 0.02     # Eski kartta bundan uzun CMD_ERASE / CMD_WRITE ACK'i işlem süresidir
+        self._idle_round_trip = 0.0        # STATUS NACK 0x01 gidiş-dönüşü (eski kart, bağlantı başına)
+        
+        # Taşıma katmanı: guard / timeout varsayılanları bağlantı türüne göre
+        self.transport: Transport = transport or create_transport(port)
+        self._apply_transport_defaults()
+        
+    def _apply_transport_defaults(self):
+        """Taşıma katmanının gecikme varsayılanlarını uygular"""
+        defaults = self.transport.defaults
+        self.guard_time = defaults.guard_time
+        self.response_timeout = defaults.response_timeout
+        self.nack_code_timeout = defaults.nack_code_timeout
+        self.status_poll_timeout = defaults.status_poll_timeout
+        
+    def connect(self, exclusive: bool = True, low_latency: bool = False) -> bool:
         """
         UART bağlantısını açar
         
+        Args:
+            exclusive: Portu başka süreçlerin açamayacağı şekilde kilitle
+            low_latency: Linux düşük gecikme ayarlarını uygula (ASYNC_LOW_LATENCY,
+                FTDI latency_timer) ve TX'i paket başına flush etmeden gönder.
+                Uygulanan ayarlar tuning_report'ta raporlanır (yalnızca yerel seri port).
+        
         Returns:
             bool: Bağlantı başarılı ise True
         """
+        if self.transport.address != self.port:
+            # Port değişti (ör. USB yeniden numaralandırma); tür değiştiyse varsayılanlar da değişir
+            previous_kind = self.transport.kind
+            self.transport = create_transport(self.port)
+            if self.transport.kind != previous_kind:
+                self._apply_transport_defaults()
+        
         try:
-            # Önce port'u kapatmaya çalış (eğer açıksa)
-            try:
-                temp_serial = serial.Serial(self.port)
-                temp_serial.close()
-                time.sleep(0.5)  # Kısa bekleme
-            except:
-                pass  # Port zaten kapalıysa hata vermez
-            
-            self.serial_conn = serial.Serial(
-                port=self.port,
-                baudrate=self.baudrate,
-                bytesize=serial.EIGHTBITS,
-                parity=serial.PARITY_NONE,
-                stopbits=serial.STOPBITS_ONE,
-                timeout=self.timeout
-            )
+            self.serial_conn = self.transport.open(self.baudrate, self.timeout, exclusive)
             self.is_connected = True
+            self.status_supported = None  # Kart değişmiş olabilir
+            self._idle_round_trip = 0.0
+            self.rto.reset()
+            self._link_cache.clear()
             print(f"UART bağlantısı başarılı: {self.port} @ {self.baudrate}")
+            
+            self.coalesce_tx = low_latency
+            self.tuning_report = None
+            if low_latency and self.transport.supports_low_latency:
+                self.tuning_report = apply_low_latency(self.serial_conn, self.port)
+                logger.debug("Düşük gecikme ayarları: %s", self.tuning_report)
+            
+            self._start_reader()
             return True
             
-        except serial.SerialException as e:
+        except (serial.SerialException, ValueError) as e:
             print(f"UART bağlantı hatası: {e}")
+            self.serial_conn = None
             self.is_connected = False
             return False
     
+    def is_alive(self) -> bool:
+        """Port hâlâ açık ve erişilebilir mi (USB çıkarılmışsa False)"""
+        if not self.is_connected or not self.serial_conn or not self.serial_conn.is_open:
+            return False
+        try:
+            self.serial_conn.in_waiting
+            return True
+        except (serial.SerialException, OSError):
+            return False
+    
     def disconnect(self):
         """UART bağlantısını kapatır"""
         if self.serial_conn and self.is_connected:
-            self.serial_conn.close()
+            self._stop_reader()
+            self.timing_table.flush()
+            if self.tuning_report and self.tuning_report.previous:
+                restored = restore_low_latency(self.serial_conn, self.port, self.tuning_report)
+                logger.debug("Düşük gecikme ayarları geri alındı: %s", ', '.join(restored) or 'yok')
+            try:
+                self.serial_conn.close()
+            except (serial.SerialException, OSError):
+                pass  # Cihaz çıkarılmışsa kapatma hatası önemsiz
             self.is_connected = False
             print("UART bağlantısı kapatıldı")
     
-    def send_packet_and_wait_ack(self, packet: bytes) -> tuple[bool, str]:
+    # ------------------------------------------------------------------
+    # Alım Thread'i
+    # ------------------------------------------------------------------
+    def _start_reader(self):
+        """Mevcut port için alım thread'ini (yeniden) başlatır"""
+        self._stop_reader()
+        self._reader_stop = threading.Event()
+        self._reader_conn = self.serial_conn
+        self._reader_error = None
+        self._rx_queue = queue.Queue()
+        self._decoder.reset()
+        if self.clock.virtual:
+            return  # Sanal zamanda thread beklenemez: yanıtlar _wait_response içinde okunur
+        self._reader_thread = threading.Thread(
+            target=self._reader_loop,
+            args=(self.serial_conn, self._reader_stop, self._rx_queue),
+            name=f"uart-rx-{self.port}",
+            daemon=True
+        )
+        self._reader_thread.start()
+    
+    def _stop_reader(self, join_timeout: float = 1.0):
+        """Alım thread'ini durdurur; bloklayan read'i mümkünse iptal eder"""
+        thread = self._reader_thread
+        if thread is None:
+            return
+        self._reader_stop.set()
+        cancel_read = getattr(self._reader_conn, "cancel_read", None)
+        if cancel_read:
+            try:
+                cancel_read()
+            except (serial.SerialException, OSError):
+                pass
+        if thread is not threading.current_thread():
+            thread.join(join_timeout)
+        self._reader_thread = None
+        self._reader_conn = None
+    
+    def _ensure_reader(self):
+        """serial_conn değiştiyse (veya dışarıdan atandıysa) alım thread'ini başlatır"""
+        if self.clock.virtual:
+            if self._reader_conn is not self.serial_conn:
+                self._start_reader()
+            return
+        if self._reader_thread is not None and self._reader_conn is self.serial_conn:
+            if self._reader_thread.is_alive():
+                return
+            if self._reader_error:
+                raise serial.SerialException(self._reader_error)
+        self._start_reader()
+    
+    def _reader_loop(self, conn, stop: threading.Event, rx_queue: "queue.Queue"):
+        """
+        Porttan bloklayarak okur ve çözülen her yanıtı zaman damgasıyla kuyruğa koyar
+        
+        İlk byte için read(1) port timeout'una kadar bloklar; ardından
+        bekleyen tüm byte'lar tek read ile alınır. NACK'ten sonra hata kodu
+        byte'ı nack_code_timeout kadar beklenir, gelmezse kodsuz NACK üretilir.
+        """
+        try:
+            while not stop.is_set():
+                events = self._read_events(conn, stop)
+                now = self.clock.time()
+                for event in events:
+                    rx_queue.put((now, event))
+        except Exception as e:
+            if stop.is_set():
+                return  # Port kapatılırken oluşan hatalar önemsiz
+            self._reader_error = f"Port okunamıyor: {e}"
+            logger.debug("Alım thread'i durdu: %s", e)
+            rx_queue.put((self.clock.time(), None))  # Bekleyen göndericiyi uyandır
+    
+    def _read_events(self, conn, stop: threading.Event) -> List[ResponseEvent]:
+        """Porttan bir okuma yapar (ilk byte için port timeout'una kadar bloklar) ve çözülen yanıtları döner"""
+        data = conn.read(1)
+        if not data:
+            if not conn.is_open:
+                raise serial.SerialException("port kapalı")
+            return []
+        waiting = conn.in_waiting
+        if waiting:
+            data += conn.read(waiting)
+        
+        with self._rx_lock:
+            events = self._decoder.feed(data)
+            if self._decoder.pending:
+                code_deadline = self.clock.time() + self.nack_code_timeout
+                while self._decoder.pending and self.clock.time() < code_deadline and not stop.is_set():
+                    waiting = conn.in_waiting
+                    if waiting:
+                        events += self._decoder.feed(conn.read(waiting))
+                    else:
+                        self.clock.sleep(0.001)
+                events += self._decoder.flush()
+        return events
+    
+    def send_packet_and_wait_ack(self, packet: bytes, timeout: Optional[float] = None) -> tuple[bool, str]:
         """
         Paket gönderir ve ACK/NACK yanıtını bekler
         
         Args:
             packet: Gönderilecek paket (21 byte)
+            timeout: Yanıt bekleme süresi (None: adaptive_timeouts açıksa mesaj tipinin
+                RTO'su, değilse / izlenmeyen tipte response_timeout)
             
         Returns:
             tuple: (başarılı_mı, hata_mesajı)
@@ -79,66 +318,168 @@ class UARTCommunication:
         if len(packet) != STM32Protocol.PACKET_SIZE:
             return False, f"Paket boyutu {STM32Protocol.PACKET_SIZE} byte olmalıdır"
         
+        self.last_nack_code = None
+        if self._is_cancelled():
+            return False, CANCELLED_MESSAGE
+        adaptive = timeout is None and self.adaptive_timeouts
+        if timeout is None:
+            timeout = (self.rto.timeout(packet, self.response_timeout) if adaptive else None) \
+                or self.response_timeout
+        debug = logger.isEnabledFor(logging.DEBUG)
         try:
+            self._discard_stale_responses()
+            
             # Paketi gönder
-            print(f"DEBUG: {len(packet)} byte paket gönderiliyor: {packet.hex()}")
-            bytes_sent = self.serial_conn.write(packet)
+            if debug:
+                logger.debug("%d byte paket gönderiliyor: %s", len(packet), packet.hex())
+            bytes_sent = self._write_packet(packet)
             if bytes_sent != len(packet):
                 return False, f"Paket tam gönderilemedi: {bytes_sent}/{len(packet)} byte"
-            
-            # Paket gönderildikten sonra flush
-            self.serial_conn.flush()
+            sent_at = self.clock.time()
             
             # Yanıt bekle
-            start_time = time.time()
-            print(f"DEBUG: Paket gönderildi, yanıt bekleniyor... (timeout: {self.response_timeout}s)")
-            
-            # Kısa bir bekleme ekle (STM32'nin işlemesi için)
-            time.sleep(0.2)  # Interrupt mode için daha uzun bekleme
+            if debug:
+                logger.debug("Paket gönderildi, yanıt bekleniyor... (timeout: %ss)", timeout)
+            event = self._wait_response(timeout)
+            late = False
+            if event is None and adaptive and not self._is_cancelled():
+                # RTO doldu: kayıp kaydedilir ve geri çekilinir, ama paket yeniden
+                # gönderilmediğinden geç gelen ACK response_timeout'a kadar beklenir
+                # (USB / zamanlayıcı gecikmesi tüm yüklemeyi düşürmemeli)
+                self.rto.on_timeout(packet)
+                self.late_response_count += 1
+                late = True
+                remaining = sent_at + max(timeout, self.response_timeout) - self.clock.time()
+                if debug:
+                    logger.debug("RTO (%.0f ms) doldu, yanıt %.2fs daha bekleniyor", timeout * 1000, remaining)
+                if remaining > 0:
+                    event = self._wait_response(remaining)
+                timeout = max(timeout, self.response_timeout)
             
-            while time.time() - start_time < self.response_timeout:
-                if self.serial_conn.in_waiting > 0:
-                    # Önce 1 byte oku (ACK/NACK)
-                    response = self.serial_conn.read(1)
-                    if response:
-                        first_byte = response[0]
-                        time.sleep(0.4)
-                        print(f"DEBUG: Yanıt alındı: 0x{first_byte:02X}")
-                        
-                        if first_byte == 0xAA:  # ACK
-                            return True, "ACK alındı"
-                        elif first_byte == 0x55:  # NACK
-                            # NACK durumunda ek byte'ları da oku (hata kodu)
-                            if self.serial_conn.in_waiting > 0:
-                                error_code = self.serial_conn.read(1)
-                                full_response = response + error_code
-                                print(f"DEBUG: NACK + hata kodu: 0x{error_code[0]:02X}")
-                            else:
-                                full_response = response
-                                print("DEBUG: NACK (hata kodu yok)")
-                            
-                            is_ack, error = STM32Protocol.parse_response(full_response)
-                            return False, error
-                        else:
-                            print(f"DEBUG: Bilinmeyen yanıt kodu: 0x{first_byte:02X}")
-                            return False, f"Bilinmeyen yanıt: 0x{first_byte:02X} (Beklenen: ACK=0xAA, NACK=0x55)"
-                time.sleep(0.01)  # CPU kullanımını azaltmak için kısa bekleme
+            if event is None:
+                if self._is_cancelled():
+                    return False, CANCELLED_MESSAGE
+                if debug:
+                    logger.debug("Timeout! %s saniye içinde yanıt alınamadı", timeout)
+                if adaptive and not late:
+                    self.rto.on_timeout(packet)
+                return False, f"Yanıt timeout ({timeout * 1000:.0f} ms)"
             
-            print(f"DEBUG: Timeout! {self.response_timeout} saniye içinde yanıt alınamadı")
-            return False, "Yanıt timeout"
+            self.last_round_trip = max(0.0, self._last_response_time - sent_at)
+            if not late:
+                # Geç yanıtın süresi geri çekilmeyi sıfırlamaz; sonraki RTO iki katıdır
+                self.rto.observe(packet, self.last_round_trip)
+            if debug:
+                logger.debug("Yanıt alındı: %s (%.1f ms)", event, self.last_round_trip * 1000)
+            if event.is_ack:
+                return True, event.message
+            self.last_nack_code = event.code
+            self.nack_count += 1
+            return False, event.message
             
         except serial.SerialException as e:
             return False, f"UART hatası: {str(e)}"
         except Exception as e:
             return False, f"Beklenmeyen hata: {str(e)}"
     
+    def _write_packet(self, packet: bytes) -> int:
+        """
+        Son yanıttan bu yana guard süresi dolduysa paketi tek write çağrısıyla yazar
+        
+        coalesce_tx kapalıyken flush() ile TX'in tamamlanması beklenir;
+        düşük gecikme modunda bu bekleme atlanır.
+        """
+        wait = self._last_response_time + self.guard_time - self.clock.time()
+        if wait > 0:
+            self.clock.sleep(wait)
+        bytes_sent = self.serial_conn.write(packet)
+        if not self.coalesce_tx:
+            self.serial_conn.flush()
+        return bytes_sent
+    
+    def _wait_response(self, timeout: float) -> Optional[ResponseEvent]:
+        """
+        Alım thread'inin kuyruğundan sıradaki ACK/NACK yanıtını bekler
+        
+        Aynı anda birden fazla yanıt geldiyse fazlası sırayla sonraki
+        çağrılara kalır. Yanıtın zaman damgası guard süresi için saklanır.
+        
+        Etkin bir iptal bayrağı varsa bekleme cancel_check_interval
+        dilimleriyle yapılır; iptal edilince None döner.
+        
+        Returns:
+            ResponseEvent veya timeout / iptal durumunda None
+        Raises:
+            serial.SerialException: Port okunamıyorsa (ör. USB çıkarıldı)
+        """
+        self._ensure_reader()
+        if self.clock.virtual:
+            return self._poll_response(timeout)
+        deadline = self.clock.time() + timeout
+        while True:
+            remaining = max(0.0, deadline - self.clock.time())
+            if self._cancel_token is not None:
+                remaining = min(remaining, self.cancel_check_interval)
+            try:
+                timestamp, event = self._rx_queue.get(timeout=remaining)
+                break
+            except queue.Empty:
+                if self._is_cancelled() or self.clock.time() >= deadline:
+                    return None
+        if event is None:
+            raise serial.SerialException(self._reader_error or "Alım thread'i durdu")
+        self._last_response_time = timestamp
+        return event
+    
+    def _poll_response(self, timeout: float) -> Optional[ResponseEvent]:
+        """
+        Sanal zamanda _wait_response: alım thread'i yerine porttan doğrudan okur
+
+        Port okuması (VirtualLinkSerial) yanıt gelene ya da timeout dolana
+        kadar saati ilerletir; zaman damgası yanıtın sanal geliş anıdır.
+        """
+        deadline = self.clock.time() + timeout
+        while self._rx_queue.empty():
+            remaining = deadline - self.clock.time()
+            if remaining <= 0 or self._is_cancelled():
+                return None
+            self.serial_conn.timeout = remaining
+            for event in self._read_events(self.serial_conn, self._reader_stop):
+                self._rx_queue.put((self.clock.time(), event))
+        timestamp, event = self._rx_queue.get_nowait()
+        self._last_response_time = timestamp
+        return event
+    
+    def _discard_stale_responses(self):
+        """Önceki işlemlerden kalan (beklenmeyen) yanıtları atar"""
+        if self.clock.virtual and self.serial_conn:
+            # Alım thread'i yok: şimdiye kadar gelmiş byte'ları çöz
+            while self.serial_conn.in_waiting:
+                for event in self._read_events(self.serial_conn, self._reader_stop):
+                    self._rx_queue.put((self.clock.time(), event))
+        stale = []
+        while True:
+            try:
+                _, event = self._rx_queue.get_nowait()
+            except queue.Empty:
+                break
+            if event is None:
+                self._rx_queue.put((self.clock.time(), None))  # Port hatası kaybolmasın
+                break
+            stale.append(event)
+        if stale:
+            logger.debug("Beklenmeyen yanıtlar atıldı: %s", ', '.join(str(e) for e in stale))
+    
     def clear_buffers(self):
         """Giriş ve çıkış buffer'larını temizler"""
         if self.serial_conn and self.is_connected:
-            print("DEBUG: Buffer'lar temizleniyor...")
-            self.serial_conn.reset_input_buffer()
+            logger.debug("Buffer'lar temizleniyor...")
+            self._ensure_reader()
             self.serial_conn.reset_output_buffer()
-            time.sleep(0.1)  # Buffer temizliği için kısa bekleme
+            self.serial_conn.reset_input_buffer()
+            with self._rx_lock:
+                self._decoder.reset()
+            self._discard_stale_responses()
     
     def get_available_ports(self) -> List[str]:
         """Kullanılabilir seri portları listeler"""
@@ -146,6 +487,14 @@ class UARTCommunication:
         ports = serial.tools.list_ports.comports()
         return [port.device for port in ports]
     
+    def get_adapter_serial(self) -> Optional[str]:
+        """Bağlı USB-UART adaptörünün seri numarasını döner (bulunamazsa None)"""
+        import serial.tools.list_ports
+        for info in serial.tools.list_ports.comports():
+            if info.device == self.port:
+                return info.serial_number or None
+        return None
+    
     def send_cmd_write_packet(self, sector: int) -> tuple[bool, str]:
         """CMD_WRITE paketi gönderir"""
         try:
@@ -178,41 +527,276 @@ class UARTCommunication:
         except ValueError as e:
             return False, str(e)
 
+    # ------------------------------------------------------------------
+    # İptal
+    # ------------------------------------------------------------------
+    @contextmanager
+    def _cancellable(self, cancel_token: Optional[CancelToken]):
+        """İşlem süresince iptal bayrağını etkinleştirir"""
+        previous = self._cancel_token
+        self._cancel_token = cancel_token
+        try:
+            yield
+        finally:
+            self._cancel_token = previous
+
+    def _is_cancelled(self) -> bool:
+        return self._cancel_token is not None and self._cancel_token.is_cancelled
+
+    def _sleep(self, seconds: float) -> bool:
+        """İptal edilebilir bekleme; iptal edildiyse True döner"""
+        if self.clock.virtual:
+            self.clock.sleep(seconds)
+            return self._is_cancelled()
+        if self._cancel_token is not None:
+            return self._cancel_token.wait(seconds)
+        if seconds > 0:
+            self.clock.sleep(seconds)
+        return False
+
+    def _abort(self) -> tuple[bool, str]:
+        """
+        İptal edilen işlemi kapatır: cihaza FINISH gönderir ve buffer'ları temizler
+
+        FINISH, bootloader'ı CMD_WRITE / CMD_ERASE durumundan çıkarır; devam
+        eden bir flash silmesi cihazda tamamlanır (NACK 0x06 önemsizdir).
+        """
+        logger.debug("İşlem iptal edildi, cihaza FINISH gönderiliyor")
+        token, self._cancel_token = self._cancel_token, None
+        try:
+            success, message = self.send_packet_and_wait_ack(
+                STM32Protocol.create_finish_packet(), timeout=self.abort_timeout
+            )
+            if not success:
+                logger.debug("İptal FINISH yanıtı: %s", message)
+            self.clear_buffers()
+        except (serial.SerialException, OSError) as e:
+            logger.debug("İptal sonrası port temizlenemedi: %s", e)
+        finally:
+            self._cancel_token = token
+        return False, CANCELLED_MESSAGE
+
     # ------------------------------------------------------------------
     # ERASE Akışı
     # ------------------------------------------------------------------
-    def erase_sector(self, sector: int, delay_after_cmd: float = 0.5) -> tuple[bool, str]:
-        """Belirtilen sektörü siler (CMD_ERASE + gecikme + FINISH)
+    def _poll_status(self, deadline: float) -> Optional[bool]:
+        """
+        Cihaz hazır olana kadar STATUS sorgular
+
+        Returns:
+            True: cihaz hazır, False: deadline aşıldı / iptal, None: STATUS desteklenmiyor
+        """
+        packet = STM32Protocol.create_status_packet()
+        while True:
+            self._discard_stale_responses()
+            self._write_packet(packet)
+            sent_at = self.clock.time()
+            event = self._wait_response(self.status_poll_timeout)
+
+            if event and event.is_ack:
+                self.status_supported = True
+                return True
+            if event and event.code == STM32Protocol.NACK_UNKNOWN_TYPE:
+                self.status_supported = False
+                # Cihazın beklemeden verdiği yanıtın süresi: tutulan ACK'leri ayırt etmek için
+                self._idle_round_trip = max(0.0, self._last_response_time - sent_at)
+                return None
+            # NACK 0x06 (meşgul) veya yanıt yok: cihaz hâlâ flash işleminde
+            if self.clock.time() >= deadline or self._is_cancelled():
+                return False
+            if self._sleep(self.status_poll_interval):
+                return False
+
+    def wait_until_ready(self, operation: str, sector: int, command_round_trip: Optional[float] = None) -> float:
+        """
+        CMD_ERASE / CMD_WRITE ACK'inden sonra cihazın hazır olmasını bekler
+
+        Cihaz STATUS komutunu destekliyorsa hazır olana kadar sorgulanır ve
+        ölçülen süre zamanlama tablosuna kaydedilir. Desteklemiyorsa (NACK 0x01,
+        bağlantı başına bir kez denenir) eski kart yolu izlenir: ACK'ini işlem
+        bitince gönderen bootloader'da komutun gidiş-dönüşü işlem süresidir ve
+        kaydedilir. Bu kartın yeterli ölçümü varsa komut gönderiminden itibaren
+        öğrenilmiş süre (p95 × pay), yoksa kılavuzdaki en kötü durum süresi beklenir.
 
         Args:
-            sector: Silinecek sektör numarası (0-255)
-            delay_after_cmd: CMD_ERASE ACK'inden sonra bekleme süresi (saniye)
+            operation: "erase" veya "write"
+            sector: İşlem yapılan sektör
+            command_round_trip: Komutun gönderiminden ACK'ine kadar geçen süre (saniye)
         Returns:
-            (başarılı_mı, mesaj)
+            float: ACK'ten sonra beklenen toplam süre (saniye)
         """
-        if not self.is_connected:
-            return False, "UART bağlantısı yok"
+        start = self.clock.time()
 
-        # Buffer'ları temizle
-        self.clear_buffers()
+        if self.status_supported is not False:
+            ceiling = max(1.0, self.timing_table.default_delay(operation, sector) * 3)
+            ready = self._poll_status(start + ceiling)
+            elapsed = self.clock.time() - start
+            if ready:
+                self.timing_table.record(operation, sector, elapsed, self._timing_device())
+                return elapsed
+            if ready is False:
+                if not self._is_cancelled():
+                    logger.debug("Cihaz %.1fs içinde hazır olmadı", ceiling)
+                return elapsed
 
+        device = self._timing_device()
+        if command_round_trip is not None and command_round_trip >= self._held_ack_threshold():
+            # ACK işlem bitince geldi: gidiş-dönüş, kartın gerçek hazırlık süresidir
+            self.timing_table.record(operation, sector, command_round_trip, device)
+        if self.timing_table.has_learned(operation, sector, device):
+            # Öğrenilmiş süre komut gönderiminden itibaren sayılır
+            safe_delay = self.timing_table.delay(operation, sector, device) - (command_round_trip or 0.0)
+        else:
+            safe_delay = self.timing_table.default_delay(operation, sector)
+        self._sleep(safe_delay - (self.clock.time() - start))
+        return self.clock.time() - start
+
+    def _held_ack_threshold(self) -> float:
+        """Bu süreden uzun komut ACK'i cihaz işlemi bitirdikten sonra gönderilmiştir"""
+        data_estimator = self.rto.estimator(STM32Protocol.create_data_packet(bytes(STM32Protocol.DATA_PAYLOAD_SIZE)))
+        srtt = data_estimator.srtt if data_estimator and data_estimator.srtt is not None else 0.0
+        return max(self.held_ack_threshold, 4 * max(srtt, self._idle_round_trip))
+
+    def _erase_one(self, sector: int, delay_after_cmd: Optional[float] = None) -> tuple[bool, str]:
+        """Tek sektör için CMD_ERASE + hazır bekleme + FINISH (buffer temizlemeden)"""
         # CMD_ERASE gönder
         success, message = self.send_cmd_erase_packet(sector)
         if not success:
+            if self._is_cancelled():
+                return self._abort()
             return False, f"CMD_ERASE hatası: {message}"
+        command_round_trip = self.last_round_trip or 0.0
+        erase_start = self.clock.time()
 
         # Erase işlemi için bekle
-        time.sleep(delay_after_cmd)
+        if delay_after_cmd is not None:
+            self._sleep(delay_after_cmd)
+        else:
+            self.wait_until_ready("erase", sector, command_round_trip)
+        if self._is_cancelled():
+            return self._abort()
 
-        # FINISH gönder
-        success, message = self.send_finish_packet()
+        # FINISH gönder; cihaz hâlâ meşgulse (NACK 0x06) kısa aralıklarla tekrar dene
+        deadline = erase_start + max(1.0, self.timing_table.default_delay("erase", sector) * 3)
+        busy_retries = 0
+        while True:
+            success, message = self.send_finish_packet()
+            if success or self.last_nack_code != STM32Protocol.NACK_BUSY or self.clock.time() >= deadline:
+                break
+            busy_retries += 1
+            self.retry_count += 1
+            if self._sleep(0.05):
+                break
         if not success:
+            if self._is_cancelled():
+                return self._abort()
             return False, f"FINISH paketi hatası: {message}"
 
-        return True, f"Sektör {sector} başarıyla silindi"
+        if busy_retries and self.status_supported is False:
+            # Tablodaki süre yetmedi: gözlenen (üst sınır) süreyi komut gönderiminden itibaren öğren
+            self.timing_table.record("erase", sector, self.clock.time() - erase_start + command_round_trip,
+                                     self._timing_device())
+
+        return True, f"Sektör {sector} başarıyla silindi ({self.clock.time() - erase_start:.2f}s)"
+
+    def erase_sector(self, sector: int, delay_after_cmd: Optional[float] = None,
+                     cancel_token: Optional[CancelToken] = None) -> tuple[bool, str]:
+        """Belirtilen sektörü siler (CMD_ERASE + hazır olana kadar bekle + FINISH)
+
+        Args:
+            sector: Silinecek sektör numarası (0-255)
+            delay_after_cmd: CMD_ERASE ACK'inden sonra sabit bekleme süresi (saniye).
+                None ise cihazın hazır bilgisi / öğrenilmiş zamanlama tablosu kullanılır.
+            cancel_token: İptal edilirse cihaza FINISH gönderilip (False, "İşlem iptal edildi") döner
+        Returns:
+            (başarılı_mı, mesaj)
+        """
+        if not self.is_connected:
+            return False, "UART bağlantısı yok"
+
+        self._begin_session()
+        with self._cancellable(cancel_token):
+            # Buffer'ları temizle
+            self.clear_buffers()
+
+            result = self._erase_one(sector, delay_after_cmd)
+        self._phases[f"erase_{sector}"] = self.clock.time() - self._session_start
+        self._record_session("erase", str(sector), result)
+        return result
+
+    def erase_sectors(self, sectors: Iterable[int],
+                      progress_callback: Optional[Callable[[int, int, SectorEraseResult], None]] = None,
+                      stop_on_error: bool = True,
+                      cancel_token: Optional[CancelToken] = None) -> tuple[bool, str]:
+        """Birden fazla sektörü art arda siler
+
+        Buffer'lar yalnızca başta bir kez temizlenir; her sektörün FINISH
+        ACK'i gelir gelmez sıradaki CMD_ERASE gönderilir. Sektör başına
+        sonuç ve süreler last_erase_results'ta tutulur.
+
+        Args:
+            sectors: Silinecek sektör numaraları (sırayla)
+            progress_callback: Her sektör sonrası çağrılır (current, total, sonuç)
+            stop_on_error: İlk hatada dur (False: kalan sektörlere devam et)
+            cancel_token: İptal edilirse sıradaki sektöre geçilmez
+        Returns:
+            (başarılı_mı, mesaj)
+        """
+        if not self.is_connected:
+            return False, "UART bağlantısı yok"
+
+        sectors = list(sectors)
+        self.last_erase_results = []
+        if not sectors:
+            return False, "Silinecek sektör yok"
+
+        self._begin_session()
+        with self._cancellable(cancel_token):
+            result = self._erase_batch(sectors, progress_callback, stop_on_error)
+        for erase_result in self.last_erase_results:
+            self._phases[f"erase_{erase_result.sector}"] = erase_result.duration
+        self._record_session("erase", ",".join(map(str, sectors)), result)
+        return result
+
+    def _erase_batch(self, sectors: List[int],
+                     progress_callback: Optional[Callable[[int, int, SectorEraseResult], None]],
+                     stop_on_error: bool) -> tuple[bool, str]:
+        """erase_sectors gövdesi (iptal bayrağı etkinken çağrılır)"""
+        self.clear_buffers()
+        batch_start = self.clock.time()
+
+        for index, sector in enumerate(sectors):
+            if self._is_cancelled():
+                return False, f"{CANCELLED_MESSAGE} ({index}/{len(sectors)} sektör silindi)"
+            sector_start = self.clock.time()
+            success, message = self._erase_one(sector)
+            result = SectorEraseResult(sector, success, message, self.clock.time() - sector_start)
+            self.last_erase_results.append(result)
+            logger.debug("Sektör %d: %s (%.3fs)", sector, 'OK' if success else 'HATA', result.duration)
+
+            if progress_callback:
+                progress_callback(index + 1, len(sectors), result)
+            if not success and self._is_cancelled():
+                return False, f"{CANCELLED_MESSAGE} ({index}/{len(sectors)} sektör silindi)"
+            if not success and stop_on_error:
+                return False, f"Sektör {sector} silinemedi: {message}"
+
+        failed = [r.sector for r in self.last_erase_results if not r.success]
+        elapsed = self.clock.time() - batch_start
+        if failed:
+            return False, f"{len(failed)} sektör silinemedi: {failed} ({elapsed:.2f}s)"
+        return True, f"{len(sectors)} sektör başarıyla silindi ({elapsed:.2f}s)"
+
+    def erase_all(self, sector_count: int = len(STM32F4_SECTOR_SIZES),
+                  progress_callback: Optional[Callable[[int, int, SectorEraseResult], None]] = None,
+                  cancel_token: Optional[CancelToken] = None) -> tuple[bool, str]:
+        """Tüm sektörleri siler (varsayılan: STM32F4'ün 12 sektörü)"""
+        return self.erase_sectors(range(sector_count), progress_callback, cancel_token=cancel_token)
     
     def send_firmware(self, firmware_data: bytes, sector: int, 
-                     progress_callback: Optional[Callable[[int, int], None]] = None) -> tuple[bool, str]:
+                     progress_callback: Optional[Callable[[int, int], None]] = None,
+                     cancel_token: Optional[CancelToken] = None,
+                     plan: Optional[TransferPlan] = None) -> tuple[bool, str]:
         """
         Tüm firmware'i gönderir
         
@@ -220,6 +804,13 @@ class UARTCommunication:
             firmware_data: Firmware binary data
             sector: Hedef sektör
             progress_callback: İlerleme callback fonksiyonu (current, total)
+            cancel_token: İptal edilirse en geç bir paket gidiş-dönüşü içinde
+                durulur, cihaza FINISH gönderilir ve buffer'lar temizlenir
+            plan: Bu görüntü için plan_transfer ile hesaplanmış tahmin. Verilirse
+                aktarım modu plandan seçilir, gerçek süre plana yazılır ve tahmin
+                geçmişe kaydedilir; yükleme tahmin için beklemez.
+            
+        profile_mode ayarlıysa oturum profillenir; sonuç last_profile'da tutulur.
             
         Returns:
             tuple: (başarılı_mı, sonuç_mesajı)
@@ -227,36 +818,398 @@ class UARTCommunication:
         if not self.is_connected:
             return False, "UART bağlantısı yok"
         
+        self.last_plan = plan
+        if plan:
+            self.transfer_mode = plan.best().mode
+        
+        self._begin_session()
+        if not self.profile_mode:
+            with self._cancellable(cancel_token):
+                result = self._send_firmware(firmware_data, sector, progress_callback)
+        else:
+            with SessionProfiler(self.profile_mode, name=f"flash_{self.port}") as profiler, \
+                    self._cancellable(cancel_token):
+                result = self._send_firmware(firmware_data, sector, progress_callback)
+            self.last_profile = profiler.report
+        if plan and result[0]:
+            # Tahmin gerçek süreyle birlikte kaydedilir: model geçmişten kalibre edilir
+            plan.actual = self.clock.time() - self._session_start
+            self._phases["predicted"] = plan.flash_duration
+            logger.debug("Yükleme süresi: %s", plan.compare())
+        self._record_session("flash", str(sector), result, firmware_data)
+        self._link_cache.clear()  # Geçmişe yeni ölçüm eklendi
+        return result
+
+    def plan_transfer(self, firmware_data: bytes, sector: int, erase: bool = False) -> TransferPlan:
+        """
+        Yükleme süresini her aktarım modu için tahmin eder
+
+        Bağlantı profili aynı port / baud rate'teki önceki yüklemelerden,
+        yoksa bu bağlantıda ölçülen DATA gidiş-dönüşünden çıkarılır. Profil
+        bağlantı ve yükleme başına bir kez hesaplanıp saklanır.
+
+        Args:
+            firmware_data: Gönderilecek görüntü
+            sector: Hedef sektör
+            erase: Yükleme öncesi silme süresi de eklensin
+        """
+        device = self._timing_device()
+        key = (self.port, self.baudrate, sector, device)
+        link = self._link_cache.get(key)
+        if link is None:
+            data_estimator = self.rto.estimator(
+                STM32Protocol.create_data_packet(bytes(STM32Protocol.DATA_PAYLOAD_SIZE)))
+            history = (self.history or default_flash_history()) if self.record_history else None
+            link = self._link_cache[key] = estimate_link(
+                self.baudrate, self.guard_time, sector, history, self.port,
+                rtt=data_estimator.srtt if data_estimator else None, timing_table=self.timing_table, device=device)
+        erase_time = self.timing_table.delay("erase", sector, self._timing_device()) if erase else 0.0
+        return plan_transfer(firmware_data, link, self.supported_transfer_modes, erase_time)
+    
+    def _send_firmware(self, firmware_data: bytes, sector: int,
+                       progress_callback: Optional[Callable[[int, int], None]]) -> tuple[bool, str]:
+        """send_firmware gövdesi (iptal bayrağı etkinken çağrılır)"""
+        # Paketleri hazırla (aynı görüntü daha önce paketlendiyse önbellekten gelir)
+        encoded = self.frame_cache.get_or_encode(firmware_data, sector)
+        
         # Buffer'ları temizle
         self.clear_buffers()
         
+        success, message = self._write_image(encoded, sector, progress_callback)
+        if not success:
+            return False, message
+        return True, f"Firmware başarıyla gönderildi ({len(firmware_data)} byte, {encoded.packet_count} paket)" 
+
+    def _write_image(self, encoded: EncodedImage, sector: int,
+                     progress_callback: Optional[Callable[[int, int], None]],
+                     phase_prefix: str = "") -> tuple[bool, str]:
+        """Paketlenmiş görüntüyü yazar: CMD_WRITE + hazır bekleme + DATA + FINISH (buffer temizlemeden)"""
+        phase_start = self.clock.time()
+        
         # CMD_WRITE paketi gönder (sektörü yazma için hazırla)
         success, message = self.send_cmd_write_packet(sector)
         if not success:
+            if self._is_cancelled():
+                return self._abort()
             return False, f"CMD_WRITE paketi hatası: {message}"
         
-        # CMD_WRITE ACK'inden sonra gecikme (STM32'nin hazırlanması için)
-        time.sleep(1)  # 500 ms bekle
+        # CMD_WRITE ACK'inden sonra STM32'nin hazırlanmasını bekle
+        self.wait_until_ready("write", sector, self.last_round_trip)
+        phase_start = self._end_phase(phase_prefix + "prepare", phase_start)
 
         # DATA paketlerini gönder
-        data_size = STM32Protocol.DATA_PAYLOAD_SIZE
-        total_packets = (len(firmware_data) + data_size - 1) // data_size
+        total_packets = encoded.packet_count
         
-        for i in range(total_packets):
-            start_idx = i * data_size
-            end_idx = min(start_idx + data_size, len(firmware_data))
-            chunk = firmware_data[start_idx:end_idx]
-            
-            success, message = self.send_data_packet(chunk)
+        for i, packet in enumerate(encoded.packets()):
+            success, message = self.send_packet_and_wait_ack(packet)
             if not success:
+                if self._is_cancelled():
+                    return self._abort()
                 return False, f"DATA paketi {i+1}/{total_packets} hatası: {message}"
             
             if progress_callback:
                 progress_callback(i + 1, total_packets)
+        phase_start = self._end_phase(phase_prefix + "data", phase_start)
         
         # FINISH paketi gönder
         success, message = self.send_finish_packet()
         if not success:
+            if self._is_cancelled():
+                return self._abort()
             return False, f"FINISH paketi hatası: {message}"
+        self._end_phase(phase_prefix + "finish", phase_start)
         
-        return True, f"Firmware başarıyla gönderildi ({len(firmware_data)} byte, {total_packets} paket)" 
\ No newline at end of file
+        return True, f"Sektör {sector}: {total_packets} paket yazıldı"
+
+    def flash_bundle(self, manifest: BundleManifest,
+                     progress_callback: Optional[Callable[[int, int], None]] = None,
+                     cancel_token: Optional[CancelToken] = None) -> tuple[bool, str]:
+        """
+        Paketteki görüntüleri (konfigürasyon, uygulama, kalibrasyon...) tek oturumda yükler
+
+        Tüm görüntüler önce paketlenir (önbellekten), buffer'lar bir kez
+        temizlenir, manifest.erase ise gereken her sektör bir kez silinir ve
+        görüntüler sırayla açık bağlantı üzerinden yazılır. Birleşik zamanlama
+        raporu last_bundle_report'ta tutulur.
+
+        Args:
+            manifest: Paket tanımı (bkz. load_manifest)
+            progress_callback: Tüm paketler üzerinden ilerleme (current, total)
+            cancel_token: İptal edilirse cihaza FINISH gönderilir, kalan görüntüler yazılmaz
+        Returns:
+            (başarılı_mı, mesaj)
+        """
+        if not self.is_connected:
+            return False, "UART bağlantısı yok"
+        errors = manifest.validate()
+        if errors:
+            return False, "Paket tanımı hatalı: " + "; ".join(errors)
+
+        self._begin_session()
+        report = self.last_bundle_report = BundleReport(manifest.name)
+        with self._cancellable(cancel_token):
+            result = self._flash_bundle(manifest, report, progress_callback)
+        report.success, report.message = result
+        report.duration = self.clock.time() - self._session_start
+
+        images = manifest.ordered()
+        self._record_session("bundle", ",".join(str(image.sector) for image in images), result,
+                             b"".join(image.data for image in images))
+        return result
+
+    def _flash_bundle(self, manifest: BundleManifest, report: BundleReport,
+                      progress_callback: Optional[Callable[[int, int], None]]) -> tuple[bool, str]:
+        """flash_bundle gövdesi (iptal bayrağı etkinken çağrılır)"""
+        images = manifest.ordered()
+        # Flash'a dokunmadan önce hepsini paketle
+        encoded = [self.frame_cache.get_or_encode(image.data, image.sector) for image in images]
+        total_packets = sum(frames.packet_count for frames in encoded)
+
+        self.clear_buffers()
+
+        if manifest.erase:
+            for sector in manifest.erase_plan():
+                if self._is_cancelled():
+                    return self._abort()
+                sector_start = self.clock.time()
+                success, message = self._erase_one(sector)
+                report.erase_durations[sector] = self._phases[f"erase_{sector}"] = self.clock.time() - sector_start
+                logger.debug("Paket silme sektör %d: %s", sector, 'OK' if success else 'HATA')
+                if not success:
+                    return False, message if self._is_cancelled() else f"Sektör {sector} silinemedi: {message}"
+
+        sent = 0
+        for image, frames in zip(images, encoded):
+            if self._is_cancelled():
+                return self._abort()
+
+            def on_packet(current: int, _total: int, offset: int = sent):
+                progress_callback(offset + current, total_packets)
+
+            prefix = f"{image.name}."
+            success, message = self._write_image(frames, image.sector, on_packet if progress_callback else None,
+                                                 phase_prefix=prefix)
+            report.images.append(BundleImageResult(
+                name=image.name,
+                sector=image.sector,
+                bytes=len(image.data),
+                packets=frames.packet_count,
+                success=success,
+                message=message,
+                phases={name[len(prefix):]: value for name, value in self._phases.items() if name.startswith(prefix)},
+            ))
+            if not success:
+                if self._is_cancelled():
+                    return False, message
+                return False, f"'{image.name}' (sektör {image.sector}) yüklenemedi: {message}"
+            sent += frames.packet_count
+
+        return True, (f"{len(images)} görüntü yüklendi ({manifest.total_bytes} byte, {total_packets} paket, "
+                      f"{self.clock.time() - self._session_start:.2f}s)")
+
+    # ------------------------------------------------------------------
+    # Oturum Geçmişi
+    # ------------------------------------------------------------------
+    def _begin_session(self):
+        """Oturum sayaçlarını ve aşama sürelerini sıfırlar"""
+        self._session_start = self.clock.time()
+        self.nack_count = 0
+        self.retry_count = 0
+        self.late_response_count = 0
+        self._phases = {}
+
+    def _end_phase(self, name: str, phase_start: float) -> float:
+        """Aşama süresini kaydeder, sonraki aşamanın başlangıcını döner"""
+        now = self.clock.time()
+        self._phases[name] = now - phase_start
+        return now
+
+    def _cached_adapter_serial(self) -> Optional[str]:
+        """Adaptör seri numarası (port başına bir kez taranır; ağ bağlantılarında None)"""
+        if self.transport.kind != "serial":
+            return None
+        if self._adapter_serial_cache is None or self._adapter_serial_cache[0] != self.port:
+            self._adapter_serial_cache = (self.port, self.get_adapter_serial())
+        return self._adapter_serial_cache[1]
+
+    def _timing_device(self) -> str:
+        """Zamanlama tablosundaki cihaz kimliği: adaptör seri numarası (yoksa port) + STATUS desteği"""
+        identity = self._cached_adapter_serial() or self.port
+        return f"{identity}|{'status' if self.status_supported else 'legacy'}"
+
+    def _record_session(self, operation: str, sectors: str, result: tuple,
+                        firmware_data: Optional[bytes] = None):
+        """Biten oturumu geçmiş deposuna kuyruklar (aktarım sonrası, hata aktarımı etkilemez)"""
+        if not self.record_history:
+            return
+        try:
+            history = self.history or default_flash_history()
+            size = len(firmware_data) if firmware_data is not None else 0
+            history.record(FlashRecord(
+                operation=operation,
+                port=self.port,
+                started_at=self._session_start,
+                duration=self.clock.time() - self._session_start,
+                success=bool(result[0]),
+                message=result[1],
+                sectors=sectors,
+                bytes=size,
+                packets=-(-size // STM32Protocol.DATA_PAYLOAD_SIZE),
+                baudrate=self.baudrate,
+                nacks=self.nack_count,
+                retries=self.retry_count,
+                adapter_serial=self._cached_adapter_serial(),
+                image_hash=hashlib.sha256(firmware_data).hexdigest() if firmware_data is not None else None,
+                phases={name: round(value, 4) for name, value in self._phases.items()},
+                app_version=app_version(),
+            ))
+        except Exception as e:
+            logger.debug("Oturum geçmişe kaydedilemedi: %s", e)
+
+    # ------------------------------------------------------------------
+    # Otomatik Baud Rate
+    # ------------------------------------------------------------------
+    def _set_host_baudrate(self, baudrate: int):
+        """Sadece host tarafındaki baud rate'i değiştirir"""
+        self.serial_conn.baudrate = baudrate
+        self.baudrate = baudrate
+        self.rto.reset()  # Gidiş-dönüş süreleri hızla değişir
+        self.serial_conn.reset_input_buffer()
+        with self._rx_lock:
+            self._decoder.reset()
+        self._discard_stale_responses()
+
+    def probe_link(self, burst_size: int = 20, timeout: float = 0.2) -> BaudProbeResult:
+        """
+        Mevcut baud rate'te PING paketi patlaması gönderip hata oranını ölçer
+
+        NACK 0x01 (bilinmeyen mesaj tipi) yanıtı da başarılı sayılır: PING'i
+        desteklemeyen bootloader'larda bile paketin bozulmadan ulaştığını gösterir.
+        """
+        result = BaudProbeResult(self.baudrate)
+        packet = STM32Protocol.create_ping_packet()
+        self.clear_buffers()
+
+        for _ in range(burst_size):
+            result.sent += 1
+            self._discard_stale_responses()
+            self._write_packet(packet)
+            event = self._wait_response(timeout)
+
+            if event is None:
+                result.timeouts += 1
+            elif event.is_ack or event.code == STM32Protocol.NACK_UNKNOWN_TYPE:
+                result.acked += 1
+            else:
+                result.nacks += 1
+
+        return result
+
+    def request_baudrate(self, baudrate: int, timeout: float = 0.5) -> tuple[bool, str]:
+        """
+        Cihazdan SET_BAUD ile yeni hıza geçmesini ister, ACK sonrası host'u da geçirir
+
+        Returns:
+            (başarılı_mı, mesaj)
+        """
+        previous = self.baudrate
+        packet = STM32Protocol.create_set_baud_packet(baudrate)
+        self.clear_buffers()
+        self._write_packet(packet)
+        event = self._wait_response(timeout)
+
+        if event and event.is_ack:
+            self._set_host_baudrate(baudrate)
+            return True, f"Baud rate değiştirildi: {previous} -> {baudrate}"
+
+        if event is None:
+            # ACK kaybolmuş olabilir; cihaz yeni hıza geçmişse orada yanıt verir
+            self._set_host_baudrate(baudrate)
+            if self.probe_link(burst_size=3, timeout=timeout).acked > 0:
+                return True, f"Baud rate değiştirildi (ACK kayıp): {previous} -> {baudrate}"
+            self._set_host_baudrate(previous)
+            return False, "SET_BAUD yanıt timeout"
+
+        return False, f"SET_BAUD reddedildi: {event.message}"
+
+    def auto_baud(self, candidates: Optional[List[int]] = None, max_error_rate: float = 0.02,
+                  burst_size: int = 20, probe_timeout: float = 0.2,
+                  cache: Optional[BaudRateCache] = None, use_cache: bool = True,
+                  progress_callback: Optional[Callable[[BaudProbeResult], None]] = None) -> tuple[bool, str]:
+        """
+        Güvenli hızdan başlayarak hata oranı eşiğin altında kalan en yüksek baud rate'i bulur
+
+        Her aday hızda PING patlaması gönderilir; NACK + timeout oranı
+        max_error_rate'i geçen ilk hızda bir önceki hıza dönülür. Sonuç
+        adaptör seri numarasına göre önbelleğe yazılır ve sonraki oturumda
+        önce o hız denenir.
+
+        Args:
+            candidates: Denenecek baud rate'ler (varsayılan: DEFAULT_BAUDRATE_CANDIDATES)
+            max_error_rate: Kabul edilen en yüksek hata oranı (0.0-1.0)
+            burst_size: Her hızda gönderilecek test paketi sayısı
+            probe_timeout: Test paketi başına yanıt bekleme süresi (saniye)
+            cache: Baud rate önbelleği (varsayılan: kullanıcı veri dizini)
+            use_cache: Önbellekteki hız önce denensin mi
+            progress_callback: Her ölçüm sonrası çağrılır
+        Returns:
+            (başarılı_mı, mesaj)
+        """
+        if not self.is_connected or not self.serial_conn:
+            return False, "UART bağlantısı yok"
+        if not self.transport.supports_baudrate:
+            return False, f"{self.port}: bu bağlantı türünde host baud rate'i değiştirilemez"
+
+        candidates = candidates or DEFAULT_BAUDRATE_CANDIDATES
+        cache = cache or BaudRateCache()
+        adapter_serial = self.get_adapter_serial()
+        self.baud_probe_results = []
+
+        def measure() -> BaudProbeResult:
+            result = self.probe_link(burst_size, probe_timeout)
+            self.baud_probe_results.append(result)
+            logger.debug("Baud testi - %s", result)
+            if progress_callback:
+                progress_callback(result)
+            return result
+
+        start_rate = self.baudrate
+
+        # Önbellekteki hız doğrudan çalışıyorsa taramaya gerek yok
+        if use_cache and adapter_serial:
+            cached_rate = cache.get(adapter_serial)
+            if cached_rate and cached_rate != start_rate:
+                ok, _ = self.request_baudrate(cached_rate, probe_timeout)
+                if ok:
+                    result = measure()
+                    if result.error_rate <= max_error_rate:
+                        return True, f"Önbellekteki baud rate kullanılıyor: {cached_rate}"
+                    if not self.request_baudrate(start_rate, probe_timeout)[0]:
+                        return False, f"{start_rate} baud'a geri dönülemedi, kartı resetleyin"
+
+        best = measure()
+        if best.error_rate > max_error_rate:
+            return False, f"Başlangıç hızında bağlantı güvenilir değil: {best}"
+
+        for rate in sorted(c for c in candidates if c > start_rate):
+            previous = self.baudrate
+            ok, message = self.request_baudrate(rate, probe_timeout)
+            if not ok:
+                logger.debug("%s baud'a geçilemedi: %s", rate, message)
+                break
+
+            result = measure()
+            if result.error_rate <= max_error_rate:
+                best = result
+                continue
+
+            # Hata oranı yüksek: son güvenilir hıza geri dön
+            recovered = any(self.request_baudrate(previous, probe_timeout)[0] for _ in range(5))
+            if not recovered:
+                return False, f"{previous} baud'a geri dönülemedi, kartı resetleyin"
+            break
+
+        if adapter_serial:
+            cache.set(adapter_serial, best.baudrate, best.error_rate)
+
+        return True, f"En hızlı güvenilir baud rate: {best.baudrate} ({best})"
@@ -0,0 +1,113 @@
+import itertools
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional
+from .clock import VirtualClock
+from .device_simulator import STM32BootloaderSimulator, VirtualLinkSerial
+from .frame_cache import FrameCache
+from .sector_timing import SectorTimingTable
+from .transfer_planner import LinkProfile, format_duration, plan_transfer
+from .uart_comm import UARTCommunication
+
+@dataclass
+class VirtualRun:
+    """Sanal zamanda koşulan tek yükleme oturumunun sonucu"""
+    baudrate: int
+    turnaround: float
+    error_rate: float
+    image_size: int
+    success: bool
+    message: str
+    duration: float      # Oturumun gerçek hatta süreceği zaman (sanal saniye)
+    wall_time: float     # Simülasyonun gerçekte sürdüğü zaman (saniye)
+    predicted: float     # Planlayıcının aynı hat parametreleriyle tahmini (saniye)
+    nacks: int = 0
+    phases: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def throughput(self) -> float:
+        """Byte/saniye (sanal; yarıda kalan oturumda 0)"""
+        return self.image_size / self.duration if self.success and self.duration else 0.0
+
+    def __str__(self) -> str:
+        line = (f"{self.baudrate:>8} baud  bekleme {self.turnaround * 1000:5.2f} ms  hata %{self.error_rate * 100:<5g} "
+                f"{format_duration(self.duration):>8}  ")
+        if not self.success:
+            return line + f"[{self.wall_time * 1000:.0f} ms]  HATA: {self.message}"
+        error = round((self.duration - self.predicted) / self.predicted * 100, 1) + 0.0 if self.predicted else 0.0
+        return line + (f"{self.throughput / 1024:7.1f} KB/s  tahmin {format_duration(self.predicted)} (%{error:+.1f})  "
+                       f"[{self.wall_time * 1000:.0f} ms]")
+
+def simulate_flash(image: bytes, sector: int = 5, baudrate: int = 115200, turnaround: float = 0.0005,
+                   error_rate: float = 0.0, erase: bool = False, guard_time: Optional[float] = None,
+                   write_prepare_time: float = 0.0, seed: Optional[int] = 0) -> VirtualRun:
+    """
+    Görüntüyü sanal zamanda simüle cihaza yükler
+
+    UARTCommunication ve cihaz aynı VirtualClock'u paylaşır; hat süreleri
+    baud rate ve çerçeve boyundan hesaplanır, beklemeler saati ilerletir.
+    Gerçek donanımda dakikalar sürecek oturum saniyeler içinde biter (süre
+    paket sayısıyla doğrusal; ör. 256 KB ≈ 16k paket). Paket izi yalnızca
+    src.uart_comm logger'ı DEBUG seviyesindeyse üretilir.
+
+    Args:
+        image: Gönderilecek görüntü
+        sector: Hedef sektör
+        baudrate: Hat hızı
+        turnaround: Paketin cihaza ulaşmasından yanıtın gönderilmesine kadar (saniye)
+        error_rate: Paket başına bozulma / kaybolma olasılığı
+        erase: Yüklemeden önce sektörü sil
+        guard_time: Yanıt sonrası bekleme (None: UARTCommunication varsayılanı)
+        write_prepare_time: Cihazın CMD_WRITE sonrası meşgul kalma süresi (saniye)
+        seed: Hata üreteci tohumu
+    """
+    clock = VirtualClock()
+    device = STM32BootloaderSimulator(baudrate, write_prepare_time=write_prepare_time, clock=clock)
+    uart = UARTCommunication("virtual", baudrate, clock=clock)
+    uart.serial_conn = VirtualLinkSerial(device, clock, baudrate, turnaround=turnaround,
+                                         error_rate=error_rate, seed=seed)
+    uart.is_connected = True
+    uart.record_history = False
+    uart.timing_table = SectorTimingTable(path="")
+    uart.frame_cache = FrameCache()
+    if guard_time is not None:
+        uart.guard_time = guard_time
+
+    wall_start = time.perf_counter()
+    result = (True, "")
+    phases: Dict[str, float] = {}
+    if erase:
+        result = uart.erase_sector(sector)
+        phases.update(uart._phases)
+    if result[0]:
+        result = uart.send_firmware(image, sector)
+        phases.update(uart._phases)
+    wall_time = time.perf_counter() - wall_start
+
+    # Planlayıcının modeli: aynı hat parametreleriyle analitik tahmin
+    link = LinkProfile(baudrate, turnaround, uart.guard_time, prepare=0.0, finish=0.0, source="simülasyon")
+    link.prepare = 2 * link.frame_time() + write_prepare_time  # CMD_WRITE + STATUS
+    link.finish = link.frame_time()
+    erase_time = 2 * link.frame_time() + device.erase_duration(sector) if erase else 0.0
+    predicted = plan_transfer(image, link, erase_time=erase_time).best().duration
+
+    return VirtualRun(baudrate, turnaround, error_rate, len(image), result[0], result[1], clock.elapsed,
+                      wall_time, predicted, uart.nack_count, phases)
+
+def sweep(image: bytes, baudrates: Iterable[int] = (115200,), turnarounds: Iterable[float] = (0.0005,),
+          error_rates: Iterable[float] = (0.0,), on_run: Optional[Callable[[VirtualRun], None]] = None,
+          **kwargs) -> List[VirtualRun]:
+    """
+    Parametrelerin tüm kombinasyonlarını sanal zamanda koşar
+
+    Args:
+        on_run: Her oturumdan sonra çağrılır (ör. print)
+        kwargs: simulate_flash parametreleri
+    """
+    runs = []
+    for baudrate, turnaround, error_rate in itertools.product(baudrates, turnarounds, error_rates):
+        run = simulate_flash(image, baudrate=baudrate, turnaround=turnaround, error_rate=error_rate, **kwargs)
+        runs.append(run)
+        if on_run:
+            on_run(run)
+    return runs
@@ -0,0 +1,46 @@
+"""
+pytest ortak ayarları
+
+Testler geliştiricinin ~/.stm32_bootloader dizinine (yükleme geçmişi,
+sektör zamanlama tablosu, oturum logları, baud önbelleği) yazmamalı: bu
+kayıtlar gerçek donanımdaki tahminleri ve beklemeleri etkiler. Oturum
+boyunca uygulama veri dizini geçici bir dizine yönlendirilir ve paylaşılan
+varsayılan nesneler (geçmiş deposu, log yazıcısı) sıfırlanır.
+"""
+
+import os
+import sys
+
+import pytest
+
+# Proje kök dizinini Python path'ine ekle
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src import flash_history, session_log
+
+def reset_default_stores():
+    """Paylaşılan geçmiş deposunu kapatır, log yazıcısının kuyruğunu boşaltır ve ikisini de sıfırlar"""
+    with flash_history._default_lock:
+        history, flash_history._default_history = flash_history._default_history, None
+    if history is not None:
+        history.close()
+    with session_log._default_lock:
+        writer, session_log._default_writer = session_log._default_writer, None
+    if writer is not None:
+        writer.flush()
+
+@pytest.fixture(scope="session", autouse=True)
+def isolated_app_home(tmp_path_factory):
+    """Uygulama veri dizini test oturumu boyunca geçici dizindir"""
+    home = str(tmp_path_factory.mktemp("stm32_bootloader_home"))
+    previous = os.environ.get("STM32_BOOTLOADER_HOME")
+    os.environ["STM32_BOOTLOADER_HOME"] = home
+    reset_default_stores()
+    try:
+        yield home
+    finally:
+        reset_default_stores()
+        if previous is None:
+            os.environ.pop("STM32_BOOTLOADER_HOME", None)
+        else:
+            os.environ["STM32_BOOTLOADER_HOME"] = previous
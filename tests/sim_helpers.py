@@ -0,0 +1,42 @@
+"""
+Testlerin ortak simülatör yardımcıları
+
+make_uart, simülatöre bağlı ve diske hiçbir şey yazmayan bir
+UARTCommunication döner: sektör zamanlama tablosu yalnızca bellekte,
+paket önbelleği teste özel, yükleme geçmişi ya verilen depoya (ör.
+FlashHistory(path="")) yazılır ya da kapalıdır. Gerçek veri dizinine
+yazan bir test, gerçek donanımdaki beklemeleri ve tahminleri bozar.
+"""
+
+import os
+import sys
+from typing import Optional
+
+# Proje kök dizinini Python path'ine ekle
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.device_simulator import STM32BootloaderSimulator, SimulatedSerial
+from src.flash_history import FlashHistory
+from src.frame_cache import FrameCache
+from src.sector_timing import SectorTimingTable
+from src.uart_comm import UARTCommunication
+
+def make_uart(device: STM32BootloaderSimulator, history: Optional[FlashHistory] = None,
+              seed: Optional[int] = None, link=None) -> UARTCommunication:
+    """
+    Simülatöre bağlı, disk durumundan yalıtılmış UARTCommunication
+
+    Args:
+        device: Simüle cihaz (saati UARTCommunication'a da verilir)
+        history: Oturumların yazılacağı depo (None: kayıt kapalı)
+        seed: SimulatedSerial hata üreteci tohumu
+        link: Hazır port (ör. VirtualLinkSerial; None: SimulatedSerial)
+    """
+    uart = UARTCommunication("virtual" if device.clock.virtual else "sim", device.baudrate, clock=device.clock)
+    uart.serial_conn = link or SimulatedSerial(device, device.baudrate, seed=seed)
+    uart.is_connected = True
+    uart.timing_table = SectorTimingTable(path="")
+    uart.frame_cache = FrameCache()
+    uart.history = history
+    uart.record_history = history is not None
+    return uart
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Otomatik Baud Rate Test Dosyası
+===============================
+
+UARTCommunication.auto_baud akışını simülatöre karşı test eder.
+"""
+
+import sys
+import os
+import tempfile
+
+# Proje kök dizinini Python path'ine ekle
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.auto_baud import BaudRateCache
+from src.device_simulator import STM32BootloaderSimulator
+from tests.sim_helpers import make_uart
+
+def test_auto_baud_settles_below_error_threshold():
+    """Hata oranı eşiği aşan ilk hızdan önceki hızda durmalı"""
+    print("⚡ Otomatik Baud Testleri:")
+
+    device = STM32BootloaderSimulator(max_reliable_baudrate=1000000)
+    uart = make_uart(device, seed=1)
+    cache = BaudRateCache(os.path.join(tempfile.mkdtemp(), "baud.json"))
+
+    success, message = uart.auto_baud(cache=cache, burst_size=10, probe_timeout=0.02)
+    print(f"  {message}")
+    assert success, message
+    assert uart.baudrate == 1000000, "En hızlı güvenilir hız 1 Mbps olmalı"
+    assert device.baudrate == uart.baudrate, "Cihaz ve host aynı hızda kalmalı"
+    assert uart.baud_probe_results[-1].error_rate > 0, "Son ölçüm eşiği aşmış olmalı"
+
+    print("  ✅ Otomatik baud testleri başarılı\n")
+
+def test_auto_baud_without_extensions():
+    """PING/SET_BAUD desteklemeyen cihazda başlangıç hızında kalmalı"""
+    print("🐢 Eski Bootloader Testleri:")
+
+    device = STM32BootloaderSimulator(support_extensions=False)
+    uart = make_uart(device, seed=1)
+    cache = BaudRateCache(os.path.join(tempfile.mkdtemp(), "baud.json"))
+
+    success, message = uart.auto_baud(cache=cache, burst_size=5, probe_timeout=0.02)
+    print(f"  {message}")
+    assert success, "NACK 0x01 yanıtları sağlam çerçeve sayılmalı"
+    assert uart.baudrate == 115200, "Hız değişmemeli"
+
+    print("  ✅ Eski bootloader testleri başarılı\n")
+
+def test_baud_cache_roundtrip():
+    """Önbellek adaptör seri numarasına göre hız saklamalı"""
+    print("💾 Baud Önbellek Testleri:")
+
+    cache = BaudRateCache(os.path.join(tempfile.mkdtemp(), "baud.json"))
+    assert cache.get("FT123") is None, "Boş önbellek None dönmeli"
+    cache.set("FT123", 921600, 0.01)
+    cache.set("FT456", 460800)
+    assert cache.get("FT123") == 921600, "Kaydedilen hız okunmalı"
+    cache.forget("FT123")
+    assert cache.get("FT123") is None, "Silinen kayıt None dönmeli"
+    assert cache.get("FT456") == 460800, "Diğer adaptörlerin kaydı korunmalı"
+    assert not os.path.exists(cache.path + ".tmp"), "Silme de geçici dosya üzerinden atomik yazmalı"
+
+    print("  ✅ Baud önbellek testleri başarılı\n")
+
+def main():
+    """Ana test fonksiyonu"""
+    print("Otomatik Baud Testleri Başlatılıyor...\n")
+
+    try:
+        test_baud_cache_roundtrip()
+        test_auto_baud_settles_below_error_threshold()
+        test_auto_baud_without_extensions()
+
+        print("🎉 Tüm testler başarıyla tamamlandı!")
+
+    except AssertionError as e:
+        print(f"❌ Test hatası: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"❌ Beklenmeyen hata: {e}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Komut Satırı Test Dosyası
+=========================
+
+CLI yardımcılarını (sektör listesi çözümü) test eder.
+"""
+
+import sys
+import os
+import contextlib
+import io
+import tempfile
+
+# Proje kök dizinini Python path'ine ekle
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.cli import main as cli_main, parse_sector_list
+
+def test_parse_sector_list():
+    """Tek sektör, aralık ve karışık listeler çözülmeli; hatalı aralıklar reddedilmeli"""
+    print("🔢 Sektör Listesi Testleri:")
+
+    assert parse_sector_list("5") == [5], "Tek sektör"
+    assert parse_sector_list("2-5") == [2, 3, 4, 5], "Aralık"
+    assert parse_sector_list("1,3-5") == [1, 3, 4, 5], "Sektör listesi çözülmeli"
+    assert parse_sector_list(" 4, 7 ,") == [4, 7], "Boşluklar ve boş parçalar yok sayılmalı"
+
+    for text in ("5-2", "", "a"):
+        try:
+            parse_sector_list(text)
+            assert False, f"'{text}' reddedilmeli"
+        except ValueError as e:
+            print(f"  Beklenen hata ({text!r}): {e}")
+
+    print("  ✅ Sektör listesi testleri başarılı\n")
+
+def test_plan_command():
+    """plan komutu porta bağlanmadan mod başına tahmin yazmalı"""
+    print("⏱️ Plan Komutu Testleri:")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        image_path = os.path.join(tmp, "firmware.bin")
+        with open(image_path, "wb") as f:
+            f.write(bytes(range(256)) * 16)
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            code = cli_main(["plan", image_path, "--sector", "5", "--erase", "--raw"])
+        print("  " + output.getvalue().strip().replace("\n", "\n  "))
+        assert code == 0, "plan komutu başarılı olmalı"
+        assert output.getvalue().strip(), "Tahmin yazılmalı"
+
+    print("  ✅ Plan komutu testleri başarılı\n")
+
+def main():
+    """Ana test fonksiyonu"""
+    print("CLI Testleri Başlatılıyor...\n")
+
+    try:
+        test_parse_sector_list()
+        test_plan_command()
+
+        print("🎉 Tüm testler başarıyla tamamlandı!")
+
+    except AssertionError as e:
+        print(f"❌ Test hatası: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"❌ Beklenmeyen hata: {e}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Cihaz Yürütücüsü Test Dosyası
+=============================
+
+Bağlantı başına tek işçili yürütücünün işlemleri sırayla çalıştırmasını,
+kapatırken bekleyenleri iptal etmesini, Future'ların after() döngüsüyle
+alınmasını ve ana döngü kare süresi ölçümünü test eder (Tk gerektirmez).
+"""
+
+import sys
+import os
+import threading
+import time
+
+# Proje kök dizinini Python path'ine ekle
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.device_executor import DeviceExecutor, FrameMonitor, FuturePoller
+
+class FakeLoop:
+    """Tk after() döngüsünün yerine geçen basit olay döngüsü"""
+
+    def __init__(self):
+        self._timers = []
+        self.thread_ids = set()
+
+    def after(self, ms, fn):
+        self._timers.append((time.perf_counter() + ms / 1000, fn))
+
+    def run(self, duration: float, until=None, stall_at=None, stall=0.0):
+        end = time.perf_counter() + duration
+        while time.perf_counter() < end and not (until and until()):
+            if stall_at is not None and time.perf_counter() >= stall_at:
+                time.sleep(stall)  # Ana döngüyü bloklayan uzun bir işlem
+                stall_at = None
+            now = time.perf_counter()
+            due = [t for t in self._timers if t[0] <= now]
+            for timer in due:
+                self._timers.remove(timer)
+                self.thread_ids.add(threading.get_ident())
+                timer[1]()
+            time.sleep(0.001)
+
+def test_executor_serializes_operations():
+    """Aynı bağlantıdaki işlemler üst üste binmemeli, sonuçlar GUI thread'inde alınmalı"""
+    print("🧵 Yürütücü Testleri:")
+
+    executor = DeviceExecutor("sim")
+    loop = FakeLoop()
+    poller = FuturePoller(loop, interval_ms=5)
+    active, overlaps, results = [], [], []
+
+    def operation(name):
+        active.append(name)
+        if len(active) > 1:
+            overlaps.append(list(active))
+        time.sleep(0.05)
+        active.remove(name)
+        return True, name
+
+    for name in ("erase", "flash"):
+        poller.watch(executor.submit(operation, name), lambda f: results.append(f.result()))
+    assert executor.busy, "İşlem sürerken busy True olmalı"
+
+    loop.run(2.0, until=lambda: len(results) == 2)
+    print(f"  Sonuçlar: {results}")
+    assert results == [(True, "erase"), (True, "flash")], "İşlemler sırayla bitmeli"
+    assert not overlaps, "Aynı portta iki işlem aynı anda çalışmamalı"
+    assert loop.thread_ids == {threading.get_ident()}, "Callback'ler döngü thread'inde çağrılmalı"
+    assert not executor.busy and poller.pending == 0, "İş kalmamalı"
+
+    # Kapatma: bekleyen işlem iptal edilir, port kapatma son işlem olarak çalışır
+    closed = threading.Event()
+    running = executor.submit(time.sleep, 0.1)
+    queued = executor.submit(operation, "late")
+    final = executor.close(closed.set)
+    assert queued.cancelled(), "Sıradaki işlem iptal edilmeli"
+    final.result(timeout=2)
+    assert running.done() and closed.is_set(), "Süren işlem bitmeli, ardından kapatma çalışmalı"
+    try:
+        executor.submit(operation, "after-close")
+        assert False, "Kapatılan yürütücü yeni iş almamalı"
+    except RuntimeError:
+        pass
+
+    print("  ✅ Yürütücü testleri başarılı\n")
+
+def test_frame_monitor():
+    """Bütçeyi aşan ana döngü blokları ölçülüp raporlanmalı"""
+    print("⏱️ Kare Süresi Testleri:")
+
+    loop = FakeLoop()
+    stalls = []
+    monitor = FrameMonitor(loop, budget_ms=50, interval_ms=10, on_stall=stalls.append)
+    monitor.start()
+    loop.run(0.3, stall_at=time.perf_counter() + 0.1, stall=0.15)
+    monitor.stop()
+
+    stats = monitor.stats()
+    print(f"  {stats}, donmalar: {[f'{s:.0f} ms' for s in stalls]}")
+    assert stats["frames"] > 5, "Kareler sayılmalı"
+    assert stats["stalls"] == 1 and len(stalls) == 1, "Tek donma raporlanmalı"
+    assert 100 <= stalls[0] <= 300, "Donma süresi ölçülmeli"
+    assert monitor.max_frame_ms >= stalls[0], "En uzun kare kaydedilmeli"
+
+    print("  ✅ Kare süresi testleri başarılı\n")
+
+def main():
+    """Ana test fonksiyonu"""
+    print("Cihaz Yürütücüsü Testleri Başlatılıyor...\n")
+
+    try:
+        test_executor_serializes_operations()
+        test_frame_monitor()
+
+        print("🎉 Tüm testler başarıyla tamamlandı!")
+
+    except AssertionError as e:
+        print(f"❌ Test hatası: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"❌ Beklenmeyen hata: {e}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
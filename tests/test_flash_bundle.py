@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Paket Yükleme Test Dosyası
+==========================
+
+Çoklu görüntü paket tanımının okunmasını / doğrulanmasını ve paketin
+simülatöre tek oturumda yüklenmesini test eder: her sektör bir kez silinir,
+buffer'lar bir kez temizlenir, görüntüler sırayla yazılır ve birleşik
+zamanlama raporu üretilir.
+"""
+
+import sys
+import os
+import json
+import struct
+import tempfile
+
+# Proje kök dizinini Python path'ine ekle
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.cancellation import CancelToken, CANCELLED_MESSAGE
+from src.device_simulator import STM32BootloaderSimulator
+from src.flash_bundle import BundleImage, BundleManifest, load_manifest
+from src.flash_layout import sector_address
+from src.stm32_protocol import MessageType
+from tests.sim_helpers import make_uart
+
+def app_image(sector: int, size: int = 512) -> bytes:
+    """Geçerli vektör tablolu uygulama görüntüsü"""
+    header = struct.pack("<II", 0x20020000, sector_address(sector) + 0x101)
+    return header + bytes(i % 251 for i in range(size - len(header)))
+
+def production_bundle() -> BundleManifest:
+    return BundleManifest("production", [
+        BundleImage("app", 5, app_image(5), order=2, vectors=True),
+        BundleImage("config", 2, bytes(range(64)), order=1),
+        BundleImage("calibration", 3, b"\x5a" * 48, order=3),
+    ])
+
+def test_manifest():
+    """Paket tanımı dosyadan okunmalı, hatalı tanımlar reddedilmeli"""
+    print("📄 Paket Tanımı Testleri:")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, data in (("config.bin", b"\x01" * 32), ("app.bin", app_image(5))):
+            with open(os.path.join(tmp, name), "wb") as f:
+                f.write(data)
+        path = os.path.join(tmp, "production.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"images": [
+                {"file": "app.bin", "sector": 5, "order": 2, "vectors": True},
+                {"name": "config", "file": "config.bin", "sector": 2, "order": 1},
+            ]}, f)
+
+        manifest = load_manifest(path)
+        print(f"  {manifest.name}: {[(i.name, i.sector) for i in manifest.ordered()]}")
+        assert manifest.name == "production" and manifest.erase, "Varsayılanlar dosyadan türetilmeli"
+        assert [i.name for i in manifest.ordered()] == ["config", "app"], "order alanına göre sıralanmalı"
+        assert manifest.ordered()[1].vectors and not manifest.ordered()[0].vectors, "vectors alanı okunmalı"
+
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"images": [
+                {"file": "app.bin", "sector": 5},
+                {"file": "config.bin", "sector": 5},
+            ]}, f)
+        try:
+            load_manifest(path)
+            assert False, "Aynı sektörü hedefleyen görüntüler reddedilmeli"
+        except ValueError as e:
+            print(f"  Beklenen hata: {e}")
+
+    bundle = production_bundle()
+    reports = bundle.preprocess()
+    assert all(report.ok for report in reports.values()), "Geçerli görüntüler ön işlemden geçmeli"
+    assert bundle.erase_plan() == [2, 5, 3], "Silme planı yazma sırasını izlemeli"
+
+    bad = BundleManifest("bad", [BundleImage("config", 2, b"\x01" * 32, vectors=True)])
+    assert not bad.preprocess()["config"].ok, "vectors=True görüntü doğrulanmalı"
+
+    print("  ✅ Paket tanımı testleri başarılı\n")
+
+def test_bundle_single_session():
+    """Paket tek oturumda yüklenmeli: sektör başına bir silme, tek buffer temizliği"""
+    print("📦 Paket Yükleme Testleri:")
+
+    device = STM32BootloaderSimulator(erase_time_scale=0.01)
+    uart = make_uart(device)
+    bundle = production_bundle()
+
+    clears = []
+    original_clear = uart.clear_buffers
+    uart.clear_buffers = lambda: (clears.append(1), original_clear())
+    progress = []
+
+    success, message = uart.flash_bundle(bundle, lambda current, total: progress.append((current, total)))
+    print(f"  {message}")
+    print("  " + uart.last_bundle_report.summary().replace("\n", "\n  "))
+    assert success, message
+
+    erases = device.received_types.count(MessageType.CMD_ERASE)
+    assert erases == 3 and device.erased_sectors == {2, 3, 5}, "Her sektör bir kez silinmeli"
+    assert len(clears) == 1, "Buffer'lar oturumda bir kez temizlenmeli"
+    for image in bundle.images:
+        assert bytes(device.flash[image.sector][:len(image.data)]) == image.data, f"{image.name} yazılmalı"
+
+    total = sum(-(-len(image.data) // 16) for image in bundle.images)
+    assert progress[-1] == (total, total), "İlerleme tüm paketler üzerinden raporlanmalı"
+    assert [current for current, _ in progress] == list(range(1, total + 1)), "İlerleme kesintisiz artmalı"
+
+    report = uart.last_bundle_report
+    assert report.success and [i.name for i in report.images] == ["config", "app", "calibration"], \
+        "Rapor yazma sırasını izlemeli"
+    assert set(report.erase_durations) == {2, 3, 5}, "Silme süreleri raporda olmalı"
+    assert all(set(i.phases) == {"prepare", "data", "finish"} for i in report.images), "Aşama süreleri ayrılmalı"
+
+    # Aynı paket tekrar: paketler önbellekten gelir
+    hits = uart.frame_cache.hits
+    success, message = uart.flash_bundle(bundle)
+    assert success and uart.frame_cache.hits - hits == 3, "Paketlenmiş görüntüler yeniden kullanılmalı"
+
+    print("  ✅ Paket yükleme testleri başarılı\n")
+
+def test_bundle_cancel():
+    """İptal edilen paket kalan görüntüleri yazmamalı"""
+    print("🛑 Paket İptal Testleri:")
+
+    device = STM32BootloaderSimulator(erase_time_scale=0.01)
+    uart = make_uart(device)
+    bundle = production_bundle()
+    bundle.erase = False
+    token = CancelToken()
+
+    def cancel_in_app(current, total):
+        if current == 10:
+            token.cancel()
+
+    success, message = uart.flash_bundle(bundle, cancel_in_app, cancel_token=token)
+    print(f"  {message}")
+    assert not success and message == CANCELLED_MESSAGE, "İptal raporlanmalı"
+    assert MessageType.CMD_ERASE not in device.received_types, "erase=False iken silme yapılmamalı"
+    assert 3 not in device.flash, "İptalden sonraki görüntü yazılmamalı"
+    assert [i.success for i in uart.last_bundle_report.images] == [True, False], "Rapor iptal edilen görüntüde bitmeli"
+
+    print("  ✅ Paket iptal testleri başarılı\n")
+
+def main():
+    """Ana test fonksiyonu"""
+    print("Paket Yükleme Testleri Başlatılıyor...\n")
+
+    try:
+        test_manifest()
+        test_bundle_single_session()
+        test_bundle_cancel()
+
+        print("🎉 Tüm testler başarıyla tamamlandı!")
+
+    except AssertionError as e:
+        print(f"❌ Test hatası: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"❌ Beklenmeyen hata: {e}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Yükleme Servisi Test Dosyası
+============================
+
+Port zamanlayıcısının öncelik/adalet sırasını, HTTP API üzerinden TCP
+simülatörlerine çok portlu yüklemeyi ve API'nin erişim denetimlerini
+(anahtar, Host, içerik türü, görüntü dizini) test eder. Görüntüsüz silme
+işlerini ve servisin tuttuğu portun başka süreçlerce açılamadığını da sınar.
+"""
+
+import base64
+import sys
+import os
+import json
+import struct
+import tempfile
+import urllib.error
+import urllib.request
+
+# Proje kök dizinini Python path'ine ekle
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.device_simulator import STM32BootloaderSimulator, TcpBootloaderDevice
+from src.flash_layout import sector_address
+from src.flash_daemon import FlashDaemon, FlashDaemonClient, FlashJob, PortScheduler, PortTask
+from src.frame_cache import FrameCache
+from src.port_lock import PortBusyError
+from src.serial_session import SerialSession
+
+def make_task(job_id: str, client: str, priority: int, seq: int) -> PortTask:
+    job = FlashJob(id=job_id, image=b"\x00", image_name="x.bin", ports=["p"], sector=0,
+                   priority=priority, client=client)
+    return PortTask(job, "p", seq)
+
+def test_scheduler_priority_and_fairness():
+    """Yüksek öncelik önce, aynı öncelikte istemciler sırayla"""
+    print("⚖️ Zamanlayıcı Testleri:")
+
+    scheduler = PortScheduler()
+    for seq, (job_id, client, priority) in enumerate([
+        ("a1", "A", 0), ("a2", "A", 0), ("a3", "A", 0), ("b1", "B", 0), ("urgent", "C", 5),
+    ]):
+        scheduler.put(make_task(job_id, client, priority, seq))
+
+    order = [scheduler.take("p", timeout=0.1).job.id for _ in range(5)]
+    print(f"  Sıra: {order}")
+    assert order[0] == "urgent", "Yüksek öncelikli iş önce alınmalı"
+    assert order.index("b1") < order.index("a2"), "B istemcisi A'nın tüm işlerini beklememeli"
+    assert scheduler.take("p", timeout=0.05) is None, "Kuyruk boşalmalı"
+
+    print("  ✅ Zamanlayıcı testleri başarılı\n")
+
+def test_daemon_multi_port_flash():
+    """İki porta aynı görüntü HTTP API ile yüklenmeli, portlar açık kalmalı"""
+    print("🏭 Yükleme Servisi Testleri:")
+
+    devices = [STM32BootloaderSimulator(erase_time_scale=0.01) for _ in range(2)]
+    with TcpBootloaderDevice(devices[0]) as tcp_a, TcpBootloaderDevice(devices[1]) as tcp_b, \
+            tempfile.TemporaryDirectory() as tmp:
+        image_path = os.path.join(tmp, "firmware.bin")
+        # Geçerli vektör tablosu: SP RAM'de, reset vektörü görüntünün içinde (Thumb biti)
+        firmware = struct.pack("<II", 0x20020000, sector_address(3) + 0x101) + (bytes(range(256)) * 4)[8:]
+        with open(image_path, "wb") as f:
+            f.write(firmware)
+
+        cache = FrameCache()
+        daemon = FlashDaemon(port=0, frame_cache=cache, max_finished_jobs=1).start()
+        try:
+            client = FlashDaemonClient(daemon.url)
+            ports = [tcp_a.url, tcp_b.url]
+
+            for _ in range(2):
+                job = client.submit(image_path, ports, sector=3, erase_sectors=[3])
+                events = list(client.events(job_id=job["id"]))
+                types = [e["type"] for e in events]
+                print(f"  {job['id']}: {len(events)} olay, son: {events[-1]}")
+                assert events[-1]["type"] == "job_finished" and events[-1]["state"] == "done", "İş başarıyla bitmeli"
+                assert types.count("done") == 2, "Her port için 'done' olayı gelmeli"
+                assert "progress" in types, "İlerleme olayları akmalı"
+
+            for device in devices:
+                assert device.flash[3][:len(firmware)] == firmware, "Firmware her karta yazılmalı"
+            assert tcp_a.connections == 1 and tcp_b.connections == 1, "Port işler arasında açık kalmalı"
+            assert cache.stats()["misses"] == 1, "Görüntü bir kez paketlenmeli"
+
+            port_states = client.ports()
+            assert all(p["connected"] and p["completed"] == 2 for p in port_states), "Port durumları raporlanmalı"
+            listed = client.jobs()
+            assert [j["id"] for j in listed] == [job["id"]], "En eski biten iş atılmalı"
+            assert daemon.jobs[job["id"]].image == b"", "Biten işin görüntüsü bellekte tutulmamalı"
+            assert listed[0]["image_size"] == len(firmware), "Görüntü boyu raporlanmaya devam etmeli"
+
+            with open(os.path.join(tmp, "raw.bin"), "wb") as f:
+                f.write(bytes(64))
+            try:
+                client.submit(os.path.join(tmp, "raw.bin"), [tcp_a.url], sector=3)
+                assert False, "Vektör tablosu geçersiz görüntü reddedilmeli"
+            except ValueError:
+                pass
+
+            try:
+                client.submit(image_path, [], sector=3)
+                assert False, "Portsuz iş reddedilmeli"
+            except ValueError:
+                pass
+        finally:
+            daemon.stop()
+
+    print("  ✅ Yükleme servisi testleri başarılı\n")
+
+def test_daemon_erase_only_and_port_lock():
+    """Görüntüsüz iş yalnızca siler; servis açık tuttuğu portu kilitler"""
+    print("🧹 Servis Silme ve Port Kilidi Testleri:")
+
+    device = STM32BootloaderSimulator(erase_time_scale=0.01)
+    device.flash[4] = bytearray(b"\x12\x34\x56\x78")
+    with TcpBootloaderDevice(device) as tcp:
+        daemon = FlashDaemon(port=0).start()
+        try:
+            assert not FlashDaemonClient(daemon.url, token="yanlis").available(), \
+                "Anahtarı kabul edilmeyen servis kullanılamaz sayılmalı"
+            assert not FlashDaemonClient("http://127.0.0.1:1", timeout=0.5).available(), \
+                "Çalışmayan servis kullanılamaz sayılmalı"
+            client = FlashDaemonClient(daemon.url)
+            assert client.available(), "Çalışan servis kullanılabilir olmalı"
+
+            job = client.erase([tcp.url], [4])
+            events = list(client.events(job_id=job["id"]))
+            types = [e["type"] for e in events]
+            print(f"  {job['id']}: {types}")
+            assert events[-1]["state"] == "done", "Silme işi başarıyla bitmeli"
+            assert "erase" in types and "progress" not in types, "Yalnızca silme yapılmalı"
+            assert device.erased_sectors == {4} and 4 not in device.flash, "Sektör silinmeli"
+
+            session = SerialSession(tcp.url, owner="GUI")
+            try:
+                session.open()
+                assert False, "Servisin açık tuttuğu port başka oturumca açılmamalı"
+            except PortBusyError as e:
+                print(f"  Beklenen hata: {e}")
+            assert tcp.connections == 1, "İkinci bağlantı açılmamalı"
+
+            try:
+                client.submit_image(b"", "", [tcp.url], sector=4)
+                assert False, "Görüntüsüz ve silmesiz iş reddedilmeli"
+            except ValueError:
+                pass
+        finally:
+            daemon.stop()
+
+    print("  ✅ Servis silme ve port kilidi testleri başarılı\n")
+
+def raw_request(daemon: FlashDaemon, method: str, path: str, body=None, headers=None) -> int:
+    """İstemci sınıfını atlayarak ham HTTP isteği gönderir; durum kodunu döner"""
+    request = urllib.request.Request(daemon.url + path, data=body, method=method, headers=headers or {})
+    try:
+        with urllib.request.urlopen(request, timeout=5) as response:
+            return response.status
+    except urllib.error.HTTPError as e:
+        return e.code
+
+def test_daemon_access_checks():
+    """Anahtarsız, yabancı Host'lu, JSON olmayan istekler ve dizin dışı görüntüler reddedilmeli"""
+    print("🔒 Servis Erişim Testleri:")
+
+    with tempfile.TemporaryDirectory() as image_dir, tempfile.TemporaryDirectory() as outside:
+        daemon = FlashDaemon(port=0, token="test-anahtari", image_dir=image_dir).start()
+        try:
+            auth = {"Authorization": "Bearer test-anahtari"}
+            json_headers = {**auth, "Content-Type": "application/json"}
+            job = json.dumps({"image_path": "/etc/passwd", "ports": ["/dev/ttyUSB0"], "sector": 5}).encode()
+
+            assert raw_request(daemon, "GET", "/jobs", headers=auth) == 200, "Anahtarlı istek kabul edilmeli"
+            assert raw_request(daemon, "GET", "/jobs") == 401, "Anahtarsız istek reddedilmeli"
+            assert raw_request(daemon, "GET", "/jobs", headers={"Authorization": "Bearer yanlis"}) == 401, \
+                "Yanlış anahtar reddedilmeli"
+            assert raw_request(daemon, "GET", "/jobs", headers={**auth, "Host": "evil.example:8765"}) == 403, \
+                "Yabancı Host başlığı reddedilmeli"
+            # Tarayıcının ön kontrolsüz gönderebildiği text/plain gövde
+            assert raw_request(daemon, "POST", "/jobs", job, {**auth, "Content-Type": "text/plain"}) == 415, \
+                "JSON olmayan gövde reddedilmeli"
+            assert raw_request(daemon, "GET", "/events?since=abc", headers=auth) == 400, \
+                "Sayı olmayan since 400 dönmeli"
+
+            # Nesne olmayan gövdeler ve hatalı alan türleri bağlantıyı düşürmeden 400 almalı
+            image_b64 = base64.b64encode(bytes(64)).decode()
+            for body in ([], "x", 5, None,
+                         {"image_b64": image_b64, "ports": 5, "sector": 5},
+                         {"image_b64": image_b64, "ports": "/dev/ttyUSB0", "sector": 5},
+                         {"image_b64": image_b64, "ports": ["/dev/ttyUSB0"], "sector": None},
+                         {"image_b64": image_b64, "ports": ["/dev/ttyUSB0"], "sector": 5, "erase_sectors": 3},
+                         {"image_b64": 5, "ports": ["/dev/ttyUSB0"], "sector": 5},
+                         {"image_path": 5, "ports": ["/dev/ttyUSB0"], "sector": 5},
+                         {"ports": ["/dev/ttyUSB0"], "sector": 5}):
+                status = raw_request(daemon, "POST", "/jobs", json.dumps(body).encode(), json_headers)
+                assert status == 400, f"Hatalı gövde 400 almalı: {body!r} ({status})"
+
+            # image_path yalnızca görüntü dizininden okunur
+            assert raw_request(daemon, "POST", "/jobs", job, json_headers) == 400, "Dizin dışı yol reddedilmeli"
+            outside_path = os.path.join(outside, "firmware.bin")
+            with open(outside_path, "wb") as f:
+                f.write(bytes(64))
+            os.symlink(outside_path, os.path.join(image_dir, "link.bin"))
+            for path in (os.path.join(image_dir, "..", os.path.basename(outside), "firmware.bin"),
+                         os.path.join(image_dir, "link.bin")):
+                try:
+                    daemon.read_image_path(path)
+                    assert False, f"Dizin dışına çıkan yol reddedilmeli: {path}"
+                except ValueError as e:
+                    print(f"  Beklenen hata: {e}")
+            with open(os.path.join(image_dir, "inside.bin"), "wb") as f:
+                f.write(b"\x01" * 32)
+            assert daemon.read_image_path(os.path.join(image_dir, "inside.bin")) == b"\x01" * 32, \
+                "Dizindeki görüntü okunmalı"
+            assert not daemon.jobs, "Reddedilen istekler iş oluşturmamalı"
+        finally:
+            daemon.stop()
+
+    no_dir = FlashDaemon(port=0, token="x")
+    try:
+        no_dir.read_image_path(__file__)
+        assert False, "Görüntü dizini yokken image_path kapalı olmalı"
+    except ValueError:
+        pass
+    finally:
+        no_dir.stop()
+
+    print("  ✅ Servis erişim testleri başarılı\n")
+
+def main():
+    """Ana test fonksiyonu"""
+    print("Yükleme Servisi Testleri Başlatılıyor...\n")
+
+    try:
+        test_scheduler_priority_and_fairness()
+        test_daemon_multi_port_flash()
+        test_daemon_erase_only_and_port_lock()
+        test_daemon_access_checks()
+
+        print("🎉 Tüm testler başarıyla tamamlandı!")
+
+    except AssertionError as e:
+        print(f"❌ Test hatası: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"❌ Beklenmeyen hata: {e}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
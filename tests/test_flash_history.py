@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Yükleme Geçmişi Test Dosyası
+============================
+
+Silme / yükleme oturumlarının SQLite geçmişine kaydını (aşama süreleri,
+NACK / tekrar sayıları) ve port / gün bazlı yüzdelik sorgularını test eder.
+"""
+
+import sys
+import os
+import tempfile
+import time
+
+# Proje kök dizinini Python path'ine ekle
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.device_simulator import STM32BootloaderSimulator
+from src.flash_history import FlashHistory, FlashRecord, percentile
+from tests.sim_helpers import make_uart
+
+def test_sessions_recorded():
+    """Her oturum aşama süreleri, NACK ve tekrar sayılarıyla kaydedilmeli"""
+    print("🗄️ Oturum Kaydı Testleri:")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "history.sqlite3")
+        history = FlashHistory(path=path, flush_interval=0.05)
+
+        # Eski bootloader (STATUS yok): beklemesiz FINISH meşgul NACK'i alır ve tekrarlanır
+        device = STM32BootloaderSimulator(erase_time_scale=0.05, support_extensions=False)
+        uart = make_uart(device, history)
+        firmware = bytes(range(256)) * 4
+
+        success, message = uart.erase_sector(0, delay_after_cmd=0)
+        assert success, message
+        for _ in range(2):
+            success, message = uart.send_firmware(firmware, 0)
+            assert success, message
+        success, message = uart.erase_sectors([20])
+        assert not success, "Geçersiz sektör silinememeli"
+
+        records = history.recent(10)
+        print(f"  {len(records)} kayıt, son yükleme aşamaları: {records[1].phases}")
+        assert len(records) == 4, "Dört oturum kaydedilmeli"
+        failed_erase, flash, _, erase = records
+        assert not failed_erase.success and failed_erase.sectors == "20", "Başarısız silme kaydedilmeli"
+        assert flash.operation == "flash" and flash.bytes == len(firmware) and flash.packets == 64, "Boyut kaydedilmeli"
+        assert set(flash.phases) == {"prepare", "data", "finish"}, \
+            "Yükleme aşamaları kaydedilmeli (tahmin istenmediyse hesaplanmaz)"
+        assert flash.image_hash and flash.app_version, "Görüntü özeti ve sürüm kaydedilmeli"
+        assert erase.retries > 0 and erase.nacks >= erase.retries, "Meşgul tekrarları ve NACK'ler sayılmalı"
+        assert "erase_0" in erase.phases, "Sektör silme süresi kaydedilmeli"
+        assert flash.nacks == 0 and flash.retries == 0, "Sayaçlar oturum başında sıfırlanmalı"
+
+        rows = history.percentiles("port", "flash")
+        assert rows[0]["key"] == "sim" and rows[0]["sessions"] == 2 and rows[0]["p50"] > 0, "Port bazlı hız hesaplanmalı"
+        rows = history.percentiles("day", "erase", metric="duration")
+        assert rows[0]["sessions"] == 2 and rows[0]["failures"] == 1, "Gün bazlı silme istatistiği hesaplanmalı"
+        history.close()
+
+        reopened = FlashHistory(path=path)
+        assert len(reopened.recent(10)) == 4, "Kayıtlar kalıcı olmalı"
+        reopened.close()
+
+    print("  ✅ Oturum kaydı testleri başarılı\n")
+
+def test_batched_writes_and_percentiles():
+    """record() bloklamamalı; kayıtlar toplu yazılmalı ve yüzdelikler doğru olmalı"""
+    print("📊 Toplu Yazma / Yüzdelik Testleri:")
+
+    assert percentile([1, 2, 3, 4], 0.5) == 2 and percentile([1, 2, 3, 4], 0.99) == 4, "Yüzdelik hesabı"
+    assert percentile([], 0.5) == 0.0, "Boş liste 0 dönmeli"
+
+    history = FlashHistory(path="", batch_size=50)
+    now = time.time()
+    start = time.perf_counter()
+    for i in range(500):
+        history.record(FlashRecord(operation="flash", port=f"p{i % 2}", started_at=now - 86400 * (i % 3),
+                                   duration=1.0, success=True, bytes=1000 * (i % 10 + 1)))
+    elapsed = time.perf_counter() - start
+    print(f"  500 kayıt kuyruğa {elapsed * 1000:.1f} ms'de eklendi")
+    assert elapsed < 0.5, "record() diske yazmayı beklememeli"
+
+    by_port = {row["key"]: row for row in history.percentiles("port")}
+    assert by_port["p0"]["sessions"] == 250 and by_port["p1"]["sessions"] == 250, "Tüm kayıtlar yazılmalı"
+    assert by_port["p0"]["p99"] == 9000 and by_port["p1"]["p50"] == 6000, "Port bazlı yüzdelikler"
+    assert len(history.percentiles("day")) == 3, "Gün bazlı gruplama"
+    assert len(history.percentiles("day", since=now - 3600)) == 1, "Zaman filtresi uygulanmalı"
+
+    try:
+        history.percentiles("color")
+        assert False, "Geçersiz gruplama reddedilmeli"
+    except ValueError:
+        pass
+    history.close()
+
+    print("  ✅ Toplu yazma / yüzdelik testleri başarılı\n")
+
+def main():
+    """Ana test fonksiyonu"""
+    print("Yükleme Geçmişi Testleri Başlatılıyor...\n")
+
+    try:
+        test_sessions_recorded()
+        test_batched_writes_and_percentiles()
+
+        print("🎉 Tüm testler başarıyla tamamlandı!")
+
+    except AssertionError as e:
+        print(f"❌ Test hatası: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"❌ Beklenmeyen hata: {e}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Paket Önbelleği Test Dosyası
+============================
+
+FrameCache'in isabet/ıskalama, LRU atma ve disk taşması davranışını test eder.
+"""
+
+import sys
+import os
+import tempfile
+
+# Proje kök dizinini Python path'ine ekle
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.frame_cache import FrameCache
+from src.stm32_protocol import STM32Protocol
+
+def test_encoded_stream_matches_packets():
+    """Önbellekteki paketler tek tek oluşturulanlarla aynı olmalı"""
+    print("📦 Paketleme Testleri:")
+
+    firmware = bytes(range(256)) * 2 + b"\x01\x02\x03"
+    image = FrameCache().get_or_encode(firmware, 5)
+    assert image.packet_count == 33, "515 byte için 33 paket olmalı"
+    assert image.packet(0) == STM32Protocol.create_data_packet(firmware[:16]), "İlk paket aynı olmalı"
+    assert image.packet(32) == STM32Protocol.create_data_packet(firmware[512:]), "Son paket aynı olmalı"
+    assert len(list(image.packets())) == image.packet_count, "Tüm paketler gezilmeli"
+
+    print("  ✅ Paketleme testleri başarılı\n")
+
+def test_hits_misses_and_eviction():
+    """Aynı görüntü ikinci kez paketlenmemeli; sınır aşılınca en eskisi atılmalı"""
+    print("♻️ LRU Önbellek Testleri:")
+
+    spill_dir = tempfile.mkdtemp()
+    cache = FrameCache(max_bytes=2 * 21 * 64, spill_dir=spill_dir)
+    image_a, image_b, image_c = (bytes([n]) * 1024 for n in (1, 2, 3))
+
+    first = cache.get_or_encode(image_a, 0)
+    assert cache.get_or_encode(image_a, 0) is first, "İkinci istek önbellekten gelmeli"
+    cache.get_or_encode(image_a, 1)
+    assert cache.stats()["misses"] == 2, "Farklı sektör planı ayrı anahtar olmalı"
+
+    cache.get_or_encode(image_b, 0)
+    cache.get_or_encode(image_c, 0)
+    stats = cache.stats()
+    print(f"  {stats}")
+    assert stats["hits"] == 1, "Bir isabet olmalı"
+    assert stats["evictions"] >= 1, "Sınır aşılınca kayıt atılmalı"
+    assert stats["bytes"] <= cache.max_bytes, "Bellek sınırı aşılmamalı"
+
+    again = cache.get_or_encode(image_a, 0)
+    assert cache.stats()["spill_hits"] == 1, "Atılan kayıt diskten okunmalı"
+    assert again.data_stream == first.data_stream, "Diskten okunan paketler aynı olmalı"
+
+    print("  ✅ LRU önbellek testleri başarılı\n")
+
+def test_corrupt_spill_is_reencoded():
+    """Uzunluğu veya özeti tutmayan disk kaydı silinip görüntü yeniden paketlenmeli"""
+    print("🩹 Bozuk Disk Kaydı Testleri:")
+
+    firmware = bytes(range(256)) * 4
+    expected = FrameCache().get_or_encode(firmware, 0).data_stream
+    spill_dir = tempfile.mkdtemp()
+    cache = FrameCache(max_bytes=1, spill_dir=spill_dir)
+    cache.get_or_encode(firmware, 0)
+    cache.get_or_encode(bytes(1024), 0)  # İlk kayıt diske taşar
+    path = cache._spill_path(FrameCache.make_key(firmware, 0))
+
+    with open(path, "rb") as f:
+        content = f.read()
+    corruptions = {
+        "kesik": content[:-5],
+        "bozuk byte": content[:-1] + bytes([content[-1] ^ 0xFF]),
+        "eksik başlık": content[:4],
+    }
+    for name, damaged in corruptions.items():
+        with open(path, "wb") as f:
+            f.write(damaged)
+        cache.clear()
+        misses = cache.stats()["misses"]
+        image = cache.get_or_encode(firmware, 0)
+        assert image.data_stream == expected, f"{name}: paketler yeniden oluşturulmalı"
+        assert cache.stats()["misses"] == misses + 1, f"{name}: ıskalama sayılmalı"
+        assert not os.path.exists(path), f"{name}: bozuk kayıt silinmeli"
+        cache.get_or_encode(bytes(1024), 0)  # Sağlam kayıt yeniden diske yazılır
+        assert os.path.exists(path), f"{name}: yeniden paketlenen görüntü diske taşmalı"
+    print(f"  {len(corruptions)} bozuk kayıt yeniden paketlendi")
+
+    print("  ✅ Bozuk disk kaydı testleri başarılı\n")
+
+def main():
+    """Ana test fonksiyonu"""
+    print("Paket Önbelleği Testleri Başlatılıyor...\n")
+
+    try:
+        test_encoded_stream_matches_packets()
+        test_hits_misses_and_eviction()
+        test_corrupt_spill_is_reencoded()
+
+        print("🎉 Tüm testler başarıyla tamamlandı!")
+
+    except AssertionError as e:
+        print(f"❌ Test hatası: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"❌ Beklenmeyen hata: {e}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
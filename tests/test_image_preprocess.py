@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Görüntü Ön İşleme Test Dosyası
+==============================
+
+Sondaki 0xFF'lerin kırpılmasını, 16 byte hizalamayı, vektör tablosu ve sektör
+boyutu doğrulamasını ve kazanılan paket sayısını test eder.
+"""
+
+import sys
+import os
+import struct
+
+# Proje kök dizinini Python path'ine ekle
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.flash_layout import sector_address, sector_size
+from src.image_preprocess import align_image, preprocess_image, trim_erased_tail, validate_vector_table
+
+def make_image(sector: int, body_size: int, tail_size: int, sp: int = 0x20020000, reset_offset: int = 0x101) -> bytes:
+    """Vektör tablosu + gövde + sonda 0xFF dolgu (linker'ın bölge sonuna doldurduğu gibi)"""
+    header = struct.pack("<II", sp, sector_address(sector) + reset_offset)
+    body = bytes((i * 7 + 1) % 255 for i in range(body_size - len(header)))
+    return header + body + b"\xFF" * tail_size
+
+def test_trim_and_align():
+    """Kırpma ve hizalama 0xFF ile yapılmalı"""
+    print("✂️ Kırpma / Hizalama Testleri:")
+
+    assert trim_erased_tail(b"\x01\x02\xFF\xFF") == b"\x01\x02", "Sondaki 0xFF'ler atılmalı"
+    assert trim_erased_tail(b"\xFF\x01\xFF") == b"\xFF\x01", "Aradaki 0xFF'ler korunmalı"
+    assert align_image(b"\x01" * 17) == b"\x01" * 17 + b"\xFF" * 15, "16 byte'a 0xFF ile tamamlanmalı"
+    assert align_image(b"\x01" * 32) == b"\x01" * 32, "Hizalı görüntü değişmemeli"
+
+    image = make_image(5, 1000, 30000)
+    result = preprocess_image(image, 5)
+    print(f"  {result.summary()}")
+    assert result.ok, result.summary()
+    assert len(result.image) == 1008 and result.image[1000:] == b"\xFF" * 8, "Görüntü 1008 byte olmalı"
+    assert result.trimmed_bytes == 30000 and result.padded_bytes == 8, "Rapor kırpma/dolguyu göstermeli"
+    assert result.packets_before == 1938 and result.packets_after == 63, "Paket sayıları hesaplanmalı"
+    assert result.packets_saved == 1875, "Kazanılan paket sayısı raporlanmalı"
+
+    raw = preprocess_image(image, 5, trim=False)
+    assert raw.image[:len(image)] == image and raw.trimmed_bytes == 0, "trim=False görüntüyü kırpmamalı"
+
+    print("  ✅ Kırpma / hizalama testleri başarılı\n")
+
+def test_validation():
+    """Geçersiz vektör tablosu ve sektöre sığmayan görüntü reddedilmeli"""
+    print("🛡️ Doğrulama Testleri:")
+
+    assert not validate_vector_table(make_image(5, 512, 0), sector_address(5)), "Geçerli tablo kabul edilmeli"
+
+    errors = validate_vector_table(make_image(5, 512, 0, sp=0x08000000), sector_address(5))
+    assert errors and "SP" in errors[0], "Flash'ı gösteren SP reddedilmeli"
+    errors = validate_vector_table(make_image(5, 512, 0, sp=0x20020004), sector_address(5))
+    assert errors and "hizalı" in errors[0], "Hizasız SP reddedilmeli"
+    errors = validate_vector_table(make_image(5, 512, 0, reset_offset=0x100), sector_address(5))
+    assert any("Thumb" in e for e in errors), "Thumb bitsiz reset vektörü reddedilmeli"
+
+    # Sektör 0'a bağlanmış görüntü sektör 5'e yüklenirse reset vektörü görüntü dışında kalır
+    result = preprocess_image(make_image(0, 512, 0), 5)
+    print(f"  Yanlış sektör: {result.summary()}")
+    assert not result.ok and "görüntü dışında" in result.errors[0], "Yanlış sektöre bağlanmış görüntü reddedilmeli"
+    assert preprocess_image(make_image(0, 512, 0), 5, validate_vectors=False).ok, "Doğrulama kapatılabilmeli"
+
+    result = preprocess_image(make_image(0, sector_size(0) + 16, 0), 0)
+    assert not result.ok and "aşıyor" in result.errors[-1], "Sektöre sığmayan görüntü reddedilmeli"
+    result = preprocess_image(make_image(0, sector_size(0) - 16, 0), 0)
+    assert result.ok and result.warnings, "Sektörü neredeyse dolduran görüntü uyarı vermeli"
+
+    assert not preprocess_image(b"\xFF" * 64, 5).ok, "Tamamı 0xFF görüntü reddedilmeli"
+    assert not preprocess_image(make_image(5, 512, 0), 12).ok, "Geçersiz sektör reddedilmeli"
+
+    print("  ✅ Doğrulama testleri başarılı\n")
+
+def main():
+    """Ana test fonksiyonu"""
+    print("Görüntü Ön İşleme Testleri Başlatılıyor...\n")
+
+    try:
+        test_trim_and_align()
+        test_validation()
+
+        print("🎉 Tüm testler başarıyla tamamlandı!")
+
+    except AssertionError as e:
+        print(f"❌ Test hatası: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"❌ Beklenmeyen hata: {e}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
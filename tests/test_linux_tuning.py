@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Düşük Gecikme Modu Test Dosyası
+===============================
+
+Düşük gecikme ayarlarının pty üzerindeki simülatöre karşı sorunsuz
+atlandığını ve gerçek pyserial yolunun uçtan uca çalıştığını test eder.
+"""
+
+import sys
+import os
+import tempfile
+
+# Proje kök dizinini Python path'ine ekle
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src import linux_tuning
+from src.device_simulator import STM32BootloaderSimulator, PtyBootloaderDevice
+from src.linux_tuning import apply_low_latency, restore_low_latency
+from src.sector_timing import SectorTimingTable
+from src.uart_comm import UARTCommunication
+
+def test_low_latency_on_pty():
+    """Pty'de desteklenmeyen ayarlar atlanmalı, aktarım çalışmalı"""
+    print("🐧 Düşük Gecikme Modu Testleri:")
+
+    device = STM32BootloaderSimulator(erase_time_scale=0.01)
+    with PtyBootloaderDevice(device) as pty_device:
+        uart = UARTCommunication(pty_device.port)
+        uart.timing_table = SectorTimingTable(path="")
+        assert uart.connect(low_latency=True), "Pty portu açılmalı"
+        try:
+            report = uart.tuning_report
+            print(f"  Ayarlar: {report}")
+            assert "exclusive" in report.applied, "Özel erişim uygulanmalı"
+            assert "low_latency" in report.skipped, "Pty'de ASYNC_LOW_LATENCY atlanmalı"
+            assert "latency_timer" in report.skipped, "Pty'de latency_timer atlanmalı"
+            assert uart.coalesce_tx, "TX birleştirme açık olmalı"
+
+            success, message = uart.erase_sector(0)
+            assert success, message
+
+            firmware = bytes(range(100))
+            success, message = uart.send_firmware(firmware, 0)
+            print(f"  {message}")
+            assert success, message
+            assert device.flash[0][:100] == firmware, "Firmware cihaza aynen yazılmalı"
+        finally:
+            uart.disconnect()
+
+    print("  ✅ Düşük gecikme modu testleri başarılı\n")
+
+def test_latency_timer_restored():
+    """Değiştirilen latency_timer önceki değerine geri yüklenmeli"""
+    print("↩️ Ayar Geri Yükleme Testleri:")
+
+    if not sys.platform.startswith("linux"):
+        print("  Linux dışı platform, atlandı\n")
+        return
+
+    sysfs_dir = tempfile.mkdtemp()
+    os.makedirs(os.path.join(sysfs_dir, "ttyUSB7"))
+    timer_path = os.path.join(sysfs_dir, "ttyUSB7", "latency_timer")
+    with open(timer_path, "w") as f:
+        f.write("16\n")
+
+    saved_dir = linux_tuning.SYSFS_USB_SERIAL_DIR
+    linux_tuning.SYSFS_USB_SERIAL_DIR = sysfs_dir
+    try:
+        report = apply_low_latency(object(), "/dev/ttyUSB7")
+        print(f"  Ayarlar: {report}")
+        with open(timer_path) as f:
+            assert f.read().strip() == "1", "latency_timer 1 ms yapılmalı"
+        assert report.previous == {"latency_timer": 16}, "Önceki değer raporlanmalı"
+
+        restored = restore_low_latency(object(), "/dev/ttyUSB7", report)
+        with open(timer_path) as f:
+            assert f.read().strip() == "16", "latency_timer önceki değerine dönmeli"
+        assert restored == ["latency_timer=16ms"] and not report.previous, "Geri yükleme bir kez yapılmalı"
+
+        # Zaten 1 ms olan ayar değiştirilmediği için geri yüklenmez
+        with open(timer_path, "w") as f:
+            f.write("1")
+        report = apply_low_latency(object(), "/dev/ttyUSB7")
+        assert not report.previous, "Değişmeyen ayar kaydedilmemeli"
+    finally:
+        linux_tuning.SYSFS_USB_SERIAL_DIR = saved_dir
+
+    print("  ✅ Ayar geri yükleme testleri başarılı\n")
+
+def main():
+    """Ana test fonksiyonu"""
+    print("Düşük Gecikme Modu Testleri Başlatılıyor...\n")
+
+    try:
+        test_low_latency_on_pty()
+        test_latency_timer_restored()
+
+        print("🎉 Tüm testler başarıyla tamamlandı!")
+
+    except AssertionError as e:
+        print(f"❌ Test hatası: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"❌ Beklenmeyen hata: {e}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
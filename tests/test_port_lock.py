@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Port Kilidi Test Dosyası
+========================
+
+Süreçler arası port kilidinin ikinci sahibi reddetmesini, kilidi tutanın
+bilgisini ve SerialSession'ın kilitli portu açmamasını test eder.
+"""
+
+import sys
+import os
+import tempfile
+
+# Proje kök dizinini Python path'ine ekle
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.device_simulator import STM32BootloaderSimulator, TcpBootloaderDevice
+from src.port_lock import PortBusyError, PortLock
+from src.serial_session import SerialSession
+
+def test_port_lock_exclusive():
+    """Tutulan kilit ikinci kez alınamamalı, bırakılınca alınabilmeli"""
+    print("🔐 Port Kilidi Testleri:")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        daemon_lock = PortLock("/dev/ttyUSB0", owner="yükleme servisi", directory=tmp)
+        gui_lock = PortLock("/dev/ttyUSB0", owner="GUI", directory=tmp)
+        other_port = PortLock("/dev/ttyUSB1", owner="GUI", directory=tmp)
+
+        assert daemon_lock.acquire(), "Boş port kilitlenebilmeli"
+        assert daemon_lock.acquire(), "Kilidi tutan tekrar alabilmeli"
+        assert not gui_lock.acquire(), "Tutulan kilit ikinci kez alınamamalı"
+        assert "yükleme servisi" in gui_lock.holder(), "Kilidi tutan görünmeli"
+        assert f"pid {os.getpid()}" in gui_lock.holder(), "Kilidi tutan pid görünmeli"
+        assert other_port.acquire(), "Başka port etkilenmemeli"
+
+        try:
+            with gui_lock:
+                assert False, "Meşgul portta bağlam yöneticisi hata vermeli"
+        except PortBusyError as e:
+            print(f"  Beklenen hata: {e}")
+
+        daemon_lock.release()
+        with gui_lock:
+            assert gui_lock.held, "Bırakılan kilit alınabilmeli"
+        assert not gui_lock.held, "Bağlamdan çıkınca kilit bırakılmalı"
+        other_port.release()
+
+    print("  ✅ Port kilidi testleri başarılı\n")
+
+def test_session_respects_lock():
+    """Başka süreç portu kilitlemişken SerialSession portu açmamalı"""
+    print("🚧 Oturum Kilidi Testleri:")
+
+    device = STM32BootloaderSimulator()
+    with TcpBootloaderDevice(device) as tcp:
+        holder = PortLock(tcp.url, owner="yükleme servisi")
+        assert holder.acquire(), "Kilit alınabilmeli"
+        session = SerialSession(tcp.url, owner="GUI")
+        try:
+            session.open()
+            assert False, "Kilitli port açılmamalı"
+        except PortBusyError as e:
+            print(f"  Beklenen hata: {e}")
+            assert "yükleme servisi" in str(e), "Hata kilidi tutanı söylemeli"
+        assert not session.is_connected, "Oturum bağlanmamalı"
+        assert tcp.connections == 0, "Cihaza bağlantı açılmamalı"
+
+        holder.release()
+        assert session.open(), "Kilit bırakılınca port açılmalı"
+        assert not holder.acquire(), "Açık oturum portu kilitli tutmalı"
+        session.close()
+        assert holder.acquire(), "Oturum kapanınca kilit bırakılmalı"
+        holder.release()
+
+    print("  ✅ Oturum kilidi testleri başarılı\n")
+
+def main():
+    """Ana test fonksiyonu"""
+    print("Port Kilidi Testleri Başlatılıyor...\n")
+
+    try:
+        test_port_lock_exclusive()
+        test_session_respects_lock()
+
+        print("🎉 Tüm testler başarıyla tamamlandı!")
+
+    except AssertionError as e:
+        print(f"❌ Test hatası: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"❌ Beklenmeyen hata: {e}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
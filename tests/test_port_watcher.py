@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Port İzleyici Test Dosyası
+==========================
+
+PortFilter ve PortWatcher'ın olay üretimini test eder.
+"""
+
+import sys
+import os
+
+# Proje kök dizinini Python path'ine ekle
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src import port_watcher
+from src.port_watcher import PortFilter, PortInfo, PortWatcher
+
+FTDI = PortInfo("/dev/ttyUSB0", 0x0403, 0x6001, "FT123")
+CP210X = PortInfo("/dev/ttyUSB1", 0x10C4, 0xEA60, "CP999")
+BUILTIN = PortInfo("/dev/ttyS0")
+
+def test_port_filter():
+    """VID/PID ve seri numarası filtreleri"""
+    print("🔎 Port Filtre Testleri:")
+
+    assert PortFilter().matches(BUILTIN), "Boş filtre her portu kabul etmeli"
+
+    vid_only = PortFilter.parse("0403")
+    assert vid_only.matches(FTDI), "Sadece VID ile eşleşmeli"
+    assert not vid_only.matches(CP210X), "Farklı VID reddedilmeli"
+    assert not vid_only.matches(BUILTIN), "USB olmayan port reddedilmeli"
+
+    exact = PortFilter.parse("0403:6001, 10c4:ea60", "CP999")
+    assert exact.matches(CP210X), "VID:PID + seri numarası eşleşmeli"
+    assert not exact.matches(FTDI), "Seri numarası listede değilse reddedilmeli"
+
+    print("  ✅ Port filtre testleri başarılı\n")
+
+def test_watcher_events():
+    """Eklenen/çıkarılan portlar için olaylar"""
+    print("🔌 Port İzleyici Testleri:")
+
+    visible = [FTDI]
+    original = port_watcher.enumerate_ports
+    port_watcher.enumerate_ports = lambda port_filter=None: [
+        p for p in visible if port_filter is None or port_filter.matches(p)
+    ]
+
+    added, removed = [], []
+    watcher = PortWatcher(PortFilter.parse("0403,10c4"),
+                          on_added=added.append, on_removed=removed.append)
+    watcher._sysfs_signature = lambda: None  # Her turda tam tarama
+
+    try:
+        watcher.poll()
+        assert added == [FTDI], "İlk tarama mevcut portları bildirmeli"
+
+        visible[:] = [CP210X, BUILTIN]
+        watcher.poll()
+        assert added == [FTDI, CP210X], "Yeni fikstür adaptörü bildirilmeli"
+        assert removed == [FTDI], "Çıkarılan port bildirilmeli"
+        assert watcher.ports == [CP210X], "Önbellek sadece filtreye uyan portları tutmalı"
+    finally:
+        port_watcher.enumerate_ports = original
+
+    print("  ✅ Port izleyici testleri başarılı\n")
+
+def main():
+    """Ana test fonksiyonu"""
+    print("Port İzleyici Testleri Başlatılıyor...\n")
+
+    try:
+        test_port_filter()
+        test_watcher_events()
+
+        print("🎉 Tüm testler başarıyla tamamlandı!")
+
+    except AssertionError as e:
+        print(f"❌ Test hatası: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"❌ Beklenmeyen hata: {e}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
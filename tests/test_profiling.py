@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Profil Test Dosyası
+===================
+
+Yükleme oturumunun cProfile ve örnekleyici profil ile çalıştırılmasını test eder.
+"""
+
+import sys
+import os
+import pstats
+import tempfile
+
+# Proje kök dizinini Python path'ine ekle
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.device_simulator import STM32BootloaderSimulator
+from src.profiling import SessionProfiler
+from tests.sim_helpers import make_uart
+
+def test_sampling_profile_folded_output():
+    """Örnekleyici profil katlanmış yığın dosyası ve özet üretmeli"""
+    print("🔬 Örnekleyici Profil Testleri:")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["STM32_BOOTLOADER_HOME"] = tmp
+        try:
+            uart = make_uart(STM32BootloaderSimulator())
+            uart.profile_mode = "sampling"
+            success, message = uart.send_firmware(bytes(16 * 300), 5)
+            assert success, message
+
+            report = uart.last_profile
+            assert report is not None, "Profil raporu oluşmalı"
+            print(f"  {report} ({report.samples} örnek)")
+            assert os.path.dirname(report.path) == os.path.join(tmp, "logs"), "Çıktı log dizinine yazılmalı"
+            assert report.path.endswith(".folded"), "Katlanmış yığın dosyası olmalı"
+
+            with open(report.path, encoding="utf-8") as f:
+                lines = f.read().splitlines()
+            assert lines, "Yığın örnekleri yazılmalı"
+            stack, count = lines[0].rsplit(" ", 1)
+            assert int(count) > 0 and ";" in stack, "Satır biçimi 'a;b;c sayı' olmalı"
+            assert any("send_firmware" in line for line in lines), "Yükleme thread'i görünmeli"
+            assert "fonksiyon" in report.summary, "Özet tablosu olmalı"
+        finally:
+            del os.environ["STM32_BOOTLOADER_HOME"]
+
+    print("  ✅ Örnekleyici profil testleri başarılı\n")
+
+def test_cprofile_stats_output():
+    """cProfile modu pstats ile okunabilir .prof dosyası üretmeli"""
+    print("📈 cProfile Testleri:")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        uart = make_uart(STM32BootloaderSimulator())
+        with SessionProfiler("cprofile", name="sim", output_dir=tmp, top_n=5) as profiler:
+            success, message = uart.send_firmware(bytes(16 * 50), 5)
+        assert success, message
+
+        report = profiler.report
+        assert report.path.endswith(".prof"), ".prof dosyası olmalı"
+        stats = pstats.Stats(report.path)
+        assert stats.total_calls > 0, "Çağrılar kaydedilmeli"
+
+    try:
+        SessionProfiler("gecersiz")
+        assert False, "Geçersiz mod reddedilmeli"
+    except ValueError:
+        pass
+
+    print("  ✅ cProfile testleri başarılı\n")
+
+def main():
+    """Ana test fonksiyonu"""
+    print("Profil Testleri Başlatılıyor...\n")
+
+    try:
+        test_sampling_profile_folded_output()
+        test_cprofile_stats_output()
+
+        print("🎉 Tüm testler başarıyla tamamlandı!")
+
+    except AssertionError as e:
+        print(f"❌ Test hatası: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"❌ Beklenmeyen hata: {e}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
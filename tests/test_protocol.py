@@ -12,7 +12,7 @@ import os
 # src klasörünü Python path'ine ekle
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
-from stm32_protocol import STM32Protocol, MessageType
+from stm32_protocol import STM32Protocol, MessageType, ResponseDecoder, ResponseEvent, ResponseType
 
 def test_cmd_packets():
     """CMD paketi oluşturma testleri"""
@@ -61,6 +61,30 @@ def test_finish_packet():
     
     print("  ✅ FINISH paket testleri başarılı\n")
 
+def test_extension_packets():
+    """PING / SET_BAUD / STATUS paketi testleri"""
+    print("🟪 Uzantı Paketi Testleri:")
+    
+    packet = STM32Protocol.create_ping_packet()
+    assert packet[0] == MessageType.PING, "İlk byte PING tipi olmalı"
+    assert STM32Protocol.verify_packet_crc(packet), "PING CRC doğru olmalı"
+    
+    packet = STM32Protocol.create_set_baud_packet(921600)
+    print(f"  SET_BAUD 921600 paketi: {len(packet)} byte - {packet.hex()}")
+    assert packet[0] == MessageType.SET_BAUD, "İlk byte SET_BAUD tipi olmalı"
+    assert packet[1:5] == (921600).to_bytes(4, 'little'), "Baud rate little-endian olmalı"
+    assert STM32Protocol.verify_packet_crc(packet), "SET_BAUD CRC doğru olmalı"
+    
+    packet = STM32Protocol.create_status_packet()
+    assert packet[0] == MessageType.STATUS, "İlk byte STATUS tipi olmalı"
+    assert len(packet) == 21, "Paket boyutu 21 byte olmalı"
+    
+    corrupted = bytearray(packet)
+    corrupted[3] ^= 0xFF
+    assert not STM32Protocol.verify_packet_crc(bytes(corrupted)), "Bozuk paket CRC'den geçmemeli"
+    
+    print("  ✅ Uzantı paket testleri başarılı\n")
+
 def test_crc32_calculation():
     """CRC32 hesaplama testleri"""
     print("🔧 CRC32 Hesaplama Testleri:")
@@ -76,6 +100,18 @@ def test_crc32_calculation():
     crc2 = STM32Protocol.calculate_crc32(test_data)
     assert crc == crc2, "Aynı veri için aynı CRC32 üretilmeli"
     
+    # STM32 tarafındaki bit bit algoritma ile aynı sonuç
+    def stm32_crc32(data: bytes) -> int:
+        crc = 0xFFFFFFFF
+        for byte in data:
+            crc ^= byte
+            for _ in range(8):
+                crc = (crc >> 1) ^ 0xEDB88320 if crc & 1 else crc >> 1
+        return ~crc & 0xFFFFFFFF
+    
+    for sample in [b"", b"Hello", bytes(range(17)), b"\xff" * 17]:
+        assert STM32Protocol.calculate_crc32(sample) == stm32_crc32(sample), "STM32 algoritması ile aynı olmalı"
+    
     print("  ✅ CRC32 testleri başarılı\n")
 
 def test_packet_verification():
@@ -103,6 +139,7 @@ def test_nack_error_parsing():
         (b'\x55\x03', "Mesaj kuyruğu dolu"),
         (b'\x55\x04', "Komut verisi geçersiz (sektör out-of-range)"),
         (b'\x55\x05', "Mesaj sıralaması hatalı (CMD gelmeden DATA)"),
+        (b'\x55\x06', "Cihaz meşgul (flash işlemi sürüyor)"),
         (b'\x55\xFF', "Bilinmeyen hata kodu: 0xFF"),
     ]
     
@@ -114,6 +151,47 @@ def test_nack_error_parsing():
     
     print("  ✅ NACK hata kodu testleri başarılı\n")
 
+def test_response_decoder():
+    """Artımlı yanıt çözücü testleri"""
+    print("🧩 Yanıt Çözücü Testleri:")
+    
+    ACK = ResponseEvent(ResponseType.ACK)
+    
+    # Tek parça içinde birden fazla yanıt
+    decoder = ResponseDecoder()
+    events = decoder.feed(b'\xaa\x55\x02\xaa')
+    assert events == [ACK, ResponseEvent(ResponseType.NACK, 0x02), ACK], "Kuyruktaki yanıtlar sırayla çözülmeli"
+    
+    # Byte byte verilen NACK + kod
+    decoder = ResponseDecoder()
+    assert decoder.feed(b'\x55') == [], "Kod gelmeden NACK tamamlanmamalı"
+    assert decoder.pending, "NACK kodu bekleniyor olmalı"
+    assert decoder.feed(b'\x04') == [ResponseEvent(ResponseType.NACK, 0x04)], "Kod sonraki parçadan eklenmeli"
+    
+    # Boot banner'ı ve gürültü atlanmalı ('U' = 0x55 metin içinde)
+    decoder = ResponseDecoder()
+    events = decoder.feed(b'\x00\xffSTM32 Bootloader USB\r\n\xaa')
+    assert events == [ACK], f"Sadece ACK çözülmeli, alınan: {events}"
+    assert decoder.noise_bytes == 24, f"Gürültü sayılmalı, alınan: {decoder.noise_bytes}"
+    
+    # Kodsuz NACK
+    decoder = ResponseDecoder()
+    assert decoder.feed(b'\x55\xaa') == [ResponseEvent(ResponseType.NACK), ACK], "NACK'ten sonra ACK gelirse NACK kodsuz olmalı"
+    decoder.feed(b'\x55')
+    assert decoder.flush() == [ResponseEvent(ResponseType.NACK)], "flush kodsuz NACK döndürmeli"
+    
+    # Tabloda olmayan, metin de olmayan kod bilinmeyen hata kodu olarak korunmalı
+    decoder = ResponseDecoder()
+    events = decoder.feed(b'\x55\xff\xaa\x55\x80')
+    assert events == [ResponseEvent(ResponseType.NACK, 0xFF), ACK, ResponseEvent(ResponseType.NACK, 0x80)], \
+        f"Bilinmeyen kodlar NACK'e eklenmeli, alınan: {events}"
+    assert "Bilinmeyen hata kodu: 0xFF" in events[0].message, "Mesaj bilinmeyen kodu göstermeli"
+    assert decoder.noise_bytes == 0, "Bilinmeyen kod gürültü sayılmamalı"
+    print(f"  {events[0].message}")
+    
+    print(f"  {ResponseEvent(ResponseType.NACK, 0x02).message}")
+    print("  ✅ Yanıt çözücü testleri başarılı\n")
+
 def main():
     """Ana test fonksiyonu"""
     print("STM32 Protokol Testleri Başlatılıyor...\n")
@@ -123,8 +201,10 @@ def main():
         test_cmd_packets()
         test_data_packet()
         test_finish_packet()
+        test_extension_packets()
         test_packet_verification()
         test_nack_error_parsing()
+        test_response_decoder()
         
         print("🎉 Tüm testler başarıyla tamamlandı!")
         
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Uyarlanır Zaman Aşımı Test Dosyası
+==================================
+
+TCP tarzı RTO tahmincisini (SRTT / RTTVAR, taban / tavan, geri çekilme),
+mesaj tipi ve sektör başına ayrı tahmincileri, DATA aktarımında RTO'nun
+milisaniyeler içinde geri çekilmesini ve RTO'dan sonra (response_timeout
+içinde) gelen ACK'in yüklemeyi düşürmemesini test eder.
+"""
+
+import sys
+import os
+import time
+
+# Proje kök dizinini Python path'ine ekle
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.clock import VirtualClock
+from src.device_simulator import STM32BootloaderSimulator, VirtualLinkSerial
+from src.rto import AdaptiveTimeouts, RTOEstimator
+from src.stm32_protocol import STM32Protocol
+from tests.sim_helpers import make_uart
+
+def test_estimator():
+    """SRTT / RTTVAR güncellemesi, sınırlar ve geri çekilme RFC 6298'e uymalı"""
+    print("📐 RTO Tahmincisi Testleri:")
+
+    estimator = RTOEstimator(floor=0.05, ceiling=2.0)
+    assert estimator.timeout(10.0) == 2.0, "Ölçüm yokken başlangıç değeri tavana sıkıştırılmalı"
+
+    estimator.observe(0.1)
+    assert abs(estimator.timeout(10.0) - 0.3) < 1e-9, "İlk ölçüm: RTO = R + 4 * R/2"
+    estimator.observe(0.1)
+    assert abs(estimator.rttvar - 0.0375) < 1e-9 and abs(estimator.timeout(10.0) - 0.25) < 1e-9, "RTTVAR güncellenmeli"
+
+    estimator.on_timeout()
+    estimator.on_timeout()
+    assert abs(estimator.timeout(10.0) - 1.0) < 1e-9, "Her zaman aşımında RTO ikiye katlanmalı"
+    for _ in range(5):
+        estimator.on_timeout()
+    assert estimator.timeout(10.0) == 2.0, "Geri çekilme tavanı aşmamalı"
+    estimator.observe(0.1)
+    assert estimator.backoff == 1, "Geçerli ölçüm geri çekilmeyi sıfırlamalı"
+
+    fast = RTOEstimator(floor=0.05, ceiling=2.0)
+    for _ in range(50):
+        fast.observe(0.002)
+    assert fast.timeout(10.0) == 0.05, "Hızlı yanıtlarda RTO tabana inmeli"
+    print(f"  {fast}")
+
+    print("  ✅ RTO tahmincisi testleri başarılı\n")
+
+def test_per_type_estimators():
+    """Mesaj tipleri ve silme sektörleri birbirinin ölçümünü etkilememeli"""
+    print("🗂️ Tip / Sektör Ayrımı Testleri:")
+
+    timeouts = AdaptiveTimeouts()
+    erase_0 = STM32Protocol.create_cmd_erase_packet(0)
+    erase_5 = STM32Protocol.create_cmd_erase_packet(5)
+    data = STM32Protocol.create_data_packet(bytes(16))
+
+    for _ in range(10):
+        timeouts.observe(data, 0.002)
+        timeouts.observe(erase_0, 0.3)
+    print(f"  {timeouts}")
+    assert timeouts.timeout(data, 10.0) == 0.05, "DATA kendi ölçümleriyle tabana inmeli"
+    assert timeouts.timeout(erase_0, 10.0) >= 0.3, "Sektör 0 silme süresi öğrenilmeli"
+    assert timeouts.timeout(erase_5, 10.0) == 10.0, "Ölçülmemiş sektör başlangıç değerini kullanmalı"
+    assert timeouts.timeout(STM32Protocol.create_ping_packet(), 10.0) is None, "PING izlenmemeli"
+
+    timeouts.reset()
+    assert timeouts.timeout(data, 10.0) == 10.0, "reset ölçümleri silmeli"
+
+    print("  ✅ Tip / sektör ayrımı testleri başarılı\n")
+
+def test_lost_ack_detected_quickly():
+    """DATA akışında kaybolan ACK RTO içinde fark edilmeli; hata response_timeout sonunda raporlanmalı"""
+    print("📉 Kayıp ACK Testleri:")
+
+    device = STM32BootloaderSimulator()
+    uart = make_uart(device)
+    uart.response_timeout = 0.3
+    firmware = bytes(range(256)) * 8
+
+    success, message = uart.send_firmware(firmware, 0)
+    assert success, message
+    data_rto = uart.rto.timeout(STM32Protocol.create_data_packet(bytes(16)), uart.response_timeout)
+    print(f"  Öğrenilen: {uart.rto}")
+    assert data_rto < 0.2, "DATA RTO ölçümlerle kısalmalı"
+
+    def lose_ack(current, total):
+        if current == 10:
+            uart.serial_conn.lost_responses = 1
+
+    start = time.time()
+    success, message = uart.send_firmware(firmware, 0, lose_ack)
+    elapsed = time.time() - start
+    print(f"  Kayıp ACK {elapsed * 1000:.0f} ms'de fark edildi: {message}")
+    assert not success and "timeout" in message, "Kayıp ACK hata olarak raporlanmalı"
+    assert 0.3 <= elapsed < 1.0, "Kayıp ACK response_timeout sonunda raporlanmalı"
+    estimator = uart.rto.estimator(STM32Protocol.create_data_packet(bytes(16)))
+    assert estimator.backoff == 2, "Zaman aşımı sonrası RTO geri çekilmeli"
+    assert uart.late_response_count == 1, "RTO aşımı sayılmalı"
+
+    # Uyarlanır zaman aşımı kapalıyken sabit response_timeout beklenir
+    uart.adaptive_timeouts = False
+    uart.response_timeout = 0.3
+    uart.serial_conn.lost_responses = 1
+    start = time.time()
+    success, _ = uart.send_packet_and_wait_ack(STM32Protocol.create_finish_packet())
+    assert not success and time.time() - start >= 0.3, "Sabit timeout kullanılmalı"
+
+    print("  ✅ Kayıp ACK testleri başarılı\n")
+
+def test_late_ack_survives():
+    """RTO'dan sonra ama response_timeout'tan önce gelen DATA ACK'i yüklemeyi düşürmemeli"""
+    print("🐢 Geç ACK Testleri:")
+
+    clock = VirtualClock(start=1000.0)
+    device = STM32BootloaderSimulator(clock=clock)
+    uart = make_uart(device, link=VirtualLinkSerial(device, clock, device.baudrate))
+    firmware = bytes(i % 251 for i in range(4096))
+
+    success, message = uart.send_firmware(firmware, 0)
+    assert success, message
+    data = STM32Protocol.create_data_packet(bytes(16))
+    data_rto = uart.rto.timeout(data, uart.response_timeout)
+    assert data_rto < 0.2, "DATA RTO ölçümlerle kısalmalı"
+
+    def stall(current, total):
+        if current == 10:
+            uart.serial_conn.late_response_delay = data_rto + 0.2  # Ör. USB zamanlayıcı takılması
+
+    before = clock.elapsed
+    success, message = uart.send_firmware(firmware, 0, stall)
+    print(f"  RTO {data_rto * 1000:.0f} ms, geç ACK ile: {message} ({clock.elapsed - before:.2f}s sanal)")
+    assert success, "Geç gelen ACK yüklemeyi düşürmemeli"
+    assert bytes(device.flash[0][:len(firmware)]) == firmware, "Görüntü eksiksiz yazılmalı"
+    assert uart.late_response_count == 1, "RTO aşımı kaydedilmeli"
+    assert uart.rto.estimator(data).backoff == 1, "Sonraki zamanında ACK geri çekilmeyi sıfırlamalı"
+
+    print("  ✅ Geç ACK testleri başarılı\n")
+
+def main():
+    """Ana test fonksiyonu"""
+    print("Uyarlanır Zaman Aşımı Testleri Başlatılıyor...\n")
+
+    try:
+        test_estimator()
+        test_per_type_estimators()
+        test_lost_ack_detected_quickly()
+        test_late_ack_survives()
+
+        print("🎉 Tüm testler başarıyla tamamlandı!")
+
+    except AssertionError as e:
+        print(f"❌ Test hatası: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"❌ Beklenmeyen hata: {e}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
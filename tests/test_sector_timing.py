@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Sektör Zamanlama Test Dosyası
+=============================
+
+Öğrenilen zamanlama tablosunu ve STATUS ile hazır bekleme akışını test eder.
+"""
+
+import sys
+import os
+import json
+import tempfile
+
+# Proje kök dizinini Python path'ine ekle
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.clock import VirtualClock
+from src.device_simulator import STM32BootloaderSimulator, VirtualLinkSerial
+from src.flash_layout import sector_address, sector_size
+from src.sector_timing import SectorTimingTable
+from tests.sim_helpers import make_uart
+
+def test_flash_layout():
+    """STM32F4 sektör yerleşimi"""
+    print("🗺️ Flash Yerleşim Testleri:")
+
+    assert sector_size(0) == 16 * 1024, "Sektör 0 16 KB olmalı"
+    assert sector_size(4) == 64 * 1024, "Sektör 4 64 KB olmalı"
+    assert sector_size(11) == 128 * 1024, "Sektör 11 128 KB olmalı"
+    assert sector_address(5) == 0x08020000, "Sektör 5 adresi 0x08020000 olmalı"
+
+    print("  ✅ Flash yerleşim testleri başarılı\n")
+
+def test_timing_table_percentile():
+    """Yeterli ölçüm yokken varsayılan, sonra yüzdelik kullanılmalı"""
+    print("⏱️ Zamanlama Tablosu Testleri:")
+
+    table = SectorTimingTable(path="", percentile=0.9, margin=1.0, min_samples=3)
+    assert table.delay("erase", 0) == 0.5, "16 KB sektör için varsayılan 0.5 s olmalı"
+    assert table.delay("erase", 5) == 2.0, "128 KB sektör için varsayılan 2.0 s olmalı"
+
+    for duration in [0.20, 0.22, 0.21, 0.25, 0.30, 0.23, 0.24, 0.22, 0.21, 0.26]:
+        table.record("erase", 0, duration, "FT1|status")
+    assert table.delay("erase", 0, "FT1|status") == 0.26, "p90 değeri kullanılmalı"
+    assert table.delay("erase", 1, "FT1|status") == 0.5, "Diğer sektörler etkilenmemeli"
+    assert table.delay("erase", 0, "FT1|legacy") == 0.5, "STATUS ölçümleri eski karta uygulanmamalı"
+    assert table.delay("erase", 0, "FT2|status") == 0.5, "Başka adaptörün ölçümleri kullanılmamalı"
+    assert table.delay("erase", 0) == 0.5, "Kimliksiz sorgu varsayılanı dönmeli"
+
+    # Dosyaya arka planda yazılır; eski (cihaz kimliksiz) kayıtlar yok sayılır
+    path = os.path.join(tempfile.mkdtemp(), "timing.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"erase:0": [0.006] * 50}, f)
+    stored = SectorTimingTable(path=path, min_samples=1)
+    assert stored.delay("erase", 0) == 0.5, "Eski düz kayıtlar yüklenmemeli"
+    stored.record("erase", 0, 0.3, "FT1|status")
+    stored.flush()
+    reloaded = SectorTimingTable(path=path)
+    assert reloaded.samples("erase", 0, "FT1|status") == [0.3], "Kayıt cihaz kimliğiyle saklanmalı"
+
+    print("  ✅ Zamanlama tablosu testleri başarılı\n")
+
+def test_erase_with_status_polling():
+    """STATUS destekleyen cihazda süre ölçülüp tabloya yazılmalı"""
+    print("🧹 STATUS ile Silme Testleri:")
+
+    device = STM32BootloaderSimulator(erase_time_scale=1.0)
+    uart = make_uart(device)
+
+    success, message = uart.erase_sector(5)
+    print(f"  {message}")
+    assert success, message
+    assert uart.status_supported is True, "STATUS desteği algılanmalı"
+    samples = uart.timing_table.samples("erase", 5, uart._timing_device())
+    assert uart._timing_device().endswith("|status"), "Ölçüm STATUS destekli cihaz kaydına yazılmalı"
+    assert len(samples) == 1, "Ölçülen silme süresi kaydedilmeli"
+    assert samples[0] > 0, "Cihaz meşgulken beklenmiş olmalı"
+    assert samples[0] < uart.timing_table.default_delay("erase", 5), "Ölçüm en kötü durumdan kısa olmalı"
+
+    print("  ✅ STATUS ile silme testleri başarılı\n")
+
+def test_erase_legacy_device_uses_table():
+    """STATUS desteklemeyen cihaz kılavuz süresinin altında beklememeli"""
+    print("🐢 Eski Bootloader Silme Testleri:")
+
+    clock = VirtualClock(start=1000.0)
+    device = STM32BootloaderSimulator(support_extensions=False, erase_time_scale=0.1, clock=clock)
+    uart = make_uart(device, link=VirtualLinkSerial(device, clock, device.baudrate))
+    # Aynı adaptörde STATUS ile ölçülmüş kısa süreler eski karta uygulanmamalı
+    for _ in range(10):
+        uart.timing_table.record("erase", 0, 0.006, f"{uart.port}|status")
+
+    for _ in range(3):
+        start = clock.elapsed
+        success, message = uart.erase_sector(0)
+        print(f"  {message}")
+        assert success, message
+        assert clock.elapsed - start >= uart.timing_table.default_delay("erase", 0), \
+            "Ölçüm yokken FINISH kılavuz süresinden önce gönderilmemeli"
+    assert uart.status_supported is False, "STATUS desteği olmadığı algılanmalı"
+    assert 0 in device.erased_sectors, "Sektör silinmiş olmalı"
+    assert uart.timing_table.samples("erase", 0, uart._timing_device()) == [], \
+        "Hemen gelen ACK'in gidiş-dönüşü silme süresi sayılmamalı"
+
+    print("  ✅ Eski bootloader silme testleri başarılı\n")
+
+def test_legacy_wait_learned():
+    """ACK'ini işlem bitince gönderen eski kartta bekleme öğrenilen p95'e inmeli"""
+    print("📉 Eski Kart Öğrenme Testleri:")
+
+    clock = VirtualClock(start=1000.0)
+    device = STM32BootloaderSimulator(support_extensions=False, erase_time_scale=0.2, write_prepare_time=0.05,
+                                      clock=clock, ack_when_done=True)
+    uart = make_uart(device, link=VirtualLinkSerial(device, clock, device.baudrate))
+    table = uart.timing_table
+
+    durations = []
+    for _ in range(table.min_samples + 1):
+        start = clock.elapsed
+        success, message = uart.erase_sector(5)
+        assert success, message
+        durations.append(clock.elapsed - start)
+    print(f"  Silme süreleri: {', '.join(f'{d:.3f}s' for d in durations)}")
+    device_key = uart._timing_device()
+    assert device_key.endswith("|legacy"), "Ölçümler eski kart kaydına yazılmalı"
+    assert table.has_learned("erase", 5, device_key), "Tutulan ACK'ler ölçüm olarak kaydedilmeli"
+    assert durations[0] >= table.default_delay("erase", 5), "Ölçüm yokken kılavuz süresi beklenmeli"
+    assert durations[-1] < durations[0] / 2, "Öğrenildikten sonra bekleme kısalmalı"
+    assert durations[-1] >= device.erase_duration(5), "Bekleme gerçek silme süresinin altına inmemeli"
+    assert uart.retry_count == 0, "Öğrenilmiş süreden sonra FINISH meşgul yanıtı almamalı"
+
+    image = bytes(range(256)) * 4
+    for _ in range(table.min_samples + 1):
+        start = clock.elapsed
+        success, message = uart.send_firmware(image, 5)
+        assert success, message
+        prepare = uart._phases["prepare"]
+    print(f"  Yazma hazırlığı: {prepare * 1000:.0f} ms")
+    assert prepare < table.default_delay("write", 5) / 2, "Yazma hazırlığı sabit 1 s yerine öğrenilmeli"
+    assert bytes(device.flash[5]) == image, "Görüntü eksiksiz yazılmalı"
+
+    print("  ✅ Eski kart öğrenme testleri başarılı\n")
+
+def test_erase_sector_range():
+    """Toplu silme her sektör için sonuç ve süre raporlamalı"""
+    print("🧨 Toplu Silme Testleri:")
+
+    device = STM32BootloaderSimulator(erase_time_scale=0.01)
+    uart = make_uart(device)
+    progress = []
+
+    success, message = uart.erase_sectors([2, 3], lambda cur, total, res: progress.append((cur, total)))
+    print(f"  {message}")
+    assert success, message
+    assert device.erased_sectors == {2, 3}, "İki sektör de silinmiş olmalı"
+    assert progress == [(1, 2), (2, 2)], "Her sektör için ilerleme bildirilmeli"
+    assert [r.sector for r in uart.last_erase_results] == [2, 3], "Sonuçlar sıralı olmalı"
+
+    success, message = uart.erase_sectors([4, 20])
+    assert not success, "Geçersiz sektörde hata dönmeli"
+    assert not uart.last_erase_results[-1].success, "Hatalı sektör raporlanmalı"
+
+    print("  ✅ Toplu silme testleri başarılı\n")
+
+def main():
+    """Ana test fonksiyonu"""
+    print("Sektör Zamanlama Testleri Başlatılıyor...\n")
+
+    try:
+        test_flash_layout()
+        test_timing_table_percentile()
+        test_erase_with_status_polling()
+        test_erase_legacy_device_uses_table()
+        test_legacy_wait_learned()
+        test_erase_sector_range()
+
+        print("🎉 Tüm testler başarıyla tamamlandı!")
+
+    except AssertionError as e:
+        print(f"❌ Test hatası: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"❌ Beklenmeyen hata: {e}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
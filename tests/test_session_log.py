@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Oturum Logu Test Dosyası
+========================
+
+Arka plan log yazıcısını test eder: oturum / port başına dosya, boyuta göre
+döndürme ve eski dosyaların gzip ile sıkıştırılması, kuyruk dolunca
+bloklamadan satır atılması.
+"""
+
+import sys
+import os
+import glob
+import gzip
+import tempfile
+import threading
+import time
+
+# Proje kök dizinini Python path'ine ekle
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.session_log import LogWriter, SessionLog, safe_log_name
+
+class SlowDiskLog(SessionLog):
+    """Disk yazması serbest bırakılana kadar takılan log (yavaş disk)"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.release = threading.Event()
+
+    def _write_lines(self, lines):
+        self.release.wait(5.0)
+        super()._write_lines(lines)
+
+def wait_for(condition, timeout: float = 2.0) -> bool:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return condition()
+
+def test_session_files():
+    """Her oturum ayrı dosyaya yazılmalı, satırlar seviyeleriyle kaydedilmeli"""
+    print("📝 Oturum Dosyası Testleri:")
+
+    assert safe_log_name("gui_/dev/ttyUSB0") == "gui_dev_ttyUSB0", "Port adı dosya adına çevrilmeli"
+    assert safe_log_name("tcp://10.0.0.5:4001") == "tcp_10.0.0.5_4001", "Ağ adresi dosya adına çevrilmeli"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        writer = LogWriter()
+        log_a = SessionLog("gui_/dev/ttyUSB0", directory=tmp, writer=writer)
+        log_b = SessionLog("daemon_tcp://rack:4001", directory=tmp, writer=writer)
+        log_a.write("Bağlantı kuruldu", "SUCCESS")
+        log_b.write("job-1: paket 10/64")
+        log_a.write("Yanıt timeout", "ERROR")
+
+        # ERROR satırı flush çağrılmadan diske ulaşmalı
+        assert wait_for(lambda: os.path.exists(log_a.path) and "Yanıt timeout" in open(log_a.path, encoding="utf-8").read()), \
+            "ERROR satırı hemen diske yazılmalı"
+
+        log_a.close()
+        log_b.close()
+        assert writer.flush(), "Yazıcı boşalmalı"
+        assert not log_a.write("kapandıktan sonra"), "Kapatılan log yazmamalı"
+
+        lines_a = open(log_a.path, encoding="utf-8").read().splitlines()
+        print(f"  {os.path.basename(log_a.path)}: {lines_a}")
+        assert len(lines_a) == 2 and "[SUCCESS] Bağlantı kuruldu" in lines_a[0], "Satırlar seviyeleriyle yazılmalı"
+        assert os.path.basename(log_b.path).startswith("daemon_tcp_rack_4001_"), "Port başına ayrı dosya olmalı"
+        assert open(log_b.path, encoding="utf-8").read().count("\n") == 1, "Diğer oturumun satırları karışmamalı"
+
+    print("  ✅ Oturum dosyası testleri başarılı\n")
+
+def test_rotation_and_compression():
+    """Dosya eşiği aşınca döndürülmeli, eski dosyalar sıkıştırılıp sınırlanmalı"""
+    print("🗜️ Döndürme / Sıkıştırma Testleri:")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        writer = LogWriter()
+        log = SessionLog("cli_COM3", directory=tmp, writer=writer, max_bytes=2000, backup_count=2)
+        for i in range(200):
+            log.write(f"paket {i:04d} " + "x" * 40)
+        log.close()
+        assert writer.flush(), "Yazıcı boşalmalı"
+
+        pattern = log.base + ".*.log.gz"
+        assert wait_for(lambda: not glob.glob(log.base + ".*.log") and len(glob.glob(pattern)) == 2), \
+            "Eski dosyalar sıkıştırılmalı ve backup_count ile sınırlanmalı"
+        archives = sorted(glob.glob(pattern))
+        print(f"  {len(archives)} arşiv: {[os.path.basename(a) for a in archives]}")
+
+        assert os.path.getsize(log.path) <= 2000, "Güncel dosya eşiği aşmamalı"
+        with gzip.open(archives[-1], "rt", encoding="utf-8") as f:
+            archived = f.read().splitlines()
+        current = open(log.path, encoding="utf-8").read().splitlines()
+        assert archived and all("paket" in line for line in archived), "Arşiv okunabilir olmalı"
+        assert current[-1].endswith("paket 0199 " + "x" * 40), "Son satır güncel dosyada olmalı"
+
+    print("  ✅ Döndürme / sıkıştırma testleri başarılı\n")
+
+def test_full_queue_drops_without_blocking():
+    """Disk yavaşken kuyruk dolarsa satırlar atılmalı, çağıran beklememeli"""
+    print("🚦 Sınırlı Kuyruk Testleri:")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        writer = LogWriter(max_queue=20, error_put_timeout=0.05)
+        log = SlowDiskLog("gui_slow", directory=tmp, writer=writer)
+
+        start = time.perf_counter()
+        results = [log.write(f"satır {i}") for i in range(200)]
+        elapsed = time.perf_counter() - start
+        print(f"  200 satır {elapsed * 1000:.1f} ms, {results.count(False)} atıldı")
+        assert elapsed < 0.2, "write() diski beklememeli"
+        assert results.count(False) > 0 and writer.dropped == results.count(False), "Fazla satırlar sayılarak atılmalı"
+
+        start = time.perf_counter()
+        log.write("hata", "ERROR")
+        assert time.perf_counter() - start < 0.5, "ERROR satırı da en fazla kısa süre beklemeli"
+
+        log.release.set()
+        log.close()
+        assert writer.flush(), "Yazıcı boşalmalı"
+        written = open(log.path, encoding="utf-8").read().splitlines()
+        assert written and written[0].endswith("satır 0"), "Kuyruğa giren satırlar sırayla yazılmalı"
+        assert any("satır atıldı" in line for line in written), "Atılan satırlar dosyada belirtilmeli"
+
+    print("  ✅ Sınırlı kuyruk testleri başarılı\n")
+
+def main():
+    """Ana test fonksiyonu"""
+    print("Oturum Logu Testleri Başlatılıyor...\n")
+
+    try:
+        test_session_files()
+        test_rotation_and_compression()
+        test_full_queue_drops_without_blocking()
+
+        print("🎉 Tüm testler başarıyla tamamlandı!")
+
+    except AssertionError as e:
+        print(f"❌ Test hatası: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"❌ Beklenmeyen hata: {e}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
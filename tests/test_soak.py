@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Soak Testi Test Dosyası
+=======================
+
+Dayanıklılık testi eşiklerini (bellek / thread / fd büyümesi, hız düşüşü,
+hatalı turlar, GUI log alanı) ve yerel simüle cihaza karşı kısa bir
+UARTCommunication soak'unu test eder. GUI hedefi ekran gerektirdiğinden
+burada çalıştırılmaz.
+"""
+
+import sys
+import os
+import tempfile
+import threading
+
+# Proje kök dizinini Python path'ine ekle
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.soak import SoakMonitor, SoakSample, SoakThresholds, run_soak
+
+def make_sample(iteration: int, throughput: float = 40_000, threads: int = 3, rss: int = 30 << 20,
+                fds: int = 6, success: bool = True, widget_lines=None) -> SoakSample:
+    return SoakSample(iteration, iteration * 0.1, 0.1, throughput, success, "OK" if success else "NACK",
+                      rss, 100_000, threads, fds, widget_lines)
+
+def test_thresholds():
+    """Taban ve son pencere medyanları karşılaştırılmalı, tek turluk sıçramalar yok sayılmalı"""
+    print("📏 Eşik Testleri:")
+
+    thresholds = SoakThresholds(warmup=2, window=4, max_thread_growth=2, max_slowdown=0.25)
+
+    def check(samples):
+        monitor = SoakMonitor(thresholds)
+        monitor.samples = samples
+        return monitor.check()
+
+    steady = [make_sample(i) for i in range(12)]
+    steady[9].threads = 20  # Tek turluk sıçrama
+    assert check(steady) == [], "Kararlı koşu ihlal üretmemeli"
+
+    leaking = [make_sample(i, threads=3 + i) for i in range(12)]
+    violations = check(leaking)
+    print(f"  Thread sızıntısı: {violations}")
+    assert len(violations) == 1 and "Thread" in violations[0], "Thread büyümesi yakalanmalı"
+
+    slowing = [make_sample(i, throughput=40_000 if i < 8 else 20_000) for i in range(12)]
+    violations = check(slowing)
+    print(f"  Yavaşlama: {violations}")
+    assert len(violations) == 1 and "Hız" in violations[0], "Hız düşüşü yakalanmalı"
+
+    growing = [make_sample(i, rss=(30 << 20) + i * (8 << 20)) for i in range(12)]
+    assert any("RSS" in v for v in check(growing)), "RSS büyümesi yakalanmalı"
+
+    assert check(steady[:5]) == [], "Yeterli tur yokken büyüme ölçülmemeli"
+    failed = steady[:3] + [make_sample(3, success=False)]
+    assert any("başarısız" in v for v in check(failed)), "Hatalı tur hemen raporlanmalı"
+    assert check([make_sample(0, widget_lines=6000)]), "Sınırsız büyüyen log alanı yakalanmalı"
+
+    print("  ✅ Eşik testleri başarılı\n")
+
+def test_uart_soak():
+    """Simüle cihaza karşı kısa soak: tüm turlar başarılı, kaynaklar sabit"""
+    print("♻️ UART Soak Testleri:")
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        home = os.environ.get("STM32_BOOTLOADER_HOME")
+        thresholds = SoakThresholds(warmup=1, window=3, max_slowdown=0.9)
+        report = run_soak("uart", iterations=8, image_size=2048, thresholds=thresholds, data_dir=data_dir)
+        print("  " + report.summary().replace("\n", "\n  "))
+        assert report.ok and len(report.samples) == 8, "Soak başarılı olmalı"
+        assert all(s.throughput > 0 for s in report.samples), "Her turda hız ölçülmeli"
+        first, last = report.samples[0], report.samples[-1]
+        assert last.threads <= first.threads, "Bağlantı kapanınca alım thread'i kalmamalı"
+        if first.fds is not None:
+            assert last.fds <= first.fds + 1, "Port / soket tanımlayıcıları sızmamalı"
+        assert os.path.exists(os.path.join(data_dir, "sector_timing.json")), \
+            "Zamanlama tablosu verilen dizine yazılmalı"
+        assert os.environ.get("STM32_BOOTLOADER_HOME") == home, "Soak ortam değişkenlerini değiştirmemeli"
+
+        # Her turda sızan bir thread erken durdurmalı
+        stop = threading.Event()
+
+        def leak(sample):
+            threading.Thread(target=stop.wait, daemon=True).start()
+
+        thresholds = SoakThresholds(warmup=1, window=2, max_thread_growth=1, max_slowdown=0.9)
+        report = run_soak("uart", iterations=20, image_size=1024, thresholds=thresholds, on_sample=leak,
+                          data_dir=data_dir)
+        stop.set()
+        print(f"  Sızıntı: {report.violations}")
+        assert not report.ok and len(report.samples) < 20, "Thread sızıntısı soak'u durdurmalı"
+
+    print("  ✅ UART soak testleri başarılı\n")
+
+def main():
+    """Ana test fonksiyonu"""
+    print("Soak Testleri Başlatılıyor...\n")
+
+    try:
+        test_thresholds()
+        test_uart_soak()
+
+        print("🎉 Tüm testler başarıyla tamamlandı!")
+
+    except AssertionError as e:
+        print(f"❌ Test hatası: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"❌ Beklenmeyen hata: {e}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
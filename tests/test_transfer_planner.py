@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Aktarım Süresi Planlayıcı Test Dosyası
+======================================
+
+Paket / hat süresi hesabını, mod başına tahminleri, desteklenen en hızlı
+modun seçilmesini, bağlantı profilinin geçmiş oturumlardan çıkarılmasını ve
+simülatöre yükleme sonrası tahminin gerçek süreyle birlikte kaydedilmesini
+test eder.
+"""
+
+import sys
+import os
+import time
+
+# Proje kök dizinini Python path'ine ekle
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.device_simulator import STM32BootloaderSimulator
+from src.flash_history import FlashHistory, FlashRecord
+from src.sector_timing import SectorTimingTable
+from src.transfer_planner import (
+    COMPRESSED, LARGE_FRAMES, SPARSE, STOP_AND_WAIT, TRANSFER_MODES, WINDOWED,
+    LinkProfile, estimate_link, plan_transfer, wire_time,
+)
+from tests.sim_helpers import make_uart
+
+def test_frame_math():
+    """Hat süresi 8N1'e göre hesaplanmalı, modlar paket sayısına göre sıralanmalı"""
+    print("🧮 Paket Süresi Testleri:")
+
+    assert abs(wire_time(21, 115200) - 21 * 10 / 115200) < 1e-12, "8N1: byte başına 10 bit"
+    link = LinkProfile(115200, turnaround=0.001, guard_time=0.002, prepare=0.5, finish=0.01)
+    assert abs(link.frame_time() - (wire_time(22, 115200) + 0.003)) < 1e-12, "Paket + ACK + bekleme + guard"
+    print(f"  {link}")
+
+    image = bytes(i % 251 for i in range(4096))
+    plan = plan_transfer(image, link)
+    for line in plan.table():
+        print(f"  {line}")
+    assert [p.mode for p in plan.predictions] == list(TRANSFER_MODES), "Her mod tahmin edilmeli"
+
+    stop_and_wait = plan.prediction(STOP_AND_WAIT)
+    assert stop_and_wait.packets == 256, "16 byte'lık paketler"
+    assert abs(stop_and_wait.duration - (0.51 + 256 * link.frame_time())) < 1e-9, "Hazırlık + veri + FINISH"
+    assert plan.prediction(WINDOWED).duration < stop_and_wait.duration, "Pencere ACK beklemesini azaltmalı"
+    assert plan.prediction(LARGE_FRAMES).packets == 16, "256 byte'lık çerçeveler"
+    assert plan.prediction(LARGE_FRAMES).duration < stop_and_wait.duration, "Büyük çerçeve daha az ACK beklemeli"
+
+    erased = plan_transfer(image, link, erase_time=2.0)
+    assert abs(erased.best().duration - stop_and_wait.duration - 2.0) < 1e-9, "Silme süresi eklenmeli"
+
+    print("  ✅ Paket süresi testleri başarılı\n")
+
+def test_mode_selection():
+    """Otomatik seçim yalnızca cihazın desteklediği modlar arasından yapılmalı"""
+    print("🎯 Mod Seçimi Testleri:")
+
+    link = LinkProfile(921600, turnaround=0.004, guard_time=0.002, prepare=1.0, finish=0.01)
+    # Yarısı silinmiş (0xFF) ve kolay sıkışan görüntü
+    image = b"\x00\x01" * 1024 + b"\xff" * 2048
+    plan = plan_transfer(image, link)
+    print(f"  {plan.summary()}")
+    assert plan.best().mode == STOP_AND_WAIT, "Bu bootloader yalnızca stop-and-wait destekler"
+    assert all(not p.supported for p in plan.predictions if p.mode != STOP_AND_WAIT), \
+        "Diğer modlar desteklenmiyor olarak işaretlenmeli"
+    assert "cihaz desteklemiyor" in str(plan.prediction(WINDOWED)), "Tabloda belirtilmeli"
+
+    assert plan.prediction(SPARSE).packets == 128, "Tamamı 0xFF olan bloklar atlanmalı"
+    assert plan.prediction(COMPRESSED).packets < 128, "Tekrarlı veri sıkışmalı"
+
+    extended = plan_transfer(image, link, supported=TRANSFER_MODES)
+    print(f"  Tüm modlar destekli: {extended.summary()}")
+    assert extended.best().mode != STOP_AND_WAIT, "Daha hızlı mod desteklenirse seçilmeli"
+    assert extended.best().duration == min(p.duration for p in extended.predictions), "En hızlı mod seçilmeli"
+
+    try:
+        plan_transfer(image, link, supported=()).best()
+        assert False, "Desteklenen mod yoksa hata verilmeli"
+    except ValueError as e:
+        print(f"  Beklenen hata: {e}")
+
+    plan.actual = plan.best().duration * 1.1
+    print(f"  {plan.compare()}")
+    assert "%+10" in plan.compare(), "Gerçek süre tahminle karşılaştırılmalı"
+
+    print("  ✅ Mod seçimi testleri başarılı\n")
+
+def test_link_from_history():
+    """Bağlantı profili aynı port / baud rate'teki başarılı yüklemelerden çıkarılmalı"""
+    print("📚 Geçmişten Profil Testleri:")
+
+    history = FlashHistory(path="")
+    now = time.time()
+    per_packet = 0.008
+    for i in range(5):
+        history.record(FlashRecord("flash", "COM3", now + i, 3.0, True, sectors="5", bytes=4096, packets=256,
+                                   baudrate=115200, phases={"prepare": 0.6, "data": 256 * per_packet,
+                                                            "finish": 0.02}))
+    # Başka baud rate, başarısız yükleme ve başka port sayılmamalı
+    history.record(FlashRecord("flash", "COM3", now + 10, 9.0, True, packets=256, baudrate=9600,
+                               phases={"data": 5.0}))
+    history.record(FlashRecord("flash", "COM3", now + 11, 9.0, False, packets=256, baudrate=115200,
+                               phases={"data": 5.0}))
+    history.record(FlashRecord("flash", "COM4", now + 12, 9.0, True, packets=256, baudrate=115200,
+                               phases={"data": 5.0}))
+    history.flush()
+
+    link = estimate_link(115200, 0.002, 5, history, "COM3")
+    print(f"  {link}")
+    assert link.source.startswith("geçmiş") and "5 oturum" in link.source, "Geçmiş oturumlar kullanılmalı"
+    assert abs(link.frame_time() - per_packet) < 1e-9, "Paket süresi geçmişle eşleşmeli"
+    assert link.prepare == 0.6 and link.finish == 0.02, "Hazırlık / FINISH süreleri geçmişten gelmeli"
+
+    rto = estimate_link(115200, 0.002, 5, history, "COM9", rtt=0.005)
+    assert rto.source == "rto", "Geçmiş yoksa ölçülen gidiş-dönüş kullanılmalı"
+    default = estimate_link(115200, 0.002, 5, timing_table=SectorTimingTable(path=""))
+    assert default.source == "varsayılan", "Ölçüm yoksa varsayılan"
+    history.close()
+
+    print("  ✅ Geçmişten profil testleri başarılı\n")
+
+def test_prediction_recorded():
+    """Yükleme sonrası tahmin gerçek süreyle birlikte geçmişe yazılmalı"""
+    print("📝 Tahmin Kaydı Testleri:")
+
+    uart = make_uart(STM32BootloaderSimulator(), history=FlashHistory(path=""))
+
+    image = bytes(i % 251 for i in range(1024))
+    success, message = uart.send_firmware(image, 5)
+    assert success, message
+    assert uart.last_plan is None, "Plan istenmeden yüklemede tahmin hesaplanmamalı"
+
+    plan = uart.plan_transfer(image, 5, erase=True)
+    assert uart.plan_transfer(image, 5).link is plan.link, "Bağlantı profili yeniden hesaplanmamalı"
+    success, message = uart.send_firmware(image, 5, plan=plan)
+    assert success, message
+    print(f"  {plan.compare()}")
+    assert uart.last_plan is plan and plan.actual is not None and plan.actual > 0, "Gerçek süre plana yazılmalı"
+    assert abs(plan.flash_duration - (plan.best().duration - plan.erase_time)) < 1e-9 and plan.erase_time > 0, \
+        "Gerçek süre silme hariç tahminle karşılaştırılmalı"
+
+    uart.history.flush()
+    record = uart.history.recent(1, "flash")[0]
+    assert abs(record.phases["predicted"] - plan.flash_duration) < 1e-3, "Tahmin aşamalarla birlikte saklanmalı"
+
+    # Yükleme sonrası profil yenilenir: sonraki plan bu oturumlardan öğrenmeli
+    link = uart.plan_transfer(image, 5).link
+    assert link is not plan.link and link.source.startswith("geçmiş"), "Sonraki tahmin geçmiş oturumu kullanmalı"
+    uart.history.close()
+
+    print("  ✅ Tahmin kaydı testleri başarılı\n")
+
+def main():
+    """Ana test fonksiyonu"""
+    print("Aktarım Planlayıcı Testleri Başlatılıyor...\n")
+
+    try:
+        test_frame_math()
+        test_mode_selection()
+        test_link_from_history()
+        test_prediction_recorded()
+
+        print("🎉 Tüm testler başarıyla tamamlandı!")
+
+    except AssertionError as e:
+        print(f"❌ Test hatası: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"❌ Beklenmeyen hata: {e}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Taşıma Katmanı Test Dosyası
+===========================
+
+Port adından taşıma seçimini ve TCP üzerinden (ham TCP ve pyserial socket://)
+simülatöre uçtan uca aktarımı test eder; aktarım hızını da raporlar.
+"""
+
+import sys
+import os
+import time
+
+# Proje kök dizinini Python path'ine ekle
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.device_simulator import STM32BootloaderSimulator, TcpBootloaderDevice
+from src.sector_timing import SectorTimingTable
+from src.transport import (
+    LOCAL_SERIAL_DEFAULTS, NETWORK_DEFAULTS, SerialTransport, SerialURLTransport,
+    TCPTransport, Transport, create_transport, parse_host_port,
+)
+from src.uart_comm import UARTCommunication
+
+def test_create_transport():
+    """Port adına göre doğru taşıma ve varsayılanlar seçilmeli"""
+    print("🔌 Taşıma Seçimi Testleri:")
+
+    assert isinstance(create_transport("/dev/ttyUSB0"), SerialTransport), "Yerel port SerialTransport olmalı"
+    assert isinstance(create_transport("COM3"), SerialTransport), "COM port SerialTransport olmalı"
+    assert isinstance(create_transport("tcp://10.0.0.5:4001"), TCPTransport), "tcp:// TCPTransport olmalı"
+    assert isinstance(create_transport("rfc2217://rack:2217"), SerialURLTransport), "rfc2217:// URL olmalı"
+    assert create_transport("rfc2217://rack:2217").supports_baudrate, "rfc2217 baud rate'i iletebilmeli"
+    assert not create_transport("socket://rack:4001").supports_baudrate, "socket:// baud rate değiştiremez"
+    assert parse_host_port("tcp://[::1]:4001") == ("::1", 4001), "IPv6 adresi çözülmeli"
+
+    uart = UARTCommunication("tcp://10.0.0.5:4001")
+    assert uart.guard_time == NETWORK_DEFAULTS.guard_time, "Ağ guard süresi uygulanmalı"
+    assert uart.nack_code_timeout == NETWORK_DEFAULTS.nack_code_timeout, "Ağ NACK kodu beklemesi uygulanmalı"
+    uart = UARTCommunication("/dev/ttyUSB0")
+    assert uart.guard_time == LOCAL_SERIAL_DEFAULTS.guard_time, "Yerel guard süresi uygulanmalı"
+
+    try:
+        parse_host_port("tcp://rack")
+        assert False, "Portsuz adres reddedilmeli"
+    except ValueError:
+        pass
+
+    class NoOpenTransport(Transport):
+        kind = "eksik"
+    for cls in (Transport, NoOpenTransport):
+        try:
+            cls("x")
+            assert False, f"open() uygulamayan {cls.__name__} oluşturulamamalı"
+        except TypeError:
+            pass
+
+    print("  ✅ Taşıma seçimi testleri başarılı\n")
+
+def flash_over(url: str, device: STM32BootloaderSimulator) -> float:
+    """URL üzerinden silme + yükleme yapar, paket/saniye döner"""
+    uart = UARTCommunication(url)
+    uart.timing_table = SectorTimingTable(path="")
+    assert uart.connect(), f"{url} açılmalı"
+    try:
+        success, message = uart.erase_sector(0)
+        assert success, message
+
+        firmware = bytes(range(256)) * 8
+        start = time.time()
+        success, message = uart.send_firmware(firmware, 0)
+        elapsed = time.time() - start
+        assert success, message
+        assert device.flash[0][:len(firmware)] == firmware, "Firmware cihaza aynen yazılmalı"
+        return (len(firmware) // 16 + 2) / elapsed
+    finally:
+        uart.disconnect()
+
+def test_tcp_transfer():
+    """Ham TCP ve socket:// üzerinden aktarım çalışmalı"""
+    print("🌐 TCP Aktarım Testleri:")
+
+    device = STM32BootloaderSimulator(erase_time_scale=0.01)
+    with TcpBootloaderDevice(device) as tcp_device:
+        rate = flash_over(tcp_device.url, device)
+        print(f"  tcp://    {rate:8.0f} paket/s")
+        rate = flash_over(tcp_device.socket_url, device)
+        print(f"  socket:// {rate:8.0f} paket/s")
+        assert tcp_device.connections == 2, "Her aktarım ayrı bağlantı açmalı"
+
+        uart = UARTCommunication(tcp_device.url)
+        assert uart.connect(), "TCP bağlantısı açılmalı"
+        try:
+            success, message = uart.auto_baud()
+            assert not success, "Ham TCP'de oto baud reddedilmeli"
+
+            start = time.time()
+            uart.disconnect()
+            assert time.time() - start < 0.5, "Alım thread'i hemen durmalı"
+        finally:
+            uart.disconnect()
+
+    uart = UARTCommunication(tcp_device.url)
+    assert not uart.connect(), "Kapalı sunucuya bağlantı başarısız olmalı"
+
+    print("  ✅ TCP aktarım testleri başarılı\n")
+
+def main():
+    """Ana test fonksiyonu"""
+    print("Taşıma Katmanı Testleri Başlatılıyor...\n")
+
+    try:
+        test_create_transport()
+        test_tcp_transfer()
+
+        print("🎉 Tüm testler başarıyla tamamlandı!")
+
+    except AssertionError as e:
+        print(f"❌ Test hatası: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"❌ Beklenmeyen hata: {e}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+UART İletişim Test Dosyası
+==========================
+
+UARTCommunication'ın alım thread'i, yanıt kuyruğu ve iptal akışını simülatör
+üzerinden test eder.
+"""
+
+import sys
+import os
+import threading
+import time
+
+# Proje kök dizinini Python path'ine ekle
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.cancellation import CancelToken, CANCELLED_MESSAGE
+from src.device_simulator import STM32BootloaderSimulator
+from src.stm32_protocol import STM32Protocol, MessageType
+from tests.sim_helpers import make_uart
+
+def test_reader_thread_queue():
+    """Yanıtlar alım thread'i üzerinden zaman damgasıyla gelmeli"""
+    print("📥 Alım Thread'i Testleri:")
+
+    device = STM32BootloaderSimulator()
+    uart = make_uart(device)
+
+    success, message = uart.send_packet_and_wait_ack(STM32Protocol.create_ping_packet())
+    assert success, message
+    assert uart._reader_thread is not None and uart._reader_thread.is_alive(), "Alım thread'i çalışmalı"
+    assert uart.last_round_trip is not None and uart.last_round_trip < 0.5, "Gidiş-dönüş süresi ölçülmeli"
+
+    # İşlemler arasında gelen yanıt sonraki pakete atfedilmemeli
+    uart.serial_conn.inject(bytes([STM32Protocol.NACK_BYTE, 0x02]))
+    time.sleep(0.1)
+    success, message = uart.send_packet_and_wait_ack(STM32Protocol.create_ping_packet())
+    assert success, f"Eski NACK atılmalıydı: {message}"
+
+    print("  ✅ Alım thread'i testleri başarılı\n")
+
+def test_reader_thread_nack_without_code():
+    """Hata kodu gelmeyen NACK, kısa beklemeden sonra kodsuz raporlanmalı"""
+    print("❓ Kodsuz NACK Testleri:")
+
+    device = STM32BootloaderSimulator()
+    uart = make_uart(device)
+    uart._ensure_reader()
+
+    uart.serial_conn.inject(bytes([STM32Protocol.NACK_BYTE]))
+    event = uart._wait_response(1.0)
+    assert event is not None and not event.is_ack, "NACK raporlanmalı"
+    assert event.code is None, "Hata kodu olmamalı"
+
+    print("  ✅ Kodsuz NACK testleri başarılı\n")
+
+def test_reader_thread_stops_on_disconnect():
+    """disconnect() alım thread'ini beklemeden durdurmalı"""
+    print("🔌 Bağlantı Kapatma Testleri:")
+
+    device = STM32BootloaderSimulator()
+    uart = make_uart(device)
+    uart.send_packet_and_wait_ack(STM32Protocol.create_ping_packet())
+    thread = uart._reader_thread
+
+    start = time.time()
+    uart.disconnect()
+    assert time.time() - start < 0.5, "Bloklayan read iptal edilmeli"
+    assert not thread.is_alive(), "Alım thread'i durmalı"
+
+    print("  ✅ Bağlantı kapatma testleri başarılı\n")
+
+def test_cancel_firmware_transfer():
+    """İptal edilen yükleme bir paket içinde durmalı ve cihaza FINISH gitmeli"""
+    print("⛔ Yükleme İptal Testleri:")
+
+    device = STM32BootloaderSimulator()
+    uart = make_uart(device)
+    token = CancelToken()
+
+    def on_progress(current, total):
+        if current == 10:
+            token.cancel()
+
+    success, message = uart.send_firmware(bytes(16 * 200), 5, on_progress, cancel_token=token)
+    print(f"  {message}")
+    assert not success and message == CANCELLED_MESSAGE, "İptal mesajı dönmeli"
+    data_packets = device.received_types.count(MessageType.DATA)
+    assert data_packets == 10, f"İptalden sonra DATA gönderilmemeli ({data_packets})"
+    assert device.received_types[-1] == MessageType.FINISH, "Cihaza FINISH gönderilmeli"
+
+    # Port temiz kalmalı: sonraki işlem normal çalışır
+    success, message = uart.send_firmware(bytes(32), 5)
+    assert success, message
+
+    print("  ✅ Yükleme iptal testleri başarılı\n")
+
+def test_cancel_erase_wait():
+    """Silme beklemesi iptal edilince hemen dönmeli"""
+    print("🛑 Silme İptal Testleri:")
+
+    device = STM32BootloaderSimulator(erase_time_scale=1.0)
+    uart = make_uart(device)
+    token = CancelToken()
+    threading.Timer(0.1, token.cancel).start()
+
+    start = time.time()
+    success, message = uart.erase_sectors([5, 6, 7], cancel_token=token)
+    elapsed = time.time() - start
+    print(f"  {message} ({elapsed:.2f}s)")
+    assert not success and message.startswith(CANCELLED_MESSAGE), "İptal mesajı dönmeli"
+    assert elapsed < 0.8, "Silme süresinin sonu beklenmemeli"
+    assert MessageType.CMD_ERASE not in device.received_types[device.received_types.index(MessageType.FINISH):], \
+        "İptalden sonra yeni sektör silinmemeli"
+
+    print("  ✅ Silme iptal testleri başarılı\n")
+
+def main():
+    """Ana test fonksiyonu"""
+    print("UART İletişim Testleri Başlatılıyor...\n")
+
+    try:
+        test_reader_thread_queue()
+        test_reader_thread_nack_without_code()
+        test_reader_thread_stops_on_disconnect()
+        test_cancel_firmware_transfer()
+        test_cancel_erase_wait()
+
+        print("🎉 Tüm testler başarıyla tamamlandı!")
+
+    except AssertionError as e:
+        print(f"❌ Test hatası: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"❌ Beklenmeyen hata: {e}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
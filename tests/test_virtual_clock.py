@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Sanal Zaman Test Dosyası
+========================
+
+VirtualClock'u, hat süresini baud rate ve çerçeve boyundan hesaplayan
+VirtualLinkSerial'ı ve UARTCommunication'ın sanal zamanda (alım thread'i
+olmadan) silme / yükleme yapmasını test eder: oturum gerçek donanımda
+sürecek zamanı raporlamalı ama gerçekte çok daha kısa sürmeli.
+"""
+
+import contextlib
+import io
+import logging
+import sys
+import os
+import threading
+import time
+
+# Proje kök dizinini Python path'ine ekle
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.clock import SYSTEM_CLOCK, VirtualClock
+from src.device_simulator import STM32BootloaderSimulator, VirtualLinkSerial
+from src.stm32_protocol import STM32Protocol
+from src.virtual_bench import simulate_flash, sweep
+from tests.sim_helpers import make_uart
+
+def make_virtual_uart(baudrate: int = 115200, turnaround: float = 0.0005):
+    """Sanal hatla simülatöre bağlı UARTCommunication"""
+    clock = VirtualClock(start=1000.0)
+    device = STM32BootloaderSimulator(baudrate, erase_time_scale=0.5, clock=clock)
+    uart = make_uart(device, link=VirtualLinkSerial(device, clock, baudrate, turnaround=turnaround))
+    return uart, device, clock
+
+def test_clock():
+    """Sanal saat yalnızca sleep / advance_to ile ilerlemeli, geri gitmemeli"""
+    print("⏱️ Saat Testleri:")
+
+    assert not SYSTEM_CLOCK.virtual and abs(SYSTEM_CLOCK.time() - time.time()) < 1.0, "Gerçek saat"
+
+    clock = VirtualClock(start=100.0)
+    wall_start = time.perf_counter()
+    clock.sleep(3600)
+    assert time.perf_counter() - wall_start < 0.1, "Sanal bekleme gerçekte beklememeli"
+    assert clock.time() == 3700.0 and clock.elapsed == 3600.0, "Saat bekleme kadar ilerlemeli"
+    clock.advance_to(50.0)
+    assert clock.elapsed == 3600.0, "Saat geri alınmamalı"
+    clock.advance_to(3800.0)
+    clock.sleep(-1)
+    assert clock.elapsed == 3700.0, "advance_to ileri almalı, negatif bekleme yok sayılmalı"
+
+    print("  ✅ Saat testleri başarılı\n")
+
+def test_virtual_link():
+    """Gidiş-dönüş hat süresi + cihaz gecikmesi olmalı; kayıp yanıt sanal timeout'a düşmeli"""
+    print("🔌 Sanal Hat Testleri:")
+
+    threads = threading.active_count()
+    uart, device, clock = make_virtual_uart(turnaround=0.001)
+    link = uart.serial_conn
+
+    success, message = uart.send_cmd_write_packet(5)
+    assert success, message
+    success, message = uart.send_data_packet(b"\x11" * 16)
+    assert success, message
+    # flush() TX bitene kadar bekler: ölçüm paket hattan çıktıktan sonra başlar
+    expected = 0.001 + link.wire_time(1)
+    print(f"  DATA gidiş-dönüşü: {uart.last_round_trip * 1000:.3f} ms (beklenen {expected * 1000:.3f} ms)")
+    assert abs(uart.last_round_trip - expected) < 1e-6, "Gidiş-dönüş cihaz gecikmesi + ACK hat süresi olmalı"
+    assert threading.active_count() == threads, "Sanal zamanda alım thread'i başlatılmamalı"
+
+    # Kayıp yanıt: timeout sanal saatte dolmalı
+    link.lost_responses = 1
+    before, wall_start = clock.elapsed, time.perf_counter()
+    success, message = uart.send_packet_and_wait_ack(STM32Protocol.create_data_packet(b"\x22" * 16), timeout=5.0)
+    print(f"  Kayıp yanıt: {message} (sanal {clock.elapsed - before:.2f}s)")
+    assert not success and "timeout" in message, "Kayıp yanıt timeout olmalı"
+    assert clock.elapsed - before >= 5.0, "Timeout sanal saatte dolmalı"
+    assert time.perf_counter() - wall_start < 0.5, "Timeout gerçekte beklenmemeli"
+
+    # NACK hata kodu da sanal zamanda çözülmeli
+    success, message = uart.send_cmd_write_packet(20)
+    assert not success and uart.last_nack_code == 0x04, "Geçersiz sektör NACK 0x04 almalı"
+
+    print("  ✅ Sanal hat testleri başarılı\n")
+
+def test_virtual_session():
+    """Silme + yükleme sanal zamanda: gerçek donanım süresi raporlanmalı, gerçekte kısa sürmeli"""
+    print("🚀 Sanal Oturum Testleri:")
+
+    uart, device, clock = make_virtual_uart()
+    wall_start = time.perf_counter()
+    success, message = uart.erase_sector(5)
+    assert success, message
+    print(f"  {message}")
+    assert abs(clock.elapsed - device.erase_duration(5)) < 0.05, "Silme süresi cihazın meşgul süresi kadar olmalı"
+
+    image = bytes(i % 251 for i in range(16 * 1024))
+    success, message = uart.send_firmware(image, 5, plan=uart.plan_transfer(image, 5))
+    wall = time.perf_counter() - wall_start
+    assert success, message
+    assert bytes(device.flash[5]) == image, "Görüntü cihaza yazılmalı"
+    print(f"  Sanal {clock.elapsed:.2f}s, gerçek {wall * 1000:.0f} ms")
+    assert wall < clock.elapsed / 5, "Simülasyon gerçek süreden çok daha kısa sürmeli"
+    actual = uart.last_plan.actual
+    assert actual > 1024 * uart.serial_conn.wire_time(STM32Protocol.PACKET_SIZE), "Süre hat süresini içermeli"
+    assert abs(actual - sum(uart._phases[p] for p in ("prepare", "data", "finish"))) < 1e-3, \
+        "Oturum ve aşama süreleri sanal saatten ölçülmeli"
+
+    print("  ✅ Sanal oturum testleri başarılı\n")
+
+def test_bench():
+    """Sanal koşu planlayıcının tahminiyle örtüşmeli; parametre taraması karşılaştırılabilir olmalı"""
+    print("📊 Sanal Benchmark Testleri:")
+
+    image = bytes(i % 251 for i in range(128 * 1024))
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        run = simulate_flash(image, baudrate=115200, erase=True)
+    assert output.getvalue() == "" or logging.getLogger("src.uart_comm").isEnabledFor(logging.DEBUG), \
+        "DEBUG kapalıyken paket izi yazılmamalı"
+    print(f"  {run}")
+    assert run.success, run.message
+    assert abs(run.duration - run.predicted) / run.predicted < 0.01, "Simülasyon analitik modelle örtüşmeli"
+    assert run.duration > 30 and run.wall_time < run.duration / 20, "Dakikalık oturum saniyeler içinde bitmeli"
+    assert {"erase_5", "prepare", "data", "finish"} <= set(run.phases), "Aşama süreleri raporlanmalı"
+
+    small = image[:8 * 1024]
+    runs = sweep(small, baudrates=(115200, 921600), turnarounds=(0.0005, 0.004), error_rates=(0.0, 0.05))
+    for run in runs:
+        print(f"  {run}")
+    assert len(runs) == 8, "Tüm kombinasyonlar koşulmalı"
+    ok = {(r.baudrate, r.turnaround): r.duration for r in runs if r.error_rate == 0}
+    assert all(r.success for r in runs if r.error_rate == 0), "Hatasız hatta yükleme başarılı olmalı"
+    assert ok[(921600, 0.0005)] < ok[(115200, 0.0005)] < ok[(115200, 0.004)], "Hız ve gecikme süreyi etkilemeli"
+    assert not any(r.success for r in runs if r.error_rate == 0.05), \
+        "Tekrar denemesiz protokolde %5 hata oturumu düşürmeli"
+    again = simulate_flash(small, error_rate=0.05, seed=0)
+    assert again.message == runs[1].message, "Aynı tohumla sonuç tekrarlanabilir olmalı"
+
+    print("  ✅ Sanal benchmark testleri başarılı\n")
+
+def main():
+    """Ana test fonksiyonu"""
+    print("Sanal Zaman Testleri Başlatılıyor...\n")
+
+    try:
+        test_clock()
+        test_virtual_link()
+        test_virtual_session()
+        test_bench()
+
+        print("🎉 Tüm testler başarıyla tamamlandı!")
+
+    except AssertionError as e:
+        print(f"❌ Test hatası: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"❌ Beklenmeyen hata: {e}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()